@@ -1,6 +1,5 @@
 from milenage import Milenage
 import binascii
-import base64
 import logging
 import os
 import sys
@@ -19,123 +18,57 @@ CryptoLogger.info("Initialised Diameter Logger, importing database")
 #The EUTRAN Authentication Vector generator is based on the one used in [Facebook Magma](https://github.com/facebookincubator/magma), which in turn is based off [OAI-CN](https://github.com/OPENAIRINTERFACE/openair-cn).
 
 def generate_eutran_vector(key, op_c, amf, sqn, plmn):
-    CryptoLogger.debug("Generating EUTRAN Vectors")
+    return generate_eutran_vectors(key, op_c, amf, [sqn], plmn)[0]
 
-    key = key.encode('utf-8')
-    CryptoLogger.debug("Input K:  " + str(key))
+def generate_eutran_vectors(key, op_c, amf, sqns, plmn):
+    """
+    Generates one EUTRAN vector per SQN in sqns for the same subscriber, as a list of hex (rand, xres, autn, kasme).
+    The keys are decoded once for the whole batch.
+    """
     key = binascii.unhexlify(key)
-    
-    op_c = op_c.encode('utf-8')
-    CryptoLogger.debug("Input OPc:  " + str(op_c))
     op_c = binascii.unhexlify(op_c)
-    
-    amf = str(amf)
-    amf = amf.encode('utf-8')
-    amf = binascii.unhexlify(amf)
-    CryptoLogger.debug("Input AMF: " + str(amf))
-    
-    sqn = int(sqn)
-    CryptoLogger.debug("Input SQN: " + str(sqn))
-
-    plmn = plmn.encode('utf-8')
     plmn = binascii.unhexlify(plmn)
-    CryptoLogger.debug("Input PLMN: " + str(plmn))
-    
-
+    crypto = Milenage(binascii.unhexlify(str(amf)))
+
+    vectors = []
+    for sqn in sqns:
+        vector = crypto.generate_eutran_vector(key, op_c, int(sqn), plmn)
+        vectors.append(tuple(value.hex() for value in vector))
+    return vectors
+
+def generate_eutran_vector_batch(keys, op_cs, amf, sqns, plmn):
+    """
+    Generates one EUTRAN vector per row with the batch Milenage, where row i uses keys[i], op_cs[i] and sqns[i], as a list of hex (rand, xres, autn, kasme).
+    Every row shares the same AMF and PLMN. Falls back to the scalar Milenage if NumPy isn't installed.
+    """
+    try:
+        import milenageBatch
+    except ImportError:
+        return [generate_eutran_vector(key, op_c, amf, sqn, plmn) for key, op_c, sqn in zip(keys, op_cs, sqns)]
+    vectors = milenageBatch.generateEutranVectors([binascii.unhexlify(key) for key in keys], [binascii.unhexlify(op_c) for op_c in op_cs], sqns, binascii.unhexlify(plmn), binascii.unhexlify(str(amf)))
+    return [tuple(values[i].tobytes().hex() for values in vectors) for i in range(len(sqns))]
+
+def generate_aka_vectors(key, op_c, amf, sqns):
+    """
+    Generates one UMTS AKA vector per SQN in sqns for the same subscriber with the batch Milenage, as a list of hex (rand, autn, xres, ck, ik).
+    Falls back to the scalar Milenage if NumPy isn't installed.
+    """
+    try:
+        import milenageBatch
+    except ImportError:
+        crypto = Milenage(binascii.unhexlify(str(amf)))
+        vectors = [crypto.generate_maa_vector(binascii.unhexlify(key), binascii.unhexlify(op_c), int(sqn), None) for sqn in sqns]
+        return [(rand.hex(), autn.hex(), xres.hex(), ck.hex(), ik.hex()) for rand, xres, autn, ck, ik in vectors]
+    vectors = milenageBatch.generateAkaVectors(binascii.unhexlify(key), binascii.unhexlify(op_c), sqns, binascii.unhexlify(str(amf)))
+    return [tuple(values[i].tobytes().hex() for values in vectors) for i in range(len(sqns))]
 
-    crypto = Milenage(amf)
-
-    CryptoLogger.debug("Instantiated crypto object")
-    CryptoLogger.debug("Running crypto.generate_eutran_vector")
-    (rand, xres, autn, kasme) = crypto.generate_eutran_vector(key, op_c, sqn, plmn)
-    CryptoLogger.debug("Successfully ran crypto.generate_eutran_vector")
-    rand = binascii.hexlify(rand).decode('utf-8')
-
-    CryptoLogger.debug("output rand: " + str(rand))
-    xres = binascii.hexlify(xres).decode('utf-8')
-    CryptoLogger.debug("output xres: " + str(xres))
-    autn = binascii.hexlify(autn).decode('utf-8')
-    CryptoLogger.debug("output autn: " + str(autn))
-    kasme = binascii.hexlify(kasme).decode('utf-8')
-    CryptoLogger.debug("output kasme: " + str(kasme))
-    CryptoLogger.debug("Generated EUTRAN vectors")
-    CryptoLogger.debug("Generated  RAND: " + str(rand))
-    CryptoLogger.debug("Generated  XRES: " + str(xres))
-    CryptoLogger.debug("Generated  AUTN: " + str(autn))
-    CryptoLogger.debug("Generated KASME: " + str(kasme))
-    CryptoLogger.debug("Successfully an S6a_crypt.generate_eutran_vector")
-    return (rand, xres, autn, kasme)
- 
 def generate_maa_vector(key, op_c, amf, sqn, plmn):
-    CryptoLogger.debug("Generating Multimedia Authentication Vector")
-    key = key.encode('utf-8')
-    CryptoLogger.debug("Input K:  " + str(key))
-    key = binascii.unhexlify(key)
-    
-    op_c = op_c.encode('utf-8')
-    CryptoLogger.debug("Input OPc:  " + str(op_c))
-    op_c = binascii.unhexlify(op_c)
-    
-    amf = str(amf)
-    amf = amf.encode('utf-8')
-    amf = binascii.unhexlify(amf)
-    CryptoLogger.debug("Input AMF: " + str(amf))
-    
-    sqn = int(sqn)
-    CryptoLogger.debug("Input SQN: " + str(sqn))
-
-    plmn = plmn.encode('utf-8')
-    plmn = binascii.unhexlify(plmn)
-    CryptoLogger.debug("Input PLMN: " + str(plmn))
-    
-
-    crypto_obj = Milenage(amf)
-
-    (rand, xres, autn, ck, ik) = crypto_obj.generate_maa_vector(key, op_c, sqn, plmn)
-
-    #rand = binascii.hexlify(rand).decode('utf-8')
-    #print("output rand: " + str(rand))
-    #print("rand type is : " + str(type(rand)))
-    #xres = binascii.hexlify(xres).decode('utf-8')
-    #print("output xres: " + str(xres))
-    #autn = binascii.hexlify(autn).decode('utf-8')
-    #print("output autn: " + str(autn))
-    #ck = binascii.hexlify(ck).decode('utf-8')
-    #ik = binascii.hexlify(ik).decode('utf-8')
-
-    SIP_Authenticate = rand + autn
-    #SIP_Authenticate = base64.b64encode(SIP_Authenticate.encode("utf-8"))
-    # print("SIP_Authenticate: " + str(SIP_Authenticate))
-    # print("xres: " + str(xres))
-    # print("ck: " + str(ck))
-    # print("ik: " + str(ik))
-    return (rand, autn, xres, ck, ik)
+    crypto_obj = Milenage(binascii.unhexlify(str(amf)))
+    return crypto_obj.generate_maa_vector(binascii.unhexlify(key), binascii.unhexlify(op_c), int(sqn), binascii.unhexlify(plmn))
 
 def generate_eap_aka_vector(key, op_c, amf, sqn, plmn):
-    CryptoLogger.debug("Generating EAP-AKA Vector")
-    key = key.encode('utf-8')
-    CryptoLogger.debug("Input K:  " + str(key))
-    key = binascii.unhexlify(key)
-    
-    op_c = op_c.encode('utf-8')
-    CryptoLogger.debug("Input OPc:  " + str(op_c))
-    op_c = binascii.unhexlify(op_c)
-    
-    amf = str(amf)
-    amf = amf.encode('utf-8')
-    amf = binascii.unhexlify(amf)
-    CryptoLogger.debug("Input AMF: " + str(amf))
-    
-    sqn = int(sqn)
-    CryptoLogger.debug("Input SQN: " + str(sqn))
-
-    plmn = plmn.encode('utf-8')
-    plmn = binascii.unhexlify(plmn)
-    CryptoLogger.debug("Input PLMN: " + str(plmn))
-    
-    crypto_obj = Milenage(amf)
-
-    return crypto_obj.generate_eap_aka_vector(key, op_c, sqn, plmn)
+    crypto_obj = Milenage(binascii.unhexlify(str(amf)))
+    return crypto_obj.generate_eap_aka_vector(binascii.unhexlify(key), binascii.unhexlify(op_c), int(sqn), binascii.unhexlify(plmn))
 
 def generate_resync_s6a(key, op_c, amf, auts, rand):
     CryptoLogger.debug("Generating correct SQN value from AUTS")
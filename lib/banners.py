@@ -106,5 +106,23 @@ class Banners:
 
                 Database Service
 
+"""
+        return bannerText
+
+    def vectorPoolService(self) -> str:
+        bannerText = """
+                                                     
+ ######            ##   ##   #####    #####  
+ ##   ##           ##   ##  ##   ##  ##   ## 
+ ##   ##  ##  ##   ##   ##  ##       ##      
+ ######   ##  ##   #######   #####    #####  
+ ##       ##  ##   ##   ##       ##       ## 
+ ##       ##  ##   ##   ##  ##   ##  ##   ## 
+ ##        #####   ##   ##   #####    #####  
+              ##                             
+           ####                              
+
+              Vector Pool Service
+
 """
         return bannerText
\ No newline at end of file
@@ -0,0 +1,88 @@
+#Bulk Provisioning Import
+import csv
+import json
+import datetime
+from sqlalchemy import Integer, BigInteger, Boolean, String, Text, Float, DateTime
+
+# Values accepted for Boolean columns, case insensitive.
+BOOLEAN_VALUES = {'1': True, 'true': True, 'yes': True, '0': False, 'false': False, 'no': False}
+
+
+def readCsvRows(textStream):
+    """
+    Yields (lineNumber, row) for each row of a CSV stream with a header line of column names.
+    Empty fields are treated as missing, so the column's default applies.
+    """
+    csvReader = csv.DictReader(textStream)
+    for row in csvReader:
+        if None in row:
+            yield csvReader.line_num, ValueError(f"Row has {len(csvReader.fieldnames) + len(row[None])} fields, header has {len(csvReader.fieldnames)}")
+            continue
+        yield csvReader.line_num, {column: value for column, value in row.items() if value not in (None, '')}
+
+
+def readNdjsonRows(textStream):
+    """
+    Yields (lineNumber, row) for each JSON object in a newline delimited JSON stream. Blank lines are skipped.
+    A line which isn't a JSON object is yielded as a ValueError, so it's reported against its line rather than ending the import.
+    """
+    for lineNumber, line in enumerate(textStream, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as E:
+            yield lineNumber, ValueError(f"Invalid JSON: {E}")
+            continue
+        if not isinstance(row, dict):
+            yield lineNumber, ValueError("Line is not a JSON object")
+            continue
+        yield lineNumber, row
+
+
+def chunkRows(rows, chunkSize: int):
+    """
+    Groups an iterable of rows into lists of up to chunkSize, without reading ahead of the current chunk.
+    """
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunkSize:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def validateRow(table, row: dict) -> dict:
+    """
+    Checks a row against the columns of a table, and returns it with each value converted to its column's type.
+    Raises ValueError for unknown columns, missing required columns, and values which don't fit their column.
+    """
+    unknownColumns = [column for column in row if column not in table.columns]
+    if unknownColumns:
+        raise ValueError(f"Unknown column(s): {', '.join(unknownColumns)}")
+    validRow = {}
+    for column in table.columns:
+        value = row.get(column.name)
+        if value is None:
+            if not column.nullable and not column.primary_key and column.default is None:
+                raise ValueError(f"Missing required column: {column.name}")
+            continue
+        try:
+            if isinstance(column.type, Boolean):
+                value = value if isinstance(value, bool) else BOOLEAN_VALUES[str(value).strip().lower()]
+            elif isinstance(column.type, (Integer, BigInteger)):
+                value = int(value)
+            elif isinstance(column.type, Float):
+                value = float(value)
+            elif isinstance(column.type, DateTime):
+                value = value if isinstance(value, datetime.datetime) else datetime.datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+            elif isinstance(column.type, (String, Text)):
+                value = str(value)
+        except (KeyError, TypeError, ValueError):
+            raise ValueError(f"Invalid value for {column.name}: {value}")
+        if isinstance(column.type, String) and column.type.length is not None and len(value) > column.type.length:
+            raise ValueError(f"Value for {column.name} is longer than {column.type.length} characters")
+        validRow[column.name] = value
+    return validRow
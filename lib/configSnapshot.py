@@ -0,0 +1,79 @@
+#Configuration Snapshot
+import time
+from types import MappingProxyType
+from roamingPolicy import RoamingPolicy
+from eirEngine import EirEngine
+
+
+class ConfigSnapshot:
+    """
+    Immutable, versioned view of the configuration tables which rarely change (APN, CHARGING_RULE, TFT, ROAMING_RULE, ROAMING_NETWORK and EIR).
+    Database builds a new snapshot whenever one of these tables is written and swaps it in by reference,
+    so readers always see one consistent version and never query SQL for these rows.
+    Rows are held as read-only mappings, and the accessors return copies which the caller is free to change.
+    """
+    __slots__ = ('version', 'loadedAt', 'apnsById', 'apnsByName', 'chargingRulesById', 'tftsByGroupId', 'roamingPolicy', 'eirEngine')
+
+    def __init__(self, version: int, apns: list, chargingRules: list, tfts: list, roamingRules: list=(), roamingNetworks: list=(), eirRules: list=()):
+        apnsByName = {}
+        duplicateApnNames = set()
+        for apn in apns:
+            if apn['apn'] in apnsByName:
+                duplicateApnNames.add(apn['apn'])
+            apnsByName[apn['apn']] = apn['apn_id']
+        # APN names aren't unique in the schema, leave duplicates to the database lookup so it fails the same way it always has.
+        for apnName in duplicateApnNames:
+            del apnsByName[apnName]
+
+        tftsByGroupId = {}
+        for tft in tfts:
+            tftsByGroupId.setdefault(tft['tft_group_id'], []).append(MappingProxyType(dict(tft)))
+
+        object.__setattr__(self, 'version', version)
+        object.__setattr__(self, 'loadedAt', time.monotonic())
+        object.__setattr__(self, 'apnsById', MappingProxyType({apn['apn_id']: MappingProxyType(dict(apn)) for apn in apns}))
+        object.__setattr__(self, 'apnsByName', MappingProxyType(apnsByName))
+        object.__setattr__(self, 'chargingRulesById', MappingProxyType({chargingRule['charging_rule_id']: MappingProxyType(dict(chargingRule)) for chargingRule in chargingRules}))
+        object.__setattr__(self, 'tftsByGroupId', MappingProxyType({tftGroupId: tuple(groupTfts) for tftGroupId, groupTfts in tftsByGroupId.items()}))
+        object.__setattr__(self, 'roamingPolicy', RoamingPolicy(roamingRules, roamingNetworks))
+        object.__setattr__(self, 'eirEngine', EirEngine(eirRules))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ConfigSnapshot is immutable")
+
+    def __repr__(self) -> str:
+        return f"ConfigSnapshot(version={self.version}, apns={len(self.apnsById)}, chargingRules={len(self.chargingRulesById)}, tftGroups={len(self.tftsByGroupId)}, roamingRules={len(self.roamingPolicy.rulesById)}, {self.eirEngine})"
+
+    def age(self) -> float:
+        return time.monotonic() - self.loadedAt
+
+    def apn(self, apnId):
+        """
+        Returns a copy of the APN with the given apn_id, or None if it isn't in this snapshot.
+        """
+        try:
+            apn = self.apnsById.get(int(apnId))
+        except (TypeError, ValueError):
+            return None
+        return None if apn is None else dict(apn)
+
+    def apnByName(self, apnName: str):
+        """
+        Returns a copy of the APN with the given name, or None if it isn't in this snapshot.
+        """
+        apnId = self.apnsByName.get(str(apnName))
+        return None if apnId is None else dict(self.apnsById[apnId])
+
+    def chargingRule(self, chargingRuleId):
+        """
+        Returns a copy of the Charging Rule with the given charging_rule_id, with its TFTs under 'tft', or None if it isn't in this snapshot.
+        """
+        try:
+            chargingRule = self.chargingRulesById.get(int(chargingRuleId))
+        except (TypeError, ValueError):
+            return None
+        if chargingRule is None:
+            return None
+        chargingRule = dict(chargingRule)
+        chargingRule['tft'] = [dict(tft) for tft in self.tftsByGroupId.get(chargingRule['tft_group_id'], ())]
+        return chargingRule
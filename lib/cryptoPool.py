@@ -0,0 +1,57 @@
+#Crypto Worker Pool
+import importlib
+import multiprocessing
+import threading
+import time
+import concurrent.futures
+from concurrent.futures import ProcessPoolExecutor
+
+
+class CryptoPool:
+    """
+    Runs CPU bound authentication vector generation in worker processes, so it doesn't hold up other requests in the calling process.
+    At most workers + maxQueued jobs are accepted at once. run() waits up to timeout seconds in total, for a free slot and for the result.
+    """
+
+    def __init__(self, workers: int, maxQueued: int=64, timeout: float=3, preloadModules=()):
+        self.workers = workers
+        self.timeout = timeout
+        # A slot is held until the job finishes, so running jobs count towards the limit as well as waiting ones.
+        self.slots = threading.BoundedSemaphore(workers + maxQueued)
+        # Workers are spawned rather than forked, as the parent already runs threads (Redis, the operation log writer) which a fork would copy mid-state.
+        self.executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'), initializer=importModules, initargs=(tuple(preloadModules),))
+
+    def run(self, function, *args):
+        """
+        Calls function(*args) in a worker process and returns its result.
+        Raises TimeoutError if the pool stays full, or the result isn't ready, within timeout seconds.
+        """
+        deadline = time.monotonic() + self.timeout
+        if not self.slots.acquire(timeout=self.timeout):
+            raise TimeoutError(f"Crypto pool is full, no slot free within {self.timeout}s")
+        try:
+            future = self.executor.submit(function, *args)
+        except Exception:
+            self.slots.release()
+            raise
+        future.add_done_callback(lambda future: self.slots.release())
+        try:
+            return future.result(timeout=max(deadline - time.monotonic(), 0))
+        # Not the builtin TimeoutError before Python 3.11.
+        except concurrent.futures.TimeoutError:
+            # Drops the job if no worker has started it yet, otherwise its result is discarded.
+            future.cancel()
+            raise TimeoutError(f"Crypto job {getattr(function, '__name__', function)} didn't complete within {self.timeout}s")
+
+    def stop(self):
+        try:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+        except TypeError:
+            # cancel_futures is only available from Python 3.9.
+            self.executor.shutdown(wait=False)
+
+
+def importModules(moduleNames: tuple):
+    # Runs once in each worker, so the first job doesn't also pay for importing the crypto modules.
+    for moduleName in moduleNames:
+        importlib.import_module(moduleName)
@@ -1,5 +1,5 @@
 from sqlalchemy import Column, Integer, String, MetaData, Table, Boolean, ForeignKey, select, UniqueConstraint, DateTime, BigInteger, Text, DateTime, Float
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, update
 from sqlalchemy.engine.reflection import Inspector
 from sqlalchemy.sql import desc, func
 from sqlalchemy_utils import database_exists, create_database
@@ -7,6 +7,7 @@ from sqlalchemy.orm import sessionmaker, relationship, Session, class_mapper
 from sqlalchemy.orm.attributes import History, get_history
 from sqlalchemy.ext.declarative import declarative_base
 import  os
+from contextlib import contextmanager
 import datetime, time
 from datetime import timezone
 import re
@@ -16,6 +17,15 @@ import socket
 import pprint
 import S6a_crypt
 from messaging import RedisMessaging
+from subscriberCache import SubscriberCache
+from configSnapshot import ConfigSnapshot
+from roamingPolicy import RoamingPolicy
+from eirEngine import EirEngine
+from tacDatabase import TacDatabase
+from operationLogWriter import OperationLogWriter
+from bulkImport import chunkRows, validateRow
+from cryptoPool import CryptoPool
+from vectorPool import VectorPool
 import yaml
 import json
 import socket
@@ -333,6 +343,40 @@ class SUBSCRIBER_ATTRIBUTES_OPERATION_LOG(OPERATION_LOG_BASE):
     subscriber_attributes_id = Column(Integer, ForeignKey('subscriber_attributes.subscriber_attributes_id'))
 
 
+# Tables whose rows are held in the subscriber cache, and invalidated when a row is committed.
+CACHED_TABLES = frozenset(('subscriber', 'auc', 'ims_subscriber'))
+# Tables held in the configuration snapshot, which is rebuilt when any row in them is committed.
+SNAPSHOT_TABLES = frozenset(('apn', 'charging_rule', 'tft', 'roaming_rule', 'roaming_network', 'eir'))
+# Columns left out of UPDATE entries in the operation log, since they're rewritten by Diameter traffic rather than by an operator.
+# '*' leaves the whole table out of the operation log. Extended or overridden per table by database.operationLogIgnoredColumns.
+OPERATION_LOG_IGNORED_COLUMNS = {
+    'subscriber': ('serving_mme', 'serving_mme_timestamp', 'serving_mme_realm', 'serving_mme_peer'),
+    'ims_subscriber': ('pcscf', 'pcscf_realm', 'pcscf_active_session', 'pcscf_timestamp', 'pcscf_peer', 'scscf', 'scscf_timestamp', 'scscf_realm', 'scscf_peer'),
+    'serving_apn': ('*',),
+}
+# Step between consecutive SQNs handed out for an AuC.
+SQN_INCREMENT = 100
+# Takes the next SQN from an AuC's lease (a hash of next and ceiling), or returns -1 if there's no lease or it's used up.
+# -1 rather than false, as the client reads false as None, the same as a failed call.
+SQN_LEASE_ALLOCATE_SCRIPT = """
+local lease = redis.call('HMGET', KEYS[1], 'next', 'ceiling')
+if not lease[1] or not lease[2] then return -1 end
+local sqn = tonumber(lease[1])
+if sqn + tonumber(ARGV[1]) > tonumber(lease[2]) then return -1 end
+redis.call('HSET', KEYS[1], 'next', sqn + tonumber(ARGV[1]))
+return sqn
+"""
+# Extends an AuC's lease with a block reserved in SQL. Another process may have extended it first, so neither bound ever moves backwards.
+SQN_LEASE_EXTEND_SCRIPT = """
+local lease = redis.call('HMGET', KEYS[1], 'next', 'ceiling')
+local nextSqn = tonumber(ARGV[1])
+local ceiling = tonumber(ARGV[2])
+if lease[1] and tonumber(lease[1]) > nextSqn then nextSqn = tonumber(lease[1]) end
+if lease[2] and tonumber(lease[2]) > ceiling then ceiling = tonumber(lease[2]) end
+redis.call('HSET', KEYS[1], 'next', nextSqn, 'ceiling', ceiling)
+return 1
+"""
+
 class Database:
 
     def __init__(self, logTool, redisMessaging=None):
@@ -344,11 +388,27 @@ class Database:
         self.redisHost = self.config.get('redis', {}).get('host', 'localhost')
         self.redisPort = self.config.get('redis', {}).get('port', 6379)
         self.tacDatabasePath = self.config.get('eir', {}).get('tac_database_csv', None)
+        self.tacDatabaseIndexPath = self.config.get('eir', {}).get('tac_database_index', f"{self.tacDatabasePath}.idx" if self.tacDatabasePath else None)
         self.imsiImeiLogging = self.config.get('eir', {}).get('imsi_imei_logging', True)
         self.simSwapNotificationEnabled = self.config.get('eir', {}).get('simSwapNotification', False)
         self.georedEnabled = self.config.get('geored', {}).get('enabled', True)
         self.eirNoMatchResponse = int(self.config.get('eir', {}).get('no_match_response', 2))
         self.eirStoreOffnetImsi = self.config.get('eir', {}).get('store_offnet_imsi', False)
+        self.subscriberCacheEnabled = self.config.get('database', {}).get('subscriberCacheEnabled', False)
+        self.subscriberCacheSize = int(self.config.get('database', {}).get('subscriberCacheSize', 10000))
+        self.subscriberCacheTtl = float(self.config.get('database', {}).get('subscriberCacheTtl', 60))
+        self.subscriberCacheMetricInterval = float(self.config.get('database', {}).get('subscriberCacheMetricInterval', 10))
+        self.configSnapshotMaxAge = float(self.config.get('database', {}).get('configSnapshotMaxAge', 300))
+        self.sqnLeaseEnabled = self.config.get('database', {}).get('sqnLeaseEnabled', False)
+        self.sqnLeaseSize = int(self.config.get('database', {}).get('sqnLeaseSize', 32))
+        self.operationLogMaxRecords = int(self.config.get('database', {}).get('operationLogMaxRecords', 1000))
+        self.operationLogBatchSize = int(self.config.get('database', {}).get('operationLogBatchSize', 100))
+        self.operationLogFlushInterval = float(self.config.get('database', {}).get('operationLogFlushInterval', 1))
+        self.operationLogIgnoredColumns = {**OPERATION_LOG_IGNORED_COLUMNS, **(self.config.get('database', {}).get('operationLogIgnoredColumns', None) or {})}
+        self.vectorPoolEnabled = self.config.get('vector_pool', {}).get('enabled', False)
+        self.vectorPoolEncryptionKey = self.config.get('vector_pool', {}).get('encryption_key', None)
+        self.vectorPoolDepth = int(self.config.get('vector_pool', {}).get('depth', 8))
+        self.vectorPoolRefillThreshold = self.config.get('vector_pool', {}).get('refill_threshold', None)
 
         self.logTool = logTool
         if redisMessaging:
@@ -370,6 +430,39 @@ class Database:
             pool_size=self.config['logging'].get('sqlalchemy_pool_size', 30),
             max_overflow=self.config['logging'].get('sqlalchemy_max_overflow', 0))
 
+        # One session factory for the life of the process, rather than building a new sessionmaker on every call.
+        self.sessionFactory = sessionmaker(bind=self.engine)
+
+        # Read-through cache for the subscriber profile lookups made by the Diameter handlers.
+        self.subscriberCache = None
+        if self.subscriberCacheEnabled:
+            self.subscriberCache = SubscriberCache(maxEntries=self.subscriberCacheSize, ttl=self.subscriberCacheTtl)
+            self.subscriberCacheMetricsDue = time.monotonic() + self.subscriberCacheMetricInterval
+
+        # Snapshot of the APN, Charging Rule, TFT, roaming and EIR tables, loaded once the schema exists.
+        self.configSnapshot = None
+        self.configSnapshotStale = False
+
+        # Rows committed through sessionFactory are applied to the cache and snapshot locally, and published to every other process on this host.
+        self.instanceId = uuid.uuid4().hex
+        event.listen(self.sessionFactory, 'after_flush', self.collectChangedRows)
+        event.listen(self.sessionFactory, 'after_commit', self.publishChangedRows)
+        event.listen(self.sessionFactory, 'after_rollback', self.discardChangedRows)
+        # Operation log entries are queued when their session commits, and written in batches in the background.
+        self.operationLogWriter = OperationLogWriter(writeBatch=self.writeOperationLog, batchSize=self.operationLogBatchSize, flushInterval=self.operationLogFlushInterval, errorHandler=self.handleOperationLogError)
+        event.listen(self.sessionFactory, 'after_commit', self.queueOperationLog)
+        # Only started by services which generate vectors under load, see startCryptoPool.
+        self.cryptoPool = None
+        # Vectors pre-generated by the vector pool service. Every process needs it when enabled, to invalidate pools when an AuC changes.
+        self.vectorPool = None
+        if self.vectorPoolEnabled:
+            if self.vectorPoolEncryptionKey:
+                self.vectorPool = VectorPool(redisMessaging=self.redisMessaging, hostname=self.hostname, encryptionKey=bytes.fromhex(str(self.vectorPoolEncryptionKey)), depth=self.vectorPoolDepth,
+                                             refillThreshold=None if self.vectorPoolRefillThreshold is None else int(self.vectorPoolRefillThreshold))
+            else:
+                self.logTool.log(service='Database', level='error', message="Vector pool is enabled but vector_pool.encryption_key isn't set, vectors will be generated inline", redisClient=self.redisMessaging)
+        self.redisMessaging.subscribeChannel(channel='database-changes', messageHandler=self.handleChangedRows, errorHandler=self.handleChangeSubscriptionError, usePrefix=True, prefixHostname=self.hostname, prefixServiceName='database')
+
         # Create database if it does not exist.
         if not database_exists(self.engine.url):
             self.logTool.log(service='Database', level='debug', message="Creating database", redisClient=self.redisMessaging)
@@ -378,13 +471,12 @@ class Database:
         else:
             self.logTool.log(service='Database', level='debug', message="Database already created", redisClient=self.redisMessaging)
 
-        #Load IMEI TAC database into Redis if enabled
+        #Load IMEI TAC database if enabled
+        self.tacDatabase = None
         if self.tacDatabasePath:
-            self.load_IMEI_database_into_Redis()
-            self.tacData = json.loads(self.redisMessaging.getValue(key="tacDatabase", usePrefix=True, prefixHostname=self.hostname, prefixServiceName='database'))
+            self.loadTacDatabase()
         else:
-            self.logTool.log(service='Database', level='info', message="Not loading EIR IMEI TAC Database as Redis not enabled or TAC CSV Database not set in config", redisClient=self.redisMessaging)
-            self.tacData = {}
+            self.logTool.log(service='Database', level='info', message="Not loading EIR IMEI TAC Database as TAC CSV Database not set in config", redisClient=self.redisMessaging)
 
     # Create individual tables if they do not exist.
         inspector = Inspector.from_engine(self.engine)
@@ -395,44 +487,25 @@ class Database:
             else:
                 self.logTool.log(service='Database', level='debug', message=f"Table {table_name} already exists", redisClient=self.redisMessaging)
 
-    def load_IMEI_database_into_Redis(self):
-        try:
-            self.logTool.log(service='Database', level='info', message=f"Reading IMEI TAC database CSV from: {self.tacDatabasePath}", redisClient=self.redisMessaging)
-            csvfile = open(self.tacDatabasePath)
-            self.logTool.log(service='Database', level='info', message="This may take a few seconds to buffer into Redis.", redisClient=self.redisMessaging)
-        except:
-            self.logTool.log(service='Database', level='error', message="Failed to read CSV file of IMEI TAC database.", redisClient=self.redisMessaging)
-            return
-        try:
-            self.logTool.log(service='Database', level='info', message="Checking to see if entries are already present.", redisClient=self.redisMessaging)
-            redisTacDatabase = self.redisMessaging.getValue(key="tacDatabase", usePrefix=True, prefixHostname=self.hostname, prefixServiceName='database')
-            if redisTacDatabase is not None:
-                if len(redisTacDatabase) > 0:
-                    self.logTool.log(service='Database', level='info', message="IMEI TAC Database already loaded into Redis - Skipping reading from file.", redisClient=self.redisMessaging)
-                    return
+        self.loadConfigSnapshot()
 
-            self.logTool.log(service='Database', level='info', message="TAC Database not present in Redis, proceeding to load.", redisClient=self.redisMessaging)
-            count = 0
-            tacList = {"tacList": []}
-            for line in csvfile:
-                # Remove unsafe characters from the CSV file
-                line = line.replace('"', '')
-                line = line.replace("'", '')
-                line = line.replace("\\", '')
-                line = line.rstrip()
-                result = line.split(',')
-                tacPrefix = result[0]
-                name = result[1].lstrip()
-                model = result[2].lstrip()
-                count += 1
-
-            tacList['tacList'].append({str(tacPrefix): {'name': name, 'model': model}})
-            self.redisMessaging.setValue(key="tacDatabase", value=json.dumps(tacList), usePrefix=True, prefixHostname=self.hostname, prefixServiceName='database')
-            self.tacData = tacList
-            self.logTool.log(service='Database', level='info', message=f"Loaded {count} IMEI TAC entries into Redis", redisClient=self.redisMessaging)
-        except Exception as E:
-            self.logTool.log(service='Database', level='error', message=f"Failed to load IMEI Database into Redis due to error: {traceback.format_exc()}", redisClient=self.redisMessaging)
-            return
+    def loadTacDatabase(self):
+        """
+        Opens the IMEI TAC database, compiling the CSV into an index file first if the index is missing or older than the CSV.
+        The index is mapped read-only, so it's shared by every process on the host rather than held per process.
+        """
+        try:
+            self.logTool.log(service='Database', level='info', message=f"Loading IMEI TAC database from: {self.tacDatabasePath} (index: {self.tacDatabaseIndexPath})", redisClient=self.redisMessaging)
+            skippedRows = []
+            self.tacDatabase = TacDatabase.load(self.tacDatabasePath, self.tacDatabaseIndexPath, skippedRows)
+            for lineNumber, reason in skippedRows[:10]:
+                self.logTool.log(service='Database', level='warning', message=f"Skipped line {lineNumber} of IMEI TAC database: {reason}", redisClient=self.redisMessaging)
+            if len(skippedRows) > 10:
+                self.logTool.log(service='Database', level='warning', message=f"Skipped {len(skippedRows) - 10} more invalid lines of IMEI TAC database", redisClient=self.redisMessaging)
+            self.logTool.log(service='Database', level='info', message=f"Loaded {len(self.tacDatabase)} IMEI TAC entries", redisClient=self.redisMessaging)
+        except Exception:
+            self.logTool.log(service='Database', level='error', message=f"Failed to load IMEI TAC database due to error: {traceback.format_exc()}", redisClient=self.redisMessaging)
+            self.tacDatabase = None
 
     def safe_rollback(self, session):
         try:
@@ -441,6 +514,165 @@ class Database:
         except Exception as E:
             self.logTool.log(service='Database', level='error', message=f"Failed to rollback session, error: {E}", redisClient=self.redisMessaging)
 
+    def subscriberCacheKey(self, table: str, lookup: dict, fields: tuple):
+        """
+        Returns the subscriber cache key for the first of fields present in lookup, or None if caching is disabled.
+        """
+        if self.subscriberCache is None:
+            return None
+        for field in fields:
+            if field in lookup:
+                return (table, field, str(lookup[field]))
+        return None
+
+    def getCachedRow(self, cacheKey):
+        if cacheKey is None:
+            return None
+        if time.monotonic() >= self.subscriberCacheMetricsDue:
+            self.sendCacheMetrics()
+        return self.subscriberCache.get(cacheKey)
+
+    def cacheRow(self, cacheKey, table: str, row: dict):
+        if cacheKey is None:
+            return
+        self.subscriberCache.set(cacheKey, (table, row[f"{table}_id"]), row)
+
+    def collectChangedRows(self, session, flushContext):
+        """
+        Records each cached or snapshotted row written by a flush, so it can be applied once the transaction commits.
+        """
+        for changedObject in list(session.new) + list(session.dirty) + list(session.deleted):
+            table = getattr(changedObject, '__tablename__', None)
+            if table in CACHED_TABLES or table in SNAPSHOT_TABLES:
+                session.info.setdefault('changedRows', set()).add((table, getattr(changedObject, f"{table}_id")))
+
+    def publishChangedRows(self, session):
+        changedRows = session.info.pop('changedRows', None)
+        if not changedRows:
+            return
+        self.applyChangedRows(changedRows)
+        if self.sqnLeaseEnabled:
+            # The SQN may have been set directly (resync, geored or the API), so the next allocation has to lease from the new value.
+            for table, rowId in changedRows:
+                if table == 'auc':
+                    self.releaseSqnLease(rowId)
+        if self.vectorPool is not None:
+            # Pooled vectors were generated from the old SQN, K and OPc.
+            for table, rowId in changedRows:
+                if table == 'auc':
+                    self.invalidateVectorPool(rowId)
+        try:
+            self.redisMessaging.publishMessage(channel='database-changes', message=json.dumps({'origin': self.instanceId, 'rows': list(changedRows)}), usePrefix=True, prefixHostname=self.hostname, prefixServiceName='database')
+        except Exception as E:
+            self.logTool.log(service='Database', level='error', message=f"Failed to publish database changes, error: {E}", redisClient=self.redisMessaging)
+
+    def discardChangedRows(self, session):
+        session.info.pop('changedRows', None)
+        session.info.pop('operationLogEntries', None)
+
+    def applyChangedRows(self, changedRows):
+        for table, rowId in changedRows:
+            if table in SNAPSHOT_TABLES:
+                # Reloaded on next use, so a bulk write only costs one reload.
+                self.configSnapshotStale = True
+            elif self.subscriberCache is not None:
+                self.subscriberCache.invalidate((table, rowId))
+
+    def handleChangedRows(self, message):
+        try:
+            changes = json.loads(message)
+            if changes.get('origin') == self.instanceId:
+                return
+            self.applyChangedRows([tuple(row) for row in changes.get('rows', [])])
+        except Exception as E:
+            self.logTool.log(service='Database', level='error', message=f"Failed to handle database changes {message}, error: {E}", redisClient=self.redisMessaging)
+            self.handleChangeSubscriptionError(E)
+
+    def handleChangeSubscriptionError(self, exception):
+        # Changes published while we were disconnected are lost, so nothing cached can be trusted.
+        self.logTool.log(service='Database', level='warning', message=f"Database change channel failed, clearing cached data. Error: {exception}", redisClient=self.redisMessaging)
+        if self.subscriberCache is not None:
+            self.subscriberCache.clear()
+        self.configSnapshotStale = True
+
+    def loadConfigSnapshot(self):
+        """
+        Reads the APN, Charging Rule, TFT, roaming and EIR tables into a new ConfigSnapshot, and swaps it in.
+        Returns the new snapshot, or None if it couldn't be loaded.
+        """
+        # Cleared before reading, so a change committed while we're loading marks the new snapshot stale again.
+        self.configSnapshotStale = False
+        try:
+            with self.sessionScope() as session:
+                apns, chargingRules, tfts, roamingRules, roamingNetworks, eirRules = [[self.rowToDict(row) for row in session.query(table)] for table in (APN, CHARGING_RULE, TFT, ROAMING_RULE, ROAMING_NETWORK, EIR)]
+            previousVersion = self.configSnapshot.version if self.configSnapshot is not None else 0
+            configSnapshot = ConfigSnapshot(version=previousVersion + 1, apns=apns, chargingRules=chargingRules, tfts=tfts, roamingRules=roamingRules, roamingNetworks=roamingNetworks, eirRules=eirRules)
+        except Exception as E:
+            self.logTool.log(service='Database', level='error', message=f"Failed to load configuration snapshot, error: {E}", redisClient=self.redisMessaging)
+            self.configSnapshotStale = True
+            return None
+        for eirRule, eirError in configSnapshot.eirEngine.invalidRules:
+            self.logTool.log(service='Database', level='warning', message=f"Ignoring EIR rule {eirRule.get('eir_id')} with invalid regex, error: {eirError}", redisClient=self.redisMessaging)
+        self.configSnapshot = configSnapshot
+        self.logTool.log(service='Database', level='debug', message=f"Loaded {configSnapshot}", redisClient=self.redisMessaging)
+        return configSnapshot
+
+    def getConfigSnapshot(self):
+        """
+        Returns the current configuration snapshot, reloading it if it's missing, stale or older than configSnapshotMaxAge.
+        """
+        configSnapshot = self.configSnapshot
+        if configSnapshot is None or self.configSnapshotStale or configSnapshot.age() > self.configSnapshotMaxAge:
+            configSnapshot = self.loadConfigSnapshot()
+        return configSnapshot
+
+    def Get_Roaming_Policy(self) -> RoamingPolicy:
+        """
+        Returns the compiled outbound roaming policy from the configuration snapshot.
+        If the snapshot can't be loaded, the policy is compiled straight from the database.
+        """
+        configSnapshot = self.getConfigSnapshot()
+        if configSnapshot is not None:
+            return configSnapshot.roamingPolicy
+        return RoamingPolicy(self.GetAll(ROAMING_RULE), self.GetAll(ROAMING_NETWORK))
+
+    def rowToDict(self, row) -> dict:
+        row = dict(row.__dict__)
+        row.pop('_sa_instance_state', None)
+        return row
+
+    def sendCacheMetrics(self):
+        self.subscriberCacheMetricsDue = time.monotonic() + self.subscriberCacheMetricInterval
+        for cacheEvent, eventCount in self.subscriberCache.takeStats().items():
+            if eventCount == 0:
+                continue
+            self.redisMessaging.sendMetric(serviceName='database', metricName='prom_subscriber_cache_events',
+                                            metricType='counter', metricAction='inc',
+                                            metricValue=eventCount, metricHelp='Subscriber profile cache hits, misses and evictions',
+                                            metricLabels={'event': cacheEvent},
+                                            metricExpiry=60,
+                                            usePrefix=True,
+                                            prefixHostname=self.hostname,
+                                            prefixServiceName='metric')
+
+    @contextmanager
+    def sessionScope(self, existingSession=None):
+        """
+        Yields a session from the shared session factory, which is rolled back if the block raises and always closed afterwards.
+        If existingSession is given it's yielded as-is, and the caller that created it stays responsible for it.
+        """
+        if existingSession is not None:
+            yield existingSession
+            return
+        session = self.sessionFactory()
+        try:
+            yield session
+        except Exception:
+            self.safe_rollback(session)
+            raise
+        finally:
+            self.safe_close(session)
+
     def safe_close(self, session):
         try:
             if session.is_active:
@@ -486,49 +718,55 @@ class Database:
 
         return {"type": "object", "title" : str(model_class.__name__), "properties": properties, "required": required}
 
-    def update_old_record(self, session, operation_log):
-        oldest_log = session.query(OPERATION_LOG_BASE).order_by(OPERATION_LOG_BASE.timestamp.asc()).first()
-        if oldest_log is not None:
-            for attr in class_mapper(oldest_log.__class__).column_attrs:
-                if attr.key != 'id' and hasattr(operation_log, attr.key):
-                    setattr(oldest_log, attr.key, getattr(operation_log, attr.key))
-            oldest_log.timestamp = datetime.datetime.now(tz=timezone.utc)
-            session.flush()
-        else:
-            raise ValueError("Unable to find record to update")
-
     def log_change(self, session, item_id, operation, changes, table_name, operation_id, generated_id=None):
         # We don't want to log rollback operations
         if session.info.get("operation") == 'ROLLBACK':
             return
-        max_records = 1000
-        count = session.query(OPERATION_LOG_BASE).count()
+        # Held on the session until it commits, then written by operationLogWriter.
+        session.info.setdefault('operationLogEntries', []).append({
+            'item_id': item_id or generated_id,
+            'operation_id': operation_id,
+            'operation': operation,
+            'changes': changes,
+            'table_name': table_name,
+            'timestamp': datetime.datetime.now(tz=timezone.utc),
+        })
+        return operation_id
 
+    def queueOperationLog(self, session):
+        operationLogEntries = session.info.pop('operationLogEntries', None)
+        if operationLogEntries:
+            self.operationLogWriter.append(operationLogEntries)
+
+    def formatOperationLogChanges(self, changes) -> str:
         # Combine all changes into a single string with their types
-        changes_string = '\r\n\r\n'.join(f"{column_name}: [{type(old_value).__name__}] {old_value} ----> [{type(new_value).__name__}] {new_value}" for column_name, old_value, new_value in changes)
-
-        change = OPERATION_LOG_BASE(
-            item_id=item_id or generated_id,
-            operation_id=operation_id,
-            operation=operation,
-            last_modified=datetime.datetime.now(tz=timezone.utc),
-            changes=changes_string,
-            table_name=table_name
-        )
-
-        if count >= max_records:
-            self.update_old_record(session, change)
-        else:
-            try:
-                session.add(change)
-                session.flush()
-            except Exception as E:
-                self.logTool.log(service='Database', level='error', message="Failed to commit changelog, error: " + str(E), redisClient=self.redisMessaging)
-                self.safe_rollback(session)
-                self.safe_close(session)
-                raise ValueError(E)
-        return operation_id
+        return '\r\n\r\n'.join(f"{column_name}: [{type(old_value).__name__}] {old_value} ----> [{type(new_value).__name__}] {new_value}" for column_name, old_value, new_value in changes)
+
+    def writeOperationLog(self, operationLogEntries: list):
+        """
+        Writes a batch of operation log entries, then drops every entry older than the newest operationLogMaxRecords.
+        Entries are numbered by their id, so the log is trimmed with a range delete on the primary key rather than a count.
+        """
+        operationLogTable = OPERATION_LOG_BASE.__table__
+        with self.sessionScope() as session:
+            session.execute(operationLogTable.insert(), [{
+                'item_id': entry['item_id'],
+                'operation_id': entry['operation_id'],
+                'operation': entry['operation'],
+                'changes': self.formatOperationLogChanges(entry['changes']),
+                'last_modified': entry['timestamp'],
+                'timestamp': entry['timestamp'],
+                'table_name': entry['table_name'],
+            } for entry in operationLogEntries])
+            newestId = session.execute(select(func.max(operationLogTable.c.id))).scalar()
+            session.execute(operationLogTable.delete().where(operationLogTable.c.id <= newestId - self.operationLogMaxRecords))
+            session.commit()
+        droppedEntries = self.operationLogWriter.takeDroppedEntries()
+        if droppedEntries:
+            self.logTool.log(service='Database', level='warning', message=f"Dropped {droppedEntries} operation log entries while the database was unavailable", redisClient=self.redisMessaging)
 
+    def handleOperationLogError(self, exception):
+        self.logTool.log(service='Database', level='error', message=f"Failed to write operation log, {len(self.operationLogWriter)} entries queued, error: {exception}", redisClient=self.redisMessaging)
 
     def log_changes_before_commit(self, session):
 
@@ -548,6 +786,9 @@ class Database:
             for obj in state:
                 if isinstance(obj, OPERATION_LOG_BASE):
                     continue  # Skip change log entries
+                ignoredColumns = self.operationLogIgnoredColumns.get(obj.__table__.name, ())
+                if '*' in ignoredColumns:
+                    continue
 
                 item_id = getattr(obj, list(obj.__table__.primary_key.columns.keys())[0])
                 generated_id = None
@@ -563,16 +804,16 @@ class Database:
                 if operation == 'UPDATE':
                     changes = []
                     for attr in class_mapper(obj.__class__).column_attrs:
+                        if attr.key in ignoredColumns:
+                            continue
                         hist = get_history(obj, attr.key)
-                        self.logTool.log(service='Database', level='debug', message=f"History {hist}", redisClient=self.redisMessaging)
                         if hist.has_changes() and hist.added and hist.deleted:
                             old_value, new_value = hist.deleted[0], hist.added[0]
-                            self.logTool.log(service='Database', level='debug', message=f"Old Value {old_value}", redisClient=self.redisMessaging)
-                            self.logTool.log(service='Database', level='debug', message=f"New Value {new_value}", redisClient=self.redisMessaging)
                             changes.append((attr.key, old_value, new_value))
                             continue
 
-                    if not changes:
+                    # last_modified changes on every update, so it's only worth logging alongside another column.
+                    if not any(column_name != 'last_modified' for column_name, old_value, new_value in changes):
                         continue
 
                     operation_id = self.log_change(session, item_id, operation, changes, obj.__table__.name, operation_id)
@@ -621,317 +862,271 @@ class Database:
 
 
     def rollback_last_change(self, existingSession=None):
-        if not existingSession:
-            Base.metadata.create_all(self.engine)
-            Session = sessionmaker(bind=self.engine)
-            session = Session()
-        else:
-            session = existingSession
+        # Write anything still queued, so the operations just made are visible.
+        self.operationLogWriter.flush()
+        with self.sessionScope(existingSession) as session:
+            try:
+                # Get the most recent operation
+                last_operation = session.query(OPERATION_LOG_BASE).order_by(desc(OPERATION_LOG_BASE.timestamp)).first()
+
+                if last_operation is None:
+                    return "No operations to roll back."
+
+                rollback_messages = []
+                operation_id = str(uuid.uuid4())
+
+                target_class = self.get_class_by_tablename(Base, last_operation.table_name)
+                if not target_class:
+                    return f"Error: Could not find table {last_operation.table_name}"
+
+                primary_key_col = target_class.__mapper__.primary_key[0].key
+                filter_by_kwargs = {primary_key_col: last_operation.item_id}
+                target_item = session.query(target_class).filter_by(**filter_by_kwargs).one_or_none()
+
+                if last_operation.operation == 'UPDATE':
+                    if not target_item:
+                        return f"Error: Could not find item with ID {last_operation.item_id} in {last_operation.table_name.upper()} table"
+
+                    # Split the changes string into separate changes
+                    changes = last_operation.changes.split('\r\n\r\n')
+                    for change in changes:
+                        column_name, old_new_values = change.split(": ", 1)
+                        old_value_str, new_value_str = old_new_values.split(" ----> ", 1)
+
+                        # Extract type and value
+                        old_type_str, old_value_repr = old_value_str[1:].split("] ", 1)
+                        old_value = self.str_to_type(old_type_str, old_value_repr)
+
+                        # Revert the change
+                        setattr(target_item, column_name, old_value)
+
+                    rollback_message = (
+                        f"Rolled back '{last_operation.operation}' operation on {last_operation.table_name.upper()} table (ID: {last_operation.item_id}): Reverted changes"
+                    )
+
+                elif last_operation.operation == 'INSERT':
+                    if target_item:
+                        session.delete(target_item)
+
+                    rollback_message = (
+                        f"Rolled back '{last_operation.operation}' operation on {last_operation.table_name.upper()} table (ID: {last_operation.item_id}): Deleted item"
+                    )
+
+                elif last_operation.operation == 'DELETE':
+                    # Aggregate old values of all columns into a single dictionary
+                    old_values_dict = {}
+                    # Split the changes string into separate changes
+                    changes = last_operation.changes.split('\r\n\r\n')
+                    for change in changes:
+                        column_name, old_new_values = change.split(": ", 1)
+                        old_value_str, new_value_str = old_new_values.split(" ----> ", 1)
+
+                        # Extract type and value
+                        old_type_str, old_value_repr = old_value_str[1:].split("] ", 1)
+                        self.logTool.log(service='Database', level='error', message=f"running str_to_type for: {str(old_type_str)}, {str(old_value_repr)}", redisClient=self.redisMessaging)
+                        old_value = self.str_to_type(old_type_str, old_value_repr)
+
+                        old_values_dict[column_name] = old_value
+                    self.logTool.log(service='Database', level='error', message="old_value_dict: " + str(old_values_dict), redisClient=self.redisMessaging)
+
+                    if not target_item:
+                        try:
+                            # Create the target item using the aggregated old values
+                            target_item = target_class(**old_values_dict)
+                            session.add(target_item)
+                        except Exception as e:
+                            return f"Error: Failed to recreate item with ID {last_operation.item_id} in {last_operation.table_name.upper()} table - {str(e)}"
+
+                    rollback_message = (
+                        f"Rolled back '{last_operation.operation}' operation on {last_operation.table_name.upper()} table (ID: {last_operation.item_id}): Re-inserted item"
+                    )
 
-        try:
-            # Get the most recent operation
-            last_operation = session.query(OPERATION_LOG_BASE).order_by(desc(OPERATION_LOG_BASE.timestamp)).first()
-
-            if last_operation is None:
-                return "No operations to roll back."
-
-            rollback_messages = []
-            operation_id = str(uuid.uuid4())
-
-            target_class = self.get_class_by_tablename(Base, last_operation.table_name)
-            if not target_class:
-                return f"Error: Could not find table {last_operation.table_name}"
-
-            primary_key_col = target_class.__mapper__.primary_key[0].key
-            filter_by_kwargs = {primary_key_col: last_operation.item_id}
-            target_item = session.query(target_class).filter_by(**filter_by_kwargs).one_or_none()
-
-            if last_operation.operation == 'UPDATE':
-                if not target_item:
-                    return f"Error: Could not find item with ID {last_operation.item_id} in {last_operation.table_name.upper()} table"
-
-                # Split the changes string into separate changes
-                changes = last_operation.changes.split('\r\n\r\n')
-                for change in changes:
-                    column_name, old_new_values = change.split(": ", 1)
-                    old_value_str, new_value_str = old_new_values.split(" ----> ", 1)
-
-                    # Extract type and value
-                    old_type_str, old_value_repr = old_value_str[1:-1].split("] ", 1)
-                    old_value = self.str_to_type(old_type_str, old_value_repr)
-
-                    # Revert the change
-                    setattr(target_item, column_name, old_value)
-
-                rollback_message = (
-                    f"Rolled back '{last_operation.operation}' operation on {last_operation.table_name.upper()} table (ID: {last_operation.item_id}): Reverted changes"
-                )
-
-            elif last_operation.operation == 'INSERT':
-                if target_item:
-                    session.delete(target_item)
-
-                rollback_message = (
-                    f"Rolled back '{last_operation.operation}' operation on {last_operation.table_name.upper()} table (ID: {last_operation.item_id}): Deleted item"
-                )
-
-            elif last_operation.operation == 'DELETE':
-                # Aggregate old values of all columns into a single dictionary
-                old_values_dict = {}
-                # Split the changes string into separate changes
-                changes = last_operation.changes.split('\r\n\r\n')
-                for change in changes:
-                    column_name, old_new_values = change.split(": ", 1)
-                    old_value_str, new_value_str = old_new_values.split(" ----> ", 1)
-
-                    # Extract type and value
-                    old_type_str, old_value_repr = old_value_str[1:].split("] ", 1)
-                    self.logTool.log(service='Database', level='error', message=f"running str_to_type for: {str(old_type_str)}, {str(old_value_repr)}", redisClient=self.redisMessaging)
-                    old_value = self.str_to_type(old_type_str, old_value_repr)
-
-                    old_values_dict[column_name] = old_value
-                self.logTool.log(service='Database', level='error', message="old_value_dict: " + str(old_values_dict), redisClient=self.redisMessaging)
-
-                if not target_item:
-                    try:
-                        # Create the target item using the aggregated old values
-                        target_item = target_class(**old_values_dict)
-                        session.add(target_item)
-                    except Exception as e:
-                        return f"Error: Failed to recreate item with ID {last_operation.item_id} in {last_operation.table_name.upper()} table - {str(e)}"
+                else:
+                    return f"Error: Unknown operation {last_operation.operation}"
 
-                rollback_message = (
-                    f"Rolled back '{last_operation.operation}' operation on {last_operation.table_name.upper()} table (ID: {last_operation.item_id}): Re-inserted item"
-                )
+                session.commit()
 
-            else:
-                return f"Error: Unknown operation {last_operation.operation}"
+                return f"Rolled back operation with operation_id: {operation_id}\n" + "\n".join(rollback_messages)
 
-            try:
-                session.commit()
-                self.safe_close(session)
             except Exception as E:
                 self.logTool.log(service='Database', level='error', message="rollback_last_change error: " + str(E), redisClient=self.redisMessaging)
                 self.safe_rollback(session)
-                self.safe_close(session)
                 raise ValueError(E)
 
-            return f"Rolled back operation with operation_id: {operation_id}\n" + "\n".join(rollback_messages)
-
-        except Exception as E:
-            self.logTool.log(service='Database', level='error', message="rollback_last_change error: " + str(E), redisClient=self.redisMessaging)
-            self.safe_rollback(session)
-            self.safe_close(session)
-            raise ValueError(E)
-
     def rollback_change_by_operation_id(self, operation_id, existingSession=None):
-        if not existingSession:
-            Base.metadata.create_all(self.engine)
-            Session = sessionmaker(bind=self.engine)
-            session = Session()
-        else:
-            session = existingSession
+        self.operationLogWriter.flush()
+        with self.sessionScope(existingSession) as session:
+            try:
+                # Get the most recent operation
+                last_operation = session.query(OPERATION_LOG_BASE).filter(OPERATION_LOG_BASE.operation_id == operation_id).order_by(desc(OPERATION_LOG_BASE.timestamp)).first()
+
+                if last_operation is None:
+                    return "No operation to roll back."
+
+                rollback_messages = []
+                operation_id = str(uuid.uuid4())
+
+                target_class = self.get_class_by_tablename(Base, last_operation.table_name)
+                if not target_class:
+                    return f"Error: Could not find table {last_operation.table_name}"
+
+                primary_key_col = target_class.__mapper__.primary_key[0].key
+                filter_by_kwargs = {primary_key_col: last_operation.item_id}
+                target_item = session.query(target_class).filter_by(**filter_by_kwargs).one_or_none()
+
+                if last_operation.operation == 'UPDATE':
+                    if not target_item:
+                        return f"Error: Could not find item with ID {last_operation.item_id} in {last_operation.table_name.upper()} table"
+
+                    # Split the changes string into separate changes
+                    changes = last_operation.changes.split('\r\n\r\n')
+                    for change in changes:
+                        column_name, old_new_values = change.split(": ", 1)
+                        old_value_str, new_value_str = old_new_values.split(" ----> ", 1)
+
+                        # Extract type and value
+                        old_type_str, old_value_repr = old_value_str[1:].split("] ", 1)
+                        old_value = self.str_to_type(old_type_str, old_value_repr)
+
+                        # Revert the change
+                        setattr(target_item, column_name, old_value)
+
+                    rollback_message = (
+                        f"Rolled back '{last_operation.operation}' operation on {last_operation.table_name.upper()} table (ID: {last_operation.item_id}): Reverted changes"
+                    )
+
+                elif last_operation.operation == 'INSERT':
+                    if target_item:
+                        session.delete(target_item)
+
+                    rollback_message = (
+                        f"Rolled back '{last_operation.operation}' operation on {last_operation.table_name.upper()} table (ID: {last_operation.item_id}): Deleted item"
+                    )
+
+                elif last_operation.operation == 'DELETE':
+                    # Aggregate old values of all columns into a single dictionary
+                    old_values_dict = {}
+                    # Split the changes string into separate changes
+                    changes = last_operation.changes.split('\r\n\r\n')
+                    for change in changes:
+                        column_name, old_new_values = change.split(": ", 1)
+                        old_value_str, new_value_str = old_new_values.split(" ----> ", 1)
+
+                        # Extract type and value
+                        old_type_str, old_value_repr = old_value_str[1:].split("] ", 1)
+                        self.logTool.log(service='Database', level='error', message=f"running str_to_type for: {str(old_type_str)}, {str(old_value_repr)}", redisClient=self.redisMessaging)
+                        old_value = self.str_to_type(old_type_str, old_value_repr)
+
+                        old_values_dict[column_name] = old_value
+                    self.logTool.log(service='Database', level='error', message="old_value_dict: " + str(old_values_dict), redisClient=self.redisMessaging)
+
+                    if not target_item:
+                        try:
+                            # Create the target item using the aggregated old values
+                            target_item = target_class(**old_values_dict)
+                            session.add(target_item)
+                        except Exception as e:
+                            return f"Error: Failed to recreate item with ID {last_operation.item_id} in {last_operation.table_name.upper()} table - {str(e)}"
+
+                    rollback_message = (
+                        f"Rolled back '{last_operation.operation}' operation on {last_operation.table_name.upper()} table (ID: {last_operation.item_id}): Re-inserted item"
+                    )
 
-        try:
-            # Get the most recent operation
-            last_operation = session.query(OPERATION_LOG_BASE).filter(OPERATION_LOG_BASE.operation_id == operation_id).order_by(desc(OPERATION_LOG_BASE.timestamp)).first()
-
-            if last_operation is None:
-                return "No operation to roll back."
-
-            rollback_messages = []
-            operation_id = str(uuid.uuid4())
-
-            target_class = self.get_class_by_tablename(Base, last_operation.table_name)
-            if not target_class:
-                return f"Error: Could not find table {last_operation.table_name}"
-
-            primary_key_col = target_class.__mapper__.primary_key[0].key
-            filter_by_kwargs = {primary_key_col: last_operation.item_id}
-            target_item = session.query(target_class).filter_by(**filter_by_kwargs).one_or_none()
-
-            if last_operation.operation == 'UPDATE':
-                if not target_item:
-                    return f"Error: Could not find item with ID {last_operation.item_id} in {last_operation.table_name.upper()} table"
-
-                # Split the changes string into separate changes
-                changes = last_operation.changes.split('\r\n\r\n')
-                for change in changes:
-                    column_name, old_new_values = change.split(": ", 1)
-                    old_value_str, new_value_str = old_new_values.split(" ----> ", 1)
-
-                    # Extract type and value
-                    old_type_str, old_value_repr = old_value_str[1:-1].split("] ", 1)
-                    old_value = self.str_to_type(old_type_str, old_value_repr)
-
-                    # Revert the change
-                    setattr(target_item, column_name, old_value)
-
-                rollback_message = (
-                    f"Rolled back '{last_operation.operation}' operation on {last_operation.table_name.upper()} table (ID: {last_operation.item_id}): Reverted changes"
-                )
-
-            elif last_operation.operation == 'INSERT':
-                if target_item:
-                    session.delete(target_item)
-
-                rollback_message = (
-                    f"Rolled back '{last_operation.operation}' operation on {last_operation.table_name.upper()} table (ID: {last_operation.item_id}): Deleted item"
-                )
-
-            elif last_operation.operation == 'DELETE':
-                # Aggregate old values of all columns into a single dictionary
-                old_values_dict = {}
-                # Split the changes string into separate changes
-                changes = last_operation.changes.split('\r\n\r\n')
-                for change in changes:
-                    column_name, old_new_values = change.split(": ", 1)
-                    old_value_str, new_value_str = old_new_values.split(" ----> ", 1)
-
-                    # Extract type and value
-                    old_type_str, old_value_repr = old_value_str[1:].split("] ", 1)
-                    self.logTool.log(service='Database', level='error', message=f"running str_to_type for: {str(old_type_str)}, {str(old_value_repr)}", redisClient=self.redisMessaging)
-                    old_value = self.str_to_type(old_type_str, old_value_repr)
-
-                    old_values_dict[column_name] = old_value
-                self.logTool.log(service='Database', level='error', message="old_value_dict: " + str(old_values_dict), redisClient=self.redisMessaging)
-
-                if not target_item:
-                    try:
-                        # Create the target item using the aggregated old values
-                        target_item = target_class(**old_values_dict)
-                        session.add(target_item)
-                    except Exception as e:
-                        return f"Error: Failed to recreate item with ID {last_operation.item_id} in {last_operation.table_name.upper()} table - {str(e)}"
+                else:
+                    return f"Error: Unknown operation {last_operation.operation}"
 
-                rollback_message = (
-                    f"Rolled back '{last_operation.operation}' operation on {last_operation.table_name.upper()} table (ID: {last_operation.item_id}): Re-inserted item"
-                )
+                session.commit()
 
-            else:
-                return f"Error: Unknown operation {last_operation.operation}"
+                return f"Rolled back operation with operation_id: {operation_id}\n" + "\n".join(rollback_messages)
 
-            try:
-                session.commit()
-                self.safe_close(session)
             except Exception as E:
                 self.logTool.log(service='Database', level='error', message="rollback_last_change error: " + str(E), redisClient=self.redisMessaging)
                 self.safe_rollback(session)
-                self.safe_close(session)
                 raise ValueError(E)
 
-            return f"Rolled back operation with operation_id: {operation_id}\n" + "\n".join(rollback_messages)
-
-        except Exception as E:
-            self.logTool.log(service='Database', level='error', message="rollback_last_change error: " + str(E), redisClient=self.redisMessaging)
-            self.safe_rollback(session)
-            self.safe_close(session)
-            raise ValueError(E)
-
     def get_all_operation_logs(self, page=0, page_size=100, existingSession=None):
-        if not existingSession:
-            Base.metadata.create_all(self.engine)
-            Session = sessionmaker(bind=self.engine)
-            session = Session()
-        else:
-            session = existingSession
-
-        try:
-            # Get all distinct operation_ids ordered by max timestamp (descending order)
-            operation_ids = session.query(OPERATION_LOG_BASE.operation_id).group_by(OPERATION_LOG_BASE.operation_id).order_by(desc(func.max(OPERATION_LOG_BASE.timestamp)))
+        self.operationLogWriter.flush()
+        with self.sessionScope(existingSession) as session:
+            try:
+                # Get all distinct operation_ids ordered by max timestamp (descending order)
+                operation_ids = session.query(OPERATION_LOG_BASE.operation_id).group_by(OPERATION_LOG_BASE.operation_id).order_by(desc(func.max(OPERATION_LOG_BASE.timestamp)))
 
-            operation_ids = operation_ids.limit(page_size).offset(page * page_size)
+                operation_ids = operation_ids.limit(page_size).offset(page * page_size)
 
-            operation_ids = operation_ids.all()
+                operation_ids = operation_ids.all()
 
-            all_operations = []
+                all_operations = []
 
-            for operation_id in operation_ids:
-                operation_log = session.query(OPERATION_LOG_BASE).filter(OPERATION_LOG_BASE.operation_id == operation_id[0]).order_by(OPERATION_LOG_BASE.id.asc()).first()
+                for operation_id in operation_ids:
+                    operation_log = session.query(OPERATION_LOG_BASE).filter(OPERATION_LOG_BASE.operation_id == operation_id[0]).order_by(OPERATION_LOG_BASE.id.asc()).first()
 
-                if operation_log is not None:
-                    # Convert the object to dictionary
-                    obj_dict = operation_log.__dict__
-                    obj_dict.pop('_sa_instance_state')
-                    sanitized_obj_dict = self.Sanitize_Datetime(obj_dict)
-                    all_operations.append(sanitized_obj_dict)
+                    if operation_log is not None:
+                        # Convert the object to dictionary
+                        obj_dict = operation_log.__dict__
+                        obj_dict.pop('_sa_instance_state')
+                        sanitized_obj_dict = self.Sanitize_Datetime(obj_dict)
+                        all_operations.append(sanitized_obj_dict)
 
-            self.safe_close(session)
-            return all_operations
-        except Exception as E:
-            self.logTool.log(service='Database', level='error', message=f"get_all_operation_logs error: {E}", redisClient=self.redisMessaging)
-            self.logTool.log(service='Database', level='error', message=E, redisClient=self.redisMessaging)
-            self.safe_rollback(session)
-            self.safe_close(session)
-            raise ValueError(E)
+                return all_operations
+            except Exception as E:
+                self.logTool.log(service='Database', level='error', message=f"get_all_operation_logs error: {E}", redisClient=self.redisMessaging)
+                self.logTool.log(service='Database', level='error', message=E, redisClient=self.redisMessaging)
+                self.safe_rollback(session)
+                raise ValueError(E)
 
     def get_all_operation_logs_by_table(self, table_name, page=0, page_size=100, existingSession=None):
-        if not existingSession:
-            Base.metadata.create_all(self.engine)
-            Session = sessionmaker(bind=self.engine)
-            session = Session()
-        else:
-            session = existingSession
-
-        try:
-            # Get all distinct operation_ids ordered by max timestamp (descending order)
-            operation_ids = session.query(OPERATION_LOG_BASE.operation_id).filter(OPERATION_LOG_BASE.table_name == table_name).group_by(OPERATION_LOG_BASE.operation_id).order_by(desc(func.max(OPERATION_LOG_BASE.timestamp)))
+        self.operationLogWriter.flush()
+        with self.sessionScope(existingSession) as session:
+            try:
+                # Get all distinct operation_ids ordered by max timestamp (descending order)
+                operation_ids = session.query(OPERATION_LOG_BASE.operation_id).filter(OPERATION_LOG_BASE.table_name == table_name).group_by(OPERATION_LOG_BASE.operation_id).order_by(desc(func.max(OPERATION_LOG_BASE.timestamp)))
 
-            operation_ids = operation_ids.limit(page_size).offset(page * page_size)
+                operation_ids = operation_ids.limit(page_size).offset(page * page_size)
 
-            operation_ids = operation_ids.all()
+                operation_ids = operation_ids.all()
 
-            all_operations = []
+                all_operations = []
 
-            for operation_id in operation_ids:
-                operation_log = session.query(OPERATION_LOG_BASE).filter(OPERATION_LOG_BASE.operation_id == operation_id[0]).order_by(OPERATION_LOG_BASE.id.asc()).first()
+                for operation_id in operation_ids:
+                    operation_log = session.query(OPERATION_LOG_BASE).filter(OPERATION_LOG_BASE.operation_id == operation_id[0]).order_by(OPERATION_LOG_BASE.id.asc()).first()
 
-                if operation_log is not None:
-                    # Convert the object to dictionary
-                    obj_dict = operation_log.__dict__
-                    obj_dict.pop('_sa_instance_state')
-                    sanitized_obj_dict = self.Sanitize_Datetime(obj_dict)
-                    all_operations.append(sanitized_obj_dict)
+                    if operation_log is not None:
+                        # Convert the object to dictionary
+                        obj_dict = operation_log.__dict__
+                        obj_dict.pop('_sa_instance_state')
+                        sanitized_obj_dict = self.Sanitize_Datetime(obj_dict)
+                        all_operations.append(sanitized_obj_dict)
 
-            self.safe_close(session)
-            return all_operations
-        except Exception as E:
-            self.logTool.log(service='Database', level='error', message=f"get_all_operation_logs_by_table error: {E}", redisClient=self.redisMessaging)
-            self.logTool.log(service='Database', level='error', message=E, redisClient=self.redisMessaging)
-            self.safe_rollback(session)
-            self.safe_close(session)
-            raise ValueError(E)
+                return all_operations
+            except Exception as E:
+                self.logTool.log(service='Database', level='error', message=f"get_all_operation_logs_by_table error: {E}", redisClient=self.redisMessaging)
+                self.logTool.log(service='Database', level='error', message=E, redisClient=self.redisMessaging)
+                self.safe_rollback(session)
+                raise ValueError(E)
 
     def get_last_operation_log(self, existingSession=None):
-        if not existingSession:
-            Base.metadata.create_all(self.engine)
-            Session = sessionmaker(bind=self.engine)
-            session = Session()
-        else:
-            session = existingSession
-
-        try:
-            # Get the top 100 records ordered by timestamp (descending order)
-            top_100_records = session.query(OPERATION_LOG_BASE).order_by(desc(OPERATION_LOG_BASE.timestamp)).limit(100)
+        self.operationLogWriter.flush()
+        with self.sessionScope(existingSession) as session:
+            try:
+                # Get the top 100 records ordered by timestamp (descending order)
+                top_100_records = session.query(OPERATION_LOG_BASE).order_by(desc(OPERATION_LOG_BASE.timestamp)).limit(100)
 
-            # Get the most recent operation_id
-            most_recent_operation_log = top_100_records.first()
+                # Get the most recent operation_id
+                most_recent_operation_log = top_100_records.first()
 
-            # Convert the object to dictionary
-            if most_recent_operation_log is not None:
-                obj_dict = most_recent_operation_log.__dict__
-                obj_dict.pop('_sa_instance_state')
-                sanitized_obj_dict = self.Sanitize_Datetime(obj_dict)
-                return sanitized_obj_dict
+                # Convert the object to dictionary
+                if most_recent_operation_log is not None:
+                    obj_dict = most_recent_operation_log.__dict__
+                    obj_dict.pop('_sa_instance_state')
+                    sanitized_obj_dict = self.Sanitize_Datetime(obj_dict)
+                    return sanitized_obj_dict
 
-            self.safe_close(session)
-            return None
-        except Exception as E:
-            self.logTool.log(service='Database', level='error', message=f"get_last_operation_log error: {E}", redisClient=self.redisMessaging)
-            self.logTool.log(service='Database', level='error', message=E, redisClient=self.redisMessaging)
-            self.safe_rollback(session)
-            self.safe_close(session)
-            raise ValueError(E)
+                return None
+            except Exception as E:
+                self.logTool.log(service='Database', level='error', message=f"get_last_operation_log error: {E}", redisClient=self.redisMessaging)
+                self.logTool.log(service='Database', level='error', message=E, redisClient=self.redisMessaging)
+                self.safe_rollback(session)
+                raise ValueError(E)
 
     def handleGeored(self, jsonData, operation: str="PATCH", asymmetric: bool=False, asymmetricUrls: list=[]) -> bool:
         """
@@ -1013,202 +1208,191 @@ class Database:
     def GetObj(self, obj_type, obj_id=None, page=None, page_size=None):
         self.logTool.log(service='Database', level='debug', message="Called GetObj for type " + str(obj_type), redisClient=self.redisMessaging)
 
-        Base.metadata.create_all(self.engine)
-        Session = sessionmaker(bind=self.engine)
-        session = Session()
-
-        try:
-            if obj_id is not None:
-                result = session.query(obj_type).get(obj_id)
-                if result is None:
-                    raise ValueError(f"No {obj_type} found with id {obj_id}")
-
-                result = result.__dict__
-                result.pop('_sa_instance_state')
-                result = self.Sanitize_Datetime(result)
-            elif page is not None and page_size is not None:
-                if page < 1 or page_size < 1:
-                    raise ValueError("page and page_size should be positive integers")
-
-                offset = (page - 1) * page_size
-                results = (
-                    session.query(obj_type)
-                    .order_by(obj_type.id)  # Assuming obj_type has an attribute 'id'
-                    .offset(offset)
-                    .limit(page_size)
-                    .all()
-                )
-
-                result = []
-                for item in results:
-                    item_dict = item.__dict__
-                    item_dict.pop('_sa_instance_state')
-                    result.append(self.Sanitize_Datetime(item_dict))
-            else:
-                raise ValueError("Provide either obj_id or both page and page_size")
+        with self.sessionScope() as session:
+            try:
+                if obj_id is not None:
+                    result = session.query(obj_type).get(obj_id)
+                    if result is None:
+                        raise ValueError(f"No {obj_type} found with id {obj_id}")
+
+                    result = result.__dict__
+                    result.pop('_sa_instance_state')
+                    result = self.Sanitize_Datetime(result)
+                elif page is not None and page_size is not None:
+                    if page < 1 or page_size < 1:
+                        raise ValueError("page and page_size should be positive integers")
+
+                    offset = (page - 1) * page_size
+                    results = (
+                        session.query(obj_type)
+                        .order_by(obj_type.id)  # Assuming obj_type has an attribute 'id'
+                        .offset(offset)
+                        .limit(page_size)
+                        .all()
+                    )
+
+                    result = []
+                    for item in results:
+                        item_dict = item.__dict__
+                        item_dict.pop('_sa_instance_state')
+                        result.append(self.Sanitize_Datetime(item_dict))
+                else:
+                    raise ValueError("Provide either obj_id or both page and page_size")
 
-        except Exception as E:
-            self.logTool.log(service='Database', level='error', message="Failed to query, error: " + str(E), redisClient=self.redisMessaging)
-            self.safe_rollback(session)
-            self.safe_close(session)
-            raise ValueError(E)
+            except Exception as E:
+                self.logTool.log(service='Database', level='error', message="Failed to query, error: " + str(E), redisClient=self.redisMessaging)
+                self.safe_rollback(session)
+                raise ValueError(E)
 
-        self.safe_close(session)
-        return result
+            return result
 
     def GetAll(self, obj_type):
         self.logTool.log(service='Database', level='debug', message="Called GetAll for type " + str(obj_type), redisClient=self.redisMessaging)
 
-        Base.metadata.create_all(self.engine)
-        Session = sessionmaker(bind = self.engine)
-        session = Session()
         final_result_list = []
 
         try:
-            result = session.query(obj_type)
+            with self.sessionScope() as session:
+                for record in session.execute(select(obj_type.__table__)).mappings():
+                    final_result_list.append(self.serializeRow(record))
         except Exception as E:
             self.logTool.log(service='Database', level='error', message="Failed to query, error: " + str(E), redisClient=self.redisMessaging)
-            self.safe_rollback(session)
-            self.safe_close(session)
-            raise ValueError(E)    
-        
-        for record in result:
-            record = record.__dict__
-            record.pop('_sa_instance_state')
-            record = self.Sanitize_Datetime(record)
-            final_result_list.append(record)
+            raise ValueError(E)
 
-        self.safe_close(session)
         return final_result_list
 
-    def getAllPaginated(self, obj_type, page=0, page_size=0, existingSession=None):
+    def getAllPaginated(self, obj_type, page=0, page_size=0, existingSession=None, after_id=None):
+        """
+        Returns a page of obj_type rows as dicts, in primary key order.
+        If after_id is given the page starts after that primary key (keyset pagination), so a deep page costs the same as the first;
+        otherwise page and page_size give a LIMIT/OFFSET page. A page_size of 0 returns every row.
+        """
         self.logTool.log(service='Database', level='debug', message="Called getAllPaginated for type " + str(obj_type), redisClient=self.redisMessaging)
 
-        if not existingSession:
-            Base.metadata.create_all(self.engine)
-            Session = sessionmaker(bind=self.engine)
-            session = Session()
-        else:
-            session = existingSession
-
-        final_result_list = []
+        primaryKey = self.getPrimaryKeyColumn(obj_type)
+        query = select(obj_type.__table__).order_by(primaryKey)
+        if after_id is not None:
+            query = query.where(primaryKey > after_id)
+        if page_size != 0:
+            query = query.limit(page_size)
+            if after_id is None:
+                query = query.offset(page * page_size)
 
         try:
-            # Query object type
-            result = session.query(obj_type)
-
-            # Apply pagination
-            if page_size != 0:
-                result = result.limit(page_size).offset(page * page_size)
-            
-            result = result.all()
+            with self.sessionScope(existingSession) as session:
+                return [self.serializeRow(row) for row in session.execute(query).mappings()]
+        except Exception as E:
+            self.logTool.log(service='Database', level='error', message="Failed to query, error: " + str(E), redisClient=self.redisMessaging)
+            raise ValueError(E)
 
-            for record in result:
-                record = record.__dict__
-                record.pop('_sa_instance_state')
-                record = self.Sanitize_Datetime(record)
-                final_result_list.append(record)
-                
-            self.safe_close(session)
-            return final_result_list
+    def exportAll(self, obj_type, after_id=None, chunkSize=1000):
+        """
+        Yields every obj_type row after after_id as lists of up to chunkSize dicts, in primary key order.
+        Rows are read through a server-side cursor, so memory use doesn't grow with the size of the table.
+        """
+        primaryKey = self.getPrimaryKeyColumn(obj_type)
+        query = select(obj_type.__table__).order_by(primaryKey)
+        if after_id is not None:
+            query = query.where(primaryKey > after_id)
 
+        try:
+            with self.engine.connect() as connection:
+                result = connection.execution_options(stream_results=True, yield_per=chunkSize).execute(query)
+                for partition in result.mappings().partitions():
+                    yield [self.serializeRow(row) for row in partition]
         except Exception as E:
-            self.logTool.log(service='Database', level='error', message="Failed to query, error: " + str(E), redisClient=self.redisMessaging)
-            self.safe_rollback(session)
-            self.safe_close(session)
+            self.logTool.log(service='Database', level='error', message=f"Failed to export {obj_type.__tablename__}, error: {E}", redisClient=self.redisMessaging)
             raise ValueError(E)
 
+    def getPrimaryKeyColumn(self, obj_type):
+        return list(obj_type.__table__.primary_key.columns)[0]
+
+    def serializeRow(self, row) -> dict:
+        """
+        Converts a result row to a dict, formatting DateTime values the same way as Sanitize_Datetime, without logging each one.
+        """
+        record = dict(row)
+        for key, value in record.items():
+            if isinstance(value, datetime.datetime):
+                record[key] = value.strftime('%Y-%m-%dT%H:%M:%SZ')
+        return record
 
     def GetAllByTable(self, obj_type, table):
         self.logTool.log(service='Database', level='debug', message=f"Called GetAll for type {str(obj_type)} and table {table}", redisClient=self.redisMessaging)
 
-        Base.metadata.create_all(self.engine)
-        Session = sessionmaker(bind = self.engine)
-        session = Session()
         final_result_list = []
 
         try:
-            result = session.query(obj_type).filter_by(table_name=str(table))
+            with self.sessionScope() as session:
+                for record in session.query(obj_type).filter_by(table_name=str(table)):
+                    record = record.__dict__
+                    record.pop('_sa_instance_state')
+                    record = self.Sanitize_Datetime(record)
+                    final_result_list.append(record)
         except Exception as E:
             self.logTool.log(service='Database', level='error', message="Failed to query, error: " + str(E), redisClient=self.redisMessaging)
-            self.safe_rollback(session)
-            self.safe_close(session)
-            raise ValueError(E)    
-        
-        for record in result:
-            record = record.__dict__
-            record.pop('_sa_instance_state')
-            record = self.Sanitize_Datetime(record)
-            final_result_list.append(record)
+            raise ValueError(E)
 
-        self.safe_close(session)
         return final_result_list
 
     def UpdateObj(self, obj_type, json_data, obj_id, disable_logging=False, operation_id=None):
         self.logTool.log(service='Database', level='debug', message=f"Called UpdateObj() for type {obj_type} id {obj_id} with JSON data: {json_data} and operation_id: {operation_id}", redisClient=self.redisMessaging)
-        Session = sessionmaker(bind=self.engine)
-        session = Session()
-        obj_type_str = str(obj_type.__table__.name).upper()
-        self.logTool.log(service='Database', level='debug', message=f"obj_type_str is {obj_type_str}", redisClient=self.redisMessaging)
-        filter_input = eval(obj_type_str + "." + obj_type_str.lower() + "_id==obj_id")
-        try:
-            obj = session.query(obj_type).filter(filter_input).one()
-            for key, value in json_data.items():
-                if hasattr(obj, key):
-                    setattr(obj, key, value)
-                    setattr(obj, "last_modified", datetime.datetime.now(tz=datetime.timezone.utc).strftime('%Y-%m-%dT%H:%M:%S') + 'Z')
-        except Exception as E:
-            self.logTool.log(service='Database', level='error', message=f"Failed to query or update object, error: {E}", redisClient=self.redisMessaging)
-            raise ValueError(E)
-        try:
+        with self.sessionScope() as session:
+            obj_type_str = str(obj_type.__table__.name).upper()
+            self.logTool.log(service='Database', level='debug', message=f"obj_type_str is {obj_type_str}", redisClient=self.redisMessaging)
+            filter_input = eval(obj_type_str + "." + obj_type_str.lower() + "_id==obj_id")
+            try:
+                obj = session.query(obj_type).filter(filter_input).one()
+                for key, value in json_data.items():
+                    if hasattr(obj, key):
+                        setattr(obj, key, value)
+                        setattr(obj, "last_modified", datetime.datetime.now(tz=datetime.timezone.utc).strftime('%Y-%m-%dT%H:%M:%S') + 'Z')
+            except Exception as E:
+                self.logTool.log(service='Database', level='error', message=f"Failed to query or update object, error: {E}", redisClient=self.redisMessaging)
+                raise ValueError(E)
+            try:
+                    session.info["operation_id"] = operation_id  # Pass the operation id
+                    try:
+                        if not disable_logging:
+                            self.log_changes_before_commit(session)
+                        objectData = self.GetObj(obj_type, obj_id)
+                        session.commit()
+                        self.handleWebhook(objectData, 'PATCH')
+                    except Exception as E:
+                        self.logTool.log(service='Database', level='error', message=f"Failed to commit session, error: {E}", redisClient=self.redisMessaging)
+                        self.safe_rollback(session)
+                        raise ValueError(E)
+            except Exception as E:
+                self.logTool.log(service='Database', level='error', message=f"Exception in UpdateObj, error: {E}", redisClient=self.redisMessaging)
+                raise ValueError(E)
+
+        return self.GetObj(obj_type, obj_id)
+
+    def DeleteObj(self, obj_type, obj_id, disable_logging=False, operation_id=None):
+        self.logTool.log(service='Database', level='debug', message=f"Called DeleteObj for type {obj_type} with id {obj_id}", redisClient=self.redisMessaging)
+
+        with self.sessionScope() as session:
+            try:
+                res = session.query(obj_type).get(obj_id)
+                if res is None:
+                    raise ValueError("The specified row does not exist")
+                objectData = self.GetObj(obj_type, obj_id)
+                session.delete(res)
                 session.info["operation_id"] = operation_id  # Pass the operation id
                 try:
                     if not disable_logging:
                         self.log_changes_before_commit(session)
-                    objectData = self.GetObj(obj_type, obj_id)
                     session.commit()
-                    self.handleWebhook(objectData, 'PATCH')
+                    self.handleWebhook(objectData, 'DELETE')
                 except Exception as E:
                     self.logTool.log(service='Database', level='error', message=f"Failed to commit session, error: {E}", redisClient=self.redisMessaging)
                     self.safe_rollback(session)
                     raise ValueError(E)
-        except Exception as E:
-            self.logTool.log(service='Database', level='error', message=f"Exception in UpdateObj, error: {E}", redisClient=self.redisMessaging)
-            raise ValueError(E)
-        finally:
-            self.safe_close(session)
-
-        return self.GetObj(obj_type, obj_id)
-
-    def DeleteObj(self, obj_type, obj_id, disable_logging=False, operation_id=None):
-        self.logTool.log(service='Database', level='debug', message=f"Called DeleteObj for type {obj_type} with id {obj_id}", redisClient=self.redisMessaging)
-
-        Session = sessionmaker(bind=self.engine)
-        session = Session()
 
-        try:
-            res = session.query(obj_type).get(obj_id)
-            if res is None:
-                raise ValueError("The specified row does not exist")
-            objectData = self.GetObj(obj_type, obj_id)
-            session.delete(res)
-            session.info["operation_id"] = operation_id  # Pass the operation id
-            try:
-                if not disable_logging:
-                    self.log_changes_before_commit(session)
-                session.commit()
-                self.handleWebhook(objectData, 'DELETE')
             except Exception as E:
-                self.logTool.log(service='Database', level='error', message=f"Failed to commit session, error: {E}", redisClient=self.redisMessaging)
-                self.safe_rollback(session)
+                self.logTool.log(service='Database', level='error', message=f"Exception in DeleteObj, error: {E}", redisClient=self.redisMessaging)
                 raise ValueError(E)
 
-        except Exception as E:
-            self.logTool.log(service='Database', level='error', message=f"Exception in DeleteObj, error: {E}", redisClient=self.redisMessaging)
-            raise ValueError(E)
-        finally:
-            self.safe_close(session)
-
         return {'Result': 'OK'}
 
 
@@ -1217,30 +1401,95 @@ class Database:
         last_modified_value = datetime.datetime.now(tz=datetime.timezone.utc).strftime('%Y-%m-%dT%H:%M:%S') + 'Z'
         json_data["last_modified"] = last_modified_value  # set last_modified value in json_data
         newObj = obj_type(**json_data)
-        Session = sessionmaker(bind=self.engine)
-        session = Session()
-
-        session.add(newObj)
-        try:
-            session.info["operation_id"] = operation_id  # Pass the operation id
+        with self.sessionScope() as session:
+            session.add(newObj)
             try:
-                if not disable_logging:
-                    self.log_changes_before_commit(session)
-                session.commit()
+                session.info["operation_id"] = operation_id  # Pass the operation id
+                try:
+                    if not disable_logging:
+                        self.log_changes_before_commit(session)
+                    session.commit()
+                except Exception as E:
+                    self.logTool.log(service='Database', level='error', message=f"Failed to commit session, error: {E}", redisClient=self.redisMessaging)
+                    self.safe_rollback(session)
+                    raise ValueError(E)
+                session.refresh(newObj)
+                result = newObj.__dict__
+                result.pop('_sa_instance_state')
+                self.handleWebhook(result, 'PUT')
+                return result
             except Exception as E:
-                self.logTool.log(service='Database', level='error', message=f"Failed to commit session, error: {E}", redisClient=self.redisMessaging)
-                self.safe_rollback(session)
+                self.logTool.log(service='Database', level='error', message=f"Exception in CreateObj, error: {E}", redisClient=self.redisMessaging)
                 raise ValueError(E)
-            session.refresh(newObj)
-            result = newObj.__dict__
-            result.pop('_sa_instance_state')
-            self.handleWebhook(result, 'PUT')
-            return result
+
+    def bulkImport(self, obj_type, rows, chunkSize: int=1000, operation_id=None, maxErrors: int=1000) -> dict:
+        """
+        Inserts rows into obj_type's table in chunks of chunkSize, where rows is an iterable of (lineNumber, row) from bulkImport.readCsvRows or readNdjsonRows.
+        Each chunk is validated, inserted with one executemany and summarised by one operation log entry, rather than a CreateObj per row.
+        Returns the number of rows inserted and rejected, with the line and reason for each rejected row, up to maxErrors.
+        """
+        operation_id = operation_id or str(uuid.uuid4())
+        table = obj_type.__table__
+        result = {'operation_id': operation_id, 'inserted': 0, 'rejected': 0, 'errors': []}
+        for chunk in chunkRows(rows, chunkSize):
+            lastModified = datetime.datetime.now(tz=datetime.timezone.utc).strftime('%Y-%m-%dT%H:%M:%S') + 'Z'
+            validRows = []
+            for lineNumber, row in chunk:
+                try:
+                    if isinstance(row, Exception):
+                        raise row
+                    validRow = validateRow(table, row)
+                    if 'last_modified' in table.columns:
+                        validRow['last_modified'] = lastModified
+                    validRows.append((lineNumber, validRow))
+                except ValueError as E:
+                    self.recordBulkImportError(result, lineNumber, E, maxErrors)
+            inserted = self.bulkInsertChunk(table, validRows, result, maxErrors)
+            result['inserted'] += inserted
+            self.logTool.log(service='Database', level='debug', message=f"Bulk import {operation_id} inserted {inserted} of {len(chunk)} rows into {table.name} from lines {chunk[0][0]} to {chunk[-1][0]}", redisClient=self.redisMessaging)
+            if inserted and '*' not in self.operationLogIgnoredColumns.get(table.name, ()):
+                self.operationLogWriter.append([{
+                    'item_id': 0,
+                    'operation_id': operation_id,
+                    'operation': 'IMPORT',
+                    'changes': [('inserted', None, inserted), ('rejected', None, len(chunk) - inserted), ('lines', None, f"{chunk[0][0]}-{chunk[-1][0]}")],
+                    'table_name': table.name,
+                    'timestamp': datetime.datetime.now(tz=timezone.utc),
+                }])
+        result['errors'].sort(key=lambda error: error['line'])
+        return result
+
+    def bulkInsertChunk(self, table, validRows: list, result: dict, maxErrors: int) -> int:
+        """
+        Inserts a chunk of validated rows with one executemany, and returns the number inserted.
+        If the chunk is rejected, for example by a duplicate IMSI, it's retried row by row so only the offending rows are rejected.
+        """
+        if not validRows:
+            return 0
+        try:
+            with self.sessionScope() as session:
+                session.execute(table.insert(), [validRow for lineNumber, validRow in validRows])
+                session.commit()
+            return len(validRows)
         except Exception as E:
-            self.logTool.log(service='Database', level='error', message=f"Exception in CreateObj, error: {E}", redisClient=self.redisMessaging)
-            raise ValueError(E)
-        finally:
-            self.safe_close(session)
+            self.logTool.log(service='Database', level='debug', message=f"Bulk insert of {len(validRows)} rows into {table.name} failed, retrying row by row. Error: {E}", redisClient=self.redisMessaging)
+
+        inserted = 0
+        with self.sessionScope() as session:
+            for lineNumber, validRow in validRows:
+                try:
+                    session.execute(table.insert(), validRow)
+                    session.commit()
+                    inserted += 1
+                except Exception as E:
+                    session.rollback()
+                    self.recordBulkImportError(result, lineNumber, getattr(E, 'orig', E), maxErrors)
+        return inserted
+
+    def recordBulkImportError(self, result: dict, lineNumber: int, reason, maxErrors: int):
+        result['rejected'] += 1
+        if len(result['errors']) < maxErrors:
+            result['errors'].append({'line': lineNumber, 'reason': str(reason)})
 
     def Generate_JSON_Model_for_Flask(self, obj_type):
         self.logTool.log(service='Database', level='debug', message="Generating JSON model for Flask for object type: " + str(obj_type), redisClient=self.redisMessaging)
@@ -1266,360 +1515,327 @@ class Database:
     def Get_AuC(self, **kwargs):
         #Get AuC data by IMSI or ICCID
 
-        Session = sessionmaker(bind = self.engine)
-        session = Session()
+        cacheKey = self.subscriberCacheKey('auc', kwargs, ('iccid', 'imsi'))
+        result = self.getCachedRow(cacheKey)
+        if result is not None:
+            return result
 
-        if 'iccid' in kwargs:
-            self.logTool.log(service='Database', level='debug', message="Get_AuC for iccid " + str(kwargs['iccid']), redisClient=self.redisMessaging)
-            try:
-                result = session.query(AUC).filter_by(iccid=str(kwargs['iccid'])).one()
-            except Exception as E:
-                self.safe_close(session)
-                raise ValueError(E)
-        elif 'imsi' in kwargs:
-            self.logTool.log(service='Database', level='debug', message="Get_AuC for imsi " + str(kwargs['imsi']), redisClient=self.redisMessaging)
-            try:
-                result = session.query(AUC).filter_by(imsi=str(kwargs['imsi'])).one()
-            except Exception as E:
-                self.safe_close(session)
-                raise ValueError(E)
+        with self.sessionScope() as session:
+            if 'iccid' in kwargs:
+                self.logTool.log(service='Database', level='debug', message="Get_AuC for iccid " + str(kwargs['iccid']), redisClient=self.redisMessaging)
+                try:
+                    result = session.query(AUC).filter_by(iccid=str(kwargs['iccid'])).one()
+                except Exception as E:
+                    raise ValueError(E)
+            elif 'imsi' in kwargs:
+                self.logTool.log(service='Database', level='debug', message="Get_AuC for imsi " + str(kwargs['imsi']), redisClient=self.redisMessaging)
+                try:
+                    result = session.query(AUC).filter_by(imsi=str(kwargs['imsi'])).one()
+                except Exception as E:
+                    raise ValueError(E)
 
-        result = result.__dict__
-        result = self.Sanitize_Datetime(result)
-        result.pop('_sa_instance_state')
+            result = result.__dict__
+            result = self.Sanitize_Datetime(result)
+            result.pop('_sa_instance_state')
 
-        self.logTool.log(service='Database', level='debug', message="Got back result: " + str(result), redisClient=self.redisMessaging)
-        self.safe_close(session)
-        return result
+            self.logTool.log(service='Database', level='debug', message="Got back result: " + str(result), redisClient=self.redisMessaging)
+            self.cacheRow(cacheKey, 'auc', result)
+            return result
 
     def Get_IMS_Subscriber(self, **kwargs):
         #Get subscriber by IMSI or MSISDN
-        Session = sessionmaker(bind = self.engine)
-        session = Session()
-        if 'msisdn' in kwargs:
-            self.logTool.log(service='Database', level='debug', message="Get_IMS_Subscriber for msisdn " + str(kwargs['msisdn']), redisClient=self.redisMessaging)
-            try:
-                result = session.query(IMS_SUBSCRIBER).filter_by(msisdn=str(kwargs['msisdn'])).one()
-            except Exception as E:
-                self.safe_close(session)
-                raise ValueError(E)
-        elif 'imsi' in kwargs:
-            self.logTool.log(service='Database', level='debug', message="Get_IMS_Subscriber for imsi " + str(kwargs['imsi']), redisClient=self.redisMessaging)
+        cacheKey = self.subscriberCacheKey('ims_subscriber', kwargs, ('msisdn', 'imsi'))
+        result = self.getCachedRow(cacheKey)
+        if result is not None:
+            return result
+        with self.sessionScope() as session:
+            if 'msisdn' in kwargs:
+                self.logTool.log(service='Database', level='debug', message="Get_IMS_Subscriber for msisdn " + str(kwargs['msisdn']), redisClient=self.redisMessaging)
+                try:
+                    result = session.query(IMS_SUBSCRIBER).filter_by(msisdn=str(kwargs['msisdn'])).one()
+                except Exception as E:
+                    raise ValueError(E)
+            elif 'imsi' in kwargs:
+                self.logTool.log(service='Database', level='debug', message="Get_IMS_Subscriber for imsi " + str(kwargs['imsi']), redisClient=self.redisMessaging)
+                try:
+                    result = session.query(IMS_SUBSCRIBER).filter_by(imsi=str(kwargs['imsi'])).one()
+                except Exception as E:
+                    raise ValueError(E)
+            self.logTool.log(service='Database', level='debug', message="Converting result to dict", redisClient=self.redisMessaging)
+            result = result.__dict__
             try:
-                result = session.query(IMS_SUBSCRIBER).filter_by(imsi=str(kwargs['imsi'])).one()
-            except Exception as E:
-                self.safe_close(session)
-                raise ValueError(E)
-        self.logTool.log(service='Database', level='debug', message="Converting result to dict", redisClient=self.redisMessaging)
-        result = result.__dict__
-        try:
-            result.pop('_sa_instance_state')
-        except:
-            pass
-        result = self.Sanitize_Datetime(result)
-        self.logTool.log(service='Database', level='debug', message="Returning IMS Subscriber Data: " + str(result), redisClient=self.redisMessaging)
-        self.safe_close(session)
-        return result
+                result.pop('_sa_instance_state')
+            except:
+                pass
+            result = self.Sanitize_Datetime(result)
+            self.logTool.log(service='Database', level='debug', message="Returning IMS Subscriber Data: " + str(result), redisClient=self.redisMessaging)
+            self.cacheRow(cacheKey, 'ims_subscriber', result)
+            return result
 
     def Get_Subscriber(self, **kwargs):
         #Get subscriber by IMSI or MSISDN
 
-        Session = sessionmaker(bind = self.engine)
-        session = Session()
+        cacheKey = self.subscriberCacheKey('subscriber', kwargs, ('subscriber_id', 'msisdn', 'imsi'))
+        result = self.getCachedRow(cacheKey)
+        if result is None:
+            with self.sessionScope() as session:
+                if 'subscriber_id' in kwargs:
+                    self.logTool.log(service='Database', level='debug', message="Get_Subscriber for id " + str(kwargs['subscriber_id']), redisClient=self.redisMessaging)
+                    try:
+                        result = session.query(SUBSCRIBER).filter_by(subscriber_id=int(kwargs['subscriber_id'])).one()
+                    except Exception as E:
+                        raise ValueError(E)
+                elif 'msisdn' in kwargs:
+                    self.logTool.log(service='Database', level='debug', message="Get_Subscriber for msisdn " + str(kwargs['msisdn']), redisClient=self.redisMessaging)
+                    try:
+                        result = session.query(SUBSCRIBER).filter_by(msisdn=str(kwargs['msisdn'])).one()
+                    except Exception as E:
+                        raise ValueError(E)
+                elif 'imsi' in kwargs:
+                    self.logTool.log(service='Database', level='debug', message="Get_Subscriber for imsi " + str(kwargs['imsi']), redisClient=self.redisMessaging)
+                    try:
+                        result = session.query(SUBSCRIBER).filter_by(imsi=str(kwargs['imsi'])).one()
+                    except Exception as E:
+                        raise ValueError(E)
 
-        if 'subscriber_id' in kwargs:
-            self.logTool.log(service='Database', level='debug', message="Get_Subscriber for id " + str(kwargs['subscriber_id']), redisClient=self.redisMessaging)
-            try:
-                result = session.query(SUBSCRIBER).filter_by(subscriber_id=int(kwargs['subscriber_id'])).one()
-            except Exception as E:
-                self.safe_close(session)
-                raise ValueError(E)
-        elif 'msisdn' in kwargs:
-            self.logTool.log(service='Database', level='debug', message="Get_Subscriber for msisdn " + str(kwargs['msisdn']), redisClient=self.redisMessaging)
-            try:
-                result = session.query(SUBSCRIBER).filter_by(msisdn=str(kwargs['msisdn'])).one()
-            except Exception as E:
-                self.safe_close(session)
-                raise ValueError(E)
-        elif 'imsi' in kwargs:
-            self.logTool.log(service='Database', level='debug', message="Get_Subscriber for imsi " + str(kwargs['imsi']), redisClient=self.redisMessaging)
-            try:
-                result = session.query(SUBSCRIBER).filter_by(imsi=str(kwargs['imsi'])).one()
-            except Exception as E:
-                self.safe_close(session)
-                raise ValueError(E)
+                result = result.__dict__
+                result = self.Sanitize_Datetime(result)
+                result.pop('_sa_instance_state')
+                self.cacheRow(cacheKey, 'subscriber', result)
 
-        result = result.__dict__
-        result = self.Sanitize_Datetime(result)
-        result.pop('_sa_instance_state')
-        
         if 'get_attributes' in kwargs:
             if kwargs['get_attributes'] == True:
                 attributes = self.Get_Subscriber_Attributes(result['subscriber_id'])
                 result['attributes'] = attributes
 
         self.logTool.log(service='Database', level='debug', message="Got back result: " + str(result), redisClient=self.redisMessaging)
-        self.safe_close(session)
         return result
 
     def Get_Subscribers_By_Pcscf(self, pcscf: str):
-        Session = sessionmaker(bind = self.engine)
-        session = Session()
-        self.logTool.log(service='Database', level='debug', message=f"[database.py] [Get_Subscribers_By_Pcscf] Get_Subscribers_By_Pcscf for PCSCF: {pcscf}", redisClient=self.redisMessaging)
-        try:
-            result = session.query(IMS_SUBSCRIBER).filter_by(pcscf=pcscf).all()
-        except Exception as E:
-            self.safe_close(session)
-            raise ValueError(E)
-        returnList = []
-        for item in result:
+        with self.sessionScope() as session:
+            self.logTool.log(service='Database', level='debug', message=f"[database.py] [Get_Subscribers_By_Pcscf] Get_Subscribers_By_Pcscf for PCSCF: {pcscf}", redisClient=self.redisMessaging)
             try:
-                returnList.append(item.__dict__)
-            except Exception as e:
-                self.logTool.log(service='Database', level='warning', message=f"[database.py] [Get_Subscribers_By_Pcscf] Error getting ims_subscriber: {traceback.format_exc()}", redisClient=self.redisMessaging)
-                pass
-        for item in returnList:
-            try:
-                item.pop('_sa_instance_state')
-            except Exception as e:
-                pass
-        self.safe_close(session)
-        return returnList
+                result = session.query(IMS_SUBSCRIBER).filter_by(pcscf=pcscf).all()
+            except Exception as E:
+                raise ValueError(E)
+            returnList = []
+            for item in result:
+                try:
+                    returnList.append(item.__dict__)
+                except Exception as e:
+                    self.logTool.log(service='Database', level='warning', message=f"[database.py] [Get_Subscribers_By_Pcscf] Error getting ims_subscriber: {traceback.format_exc()}", redisClient=self.redisMessaging)
+                    pass
+            for item in returnList:
+                try:
+                    item.pop('_sa_instance_state')
+                except Exception as e:
+                    pass
+            return returnList
 
     def Get_SUBSCRIBER_ROUTING(self, subscriber_id, apn_id):
-        Session = sessionmaker(bind = self.engine)
-        session = Session()
-
-        self.logTool.log(service='Database', level='debug', message="Get_SUBSCRIBER_ROUTING for subscriber_id " + str(subscriber_id) + " and apn_id " + str(apn_id), redisClient=self.redisMessaging)
-        try:
-            result = session.query(SUBSCRIBER_ROUTING).filter_by(subscriber_id=subscriber_id, apn_id=apn_id).one()
-        except Exception as E:
-            self.safe_close(session)
-            raise ValueError(E)
+        with self.sessionScope() as session:
+            self.logTool.log(service='Database', level='debug', message="Get_SUBSCRIBER_ROUTING for subscriber_id " + str(subscriber_id) + " and apn_id " + str(apn_id), redisClient=self.redisMessaging)
+            try:
+                result = session.query(SUBSCRIBER_ROUTING).filter_by(subscriber_id=subscriber_id, apn_id=apn_id).one()
+            except Exception as E:
+                raise ValueError(E)
 
-        result = result.__dict__
-        result = self.Sanitize_Datetime(result)
-        result.pop('_sa_instance_state')
+            result = result.__dict__
+            result = self.Sanitize_Datetime(result)
+            result.pop('_sa_instance_state')
 
-        self.logTool.log(service='Database', level='debug', message="Got back result: " + str(result), redisClient=self.redisMessaging)
-        self.safe_close(session)
-        return result
+            self.logTool.log(service='Database', level='debug', message="Got back result: " + str(result), redisClient=self.redisMessaging)
+            return result
 
     def Get_Subscriber_Attributes(self, subscriber_id):
         #Get subscriber attributes
 
-        Session = sessionmaker(bind = self.engine)
-        session = Session()
-
-        self.logTool.log(service='Database', level='debug', message="Get_Subscriber_Attributes for subscriber_id " + str(subscriber_id), redisClient=self.redisMessaging)
-        try:
-            result = session.query(SUBSCRIBER_ATTRIBUTES).filter_by(subscriber_id=subscriber_id)
-        except Exception as E:
-            self.safe_close(session)
-            raise ValueError(E)
-        final_res = []
-        for record in result:
-            result = record.__dict__
-            result = self.Sanitize_Datetime(result)
-            result.pop('_sa_instance_state')
-            final_res.append(result)
-        self.logTool.log(service='Database', level='debug', message="Got back result: " + str(final_res), redisClient=self.redisMessaging)
-        self.safe_close(session)
-        return final_res
+        with self.sessionScope() as session:
+            self.logTool.log(service='Database', level='debug', message="Get_Subscriber_Attributes for subscriber_id " + str(subscriber_id), redisClient=self.redisMessaging)
+            try:
+                result = session.query(SUBSCRIBER_ATTRIBUTES).filter_by(subscriber_id=subscriber_id)
+            except Exception as E:
+                raise ValueError(E)
+            final_res = []
+            for record in result:
+                result = record.__dict__
+                result = self.Sanitize_Datetime(result)
+                result.pop('_sa_instance_state')
+                final_res.append(result)
+            self.logTool.log(service='Database', level='debug', message="Got back result: " + str(final_res), redisClient=self.redisMessaging)
+            return final_res
 
 
     def Get_Served_Subscribers(self, get_local_users_only=False):
         self.logTool.log(service='Database', level='debug', message="Getting all subscribers served by this HSS", redisClient=self.redisMessaging)
 
-        Session = sessionmaker(bind = self.engine)
-        session = Session()
-
-        Served_Subs = {}
-        try:
-            results = session.query(SUBSCRIBER).filter(SUBSCRIBER.serving_mme.isnot(None))
-            for result in results:
-                result = result.__dict__
-                self.logTool.log(service='Database', level='debug', message="Result: " + str(result) + " type: " + str(type(result)), redisClient=self.redisMessaging)
-                result = self.Sanitize_Datetime(result)
-                result.pop('_sa_instance_state')
-
-                if get_local_users_only == True:
-                    self.logTool.log(service='Database', level='debug', message="Filtering to locally served IMS Subs only", redisClient=self.redisMessaging)
-                    try:
-                        serving_hss = result['serving_mme_peer'].split(';')[1]
-                        self.logTool.log(service='Database', level='debug', message="Serving HSS: " + str(serving_hss) + " and this is: " + str(self.config['hss']['OriginHost']), redisClient=self.redisMessaging)
-                        if serving_hss == self.config['hss']['OriginHost']:
-                            self.logTool.log(service='Database', level='debug', message="Serving HSS matches local HSS", redisClient=self.redisMessaging)
-                            Served_Subs[result['imsi']] = {}
-                            Served_Subs[result['imsi']] = result
-                            #self.logTool.log(service='Database', level='debug', message="Processed result", redisClient=self.redisMessaging)
+        with self.sessionScope() as session:
+            Served_Subs = {}
+            try:
+                results = session.query(SUBSCRIBER).filter(SUBSCRIBER.serving_mme.isnot(None))
+                for result in results:
+                    result = result.__dict__
+                    self.logTool.log(service='Database', level='debug', message="Result: " + str(result) + " type: " + str(type(result)), redisClient=self.redisMessaging)
+                    result = self.Sanitize_Datetime(result)
+                    result.pop('_sa_instance_state')
+
+                    if get_local_users_only == True:
+                        self.logTool.log(service='Database', level='debug', message="Filtering to locally served IMS Subs only", redisClient=self.redisMessaging)
+                        try:
+                            serving_hss = result['serving_mme_peer'].split(';')[1]
+                            self.logTool.log(service='Database', level='debug', message="Serving HSS: " + str(serving_hss) + " and this is: " + str(self.config['hss']['OriginHost']), redisClient=self.redisMessaging)
+                            if serving_hss == self.config['hss']['OriginHost']:
+                                self.logTool.log(service='Database', level='debug', message="Serving HSS matches local HSS", redisClient=self.redisMessaging)
+                                Served_Subs[result['imsi']] = {}
+                                Served_Subs[result['imsi']] = result
+                                #self.logTool.log(service='Database', level='debug', message="Processed result", redisClient=self.redisMessaging)
+                                continue
+                            else:
+                                self.logTool.log(service='Database', level='debug', message="Sub is served by remote HSS: " + str(serving_hss), redisClient=self.redisMessaging)
+                        except Exception as E:
+                            self.logTool.log(service='Database', level='debug', message="Error in filtering Get_Served_Subscribers to local peer only: " + str(E), redisClient=self.redisMessaging)
                             continue
-                        else:
-                            self.logTool.log(service='Database', level='debug', message="Sub is served by remote HSS: " + str(serving_hss), redisClient=self.redisMessaging)
-                    except Exception as E:
-                        self.logTool.log(service='Database', level='debug', message="Error in filtering Get_Served_Subscribers to local peer only: " + str(E), redisClient=self.redisMessaging)
-                        continue
-                else:
-                    Served_Subs[result['imsi']] = result
-                    self.logTool.log(service='Database', level='debug', message="Processed result", redisClient=self.redisMessaging)
+                    else:
+                        Served_Subs[result['imsi']] = result
+                        self.logTool.log(service='Database', level='debug', message="Processed result", redisClient=self.redisMessaging)
 
 
-        except Exception as E:
-            self.safe_close(session)
-            raise ValueError(E)
-        self.logTool.log(service='Database', level='debug', message="Final Served_Subs: " + str(Served_Subs), redisClient=self.redisMessaging)
-        self.safe_close(session)
-        return Served_Subs
+            except Exception as E:
+                raise ValueError(E)
+            self.logTool.log(service='Database', level='debug', message="Final Served_Subs: " + str(Served_Subs), redisClient=self.redisMessaging)
+            return Served_Subs
 
 
     def Get_Served_IMS_Subscribers(self, get_local_users_only=False):
         self.logTool.log(service='Database', level='debug', message="Getting all subscribers served by this IMS-HSS", redisClient=self.redisMessaging)
-        Session = sessionmaker(bind=self.engine)
-        session = Session()
-
-        Served_Subs = {}
-        try:
+        with self.sessionScope() as session:
+            Served_Subs = {}
+            try:
             
-            results = session.query(IMS_SUBSCRIBER).filter(
-                IMS_SUBSCRIBER.scscf.isnot(None))
-            for result in results:
-                result = result.__dict__
-                self.logTool.log(service='Database', level='debug', message="Result: " + str(result) + " type: " + str(type(result)), redisClient=self.redisMessaging)
-                result = self.Sanitize_Datetime(result)
-                result.pop('_sa_instance_state')
-                if get_local_users_only == True:
-                    self.logTool.log(service='Database', level='debug', message="Filtering Get_Served_IMS_Subscribers to locally served IMS Subs only", redisClient=self.redisMessaging)
-                    try:
-                        serving_ims_hss = result['scscf_peer'].split(';')[1]
-                        self.logTool.log(service='Database', level='debug', message="Serving IMS-HSS: " + str(serving_ims_hss) + " and this is: " + str(self.config['hss']['OriginHost']), redisClient=self.redisMessaging)
-                        if serving_ims_hss == self.config['hss']['OriginHost']:
-                            self.logTool.log(service='Database', level='debug', message="Serving IMS-HSS matches local HSS for " + str(result['imsi']), redisClient=self.redisMessaging)
-                            Served_Subs[result['imsi']] = {}
-                            Served_Subs[result['imsi']] = result
-                            self.logTool.log(service='Database', level='debug', message="Processed result", redisClient=self.redisMessaging)
+                results = session.query(IMS_SUBSCRIBER).filter(
+                    IMS_SUBSCRIBER.scscf.isnot(None))
+                for result in results:
+                    result = result.__dict__
+                    self.logTool.log(service='Database', level='debug', message="Result: " + str(result) + " type: " + str(type(result)), redisClient=self.redisMessaging)
+                    result = self.Sanitize_Datetime(result)
+                    result.pop('_sa_instance_state')
+                    if get_local_users_only == True:
+                        self.logTool.log(service='Database', level='debug', message="Filtering Get_Served_IMS_Subscribers to locally served IMS Subs only", redisClient=self.redisMessaging)
+                        try:
+                            serving_ims_hss = result['scscf_peer'].split(';')[1]
+                            self.logTool.log(service='Database', level='debug', message="Serving IMS-HSS: " + str(serving_ims_hss) + " and this is: " + str(self.config['hss']['OriginHost']), redisClient=self.redisMessaging)
+                            if serving_ims_hss == self.config['hss']['OriginHost']:
+                                self.logTool.log(service='Database', level='debug', message="Serving IMS-HSS matches local HSS for " + str(result['imsi']), redisClient=self.redisMessaging)
+                                Served_Subs[result['imsi']] = {}
+                                Served_Subs[result['imsi']] = result
+                                self.logTool.log(service='Database', level='debug', message="Processed result", redisClient=self.redisMessaging)
+                                continue
+                            else:
+                                self.logTool.log(service='Database', level='debug', message="Sub is served by remote IMS-HSS: " + str(serving_ims_hss), redisClient=self.redisMessaging)
+                        except Exception as E:
+                            self.logTool.log(service='Database', level='debug', message="Error in filtering to local peer only: " + str(E), redisClient=self.redisMessaging)
                             continue
-                        else:
-                            self.logTool.log(service='Database', level='debug', message="Sub is served by remote IMS-HSS: " + str(serving_ims_hss), redisClient=self.redisMessaging)
-                    except Exception as E:
-                        self.logTool.log(service='Database', level='debug', message="Error in filtering to local peer only: " + str(E), redisClient=self.redisMessaging)
-                        continue
-                else:
-                    Served_Subs[result['imsi']] = result
-                    self.logTool.log(service='Database', level='debug', message="Processed result", redisClient=self.redisMessaging)
+                    else:
+                        Served_Subs[result['imsi']] = result
+                        self.logTool.log(service='Database', level='debug', message="Processed result", redisClient=self.redisMessaging)
 
-        except Exception as E:
-            self.safe_close(session)
-            raise ValueError(E)
-        self.logTool.log(service='Database', level='debug', message="Final Served_Subs: " + str(Served_Subs), redisClient=self.redisMessaging)
-        self.safe_close(session)
-        return Served_Subs
+            except Exception as E:
+                raise ValueError(E)
+            self.logTool.log(service='Database', level='debug', message="Final Served_Subs: " + str(Served_Subs), redisClient=self.redisMessaging)
+            return Served_Subs
 
 
     def Get_Served_PCRF_Subscribers(self, get_local_users_only=False):
         self.logTool.log(service='Database', level='debug', message="Getting all subscribers served by this PCRF", redisClient=self.redisMessaging)
-        Session = sessionmaker(bind=self.engine)
-        session = Session()
-        Served_Subs = {}
-        try:
-            results = session.query(SERVING_APN).all()
-            for result in results:
-                result = result.__dict__
-                self.logTool.log(service='Database', level='debug', message="Result: " + str(result) + " type: " + str(type(result)), redisClient=self.redisMessaging)
-                result = self.Sanitize_Datetime(result)
-                result.pop('_sa_instance_state')
-
-                if get_local_users_only == True:
-                    self.logTool.log(service='Database', level='debug', message="Filtering to locally served IMS Subs only", redisClient=self.redisMessaging)
-                    try:
-                        serving_pcrf = result['serving_pgw_peer'].split(';')[1]
-                        self.logTool.log(service='Database', level='debug', message="Serving PCRF: " + str(serving_pcrf) + " and this is: " + str(self.config['hss']['OriginHost']), redisClient=self.redisMessaging)
-                        if serving_pcrf == self.config['hss']['OriginHost']:
-                            self.logTool.log(service='Database', level='debug', message="Serving PCRF matches local PCRF", redisClient=self.redisMessaging)
-                            self.logTool.log(service='Database', level='debug', message="Processed result", redisClient=self.redisMessaging)
+        with self.sessionScope() as session:
+            Served_Subs = {}
+            try:
+                results = session.query(SERVING_APN).all()
+                for result in results:
+                    result = result.__dict__
+                    self.logTool.log(service='Database', level='debug', message="Result: " + str(result) + " type: " + str(type(result)), redisClient=self.redisMessaging)
+                    result = self.Sanitize_Datetime(result)
+                    result.pop('_sa_instance_state')
+
+                    if get_local_users_only == True:
+                        self.logTool.log(service='Database', level='debug', message="Filtering to locally served IMS Subs only", redisClient=self.redisMessaging)
+                        try:
+                            serving_pcrf = result['serving_pgw_peer'].split(';')[1]
+                            self.logTool.log(service='Database', level='debug', message="Serving PCRF: " + str(serving_pcrf) + " and this is: " + str(self.config['hss']['OriginHost']), redisClient=self.redisMessaging)
+                            if serving_pcrf == self.config['hss']['OriginHost']:
+                                self.logTool.log(service='Database', level='debug', message="Serving PCRF matches local PCRF", redisClient=self.redisMessaging)
+                                self.logTool.log(service='Database', level='debug', message="Processed result", redisClient=self.redisMessaging)
                             
-                        else:
-                            self.logTool.log(service='Database', level='debug', message="Sub is served by remote PCRF: " + str(serving_pcrf), redisClient=self.redisMessaging)
+                            else:
+                                self.logTool.log(service='Database', level='debug', message="Sub is served by remote PCRF: " + str(serving_pcrf), redisClient=self.redisMessaging)
+                                continue
+                        except Exception as E:
+                            self.logTool.log(service='Database', level='debug', message="Error in filtering Get_Served_PCRF_Subscribers to local peer only: " + str(E), redisClient=self.redisMessaging)
                             continue
-                    except Exception as E:
-                        self.logTool.log(service='Database', level='debug', message="Error in filtering Get_Served_PCRF_Subscribers to local peer only: " + str(E), redisClient=self.redisMessaging)
-                        continue
 
-                # Get APN Info
-                apn_info = self.GetObj(APN, result['apn'])
-                #self.logTool.log(service='Database', level='debug', message="Got APN Info: " + str(apn_info), redisClient=self.redisMessaging)
-                result['apn_info'] = apn_info
+                    # Get APN Info
+                    apn_info = self.GetObj(APN, result['apn'])
+                    #self.logTool.log(service='Database', level='debug', message="Got APN Info: " + str(apn_info), redisClient=self.redisMessaging)
+                    result['apn_info'] = apn_info
 
-                # Get Subscriber Info
-                subscriber_info = self.GetObj(SUBSCRIBER, result['subscriber_id'])
-                result['subscriber_info'] = subscriber_info
+                    # Get Subscriber Info
+                    subscriber_info = self.GetObj(SUBSCRIBER, result['subscriber_id'])
+                    result['subscriber_info'] = subscriber_info
 
-                #self.logTool.log(service='Database', level='debug', message="Got Subscriber Info: " + str(subscriber_info), redisClient=self.redisMessaging)
+                    #self.logTool.log(service='Database', level='debug', message="Got Subscriber Info: " + str(subscriber_info), redisClient=self.redisMessaging)
 
-                Served_Subs[subscriber_info['imsi']] = result
-                self.logTool.log(service='Database', level='debug', message="Processed result", redisClient=self.redisMessaging)
-        except Exception as E:
-            raise ValueError(E)
-        #self.logTool.log(service='Database', level='debug', message="Final SERVING_APN: " + str(Served_Subs), redisClient=self.redisMessaging)
-        self.safe_close(session)
-        return Served_Subs
+                    Served_Subs[subscriber_info['imsi']] = result
+                    self.logTool.log(service='Database', level='debug', message="Processed result", redisClient=self.redisMessaging)
+            except Exception as E:
+                raise ValueError(E)
+            #self.logTool.log(service='Database', level='debug', message="Final SERVING_APN: " + str(Served_Subs), redisClient=self.redisMessaging)
+            return Served_Subs
 
     def Get_Vectors_AuC(self, auc_id, action, **kwargs):
         self.logTool.log(service='Database', level='debug', message="Getting Vectors for auc_id " + str(auc_id) + " with action " + str(action), redisClient=self.redisMessaging)
-        key_data = self.GetObj(AUC, auc_id)
-        vector_dict = {}
-        
         if action == "air":
-            rand, xres, autn, kasme = S6a_crypt.generate_eutran_vector(key_data['ki'], key_data['opc'], key_data['amf'], key_data['sqn'], kwargs['plmn']) 
-            vector_dict['rand'] = rand
-            vector_dict['xres'] = xres
-            vector_dict['autn'] = autn
-            vector_dict['kasme'] = kasme
+            return self.getEutranVectors(auc_id, kwargs['plmn'])[0]
 
-            #Incriment SQN
-            self.Update_AuC(auc_id, sqn=key_data['sqn']+100)
-
-            return vector_dict
+        key_data = self.GetObj(AUC, auc_id)
+        vector_dict = {}
 
-        elif action == "sqn_resync":
+        if action == "sqn_resync":
             self.logTool.log(service='Database', level='debug', message="Resync SQN", redisClient=self.redisMessaging)
             rand = kwargs['rand']       
-            sqn, mac_s = S6a_crypt.generate_resync_s6a(key_data['ki'], key_data['opc'], key_data['amf'], kwargs['auts'], rand)
+            sqn, mac_s = self.runCrypto(S6a_crypt.generate_resync_s6a, key_data['ki'], key_data['opc'], key_data['amf'], kwargs['auts'], rand)
             self.logTool.log(service='Database', level='debug', message="SQN from resync: " + str(sqn) + " SQN in DB is "  + str(key_data['sqn']) + "(Difference of " + str(int(sqn) - int(key_data['sqn'])) + ")", redisClient=self.redisMessaging)
             self.Update_AuC(auc_id, sqn=sqn+100)
             return
         
         elif action == "sip_auth":
-            rand, autn, xres, ck, ik = S6a_crypt.generate_maa_vector(key_data['ki'], key_data['opc'], key_data['amf'], key_data['sqn'], kwargs['plmn'])
+            key_data['sqn'] = self.allocateSqn(auc_id, currentSqn=key_data['sqn'])
+            self.invalidateVectorPool(auc_id)
+            rand, autn, xres, ck, ik = self.runCrypto(S6a_crypt.generate_maa_vector, key_data['ki'], key_data['opc'], key_data['amf'], key_data['sqn'], kwargs['plmn'])
             self.logTool.log(service='Database', level='debug', message="RAND is: " + str(rand), redisClient=self.redisMessaging)
             self.logTool.log(service='Database', level='debug', message="AUTN is: " + str(autn), redisClient=self.redisMessaging)
             vector_dict['SIP_Authenticate'] = rand + autn
             vector_dict['xres'] = xres
             vector_dict['ck'] = ck
             vector_dict['ik'] = ik
-            self.Update_AuC(auc_id, sqn=key_data['sqn']+100)
             return vector_dict
 
         elif action == "2g3g":
-            rand, autn, xres, ck, ik = S6a_crypt.generate_maa_vector(key_data['ki'], key_data['opc'], key_data['amf'], key_data['sqn'], kwargs['plmn'])
+            requested_vectors = int(kwargs['requested_vectors'])
+            self.logTool.log(service='Database', level='debug', message="Generating " + str(requested_vectors) + " vectors for GSM use", redisClient=self.redisMessaging)
+            if requested_vectors < 1:
+                return []
+            firstSqn = self.allocateSqn(auc_id, currentSqn=key_data['sqn'], count=requested_vectors)
+            self.invalidateVectorPool(auc_id)
+            sqns = [firstSqn + SQN_INCREMENT * vectorIndex for vectorIndex in range(requested_vectors)]
             vector_list = []
-            self.logTool.log(service='Database', level='debug', message="Generating " + str(kwargs['requested_vectors']) + " vectors for GSM use", redisClient=self.redisMessaging)
-            while kwargs['requested_vectors'] != 0:
-                self.logTool.log(service='Database', level='debug', message="RAND is: " + str(rand), redisClient=self.redisMessaging)
-                self.logTool.log(service='Database', level='debug', message="AUTN is: " + str(autn), redisClient=self.redisMessaging)
-                
-                vector_dict['rand'] = binascii.hexlify(rand).decode("utf-8")
-                vector_dict['autn'] = binascii.hexlify(autn).decode("utf-8")
-                vector_dict['xres'] = binascii.hexlify(xres).decode("utf-8")
-                vector_dict['ck'] = binascii.hexlify(ck).decode("utf-8")
-                vector_dict['ik'] = binascii.hexlify(ik).decode("utf-8")
-                
-                kwargs['requested_vectors'] = kwargs['requested_vectors'] - 1
-                vector_list.append(vector_dict)
-            self.Update_AuC(auc_id, sqn=key_data['sqn']+100)
+            for rand, autn, xres, ck, ik in self.runCrypto(S6a_crypt.generate_aka_vectors, key_data['ki'], key_data['opc'], key_data['amf'], sqns):
+                vector_list.append({'rand': rand, 'autn': autn, 'xres': xres, 'ck': ck, 'ik': ik})
             return vector_list
 
         elif action == "eap_aka":
-            rand, xres, autn, mac_a, ak = S6a_crypt.generate_eap_aka_vector(key_data['ki'], key_data['opc'], key_data['amf'], key_data['sqn'], kwargs['plmn'])
+            key_data['sqn'] = self.allocateSqn(auc_id, currentSqn=key_data['sqn'])
+            self.invalidateVectorPool(auc_id)
+            rand, xres, autn, mac_a, ak = self.runCrypto(S6a_crypt.generate_eap_aka_vector, key_data['ki'], key_data['opc'], key_data['amf'], key_data['sqn'], kwargs['plmn'])
             self.logTool.log(service='Database', level='debug', message="RAND is: " + str(rand), redisClient=self.redisMessaging)
             self.logTool.log(service='Database', level='debug', message="AUTN is: " + str(autn), redisClient=self.redisMessaging)
             vector_dict['rand'] = binascii.hexlify(rand).decode("utf-8")
@@ -1627,7 +1843,6 @@ class Database:
             vector_dict['xres'] = binascii.hexlify(xres).decode("utf-8")
             vector_dict['mac'] = binascii.hexlify(mac_a).decode("utf-8")
             vector_dict['ak'] = binascii.hexlify(ak).decode("utf-8")
-            self.Update_AuC(auc_id, sqn=key_data['sqn']+100)
             return vector_dict
 
         elif action == "Digest-MD5":
@@ -1641,34 +1856,127 @@ class Database:
         else:
             self.logTool.log(service='Database', level='error', message="Invalid action: " + str(action), redisClient=self.redisMessaging)
 
-    def Get_APN(self, apn_id):
-        self.logTool.log(service='Database', level='debug', message="Getting APN " + str(apn_id), redisClient=self.redisMessaging)
-        Session = sessionmaker(bind = self.engine)
-        session = Session()
+    def getEutranVectors(self, auc_id, plmn, count=1) -> list:
+        """
+        Generates count E-UTRAN vectors for an AuC, as dicts of hex rand, xres, autn and kasme, in SQN order.
+        The AuC is read once and all count SQNs are reserved with a single allocation, so the SQN is only written once.
+        """
+        self.logTool.log(service='Database', level='debug', message=f"Generating {count} E-UTRAN vectors for auc_id {auc_id}", redisClient=self.redisMessaging)
+        if count < 1:
+            return []
+        key_data = self.GetObj(AUC, auc_id)
+        firstSqn = self.allocateSqn(auc_id, currentSqn=key_data['sqn'], count=count)
+        self.invalidateVectorPool(auc_id)
+        sqns = [firstSqn + SQN_INCREMENT * vectorIndex for vectorIndex in range(count)]
+        vectors = self.runCrypto(S6a_crypt.generate_eutran_vectors, key_data['ki'], key_data['opc'], key_data['amf'], sqns, plmn)
+        return [{'rand': rand, 'xres': xres, 'autn': autn, 'kasme': kasme} for rand, xres, autn, kasme in vectors]
 
+    def takeEutranVectors(self, auc_id, plmn, count=1) -> list:
+        """
+        Returns count E-UTRAN vectors for an AuC in SQN order, taken from the vector pool where it has them, and generated with getEutranVectors otherwise.
+        """
+        vectors = []
+        if self.vectorPool is not None:
+            try:
+                vectors = self.vectorPool.pop(auc_id, plmn, count)
+            except Exception as E:
+                self.logTool.log(service='Database', level='warning', message=f"Failed to take pooled vectors for auc_id {auc_id}, generating them inline. Error: {E}", redisClient=self.redisMessaging)
+            self.logTool.log(service='Database', level='debug', message=f"Took {len(vectors)} of {count} E-UTRAN vectors for auc_id {auc_id} from the vector pool", redisClient=self.redisMessaging)
+        if len(vectors) < count:
+            # Reserved after the pooled vectors, so their SQNs are higher and Item-Numbers stay in SQN order.
+            vectors += self.getEutranVectors(auc_id, plmn, count - len(vectors))
+        return vectors
+
+    def getEutranVectorBatch(self, requests: list) -> dict:
+        """
+        Generates E-UTRAN vectors for several AuCs at once, for refilling the vector pool.
+        requests is a list of (auc_id, plmn, count). Returns a dict of auc_id to a list of vector dicts in SQN order, leaving out AuCs which no longer exist.
+        The AuCs are read with one query, and the vectors for each PLMN and AMF are generated in one batch Milenage call.
+        """
+        requests = [(auc_id, plmn, count) for auc_id, plmn, count in requests if count > 0]
+        if not requests:
+            return {}
+        with self.sessionScope() as session:
+            aucRows = {row['auc_id']: row for row in session.execute(select(AUC.auc_id, AUC.ki, AUC.opc, AUC.amf, AUC.sqn).where(AUC.auc_id.in_([auc_id for auc_id, plmn, count in requests]))).mappings()}
+
+        batches = {}
+        for auc_id, plmn, count in requests:
+            aucRow = aucRows.get(auc_id)
+            if aucRow is None:
+                continue
+            firstSqn = self.allocateSqn(auc_id, currentSqn=aucRow['sqn'], count=count)
+            batch = batches.setdefault((plmn, aucRow['amf']), {'auc_ids': [], 'keys': [], 'opcs': [], 'sqns': []})
+            for vectorIndex in range(count):
+                batch['auc_ids'].append(auc_id)
+                batch['keys'].append(aucRow['ki'])
+                batch['opcs'].append(aucRow['opc'])
+                batch['sqns'].append(firstSqn + SQN_INCREMENT * vectorIndex)
+
+        vectorsByAuc = {}
+        for (plmn, amf), batch in batches.items():
+            vectors = self.runCrypto(S6a_crypt.generate_eutran_vector_batch, batch['keys'], batch['opcs'], amf, batch['sqns'], plmn)
+            for auc_id, (rand, xres, autn, kasme) in zip(batch['auc_ids'], vectors):
+                vectorsByAuc.setdefault(auc_id, []).append({'rand': rand, 'xres': xres, 'autn': autn, 'kasme': kasme})
+        return vectorsByAuc
+
+    def invalidateVectorPool(self, auc_id):
+        """
+        Drops an AuC's pooled vectors, if the vector pool is enabled.
+        Called once an SQN has been reserved outside the pool, as pooled vectors with lower SQNs handed out afterwards could be rejected by the UE.
+        """
+        if self.vectorPool is None:
+            return
         try:
-            result = session.query(APN).filter_by(apn_id=apn_id).one()
+            self.vectorPool.invalidate(auc_id)
         except Exception as E:
-            self.safe_close(session)
-            raise ValueError(E)
-        result = result.__dict__
-        result.pop('_sa_instance_state')
-        self.safe_close(session)
-        return result    
+            self.logTool.log(service='Database', level='error', message=f"Failed to invalidate vector pool for auc_id {auc_id}, error: {E}", redisClient=self.redisMessaging)
+
+    def startCryptoPool(self, workers: int, maxQueued: int=64, timeout: float=3):
+        """
+        Starts a pool of worker processes which Get_Vectors_AuC and getEutranVectors submit Milenage work to, instead of running it in this process.
+        """
+        self.cryptoPool = CryptoPool(workers=workers, maxQueued=maxQueued, timeout=timeout, preloadModules=('S6a_crypt',))
+        self.logTool.log(service='Database', level='info', message=f"Started crypto pool with {workers} workers, {maxQueued} queued jobs and a {timeout}s timeout", redisClient=self.redisMessaging)
+
+    def runCrypto(self, function, *args):
+        """
+        Runs an S6a_crypt function in the crypto pool if one has been started, otherwise in this process.
+        """
+        if self.cryptoPool is None:
+            return function(*args)
+        return self.cryptoPool.run(function, *args)
+
+    def Get_APN(self, apn_id):
+        self.logTool.log(service='Database', level='debug', message="Getting APN " + str(apn_id), redisClient=self.redisMessaging)
+        configSnapshot = self.getConfigSnapshot()
+        if configSnapshot is not None:
+            result = configSnapshot.apn(apn_id)
+            if result is not None:
+                return result
+        with self.sessionScope() as session:
+            try:
+                result = session.query(APN).filter_by(apn_id=apn_id).one()
+            except Exception as E:
+                raise ValueError(E)
+            result = result.__dict__
+            result.pop('_sa_instance_state')
+            return result    
 
     def Get_APN_by_Name(self, apn):
         self.logTool.log(service='Database', level='debug', message="Getting APN named " + str(apn), redisClient=self.redisMessaging)
-        Session = sessionmaker(bind = self.engine)
-        session = Session()    
-        try:
-            result = session.query(APN).filter_by(apn=str(apn)).one()
-        except Exception as E:
-            self.safe_close(session)
-            raise ValueError(E)
-        result = result.__dict__
-        result.pop('_sa_instance_state')
-        self.safe_close(session)
-        return result 
+        configSnapshot = self.getConfigSnapshot()
+        if configSnapshot is not None:
+            result = configSnapshot.apnByName(apn)
+            if result is not None:
+                return result
+        with self.sessionScope() as session:
+            try:
+                result = session.query(APN).filter_by(apn=str(apn)).one()
+            except Exception as E:
+                raise ValueError(E)
+            result = result.__dict__
+            result.pop('_sa_instance_state')
+            return result 
 
     def Update_AuC(self, auc_id, sqn=1, propagate=True):
         self.logTool.log(service='Database', level='debug', message=f"Updating AuC record for ID: {auc_id}", redisClient=self.redisMessaging)
@@ -1685,205 +1993,261 @@ class Database:
 
         return
 
+    def allocateSqn(self, auc_id, increment=SQN_INCREMENT, currentSqn=None, count=1) -> int:
+        """
+        Reserves the next count SQNs for an AuC, increment apart, and returns the first, advancing the stored SQN by increment * count.
+        Each SQN is only ever returned once, regardless of how many workers are generating vectors for the same AuC.
+        With database.sqnLeaseEnabled, SQNs come from a block leased into Redis, so SQL is only written once per block.
+        """
+        if self.sqnLeaseEnabled:
+            sqn = self.allocateLeasedSqn(auc_id, increment, count)
+            if sqn is not None:
+                return sqn
+        return self.incrementSqn(auc_id, increment * count, currentSqn)
+
+    def incrementSqn(self, auc_id, increment, currentSqn=None) -> int:
+        """
+        Atomically advances the AuC's SQN by increment, and returns the SQN before the increment.
+        The update only applies if the SQN is still currentSqn, so a worker which raced with another reads the new value and retries.
+        Unlike Update_AuC, this writes no operation log entry.
+        """
+        with self.sessionScope() as session:
+            for attempt in range(10):
+                if currentSqn is None:
+                    currentSqn = session.execute(select(AUC.sqn).where(AUC.auc_id == auc_id)).scalar_one()
+                result = session.execute(update(AUC).where(AUC.auc_id == auc_id, AUC.sqn == currentSqn).values(sqn=currentSqn + increment))
+                session.commit()
+                if result.rowcount == 1:
+                    break
+                currentSqn = None
+            else:
+                raise ValueError(f"Failed to allocate SQN for auc_id {auc_id} after {attempt + 1} attempts")
+        # A Core update skips the flush hooks, so the cached AuC row is dropped here rather than left with the old SQN.
+        # Other instances may still have it cached, which only costs them a retry above as the SQN no longer matches.
+        if self.subscriberCache is not None:
+            self.subscriberCache.invalidate(('auc', auc_id))
+
+        if self.config['geored'].get('enabled', False) == True:
+            self.handleGeored({"auc_id": auc_id, "sqn": currentSqn + increment})
+        return currentSqn
+
+    def allocateLeasedSqn(self, auc_id, increment, count=1):
+        """
+        Takes the next count SQNs from the AuC's lease in Redis, which is shared by every worker on this host, and returns the first.
+        When the lease is missing or used up, the next sqnLeaseSize SQNs (or count, if more) are reserved in SQL first, so SQL is always ahead of any SQN handed out.
+        Returns None if Redis is unavailable, before anything is reserved, so the caller only has to write SQL once.
+        """
+        leaseKey = f"sqnLease:{auc_id}"
+        for attempt in range(2):
+            sqn = self.redisMessaging.runScript(SQN_LEASE_ALLOCATE_SCRIPT, keys=[leaseKey], args=[increment * count], usePrefix=True, prefixHostname=self.hostname, prefixServiceName='database')
+            if sqn is None:
+                return None
+            if int(sqn) >= 0:
+                return int(sqn)
+            if attempt == 0:
+                blockSize = increment * max(self.sqnLeaseSize, count)
+                blockStart = self.incrementSqn(auc_id, blockSize)
+                self.logTool.log(service='Database', level='debug', message=f"Leased SQN {blockStart} to {blockStart + blockSize} for auc_id {auc_id}", redisClient=self.redisMessaging)
+                if self.redisMessaging.runScript(SQN_LEASE_EXTEND_SCRIPT, keys=[leaseKey], args=[blockStart, blockStart + blockSize], usePrefix=True, prefixHostname=self.hostname, prefixServiceName='database') is None:
+                    # The block is already ours in SQL, so this request is served from it and the rest is skipped.
+                    self.logTool.log(service='Database', level='warning', message=f"Failed to store SQN lease for auc_id {auc_id}, using SQN {blockStart} from the reserved block", redisClient=self.redisMessaging)
+                    return blockStart
+        return None
+
+    def releaseSqnLease(self, auc_id):
+        """
+        Drops the AuC's SQN lease, the unused part of the block is skipped.
+        """
+        self.redisMessaging.deleteQueue(queue=f"sqnLease:{auc_id}", usePrefix=True, prefixHostname=self.hostname, prefixServiceName='database')
+
     def Update_Serving_MME(self, imsi, serving_mme, serving_mme_realm=None, serving_mme_peer=None, serving_mme_timestamp=None, propagate=True):
         self.logTool.log(service='Database', level='debug', message="Updating Serving MME for sub " + str(imsi) + " to MME " + str(serving_mme), redisClient=self.redisMessaging)
-        Session = sessionmaker(bind = self.engine)
-        session = Session()
-        try:
-            result = session.query(SUBSCRIBER).filter_by(imsi=imsi).one()
-            if self.config['hss']['CancelLocationRequest_Enabled'] == True:
-                self.logTool.log(service='Database', level='debug', message="Evaluating if we should trigger sending a CLR.", redisClient=self.redisMessaging)
-                serving_hss = str(result.serving_mme_peer).split(';',1)[1]
-                serving_mme_peer = str(result.serving_mme_peer).split(';',1)[0]
-                self.logTool.log(service='Database', level='debug', message="Subscriber is currently served by serving_mme: " + str(result.serving_mme) + " at realm " + str(result.serving_mme_realm) + " through Diameter peer " + str(result.serving_mme_peer), redisClient=self.redisMessaging)
-                self.logTool.log(service='Database', level='debug', message="Subscriber is now       served by serving_mme: " + str(serving_mme) + " at realm " + str(serving_mme_realm) + " through Diameter peer " + str(serving_mme_peer), redisClient=self.redisMessaging)
-                #Evaluate if we need to send a CLR to the old MME
-                if result.serving_mme != None:
-                    if str(result.serving_mme) == str(serving_mme):
-                        self.logTool.log(service='Database', level='debug', message="This MME is unchanged (" + str(serving_mme) + ") - so no need to send a CLR", redisClient=self.redisMessaging)
-                    elif (str(result.serving_mme) != str(serving_mme)):
-                        self.logTool.log(service='Database', level='debug', message="There is a difference in serving MME, old MME is '" + str(result.serving_mme) + "' new MME is '" + str(serving_mme) + "' - We need to trigger sending a CLR", redisClient=self.redisMessaging)
-                        if serving_hss != self.config['hss']['OriginHost']:
-                            self.logTool.log(service='Database', level='debug', message="This subscriber is not served by this HSS it is served by HSS at " + serving_hss + " - We need to trigger sending a CLR on " + str(serving_hss), redisClient=self.redisMessaging)
-                            URL = 'http://' + serving_hss + '.' + self.config['hss']['OriginRealm'] + ':8080/push/clr/' + str(imsi)
-                        else:
-                            self.logTool.log(service='Database', level='debug', message="This subscriber is served by this HSS we need to send a CLR to old MME from this HSS", redisClient=self.redisMessaging)
+        with self.sessionScope() as session:
+            try:
+                result = session.query(SUBSCRIBER).filter_by(imsi=imsi).one()
+                if self.config['hss']['CancelLocationRequest_Enabled'] == True:
+                    self.logTool.log(service='Database', level='debug', message="Evaluating if we should trigger sending a CLR.", redisClient=self.redisMessaging)
+                    serving_hss = str(result.serving_mme_peer).split(';',1)[1]
+                    serving_mme_peer = str(result.serving_mme_peer).split(';',1)[0]
+                    self.logTool.log(service='Database', level='debug', message="Subscriber is currently served by serving_mme: " + str(result.serving_mme) + " at realm " + str(result.serving_mme_realm) + " through Diameter peer " + str(result.serving_mme_peer), redisClient=self.redisMessaging)
+                    self.logTool.log(service='Database', level='debug', message="Subscriber is now       served by serving_mme: " + str(serving_mme) + " at realm " + str(serving_mme_realm) + " through Diameter peer " + str(serving_mme_peer), redisClient=self.redisMessaging)
+                    #Evaluate if we need to send a CLR to the old MME
+                    if result.serving_mme != None:
+                        if str(result.serving_mme) == str(serving_mme):
+                            self.logTool.log(service='Database', level='debug', message="This MME is unchanged (" + str(serving_mme) + ") - so no need to send a CLR", redisClient=self.redisMessaging)
+                        elif (str(result.serving_mme) != str(serving_mme)):
+                            self.logTool.log(service='Database', level='debug', message="There is a difference in serving MME, old MME is '" + str(result.serving_mme) + "' new MME is '" + str(serving_mme) + "' - We need to trigger sending a CLR", redisClient=self.redisMessaging)
+                            if serving_hss != self.config['hss']['OriginHost']:
+                                self.logTool.log(service='Database', level='debug', message="This subscriber is not served by this HSS it is served by HSS at " + serving_hss + " - We need to trigger sending a CLR on " + str(serving_hss), redisClient=self.redisMessaging)
+                                URL = 'http://' + serving_hss + '.' + self.config['hss']['OriginRealm'] + ':8080/push/clr/' + str(imsi)
+                            else:
+                                self.logTool.log(service='Database', level='debug', message="This subscriber is served by this HSS we need to send a CLR to old MME from this HSS", redisClient=self.redisMessaging)
                         
-                        URL = 'http://' + serving_hss + '.' + self.config['hss']['OriginRealm'] + ':8080/push/clr/' + str(imsi)
-                        self.logTool.log(service='Database', level='debug', message="Sending CLR to API at " + str(URL), redisClient=self.redisMessaging)
-
-                        clrBody = {
-                            "imsi": str(imsi), 
-                            "DestinationRealm": result.serving_mme_realm,
-                            "DestinationHost": result.serving_mme,
-                            "cancellationType": 2,
-                            "diameterPeer": serving_mme_peer,
-                            }
+                            URL = 'http://' + serving_hss + '.' + self.config['hss']['OriginRealm'] + ':8080/push/clr/' + str(imsi)
+                            self.logTool.log(service='Database', level='debug', message="Sending CLR to API at " + str(URL), redisClient=self.redisMessaging)
+
+                            clrBody = {
+                                "imsi": str(imsi), 
+                                "DestinationRealm": result.serving_mme_realm,
+                                "DestinationHost": result.serving_mme,
+                                "cancellationType": 2,
+                                "diameterPeer": serving_mme_peer,
+                                }
                         
-                        self.logTool.log(service='Database', level='debug', message="Pushing CLR to API on " + str(URL) + " with JSON body: " + str(clrBody), redisClient=self.redisMessaging)
-                        transaction_id = str(uuid.uuid4())
-                        self.handleGeored(clrBody, asymmetric=True, asymmetricUrls=[URL])
-                else:
-                    #No currently serving MME - No action to take
-                    self.logTool.log(service='Database', level='debug', message="No currently serving MME - No need to send CLR", redisClient=self.redisMessaging)
-
-            if type(serving_mme) == str:
-                self.logTool.log(service='Database', level='debug', message="Updating serving MME & Timestamp", redisClient=self.redisMessaging)
-                result.serving_mme = serving_mme
-                try:
-                    if serving_mme_timestamp != None and serving_mme_timestamp != 'None':
-                        result.serving_mme_timestamp = datetime.strptime(serving_mme_timestamp, '%Y-%m-%dT%H:%M:%SZ')
-                        result.serving_mme_timestamp = result.serving_mme_timestamp.replace(tzinfo=timezone.utc)
-                        serving_mme_timestamp_string = result.serving_mme_timestamp.strftime('%Y-%m-%dT%H:%M:%SZ')
+                            self.logTool.log(service='Database', level='debug', message="Pushing CLR to API on " + str(URL) + " with JSON body: " + str(clrBody), redisClient=self.redisMessaging)
+                            transaction_id = str(uuid.uuid4())
+                            self.handleGeored(clrBody, asymmetric=True, asymmetricUrls=[URL])
                     else:
+                        #No currently serving MME - No action to take
+                        self.logTool.log(service='Database', level='debug', message="No currently serving MME - No need to send CLR", redisClient=self.redisMessaging)
+
+                if type(serving_mme) == str:
+                    self.logTool.log(service='Database', level='debug', message="Updating serving MME & Timestamp", redisClient=self.redisMessaging)
+                    result.serving_mme = serving_mme
+                    try:
+                        if serving_mme_timestamp != None and serving_mme_timestamp != 'None':
+                            result.serving_mme_timestamp = datetime.strptime(serving_mme_timestamp, '%Y-%m-%dT%H:%M:%SZ')
+                            result.serving_mme_timestamp = result.serving_mme_timestamp.replace(tzinfo=timezone.utc)
+                            serving_mme_timestamp_string = result.serving_mme_timestamp.strftime('%Y-%m-%dT%H:%M:%SZ')
+                        else:
+                            result.serving_mme_timestamp = datetime.datetime.now(tz=timezone.utc)
+                            serving_mme_timestamp_string = result.serving_mme_timestamp.strftime('%Y-%m-%dT%H:%M:%SZ')
+                    except Exception as e:
                         result.serving_mme_timestamp = datetime.datetime.now(tz=timezone.utc)
                         serving_mme_timestamp_string = result.serving_mme_timestamp.strftime('%Y-%m-%dT%H:%M:%SZ')
-                except Exception as e:
-                    result.serving_mme_timestamp = datetime.datetime.now(tz=timezone.utc)
-                    serving_mme_timestamp_string = result.serving_mme_timestamp.strftime('%Y-%m-%dT%H:%M:%SZ')
-                result.serving_mme_realm = serving_mme_realm
-                result.serving_mme_peer = serving_mme_peer
-            else:
-                #Clear values
-                self.logTool.log(service='Database', level='debug', message="Clearing serving MME", redisClient=self.redisMessaging)
-                result.serving_mme = None
-                result.serving_mme_timestamp = None
-                result.serving_mme_realm = None
-                result.serving_mme_peer = None
-                serving_mme_timestamp_string = datetime.datetime.now(tz=timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
-
-            session.commit()
-            objectData = self.GetObj(SUBSCRIBER, result.subscriber_id)
-            self.handleWebhook(objectData, 'PATCH')
-
-            #Sync state change with geored
-            if propagate == True:
-                if 'HSS' in self.config['geored'].get('sync_actions', []) and self.config['geored'].get('enabled', False) == True:
-                    self.logTool.log(service='Database', level='debug', message="Propagate MME changes to Geographic PyHSS instances", redisClient=self.redisMessaging)
-                    self.handleGeored({
-                        "imsi": str(imsi), 
-                        "serving_mme": result.serving_mme, 
-                        "serving_mme_realm": result.serving_mme_realm, 
-                        "serving_mme_peer": result.serving_mme_peer,
-                        "serving_mme_timestamp": serving_mme_timestamp_string
-                        })
+                    result.serving_mme_realm = serving_mme_realm
+                    result.serving_mme_peer = serving_mme_peer
                 else:
-                    self.logTool.log(service='Database', level='debug', message="Config does not allow sync of HSS events", redisClient=self.redisMessaging)
-        except Exception as E:
-            self.logTool.log(service='Database', level='error', message="Error occurred in Update_Serving_MME: " + str(E), redisClient=self.redisMessaging)
-        finally:
-            self.safe_close(session)
+                    #Clear values
+                    self.logTool.log(service='Database', level='debug', message="Clearing serving MME", redisClient=self.redisMessaging)
+                    result.serving_mme = None
+                    result.serving_mme_timestamp = None
+                    result.serving_mme_realm = None
+                    result.serving_mme_peer = None
+                    serving_mme_timestamp_string = datetime.datetime.now(tz=timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+                session.commit()
+                objectData = self.GetObj(SUBSCRIBER, result.subscriber_id)
+                self.handleWebhook(objectData, 'PATCH')
+
+                #Sync state change with geored
+                if propagate == True:
+                    if 'HSS' in self.config['geored'].get('sync_actions', []) and self.config['geored'].get('enabled', False) == True:
+                        self.logTool.log(service='Database', level='debug', message="Propagate MME changes to Geographic PyHSS instances", redisClient=self.redisMessaging)
+                        self.handleGeored({
+                            "imsi": str(imsi), 
+                            "serving_mme": result.serving_mme, 
+                            "serving_mme_realm": result.serving_mme_realm, 
+                            "serving_mme_peer": result.serving_mme_peer,
+                            "serving_mme_timestamp": serving_mme_timestamp_string
+                            })
+                    else:
+                        self.logTool.log(service='Database', level='debug', message="Config does not allow sync of HSS events", redisClient=self.redisMessaging)
+            except Exception as E:
+                self.logTool.log(service='Database', level='error', message="Error occurred in Update_Serving_MME: " + str(E), redisClient=self.redisMessaging)
 
 
     def Update_Proxy_CSCF(self, imsi, proxy_cscf, pcscf_realm=None, pcscf_peer=None, pcscf_timestamp=None, pcscf_active_session=None, propagate=True):
         self.logTool.log(service='Database', level='debug', message="Update_Proxy_CSCF for sub " + str(imsi) + " to pcscf " + str(proxy_cscf) + " with realm " + str(pcscf_realm) + " and peer " + str(pcscf_peer) + " for session id " + str(pcscf_active_session), redisClient=self.redisMessaging)
-        Session = sessionmaker(bind = self.engine)
-        session = Session()
-
-        try:
-            result = session.query(IMS_SUBSCRIBER).filter_by(imsi=imsi).one()
+        with self.sessionScope() as session:
             try:
-                assert(type(proxy_cscf) == str)
-                assert(len(proxy_cscf) > 0)
-                self.logTool.log(service='Database', level='debug', message="Setting Proxy CSCF", redisClient=self.redisMessaging)
-                #Strip duplicate SIP prefix before storing
-                proxy_cscf = proxy_cscf.replace("sip:sip:", "sip:")
-                result.pcscf = proxy_cscf
-                result.pcscf_active_session = pcscf_active_session
+                result = session.query(IMS_SUBSCRIBER).filter_by(imsi=imsi).one()
                 try:
-                    if pcscf_timestamp != None and pcscf_timestamp != 'None':
-                        result.pcscf_timestamp = datetime.strptime(pcscf_timestamp, '%Y-%m-%dT%H:%M:%SZ')
-                        result.pcscf_timestamp = result.pcscf_timestamp.replace(tzinfo=timezone.utc)
-                        pcscf_timestamp_string = result.pcscf_timestamp.strftime('%Y-%m-%dT%H:%M:%SZ')
-                    else:
+                    assert(type(proxy_cscf) == str)
+                    assert(len(proxy_cscf) > 0)
+                    self.logTool.log(service='Database', level='debug', message="Setting Proxy CSCF", redisClient=self.redisMessaging)
+                    #Strip duplicate SIP prefix before storing
+                    proxy_cscf = proxy_cscf.replace("sip:sip:", "sip:")
+                    result.pcscf = proxy_cscf
+                    result.pcscf_active_session = pcscf_active_session
+                    try:
+                        if pcscf_timestamp != None and pcscf_timestamp != 'None':
+                            result.pcscf_timestamp = datetime.strptime(pcscf_timestamp, '%Y-%m-%dT%H:%M:%SZ')
+                            result.pcscf_timestamp = result.pcscf_timestamp.replace(tzinfo=timezone.utc)
+                            pcscf_timestamp_string = result.pcscf_timestamp.strftime('%Y-%m-%dT%H:%M:%SZ')
+                        else:
+                            result.pcscf_timestamp = datetime.datetime.now(tz=timezone.utc)
+                            pcscf_timestamp_string = result.pcscf_timestamp.strftime('%Y-%m-%dT%H:%M:%SZ')
+                    except Exception as e:
                         result.pcscf_timestamp = datetime.datetime.now(tz=timezone.utc)
                         pcscf_timestamp_string = result.pcscf_timestamp.strftime('%Y-%m-%dT%H:%M:%SZ')
-                except Exception as e:
-                    result.pcscf_timestamp = datetime.datetime.now(tz=timezone.utc)
-                    pcscf_timestamp_string = result.pcscf_timestamp.strftime('%Y-%m-%dT%H:%M:%SZ')
-                result.pcscf_realm = pcscf_realm
-                result.pcscf_peer = str(pcscf_peer)
-            except:
-                #Clear values
-                self.logTool.log(service='Database', level='debug', message="Clearing Proxy CSCF", redisClient=self.redisMessaging)
-                result.pcscf = None
-                result.pcscf_timestamp = None
-                result.pcscf_realm = None
-                result.pcscf_peer = None
-                result.pcscf_active_session = None
-                pcscf_timestamp_string = datetime.datetime.now(tz=timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+                    result.pcscf_realm = pcscf_realm
+                    result.pcscf_peer = str(pcscf_peer)
+                except:
+                    #Clear values
+                    self.logTool.log(service='Database', level='debug', message="Clearing Proxy CSCF", redisClient=self.redisMessaging)
+                    result.pcscf = None
+                    result.pcscf_timestamp = None
+                    result.pcscf_realm = None
+                    result.pcscf_peer = None
+                    result.pcscf_active_session = None
+                    pcscf_timestamp_string = datetime.datetime.now(tz=timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
 
-            session.commit()
-            objectData = self.GetObj(IMS_SUBSCRIBER, result.ims_subscriber_id)
-            self.handleWebhook(objectData, 'PATCH')
-
-            #Sync state change with geored
-            if propagate == True:
-                if 'IMS' in self.config['geored']['sync_actions'] and self.georedEnabled == True:
-                    self.logTool.log(service='Database', level='debug', message="Propagate IMS changes to Geographic PyHSS instances", redisClient=self.redisMessaging)
-                    self.handleGeored({"imsi": str(imsi), "pcscf": result.pcscf, "pcscf_realm": result.pcscf_realm, "pcscf_timestamp": pcscf_timestamp_string, "pcscf_peer": result.pcscf_peer, "pcscf_active_session": pcscf_active_session})
-                else:
-                    self.logTool.log(service='Database', level='debug', message="Config does not allow sync of IMS events", redisClient=self.redisMessaging)
-        except Exception as E:
-            self.logTool.log(service='Database', level='error', message="An error occurred, rolling back session: " + str(E), redisClient=self.redisMessaging)
-            self.safe_rollback(session)
-            raise
-        finally:
-            self.safe_close(session)
+                session.commit()
+                objectData = self.GetObj(IMS_SUBSCRIBER, result.ims_subscriber_id)
+                self.handleWebhook(objectData, 'PATCH')
+
+                #Sync state change with geored
+                if propagate == True:
+                    if 'IMS' in self.config['geored']['sync_actions'] and self.georedEnabled == True:
+                        self.logTool.log(service='Database', level='debug', message="Propagate IMS changes to Geographic PyHSS instances", redisClient=self.redisMessaging)
+                        self.handleGeored({"imsi": str(imsi), "pcscf": result.pcscf, "pcscf_realm": result.pcscf_realm, "pcscf_timestamp": pcscf_timestamp_string, "pcscf_peer": result.pcscf_peer, "pcscf_active_session": pcscf_active_session})
+                    else:
+                        self.logTool.log(service='Database', level='debug', message="Config does not allow sync of IMS events", redisClient=self.redisMessaging)
+            except Exception as E:
+                self.logTool.log(service='Database', level='error', message="An error occurred, rolling back session: " + str(E), redisClient=self.redisMessaging)
+                self.safe_rollback(session)
+                raise
 
     def Update_Serving_CSCF(self, imsi, serving_cscf, scscf_realm=None, scscf_peer=None, scscf_timestamp=None, propagate=True):
         self.logTool.log(service='Database', level='debug', message="Update_Serving_CSCF for sub " + str(imsi) + " to SCSCF " + str(serving_cscf) + " with realm " + str(scscf_realm) + " and peer " + str(scscf_peer), redisClient=self.redisMessaging)
-        Session = sessionmaker(bind = self.engine)
-        session = Session()
-
-        try:
-            result = session.query(IMS_SUBSCRIBER).filter_by(imsi=imsi).one()
+        with self.sessionScope() as session:
             try:
-                assert(type(serving_cscf) == str)
-                assert(len(serving_cscf) > 0)
-                self.logTool.log(service='Database', level='debug', message="Setting serving CSCF", redisClient=self.redisMessaging)
-                #Strip duplicate SIP prefix before storing
-                serving_cscf = serving_cscf.replace("sip:sip:", "sip:")
-                result.scscf = serving_cscf
+                result = session.query(IMS_SUBSCRIBER).filter_by(imsi=imsi).one()
                 try:
-                    if scscf_timestamp != None and scscf_timestamp != 'None':
-                        result.scscf_timestamp = datetime.strptime(scscf_timestamp, '%Y-%m-%dT%H:%M:%SZ')
-                        result.scscf_timestamp = result.scscf_timestamp.replace(tzinfo=timezone.utc)
-                        scscf_timestamp_string = result.scscf_timestamp.strftime('%Y-%m-%dT%H:%M:%SZ')
-                    else:
+                    assert(type(serving_cscf) == str)
+                    assert(len(serving_cscf) > 0)
+                    self.logTool.log(service='Database', level='debug', message="Setting serving CSCF", redisClient=self.redisMessaging)
+                    #Strip duplicate SIP prefix before storing
+                    serving_cscf = serving_cscf.replace("sip:sip:", "sip:")
+                    result.scscf = serving_cscf
+                    try:
+                        if scscf_timestamp != None and scscf_timestamp != 'None':
+                            result.scscf_timestamp = datetime.strptime(scscf_timestamp, '%Y-%m-%dT%H:%M:%SZ')
+                            result.scscf_timestamp = result.scscf_timestamp.replace(tzinfo=timezone.utc)
+                            scscf_timestamp_string = result.scscf_timestamp.strftime('%Y-%m-%dT%H:%M:%SZ')
+                        else:
+                            result.scscf_timestamp = datetime.datetime.now(tz=timezone.utc)
+                            scscf_timestamp_string = result.scscf_timestamp.strftime('%Y-%m-%dT%H:%M:%SZ')
+                    except Exception as e:
                         result.scscf_timestamp = datetime.datetime.now(tz=timezone.utc)
                         scscf_timestamp_string = result.scscf_timestamp.strftime('%Y-%m-%dT%H:%M:%SZ')
-                except Exception as e:
-                    result.scscf_timestamp = datetime.datetime.now(tz=timezone.utc)
-                    scscf_timestamp_string = result.scscf_timestamp.strftime('%Y-%m-%dT%H:%M:%SZ')
-                result.scscf_realm = scscf_realm
-                result.scscf_peer = str(scscf_peer)
-            except:
-                #Clear values
-                self.logTool.log(service='Database', level='debug', message="Clearing serving CSCF", redisClient=self.redisMessaging)
-                result.scscf = None
-                result.scscf_timestamp = None
-                result.scscf_realm = None
-                result.scscf_peer = None
-                scscf_timestamp_string = datetime.datetime.now(tz=timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+                    result.scscf_realm = scscf_realm
+                    result.scscf_peer = str(scscf_peer)
+                except:
+                    #Clear values
+                    self.logTool.log(service='Database', level='debug', message="Clearing serving CSCF", redisClient=self.redisMessaging)
+                    result.scscf = None
+                    result.scscf_timestamp = None
+                    result.scscf_realm = None
+                    result.scscf_peer = None
+                    scscf_timestamp_string = datetime.datetime.now(tz=timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
             
-            session.commit()
-            objectData = self.GetObj(IMS_SUBSCRIBER, result.ims_subscriber_id)
-            self.handleWebhook(objectData, 'PATCH')
-
-            #Sync state change with geored
-            if propagate == True:
-                if 'IMS' in self.config['geored']['sync_actions'] and self.georedEnabled == True:
-                    self.logTool.log(service='Database', level='debug', message="Propagate IMS changes to Geographic PyHSS instances", redisClient=self.redisMessaging)
-                    self.handleGeored({"imsi": str(imsi), "scscf": result.scscf, "scscf_realm": result.scscf_realm, "scscf_timestamp": scscf_timestamp_string, "scscf_peer": result.scscf_peer})
-                else:
-                    self.logTool.log(service='Database', level='debug', message="Config does not allow sync of IMS events", redisClient=self.redisMessaging)
-        except Exception as E:
-            self.logTool.log(service='Database', level='error', message="An error occurred, rolling back session: " + str(E), redisClient=self.redisMessaging)
-            self.safe_rollback(session)
-            raise
-        finally:
-            self.safe_close(session)
+                session.commit()
+                objectData = self.GetObj(IMS_SUBSCRIBER, result.ims_subscriber_id)
+                self.handleWebhook(objectData, 'PATCH')
+
+                #Sync state change with geored
+                if propagate == True:
+                    if 'IMS' in self.config['geored']['sync_actions'] and self.georedEnabled == True:
+                        self.logTool.log(service='Database', level='debug', message="Propagate IMS changes to Geographic PyHSS instances", redisClient=self.redisMessaging)
+                        self.handleGeored({"imsi": str(imsi), "scscf": result.scscf, "scscf_realm": result.scscf_realm, "scscf_timestamp": scscf_timestamp_string, "scscf_peer": result.scscf_peer})
+                    else:
+                        self.logTool.log(service='Database', level='debug', message="Config does not allow sync of IMS events", redisClient=self.redisMessaging)
+            except Exception as E:
+                self.logTool.log(service='Database', level='error', message="An error occurred, rolling back session: " + str(E), redisClient=self.redisMessaging)
+                self.safe_rollback(session)
+                raise
 
     def Update_Serving_APN(self, imsi, apn, pcrf_session_id, serving_pgw, subscriber_routing, serving_pgw_realm=None, serving_pgw_peer=None, serving_pgw_timestamp=None, propagate=True):
         """
@@ -2047,20 +2411,16 @@ class Database:
 
     def Get_Serving_APN(self, subscriber_id, apn_id):
         self.logTool.log(service='Database', level='debug', message="Getting Serving APN " + str(apn_id) + " with subscriber_id " + str(subscriber_id), redisClient=self.redisMessaging)
-        Session = sessionmaker(bind = self.engine)
-        session = Session()
-
-        try:
-            result = session.query(SERVING_APN).filter_by(subscriber_id=subscriber_id, apn=apn_id).first()
-        except Exception as E:
-            self.logTool.log(service='Database', level='debug', message=E, redisClient=self.redisMessaging)
-            self.safe_close(session)
-            raise ValueError(E)
-        result = result.__dict__
-        result.pop('_sa_instance_state')
+        with self.sessionScope() as session:
+            try:
+                result = session.query(SERVING_APN).filter_by(subscriber_id=subscriber_id, apn=apn_id).first()
+            except Exception as E:
+                self.logTool.log(service='Database', level='debug', message=E, redisClient=self.redisMessaging)
+                raise ValueError(E)
+            result = result.__dict__
+            result.pop('_sa_instance_state')
         
-        self.safe_close(session)
-        return result   
+            return result   
 
     def Get_Serving_APNs(self, subscriber_id: int) -> dict:
         """
@@ -2068,73 +2428,70 @@ class Database:
         with active sessions being a populated dictionary, and inactive sessions being an empty dictionary.
         """
         self.logTool.log(service='Database', level='debug', message=f"Getting Serving APNs for subscriber_id: {subscriber_id}", redisClient=self.redisMessaging)
-        Session = sessionmaker(bind = self.engine)
-        session = Session()
-        apnDict = {'apns': {}}
+        with self.sessionScope() as session:
+            apnDict = {'apns': {}}
 
-        try:
-            subscriber = self.Get_Subscriber(subscriber_id=subscriber_id)
-        except:
-            self.logTool.log(service='Database', level='debug', message=f"Unable to get subscriber with ID: {subscriber_id}: {traceback.format_exc()} ", redisClient=self.redisMessaging)
-            return apnDict
-        
-        apnList = subscriber.get('apn_list', []).split(',')
-        for apnId in apnList:
             try:
-                apnData = self.Get_APN(apnId)
-                apnName = apnData.get('apn', 'Unknown')
+                subscriber = self.Get_Subscriber(subscriber_id=subscriber_id)
+            except:
+                self.logTool.log(service='Database', level='debug', message=f"Unable to get subscriber with ID: {subscriber_id}: {traceback.format_exc()} ", redisClient=self.redisMessaging)
+                return apnDict
+        
+            apnList = subscriber.get('apn_list', []).split(',')
+            for apnId in apnList:
                 try:
-                    servingApn = self.Sanitize_Datetime(self.Get_Serving_APN(subscriber_id=subscriber_id, apn_id=apnId))
-                    self.logTool.log(service='Database', level='debug', message=f"Got serving APN: {servingApn}", redisClient=self.redisMessaging)
-                    if len(servingApn) > 0:
-                        apnDict['apns'][apnName] = servingApn
-                    else:
+                    apnData = self.Get_APN(apnId)
+                    apnName = apnData.get('apn', 'Unknown')
+                    try:
+                        servingApn = self.Sanitize_Datetime(self.Get_Serving_APN(subscriber_id=subscriber_id, apn_id=apnId))
+                        self.logTool.log(service='Database', level='debug', message=f"Got serving APN: {servingApn}", redisClient=self.redisMessaging)
+                        if len(servingApn) > 0:
+                            apnDict['apns'][apnName] = servingApn
+                        else:
+                            apnDict['apns'][apnName] = {}
+                    except Exception as e:
                         apnDict['apns'][apnName] = {}
-                except Exception as e:
-                    apnDict['apns'][apnName] = {}
-                    continue
-            except Exception as E:
-                self.logTool.log(service='Database', level='debug', message=f"Error getting apn for subscriber id: {subscriber_id}: {traceback.format_exc()} ", redisClient=self.redisMessaging)
+                        continue
+                except Exception as E:
+                    self.logTool.log(service='Database', level='debug', message=f"Error getting apn for subscriber id: {subscriber_id}: {traceback.format_exc()} ", redisClient=self.redisMessaging)
         
-        self.logTool.log(service='Database', level='debug', message=f"Returning: {apnDict}", redisClient=self.redisMessaging)
+            self.logTool.log(service='Database', level='debug', message=f"Returning: {apnDict}", redisClient=self.redisMessaging)
 
-        return apnDict
+            return apnDict
 
     def Get_Serving_APN_By_IP(self, subscriberIp):
-        Session = sessionmaker(bind = self.engine)
-        session = Session()
-
-        try:
-            result = session.query(SERVING_APN).filter_by(subscriber_routing=subscriberIp).first()
-        except Exception as E:
-            self.logTool.log(service='Database', level='debug', message=E, redisClient=self.redisMessaging)
-            self.safe_close(session)
-            raise ValueError(E)
-        result = result.__dict__
-        result.pop('_sa_instance_state')
+        with self.sessionScope() as session:
+            try:
+                result = session.query(SERVING_APN).filter_by(subscriber_routing=subscriberIp).first()
+            except Exception as E:
+                self.logTool.log(service='Database', level='debug', message=E, redisClient=self.redisMessaging)
+                raise ValueError(E)
+            result = result.__dict__
+            result.pop('_sa_instance_state')
         
-        self.safe_close(session)
-        return result   
+            return result   
 
     def Get_Charging_Rule(self, charging_rule_id):
         self.logTool.log(service='Database', level='debug', message="Called Get_Charging_Rule() for  charging_rule_id " + str(charging_rule_id), redisClient=self.redisMessaging)
-        Session = sessionmaker(bind = self.engine)
-        session = Session()
-        #Get base Rule
-        ChargingRule = self.GetObj(CHARGING_RULE, charging_rule_id)
-        ChargingRule['tft'] = []
-        #Get TFTs
-        try:
-            results = session.query(TFT).filter_by(tft_group_id=ChargingRule['tft_group_id'])
-            for result in results:
-                result = result.__dict__
-                result.pop('_sa_instance_state')
-                ChargingRule['tft'].append(result)
-        except Exception as E:
-            self.safe_close(session)
-            raise ValueError(E)
-        self.safe_close(session)
-        return ChargingRule
+        configSnapshot = self.getConfigSnapshot()
+        if configSnapshot is not None:
+            ChargingRule = configSnapshot.chargingRule(charging_rule_id)
+            if ChargingRule is not None:
+                return ChargingRule
+        with self.sessionScope() as session:
+            #Get base Rule
+            ChargingRule = self.GetObj(CHARGING_RULE, charging_rule_id)
+            ChargingRule['tft'] = []
+            #Get TFTs
+            try:
+                results = session.query(TFT).filter_by(tft_group_id=ChargingRule['tft_group_id'])
+                for result in results:
+                    result = result.__dict__
+                    result.pop('_sa_instance_state')
+                    ChargingRule['tft'].append(result)
+            except Exception as E:
+                raise ValueError(E)
+            return ChargingRule
 
     def Get_Charging_Rules(self, imsi, apn):
         self.logTool.log(service='Database', level='debug', message="Called Get_Charging_Rules() for IMSI " + str(imsi) + " and APN " + str(apn), redisClient=self.redisMessaging)
@@ -2189,219 +2546,200 @@ class Database:
     def Get_UE_by_IP(self, subscriber_routing):   
         self.logTool.log(service='Database', level='debug', message="Called Get_UE_by_IP() for IP " + str(subscriber_routing), redisClient=self.redisMessaging)
 
-        Session = sessionmaker(bind = self.engine)
-        session = Session()
-        
-        try:
-            result = session.query(SERVING_APN).filter_by(subscriber_routing=subscriber_routing).one()
-        except Exception as E:
-            self.safe_close(session)
-            raise ValueError(E)
-        result = result.__dict__
-        result.pop('_sa_instance_state')
-        result = self.Sanitize_Datetime(result)
-        return result
+        with self.sessionScope() as session:
+            try:
+                result = session.query(SERVING_APN).filter_by(subscriber_routing=subscriber_routing).one()
+            except Exception as E:
+                raise ValueError(E)
+            result = result.__dict__
+            result.pop('_sa_instance_state')
+            result = self.Sanitize_Datetime(result)
+            return result
 
     def Get_IMS_Subscriber_By_Session_Id(self, sessionId):   
         self.logTool.log(service='Database', level='debug', message="Called Get_IMS_Subscriber_By_Session_Id() for Session " + str(sessionId), redisClient=self.redisMessaging)
 
-        Session = sessionmaker(bind = self.engine)
-        session = Session()    
-        
-        try:
-            result = session.query(IMS_SUBSCRIBER).filter_by(pcscf_active_session=sessionId).one()
-        except Exception as E:
-            self.safe_close(session)
-            raise ValueError(E)
-        result = result.__dict__
-        result.pop('_sa_instance_state')
-        result = self.Sanitize_Datetime(result)
-        return result
+        with self.sessionScope() as session:
+            try:
+                result = session.query(IMS_SUBSCRIBER).filter_by(pcscf_active_session=sessionId).one()
+            except Exception as E:
+                raise ValueError(E)
+            result = result.__dict__
+            result.pop('_sa_instance_state')
+            result = self.Sanitize_Datetime(result)
+            return result
 
     def Get_Emergency_Subscriber(self, emergencySubscriberId: int=None, subscriberIp: str=None, gxSessionId: str=None, rxSessionId: str=None, imsi: str=None, **kwargs) -> dict:
         self.logTool.log(service='Database', level='debug', message=f"Getting Emergency_Subscriber", redisClient=self.redisMessaging)
-        Session = sessionmaker(bind = self.engine)
-        session = Session()
+        with self.sessionScope() as session:
+            result = None
 
-        result = None
+            try:
+                while not result:
+                    if imsi and not result:
+                        result = session.query(EMERGENCY_SUBSCRIBER).filter_by(imsi=imsi).first()
+                        if result:
+                            self.logTool.log(service='Database', level='debug', message=f"[database.py] [Get_Emergency_Subscriber] Matched emergency subscriber on IMSI: {imsi}", redisClient=self.redisMessaging)
+                            break
+                    if emergencySubscriberId and not result:
+                        result = session.query(EMERGENCY_SUBSCRIBER).filter_by(emergency_subscriber_id=emergencySubscriberId).first()
+                        if result:
+                            self.logTool.log(service='Database', level='debug', message=f"[database.py] [Get_Emergency_Subscriber] Matched emergency subscriber on IMSI: {imsi}", redisClient=self.redisMessaging)
+                            break
+                    if subscriberIp and not result:
+                        result = session.query(EMERGENCY_SUBSCRIBER).filter_by(ip=subscriberIp).first()
+                        if result:
+                            self.logTool.log(service='Database', level='debug', message=f"[database.py] [Get_Emergency_Subscriber] Matched emergency subscriber on IMSI: {imsi}", redisClient=self.redisMessaging)
+                            break
+                    if gxSessionId and not result:
+                        result = session.query(EMERGENCY_SUBSCRIBER).filter_by(serving_pgw=gxSessionId).first()
+                        if result:
+                            self.logTool.log(service='Database', level='debug', message=f"[database.py] [Get_Emergency_Subscriber] Matched emergency subscriber on IMSI: {imsi}", redisClient=self.redisMessaging)
+                            break
+                    if rxSessionId and not result:
+                        result = session.query(EMERGENCY_SUBSCRIBER).filter_by(serving_pcscf=rxSessionId).first()
+                        if result:
+                            self.logTool.log(service='Database', level='debug', message=f"[database.py] [Get_Emergency_Subscriber] Matched emergency subscriber on IMSI: {imsi}", redisClient=self.redisMessaging)
+                            break
+                    break
+
+                if not result:
+                    return None
+                result = result.__dict__
+                result.pop('_sa_instance_state')
+                return result
+        
+            except Exception as E:
+                self.logTool.log(service='Database', level='error', message=f"[database.py] [Get_Emergency_Subscriber] Error getting emergency subscriber: {traceback.format_exc()}", redisClient=self.redisMessaging)
+                return None
+
+    def Update_Emergency_Subscriber(self, emergencySubscriberId: int=None, subscriberIp: str=None, gxSessionId: str=None, rxSessionId: str=None, imsi: str=None, subscriberData: dict={}, propagate: bool=True) -> dict:
+        """
+        First, get at most one emergency subscriber.
+        Try and match on IMSI first (To detect an updated IP for an existing record),
+        If IMSI is None or no result was found, then try with a combination of all of the arguments.
+        Then update all data with the provided subscriberData, and push to geored.
+        """
+        with self.sessionScope() as session:
+            result = None
 
-        try:
             while not result:
                 if imsi and not result:
                     result = session.query(EMERGENCY_SUBSCRIBER).filter_by(imsi=imsi).first()
-                    if result:
-                        self.logTool.log(service='Database', level='debug', message=f"[database.py] [Get_Emergency_Subscriber] Matched emergency subscriber on IMSI: {imsi}", redisClient=self.redisMessaging)
-                        break
+                    self.logTool.log(service='Database', level='debug', message=f"[database.py] [Update_Emergency_Subscriber] Matched emergency subscriber on IMSI: {imsi}", redisClient=self.redisMessaging)
+                    break
                 if emergencySubscriberId and not result:
                     result = session.query(EMERGENCY_SUBSCRIBER).filter_by(emergency_subscriber_id=emergencySubscriberId).first()
-                    if result:
-                        self.logTool.log(service='Database', level='debug', message=f"[database.py] [Get_Emergency_Subscriber] Matched emergency subscriber on IMSI: {imsi}", redisClient=self.redisMessaging)
-                        break
+                    self.logTool.log(service='Database', level='debug', message=f"[database.py] [Update_Emergency_Subscriber] Matched emergency subscriber on emergency_subscriber_id: {emergencySubscriberId}", redisClient=self.redisMessaging)
+                    break
                 if subscriberIp and not result:
                     result = session.query(EMERGENCY_SUBSCRIBER).filter_by(ip=subscriberIp).first()
-                    if result:
-                        self.logTool.log(service='Database', level='debug', message=f"[database.py] [Get_Emergency_Subscriber] Matched emergency subscriber on IMSI: {imsi}", redisClient=self.redisMessaging)
-                        break
+                    self.logTool.log(service='Database', level='debug', message=f"[database.py] [Update_Emergency_Subscriber] Matched emergency subscriber on IP: {subscriberIp}", redisClient=self.redisMessaging)
+                    break
                 if gxSessionId and not result:
                     result = session.query(EMERGENCY_SUBSCRIBER).filter_by(serving_pgw=gxSessionId).first()
-                    if result:
-                        self.logTool.log(service='Database', level='debug', message=f"[database.py] [Get_Emergency_Subscriber] Matched emergency subscriber on IMSI: {imsi}", redisClient=self.redisMessaging)
-                        break
+                    self.logTool.log(service='Database', level='debug', message=f"[database.py] [Update_Emergency_Subscriber] Matched emergency subscriber on Gx Session ID: {gxSessionId}", redisClient=self.redisMessaging)
+                    break
                 if rxSessionId and not result:
                     result = session.query(EMERGENCY_SUBSCRIBER).filter_by(serving_pcscf=rxSessionId).first()
-                    if result:
-                        self.logTool.log(service='Database', level='debug', message=f"[database.py] [Get_Emergency_Subscriber] Matched emergency subscriber on IMSI: {imsi}", redisClient=self.redisMessaging)
-                        break
+                    self.logTool.log(service='Database', level='debug', message=f"[database.py] [Update_Emergency_Subscriber] Matched emergency subscriber on Rx Session ID: {rxSessionId}", redisClient=self.redisMessaging)
+                    break
                 break
 
+
+            """
+            If we havent matched in on any entries at this point, create a new emergency subscriber.
+            """
             if not result:
+                result = EMERGENCY_SUBSCRIBER()
+                session.add(result)
+
+            result.imsi = subscriberData.get('imsi')
+            result.serving_pgw = subscriberData.get('servingPgw')
+            result.serving_pgw_timestamp = subscriberData.get('requestTime')
+            result.serving_pcscf = subscriberData.get('servingPcscf')
+            result.serving_pcscf_timestamp = subscriberData.get('aarRequestTime')
+            result.gx_origin_realm = subscriberData.get('gxOriginRealm')
+            result.gx_origin_host = subscriberData.get('gxOriginHost')
+            result.rat_type = subscriberData.get('ratType')
+            result.ip = subscriberData.get('ip')
+            result.access_network_gateway_address = subscriberData.get('accessNetworkGatewayAddress')
+            result.access_network_charging_address = subscriberData.get('accessNetworkChargingAddress')
+
+            try:
+                session.commit()
+                emergencySubscriberId = result.emergency_subscriber_id
+                if propagate:
+                    self.handleGeored({ "emergency_subscriber_id": int(emergencySubscriberId),
+                                        "emergency_subscriber_imsi": subscriberData.get('imsi'),
+                                        "emergency_subscriber_serving_pgw": subscriberData.get('servingPgw'), 
+                                        "emergency_subscriber_serving_pgw_timestamp": subscriberData.get('requestTime'), 
+                                        "emergency_subscriber_serving_pcscf": subscriberData.get('servingPcscf'), 
+                                        "emergency_subscriber_serving_pcscf_timestamp": subscriberData.get('aarRequestTime'), 
+                                        "emergency_subscriber_gx_origin_realm":  subscriberData.get('gxOriginRealm'),
+                                        "emergency_subscriber_gx_origin_host": subscriberData.get('gxOriginHost'),
+                                        "emergency_subscriber_rat_type": subscriberData.get('ratType'),
+                                        "emergency_subscriber_ip": subscriberData.get('ip'),
+                                        "emergency_subscriber_access_network_gateway_address": subscriberData.get('accessNetworkGatewayAddress'),
+                                        "emergency_subscriber_access_network_charging_address": subscriberData.get('accessNetworkChargingAddress'),
+                                        })
+
+            except Exception as E:
+                self.logTool.log(service='Database', level='error', message=f"[database.py] [Update_Emergency_Subscriber] Error updating emergency subscriber: {traceback.format_exc()}", redisClient=self.redisMessaging)
                 return None
             result = result.__dict__
             result.pop('_sa_instance_state')
-            self.safe_close(session)
             return result
-        
-        except Exception as E:
-            self.logTool.log(service='Database', level='error', message=f"[database.py] [Get_Emergency_Subscriber] Error getting emergency subscriber: {traceback.format_exc()}", redisClient=self.redisMessaging)
-            self.safe_close(session)
-            return None
-
-    def Update_Emergency_Subscriber(self, emergencySubscriberId: int=None, subscriberIp: str=None, gxSessionId: str=None, rxSessionId: str=None, imsi: str=None, subscriberData: dict={}, propagate: bool=True) -> dict:
-        """
-        First, get at most one emergency subscriber.
-        Try and match on IMSI first (To detect an updated IP for an existing record),
-        If IMSI is None or no result was found, then try with a combination of all of the arguments.
-        Then update all data with the provided subscriberData, and push to geored.
-        """
-        Session = sessionmaker(bind = self.engine)
-        session = Session()
-
-        result = None
-
-        while not result:
-            if imsi and not result:
-                result = session.query(EMERGENCY_SUBSCRIBER).filter_by(imsi=imsi).first()
-                self.logTool.log(service='Database', level='debug', message=f"[database.py] [Update_Emergency_Subscriber] Matched emergency subscriber on IMSI: {imsi}", redisClient=self.redisMessaging)
-                break
-            if emergencySubscriberId and not result:
-                result = session.query(EMERGENCY_SUBSCRIBER).filter_by(emergency_subscriber_id=emergencySubscriberId).first()
-                self.logTool.log(service='Database', level='debug', message=f"[database.py] [Update_Emergency_Subscriber] Matched emergency subscriber on emergency_subscriber_id: {emergencySubscriberId}", redisClient=self.redisMessaging)
-                break
-            if subscriberIp and not result:
-                result = session.query(EMERGENCY_SUBSCRIBER).filter_by(ip=subscriberIp).first()
-                self.logTool.log(service='Database', level='debug', message=f"[database.py] [Update_Emergency_Subscriber] Matched emergency subscriber on IP: {subscriberIp}", redisClient=self.redisMessaging)
-                break
-            if gxSessionId and not result:
-                result = session.query(EMERGENCY_SUBSCRIBER).filter_by(serving_pgw=gxSessionId).first()
-                self.logTool.log(service='Database', level='debug', message=f"[database.py] [Update_Emergency_Subscriber] Matched emergency subscriber on Gx Session ID: {gxSessionId}", redisClient=self.redisMessaging)
-                break
-            if rxSessionId and not result:
-                result = session.query(EMERGENCY_SUBSCRIBER).filter_by(serving_pcscf=rxSessionId).first()
-                self.logTool.log(service='Database', level='debug', message=f"[database.py] [Update_Emergency_Subscriber] Matched emergency subscriber on Rx Session ID: {rxSessionId}", redisClient=self.redisMessaging)
-                break
-            break
-
-
-        """
-        If we havent matched in on any entries at this point, create a new emergency subscriber.
-        """
-        if not result:
-            result = EMERGENCY_SUBSCRIBER()
-            session.add(result)
-
-        result.imsi = subscriberData.get('imsi')
-        result.serving_pgw = subscriberData.get('servingPgw')
-        result.serving_pgw_timestamp = subscriberData.get('requestTime')
-        result.serving_pcscf = subscriberData.get('servingPcscf')
-        result.serving_pcscf_timestamp = subscriberData.get('aarRequestTime')
-        result.gx_origin_realm = subscriberData.get('gxOriginRealm')
-        result.gx_origin_host = subscriberData.get('gxOriginHost')
-        result.rat_type = subscriberData.get('ratType')
-        result.ip = subscriberData.get('ip')
-        result.access_network_gateway_address = subscriberData.get('accessNetworkGatewayAddress')
-        result.access_network_charging_address = subscriberData.get('accessNetworkChargingAddress')
-
-        try:
-            session.commit()
-            emergencySubscriberId = result.emergency_subscriber_id
-            if propagate:
-                self.handleGeored({ "emergency_subscriber_id": int(emergencySubscriberId),
-                                    "emergency_subscriber_imsi": subscriberData.get('imsi'),
-                                    "emergency_subscriber_serving_pgw": subscriberData.get('servingPgw'), 
-                                    "emergency_subscriber_serving_pgw_timestamp": subscriberData.get('requestTime'), 
-                                    "emergency_subscriber_serving_pcscf": subscriberData.get('servingPcscf'), 
-                                    "emergency_subscriber_serving_pcscf_timestamp": subscriberData.get('aarRequestTime'), 
-                                    "emergency_subscriber_gx_origin_realm":  subscriberData.get('gxOriginRealm'),
-                                    "emergency_subscriber_gx_origin_host": subscriberData.get('gxOriginHost'),
-                                    "emergency_subscriber_rat_type": subscriberData.get('ratType'),
-                                    "emergency_subscriber_ip": subscriberData.get('ip'),
-                                    "emergency_subscriber_access_network_gateway_address": subscriberData.get('accessNetworkGatewayAddress'),
-                                    "emergency_subscriber_access_network_charging_address": subscriberData.get('accessNetworkChargingAddress'),
-                                    })
-
-        except Exception as E:
-            self.safe_close(session)
-            self.logTool.log(service='Database', level='error', message=f"[database.py] [Update_Emergency_Subscriber] Error updating emergency subscriber: {traceback.format_exc()}", redisClient=self.redisMessaging)
-            return None
-        result = result.__dict__
-        result.pop('_sa_instance_state')
-        self.safe_close(session)
-        return result
 
     def Delete_Emergency_Subscriber(self, emergencySubscriberId: int=None, subscriberIp: str=None, gxSessionId: str=None, rxSessionId: str=None, imsi: str=None, subscriberData: dict={}, propagate: bool=True) -> bool:
         """
         First, get at most one emergency subscriber matching the provided identifiers.
         Then delete the emergency subscriber, and push to geored.
         """
-        Session = sessionmaker(bind = self.engine)
-        session = Session()
-
-        result = None
+        with self.sessionScope() as session:
+            result = None
 
-        while not result:
-            if imsi and not result:
-                result = session.query(EMERGENCY_SUBSCRIBER).filter_by(imsi=imsi).first()
-                self.logTool.log(service='Database', level='debug', message=f"[database.py] [Update_Emergency_Subscriber] Matched emergency subscriber on IMSI: {imsi}", redisClient=self.redisMessaging)
-                break
-            if emergencySubscriberId and not result:
-                result = session.query(EMERGENCY_SUBSCRIBER).filter_by(emergency_subscriber_id=emergencySubscriberId).first()
-                self.logTool.log(service='Database', level='debug', message=f"[database.py] [Update_Emergency_Subscriber] Matched emergency subscriber on emergency_subscriber_id: {emergencySubscriberId}", redisClient=self.redisMessaging)
-                break
-            if subscriberIp and not result:
-                result = session.query(EMERGENCY_SUBSCRIBER).filter_by(ip=subscriberIp).first()
-                self.logTool.log(service='Database', level='debug', message=f"[database.py] [Update_Emergency_Subscriber] Matched emergency subscriber on IP: {subscriberIp}", redisClient=self.redisMessaging)
-                break
-            if gxSessionId and not result:
-                self.logTool.log(service='Database', level='debug', message=f"[database.py] [Update_Emergency_Subscriber] Matched emergency subscriber on Gx Session ID: {gxSessionId}", redisClient=self.redisMessaging)
-                result = session.query(EMERGENCY_SUBSCRIBER).filter_by(serving_pgw=gxSessionId).first()
-                break
-            if rxSessionId and not result:
-                result = session.query(EMERGENCY_SUBSCRIBER).filter_by(serving_pcscf=rxSessionId).first()
-                self.logTool.log(service='Database', level='debug', message=f"[database.py] [Update_Emergency_Subscriber] Matched emergency subscriber on Rx Session ID: {rxSessionId}", redisClient=self.redisMessaging)
+            while not result:
+                if imsi and not result:
+                    result = session.query(EMERGENCY_SUBSCRIBER).filter_by(imsi=imsi).first()
+                    self.logTool.log(service='Database', level='debug', message=f"[database.py] [Update_Emergency_Subscriber] Matched emergency subscriber on IMSI: {imsi}", redisClient=self.redisMessaging)
+                    break
+                if emergencySubscriberId and not result:
+                    result = session.query(EMERGENCY_SUBSCRIBER).filter_by(emergency_subscriber_id=emergencySubscriberId).first()
+                    self.logTool.log(service='Database', level='debug', message=f"[database.py] [Update_Emergency_Subscriber] Matched emergency subscriber on emergency_subscriber_id: {emergencySubscriberId}", redisClient=self.redisMessaging)
+                    break
+                if subscriberIp and not result:
+                    result = session.query(EMERGENCY_SUBSCRIBER).filter_by(ip=subscriberIp).first()
+                    self.logTool.log(service='Database', level='debug', message=f"[database.py] [Update_Emergency_Subscriber] Matched emergency subscriber on IP: {subscriberIp}", redisClient=self.redisMessaging)
+                    break
+                if gxSessionId and not result:
+                    self.logTool.log(service='Database', level='debug', message=f"[database.py] [Update_Emergency_Subscriber] Matched emergency subscriber on Gx Session ID: {gxSessionId}", redisClient=self.redisMessaging)
+                    result = session.query(EMERGENCY_SUBSCRIBER).filter_by(serving_pgw=gxSessionId).first()
+                    break
+                if rxSessionId and not result:
+                    result = session.query(EMERGENCY_SUBSCRIBER).filter_by(serving_pcscf=rxSessionId).first()
+                    self.logTool.log(service='Database', level='debug', message=f"[database.py] [Update_Emergency_Subscriber] Matched emergency subscriber on Rx Session ID: {rxSessionId}", redisClient=self.redisMessaging)
+                    break
                 break
-            break
 
-        if not result:
-            self.safe_close(session)
-            return True
+            if not result:
+                return True
         
-        try:
-            emergencySubscriberId = result.emergency_subscriber_id
-            session.delete(result)
-            session.commit()
-            result = result.__dict__
-            if propagate:
-                self.handleGeored({
-                                    "emergency_subscriber_imsi": result.get('imsi'),
-                                    "emergency_subscriber_ip": result.get('ip'),
-                                    "emergency_subscriber_delete": True,
-                                })
-            self.safe_close(session)
-            return True
-        except Exception as E:
-            self.safe_close(session)
-            self.logTool.log(service='Database', level='error', message=f"[database.py] [Delete_Emergency_Subscriber] Error deleting emergency subscriber: {traceback.format_exc()}", redisClient=self.redisMessaging)
-            return False
+            try:
+                emergencySubscriberId = result.emergency_subscriber_id
+                session.delete(result)
+                session.commit()
+                result = result.__dict__
+                if propagate:
+                    self.handleGeored({
+                                        "emergency_subscriber_imsi": result.get('imsi'),
+                                        "emergency_subscriber_ip": result.get('ip'),
+                                        "emergency_subscriber_delete": True,
+                                    })
+                return True
+            except Exception as E:
+                self.logTool.log(service='Database', level='error', message=f"[database.py] [Delete_Emergency_Subscriber] Error deleting emergency subscriber: {traceback.format_exc()}", redisClient=self.redisMessaging)
+                return False
 
     def Store_IMSI_IMEI_Binding(self, imsi, imei, match_response_code, propagate=True):
         #IMSI           14-15 Digits
@@ -2413,35 +2751,29 @@ class Database:
             return
         #Concat IMEI + IMSI
         imsi_imei = str(imsi) + "," + str(imei)
-        Session = sessionmaker(bind = self.engine)
-        session = Session()
-
-        try:
-            aucSearchResult = session.query(AUC).filter_by(imsi=imsi).one()
-        except Exception as e:
-            if not self.eirStoreOffnetImsi:
-                self.logTool.log(service='Database', level='debug', message=f"[database.py] [Store_IMSI_IMEI_Binding] IMSI not present in AUC, not adding to EIR", redisClient=self.redisMessaging)   
-                self.safe_close(session)
-                return
-        try:
-            imsiImeiResult = session.query(IMSI_IMEI_HISTORY).filter_by(imsi_imei=imsi_imei).one()
-            if imsiImeiResult:
-                self.logTool.log(service='Database', level='debug', message=f"Entry already exists IMSI_IMEI_HISTORY for IMSI/IMEI: {imsi}/{imei}", redisClient=self.redisMessaging)   
-                self.safe_close(session)
-                return
-        except Exception as e:
-            self.logTool.log(service='Database', level='debug', message=f"No existing IMSI_IMEI_HISTORY for IMSI/IMEI: {imsi}/{imei}", redisClient=self.redisMessaging)   
+        with self.sessionScope() as session:
+            try:
+                aucSearchResult = session.query(AUC).filter_by(imsi=imsi).one()
+            except Exception as e:
+                if not self.eirStoreOffnetImsi:
+                    self.logTool.log(service='Database', level='debug', message=f"[database.py] [Store_IMSI_IMEI_Binding] IMSI not present in AUC, not adding to EIR", redisClient=self.redisMessaging)   
+                    return
+            try:
+                imsiImeiResult = session.query(IMSI_IMEI_HISTORY).filter_by(imsi_imei=imsi_imei).one()
+                if imsiImeiResult:
+                    self.logTool.log(service='Database', level='debug', message=f"Entry already exists IMSI_IMEI_HISTORY for IMSI/IMEI: {imsi}/{imei}", redisClient=self.redisMessaging)   
+                    return
+            except Exception as e:
+                self.logTool.log(service='Database', level='debug', message=f"No existing IMSI_IMEI_HISTORY for IMSI/IMEI: {imsi}/{imei}", redisClient=self.redisMessaging)   
 
-        newObj = IMSI_IMEI_HISTORY(imsi_imei=imsi_imei, match_response_code=match_response_code, imsi_imei_timestamp = datetime.datetime.now(tz=timezone.utc))
-        session.add(newObj)
-        try:
-            session.commit()
-        except Exception as E:
-            self.logTool.log(service='Database', level='error', message=f"Failed to commit session, error: {traceback.format_exc()}", redisClient=self.redisMessaging)
-            self.safe_rollback(session)
-            self.safe_close(session)
-            raise ValueError(E)
-        self.safe_close(session)
+            newObj = IMSI_IMEI_HISTORY(imsi_imei=imsi_imei, match_response_code=match_response_code, imsi_imei_timestamp = datetime.datetime.now(tz=timezone.utc))
+            session.add(newObj)
+            try:
+                session.commit()
+            except Exception as E:
+                self.logTool.log(service='Database', level='error', message=f"Failed to commit session, error: {traceback.format_exc()}", redisClient=self.redisMessaging)
+                self.safe_rollback(session)
+                raise ValueError(E)
         self.logTool.log(service='Database', level='debug', message="Added new IMSI_IMEI_HISTORY binding", redisClient=self.redisMessaging)
 
         if self.simSwapNotificationEnabled:
@@ -2503,116 +2835,63 @@ class Database:
 
     def Get_IMEI_IMSI_History(self, attribute):
         self.logTool.log(service='Database', level='debug', message="Called Get_IMEI_IMSI_History() for entry matching " + str(self.Get_IMEI_IMSI_History), redisClient=self.redisMessaging)
-        Session = sessionmaker(bind = self.engine)
-        session = Session()
-        result_array = []
-        try:
-            results = session.query(IMSI_IMEI_HISTORY).filter(IMSI_IMEI_HISTORY.imsi_imei.ilike("%" + str(attribute) + "%")).all()
-            for result in results:
-                result = result.__dict__
-                result.pop('_sa_instance_state')
-                result = self.Sanitize_Datetime(result)
-                try:
-                    result['imsi'] = result['imsi_imei'].split(",")[0]
-                except:
-                    continue
-                try:
-                    result['imei'] = result['imsi_imei'].split(",")[1]
-                except:
-                    continue                
-                result_array.append(result)
-            self.safe_close(session)
-            return result_array
-        except Exception as E:
-            self.safe_close(session)
-            raise ValueError(E)
+        with self.sessionScope() as session:
+            result_array = []
+            try:
+                results = session.query(IMSI_IMEI_HISTORY).filter(IMSI_IMEI_HISTORY.imsi_imei.ilike("%" + str(attribute) + "%")).all()
+                for result in results:
+                    result = result.__dict__
+                    result.pop('_sa_instance_state')
+                    result = self.Sanitize_Datetime(result)
+                    try:
+                        result['imsi'] = result['imsi_imei'].split(",")[0]
+                    except:
+                        continue
+                    try:
+                        result['imei'] = result['imsi_imei'].split(",")[1]
+                    except:
+                        continue                
+                    result_array.append(result)
+                return result_array
+            except Exception as E:
+                raise ValueError(E)
 
     def Check_EIR(self, imsi, imei):
         eir_response_code_table = {0 : 'Whitelist', 1: 'Blacklist', 2: 'Greylist'}
         self.logTool.log(service='Database', level='debug', message="Called Check_EIR() for  imsi " + str(imsi) + " and imei: " + str(imei), redisClient=self.redisMessaging)
-        Session = sessionmaker(bind = self.engine)
-        session = Session()
-        #Check for Exact Matches
-        self.logTool.log(service='Database', level='debug', message="Looking for exact matches", redisClient=self.redisMessaging)
-        #Check for exact Matches
-        try:
-            results = session.query(EIR).filter_by(imei=str(imei), regex_mode=0)
-            for result in results:
-                result = result.__dict__
-                match_response_code = result['match_response_code']
-                if result['imsi'] == '':
-                    self.logTool.log(service='Database', level='debug', message="No IMSI specified in DB, so matching only on IMEI", redisClient=self.redisMessaging)
-                    self.Store_IMSI_IMEI_Binding(imsi=imsi, imei=imei, match_response_code=match_response_code)
-                    self.safe_close(session)
-                    return match_response_code
-                elif result['imsi'] == str(imsi):
-                    self.logTool.log(service='Database', level='debug', message="Matched on IMEI and IMSI", redisClient=self.redisMessaging)
-                    self.Store_IMSI_IMEI_Binding(imsi=imsi, imei=imei, match_response_code=match_response_code)
-                    self.safe_close(session)
-                    return match_response_code
-        except Exception as E:
-            self.safe_rollback(session)
-            self.safe_close(session)
-            raise ValueError(E)
-        
-        self.logTool.log(service='Database', level='debug', message="Did not match any Exact Matches - Checking Regex", redisClient=self.redisMessaging)   
-        try:
-            results = session.query(EIR).filter_by(regex_mode=1)    #Get all Regex records from DB
-            for result in results:
-                result = result.__dict__
-                match_response_code = result['match_response_code']
-                if re.match(result['imei'], imei):
-                    self.logTool.log(service='Database', level='debug', message="IMEI matched " + str(result['imei']), redisClient=self.redisMessaging)
-                    #Check if IMSI also specified
-                    if len(result['imsi']) != 0:
-                        self.logTool.log(service='Database', level='debug', message="With IMEI matched, now checking if IMSI matches regex", redisClient=self.redisMessaging)
-                        if re.match(result['imsi'], imsi):
-                            self.logTool.log(service='Database', level='debug', message="IMSI also matched, so match OK!", redisClient=self.redisMessaging)
-                            self.Store_IMSI_IMEI_Binding(imsi=imsi, imei=imei, match_response_code=match_response_code)
-                            self.safe_close(session)
-                            return match_response_code
-                    else:
-                        self.logTool.log(service='Database', level='debug', message="No IMSI specified, so match OK!", redisClient=self.redisMessaging)
-                        self.Store_IMSI_IMEI_Binding(imsi=imsi, imei=imei, match_response_code=match_response_code)
-                        self.safe_close(session)
-                        return match_response_code
-        except Exception as E:
-            self.safe_rollback(session)
-            self.safe_close(session)
-            raise ValueError(E)
+        configSnapshot = self.getConfigSnapshot()
+        if configSnapshot is not None:
+            eirEngine = configSnapshot.eirEngine
+        else:
+            eirEngine = EirEngine(self.Get_EIR_Rules())
+
+        #Exact matches are checked first, then Regex
+        result = eirEngine.match(imsi=imsi, imei=imei)
+        if result is not None:
+            match_response_code = result['match_response_code']
+            self.logTool.log(service='Database', level='debug', message=f"IMEI {imei} and IMSI {imsi} matched EIR rule {result['eir_id']} ({'Regex' if result['regex_mode'] == 1 else 'Exact'}): {eir_response_code_table.get(match_response_code, match_response_code)}", redisClient=self.redisMessaging)
+            self.Store_IMSI_IMEI_Binding(imsi=imsi, imei=imei, match_response_code=match_response_code)
+            return match_response_code
 
-        try:
-            session.commit()
-        except Exception as E:
-            self.logTool.log(service='Database', level='error', message="Failed to commit session, error: " + str(E), redisClient=self.redisMessaging)
-            self.safe_rollback(session)
-            self.safe_close(session)
-            raise ValueError(E)
         self.logTool.log(service='Database', level='debug', message="No matches at all - Returning default response", redisClient=self.redisMessaging)
         try:
             self.Store_IMSI_IMEI_Binding(imsi=imsi, imei=imei, match_response_code=self.eirNoMatchResponse)
         except Exception as e:
             self.logTool.log(service='Database', level='error', message=f"Error Storing IMSI / IMEI Binding: {traceback.format_exc()}", redisClient=self.redisMessaging)
-        self.safe_close(session)
         return self.config['eir']['no_match_response']
 
     def Get_EIR_Rules(self):
         self.logTool.log(service='Database', level='debug', message="Getting all EIR Rules", redisClient=self.redisMessaging)
-        Session = sessionmaker(bind = self.engine)
-        session = Session()
         EIR_Rules = []
         try:
-            results = session.query(EIR)
-            for result in results:
-                result = result.__dict__
-                result.pop('_sa_instance_state')
-                EIR_Rules.append(result)
+            with self.sessionScope() as session:
+                for result in session.query(EIR):
+                    result = result.__dict__
+                    result.pop('_sa_instance_state')
+                    EIR_Rules.append(result)
         except Exception as E:
-            self.safe_rollback(session)
-            self.safe_close(session)
             raise ValueError(E)
         self.logTool.log(service='Database', level='debug', message="Final EIR_Rules: " + str(EIR_Rules), redisClient=self.redisMessaging)
-        self.safe_close(session)
         return EIR_Rules 
 
 
@@ -2622,29 +2901,15 @@ class Database:
             dict_string[key.decode()] = value.decode()
         return 
         
-    def findImeiInTacList(self, imei, tacList):
-        """
-        Iterate over every tac in the tacList and try to match the first 8 digits of the IMEI.
-        If that fails, try to match the first 6 digits of the IMEI.
-        """
-        for tac in tacList['tacList']:
-            for key, value in tac.items():
-                if str(key) == str(imei[0:8]):
-                    return {'tacPrefix': key, 'name': str(tac[key]['name']), 'model': str(tac[key]['model'])}
-            for key, value in tac.items():
-                if str(key) == str(imei[0:6]):
-                    return {'tacPrefix': key, 'name': str(tac[key]['name']), 'model': str(tac[key]['model'])}
-        return {}
-
     def getTacDataFromImei(self, imei) -> dict:
         self.logTool.log(service='Database', level='debug', message="Getting Device Info from IMEI: " + str(imei), redisClient=self.redisMessaging)
         try:
-            imei_result = self.findImeiInTacList(imei, self.tacData)
+            imei_result = self.tacDatabase.lookup(str(imei))
             assert(len(imei_result) != 0)
             self.logTool.log(service='Database', level='debug', message="Found match for IMEI " + str(imei) + " with result " + str(imei_result), redisClient=self.redisMessaging)
             return imei_result
         except:
-            self.logTool.log(service='Database', level='debug', message="Failed to match on 8 digit IMEI", redisClient=self.redisMessaging)
+            self.logTool.log(service='Database', level='debug', message="Failed to match IMEI on 8 or 6 digit TAC", redisClient=self.redisMessaging)
 
         raise ValueError("No matching TAC in IMEI Database")
 
@@ -7,7 +7,7 @@ import os
 import random
 import ipaddress
 import jinja2
-from database import Database, ROAMING_NETWORK, ROAMING_RULE
+from database import Database
 from messaging import RedisMessaging
 from redis import Redis
 import datetime
@@ -18,7 +18,11 @@ import socket
 import requests
 import traceback
 import re
-from baseModels import Peer, OutboundData
+from baseModels import Peer
+import diameterEnvelope
+from diameterEnvelope import OutboundMessage, encodeOutbound, decodeInbound
+import diameterDecoder
+import diameterEncoder
 import pydantic_core
 import xml.etree.ElementTree as ET
 
@@ -50,6 +54,33 @@ class Diameter:
         self.database = Database(logTool=logTool)
         self.diameterRequestTimeout = int(self.config.get('hss', {}).get('diameter_request_timeout', 10))
         self.diameterPeerKey = self.config.get('hss', {}).get('diameter_peer_key', 'diameterPeers')
+        self.decoderType = str(self.config.get('hss', {}).get('diameter_decoder', 'binary')).lower()
+        self.binaryMessageFormat = str(self.config.get('hss', {}).get('diameter_message_format', 'json')).lower() == 'binary'
+
+        #AVPs which never change for this HSS instance are encoded once here, and spliced into answers as-is
+        self.originHostAvp = self.generate_avp(264, 40, self.OriginHost)                                     #Origin Host
+        self.originRealmAvp = self.generate_avp(296, 40, self.OriginRealm)                                   #Origin Realm
+        self.productNameAvp = self.generate_avp(269, "00", self.ProductName)                                 #Product Name
+        self.resultCodeSuccessAvp = self.generate_avp(268, 40, self.int_to_hex(2001, 4))                     #Result Code (DIAMETER_SUCCESS (2001))
+        self.authSessionStateAvp = self.generate_avp(277, 40, "00000001")                                    #Auth-Session-State (NO_STATE_MAINTAINED)
+
+        #Vendor-Specific-Application-Id (3GPP Vendor-Id + Auth-Application-Id) for each application, keyed by Application Id
+        self.vendorSpecificApplicationIdAvps = {}
+        for applicationId in [16777216, 16777217, 16777236, 16777238, 16777251, 16777252, 16777291]:
+            VendorSpecificApplicationId = self.generate_vendor_avp(266, 40, 10415, '')                        #AVP Vendor ID
+            VendorSpecificApplicationId += self.generate_avp(258, 40, self.int_to_hex(applicationId, 4))     #Auth-Application-ID
+            self.vendorSpecificApplicationIdAvps[applicationId] = self.generate_avp(260, 40, VendorSpecificApplicationId)
+
+        #Supported-Features(628) for S6a
+        SupportedFeatures = self.generate_vendor_avp(266, 40, 10415, '')                                    #AVP Vendor ID
+        SupportedFeatures += self.generate_vendor_avp(629, 80, 10415, self.int_to_hex(1, 4))                 #Feature-List ID
+        SupportedFeatures += self.generate_vendor_avp(630, 80, 10415, "1c000607")                            #Feature-List Flags
+        self.s6aSupportedFeaturesAvp = self.generate_vendor_avp(628, "80", 10415, SupportedFeatures)
+        #Supported-Features(628) for Gx
+        self.gxSupportedFeaturesAvp = self.generate_vendor_avp(628, "80", 10415, "0000010a4000000c000028af0000027580000010000028af000000010000027680000010000028af0000000b")
+
+        #Capabilities Exchange Answer AVPs following the Origin-State-Id
+        self.capabilitiesExchangeAvps = diameterEncoder.encodeCapabilitiesExchangeAvps(self.config['hss']['bind_ip'], bytes.fromhex(self.ProductName)).hex()
 
         self.templateLoader = jinja2.FileSystemLoader(searchpath="../")
         self.templateEnv = jinja2.Environment(loader=self.templateLoader)
@@ -91,6 +122,16 @@ class Diameter:
                 {"commandCode": 319, "applicationId": 16777251, "requestMethod": self.Request_16777251_319, "failureResultCode": 5012 ,"requestAcronym": "ISD", "responseAcronym": "ISA", "requestName": "Insert Subscriber Data Request", "responseName": "Insert Subscriber Data Answer"},
         ]
 
+        #Dispatch tables keyed on (Application Id, Command Code, Request Bit), built once so each message is matched with a single lookup
+        self.diameterResponseTable = {}
+        self.diameterMessageTypeTable = {}
+        for diameterApplication in self.diameterRequestList + self.diameterResponseList:
+            applicationKey = (diameterApplication["applicationId"], diameterApplication["commandCode"])
+            self.diameterMessageTypeTable[applicationKey + (True,)] = {'inbound': diameterApplication["requestAcronym"], 'outbound': diameterApplication["responseAcronym"]}
+            self.diameterMessageTypeTable[applicationKey + (False,)] = {'inbound': diameterApplication["responseAcronym"], 'outbound': diameterApplication["requestAcronym"]}
+        for diameterApplication in self.diameterResponseList:
+            self.diameterResponseTable[(diameterApplication["applicationId"], diameterApplication["commandCode"], True)] = diameterApplication
+
     #Generates rounding for calculating padding
     def myround(self, n, base=4):
         if(n > 0):
@@ -277,67 +318,19 @@ class Diameter:
         self.logTool.log(service='HSS', level='debug', message="TBCD_decode output value is " + str(output), redisClient=self.redisMessaging)
         return output
 
-    #Generates an AVP with inputs provided (AVP Code, AVP Flags, AVP Content, Padding)
+    #Generates an AVP with inputs provided (AVP Code, AVP Flags, AVP Content), padded to a multiple of 4 bytes
     #AVP content must already be in HEX - This can be done with binascii.hexlify(avp_content.encode())
     def generate_avp(self, avp_code, avp_flags, avp_content):
-        avp_code = format(avp_code,"x").zfill(8)
-        
-        avp_length = 1 ##This is a placeholder that's overwritten later
-
-        #AVP Must always be a multiple of 4 - Round up to nearest multiple of 4 and fill remaining bits with padding
-        avp = str(avp_code) + str(avp_flags) + str("000000") + str(avp_content)
-        avp_length = int(len(avp)/2)
-
-        if avp_length % 4  == 0:    #Multiple of 4 - No Padding needed
-            avp_padding = ''
-        else:                       #Not multiple of 4 - Padding needed
-            rounded_value = self.myround(avp_length)
-            avp_padding = format(0,"x").zfill(int( rounded_value - avp_length) * 2)
+        return diameterEncoder.encodeAvp(avp_code, int(str(avp_flags), 16), bytes.fromhex(avp_content)).hex()
 
-        avp = str(avp_code) + str(avp_flags) + str(format(avp_length,"x").zfill(6)) + str(avp_content) + str(avp_padding)
-        return avp
-
-    #Generates an AVP with inputs provided (AVP Code, AVP Flags, AVP Content, Padding)
+    #Generates a Vendor AVP with inputs provided (AVP Code, AVP Flags, Vendor ID, AVP Content), padded to a multiple of 4 bytes
     #AVP content must already be in HEX - This can be done with binascii.hexlify(avp_content.encode())
     def generate_vendor_avp(self, avp_code, avp_flags, avp_vendorid, avp_content):
-        avp_code = format(avp_code,"x").zfill(8)
-        
-        avp_length = 1 ##This is a placeholder that gets overwritten later
-
-        avp_vendorid = format(int(avp_vendorid),"x").zfill(8)
-        
-        #AVP Must always be a multiple of 4 - Round up to nearest multiple of 4 and fill remaining bits with padding
-        avp = str(avp_code) + str(avp_flags) + str("000000") + str(avp_vendorid) + str(avp_content)
-        avp_length = int(len(avp)/2)
-
-        if avp_length % 4  == 0:    #Multiple of 4 - No Padding needed
-            avp_padding = ''
-        else:                       #Not multiple of 4 - Padding needed
-            rounded_value = self.myround(avp_length)
-            self.logTool.log(service='HSS', level='debug', message="Rounded value is " + str(rounded_value), redisClient=self.redisMessaging)
-            self.logTool.log(service='HSS', level='debug', message="Has " + str( int( rounded_value - avp_length)) + " bytes of padding", redisClient=self.redisMessaging)
-            avp_padding = format(0,"x").zfill(int( rounded_value - avp_length) * 2)
-
-
-        
-        avp = str(avp_code) + str(avp_flags) + str(format(avp_length,"x").zfill(6)) + str(avp_vendorid) + str(avp_content) + str(avp_padding)
-        return avp
+        return diameterEncoder.encodeAvp(avp_code, int(str(avp_flags), 16), bytes.fromhex(avp_content), vendorId=int(avp_vendorid)).hex()
 
     def generate_diameter_packet(self, packet_version, packet_flags, packet_command_code, packet_application_id, packet_hop_by_hop_id, packet_end_to_end_id, avp):
         try:
-            packet_length = 228
-            packet_length = format(packet_length,"x").zfill(6)
-        
-            packet_command_code = format(packet_command_code,"x").zfill(6)
-            
-            packet_application_id = format(packet_application_id,"x").zfill(8)
-            
-            packet_hex = packet_version + packet_length + packet_flags + packet_command_code + packet_application_id + packet_hop_by_hop_id + packet_end_to_end_id + avp
-            packet_length = int(round(len(packet_hex))/2)
-            packet_length = format(packet_length,"x").zfill(6)
-            
-            packet_hex = packet_version + packet_length + packet_flags + packet_command_code + packet_application_id + packet_hop_by_hop_id + packet_end_to_end_id + avp
-            return packet_hex
+            return diameterEncoder.encodePacket(int(packet_flags, 16), int(packet_command_code), int(packet_application_id), int(packet_hop_by_hop_id, 16), int(packet_end_to_end_id, 16), bytes.fromhex(avp), version=int(packet_version, 16)).hex()
         except Exception as e:
             self.logTool.log(service='HSS', level='error', message=f"[diameter.py] [generate_diameter_packet] Exception: {e}", redisClient=self.redisMessaging)
 
@@ -448,7 +441,12 @@ class Diameter:
     def decode_diameter_packet(self, data):
         """
         Handles decoding of a full diameter packet.
+        Uses the binary decoder unless hss.diameter_decoder is set to 'legacy' in the config.
         """
+        if self.decoderType != 'legacy':
+            header, avps = diameterDecoder.decodePacket(data)
+            return header.toPacketVars(), diameterDecoder.AvpContainer(avps)
+
         packet_vars = {}
         avps = []
 
@@ -481,7 +479,7 @@ class Diameter:
 
         avps = self.decodeAvpPacket(remaining_avps)
 
-        return packet_vars, avps
+        return packet_vars, diameterDecoder.fromLegacyAvps(avps)
 
     def decodeAvpPacket(self, data):
         """
@@ -607,21 +605,6 @@ class Diameter:
 
         return processed_avps
 
-    def get_avp_data(self, avps, avp_code):               
-        #Loops through list of dicts generated by the packet decoder, and returns the data for a specific AVP code in list (May be more than one AVP with same code but different data)
-        misc_data = []
-        for avpObject in avps:
-            if int(avpObject['avp_code']) == int(avp_code):
-                if len(avpObject['misc_data']) == 0:
-                    misc_data.append(avpObject['sub_avps'])
-                else:
-                    misc_data.append(avpObject['misc_data'])
-            if 'sub_avps' in avpObject:
-                for sub_avp in avpObject['sub_avps']:
-                    if int(sub_avp['avp_code']) == int(avp_code):
-                        misc_data.append(sub_avp['misc_data'])
-        return misc_data
-
     def decode_diameter_packet_length(self, data):
         packet_vars = {}
         data = data.hex()
@@ -690,26 +673,16 @@ class Diameter:
             self.logTool.log(service='HSS', level='error', message=f"[diameter.py] [getPeerByHostname] Failed to find peer with hostname {hostname}, {traceback.format_exc()}", redisClient=self.redisMessaging)
             return {}
 
-    def getDiameterMessageType(self, binaryData: str) -> dict:
+    def getDiameterMessageType(self, binaryData: str=None, packetVars: dict=None) -> dict:
         """
         Determines whether a message is a request or a response, and the appropriate acronyms for each type.
+        Pass packetVars from decode_diameter_packet to avoid decoding the message again.
         """
-        packet_vars, avps = self.decode_diameter_packet(binaryData)
-        response = {}
-        
-        for diameterApplication in self.diameterResponseList:
-            try:
-                assert(packet_vars["command_code"] == diameterApplication["commandCode"])
-                assert(packet_vars["ApplicationId"] == diameterApplication["applicationId"])
-                if packet_vars["flags_bin"][0:1] == "1":
-                    response['inbound'] = diameterApplication["requestAcronym"]
-                    response['outbound'] = diameterApplication["responseAcronym"]
-                else:
-                    response['inbound'] = diameterApplication["responseAcronym"]
-                    response['outbound'] = diameterApplication["requestAcronym"]
-                self.logTool.log(service='HSS', level='debug', message=f"[diameter.py] Matched message types: {response}", redisClient=self.redisMessaging)
-            except Exception as e:
-                continue
+        if packetVars is None:
+            packetVars, avps = self.decode_diameter_packet(binaryData)
+        response = dict(self.diameterMessageTypeTable.get((packetVars["ApplicationId"], packetVars["command_code"], packetVars["flags_bin"][0:1] == "1"), {}))
+        if response:
+            self.logTool.log(service='HSS', level='debug', message=f"[diameter.py] Matched message types: {response}", redisClient=self.redisMessaging)
         return response
 
     def sendDiameterRequest(self, requestType: str, hostname: str, **kwargs) -> str:
@@ -740,11 +713,11 @@ class Diameter:
                     return ''
                 outboundQueue = f"diameter-outbound-{peerIp}-{peerPort}"
                 sendTime = time.time_ns()
-                outboundMessage = OutboundData(DestinationIp=peerIp,
-                                                DestinationPort=peerPort,
-                                                InitialReceiveTimestamp=sendTime,
-                                                OutboundHex=request)
-                self.redisMessaging.sendMessage(queue=outboundQueue, message=outboundMessage.model_dump_json(), queueExpiry=self.diameterRequestTimeout, usePrefix=True, prefixHostname=self.hostname, prefixServiceName='diameter')
+                outboundMessage = encodeOutbound(OutboundMessage(DestinationIp=peerIp,
+                                                                 DestinationPort=peerPort,
+                                                                 InitialReceiveTimestamp=sendTime,
+                                                                 Packet=bytes.fromhex(request)), binary=self.binaryMessageFormat)
+                self.redisMessaging.sendMessage(queue=outboundQueue, message=outboundMessage, queueExpiry=self.diameterRequestTimeout, usePrefix=True, prefixHostname=self.hostname, prefixServiceName='diameter')
                 self.logTool.log(service='HSS', level='debug', message=f"[diameter.py] [sendDiameterRequest] [{requestType}] Queueing for host: {hostname} on {peerIp}-{peerPort}", redisClient=self.redisMessaging)
             return request
         except Exception as e:
@@ -782,12 +755,12 @@ class Diameter:
                     outboundQueue = f"diameter-outbound-{peerIp}-{peerPort}"
                     sendTime = time.time_ns()
 
-                    outboundMessage = OutboundData(DestinationIp=peerIp,
-                                                DestinationPort=peerPort,
-                                                InitialReceiveTimestamp=sendTime,
-                                                OutboundHex=request)
+                    outboundMessage = encodeOutbound(OutboundMessage(DestinationIp=peerIp,
+                                                                     DestinationPort=peerPort,
+                                                                     InitialReceiveTimestamp=sendTime,
+                                                                     Packet=bytes.fromhex(request)), binary=self.binaryMessageFormat)
                     
-                    self.redisMessaging.sendMessage(queue=outboundQueue, message=outboundMessage.model_dump_json(), queueExpiry=self.diameterRequestTimeout, usePrefix=True, prefixHostname=self.hostname, prefixServiceName='diameter')
+                    self.redisMessaging.sendMessage(queue=outboundQueue, message=outboundMessage, queueExpiry=self.diameterRequestTimeout, usePrefix=True, prefixHostname=self.hostname, prefixServiceName='diameter')
                     self.logTool.log(service='HSS', level='debug', message=f"[diameter.py] [broadcastDiameterRequest] [{requestType}] Queueing for peer type: {peerType} on {peerIp}-{peerPort}", redisClient=self.redisMessaging)
             return connectedPeerList
         except Exception as e:
@@ -799,14 +772,13 @@ class Diameter:
         Ensures the peer is connected, sends the request, then waits on and returns the response.
         If the timeout is reached, the function fails.
 
-        Diameter lacks a unique identifier for all message types, the closest being Session-ID which exists for most.
-        We attempt to get the associated response given the following logic:
-          - If sessionId is none, attempt to return the first response that matches the expected response method (eg AAA, CEA, etc.) which has a timestamp greater than sendTime.
-          - If sessionId is not none, perform the logic above, and also ensure that sessionId matches.
+        The request is registered under its peer, Hop-by-Hop and End-to-End Identifiers before it's queued.
+        When the Diameter service receives an answer matching a registered request, it pushes the answer to a reply queue for that request instead of diameter-inbound.
+        This method blocks on the reply queue for up to timeout seconds.
 
         Returns an empty string if fails.
 
-        Until diameter.py is rewritten to be asynchronous, this method should be called only when strictly necessary. It potentially adds up to 120ms of delay per invocation.
+        Until diameter.py is rewritten to be asynchronous, this method should be called only when strictly necessary. It blocks until the answer arrives or the timeout is reached.
         """
         try:
             request = ''
@@ -833,71 +805,42 @@ class Diameter:
                 except Exception as e:
                     self.logTool.log(service='HSS', level='error', message=f"[diameter.py] [awaitDiameterRequestAndResponse] [{requestType}] Error generating request: {traceback.format_exc()}", redisClient=self.redisMessaging)
                     return ''
-                responseType = diameterApplication["responseAcronym"]
-                sessionId = kwargs.get('sessionId', None)
                 self.logTool.log(service='HSS', level='debug', message=f"[diameter.py] [awaitDiameterRequestAndResponse] [{requestType}] Successfully generated request: {request}", redisClient=self.redisMessaging)
+                requestBinary = bytes.fromhex(request)
+                # Register the request before it's sent, so the Diameter service can route the answer straight to the reply queue.
+                pendingKey, replyKey = diameterEnvelope.correlationKeys(peerIp, peerPort, requestBinary)
+                self.redisMessaging.setValue(key=pendingKey, value='1', keyExpiry=self.diameterRequestTimeout, usePrefix=True, prefixHostname=self.hostname, prefixServiceName='diameter')
                 sendTime = time.time_ns()
                 outboundQueue = f"diameter-outbound-{peerIp}-{peerPort}"
-                outboundMessage = OutboundData(DestinationIp=peerIp,
-                                                DestinationPort=peerPort,
-                                                InitialReceiveTimestamp=sendTime,
-                                                OutboundHex=request)
-                self.redisMessaging.sendMessage(queue=outboundQueue, message=outboundMessage.model_dump_json(), queueExpiry=self.diameterRequestTimeout, usePrefix=True, prefixHostname=self.hostname, prefixServiceName='diameter')
+                outboundMessage = encodeOutbound(OutboundMessage(DestinationIp=peerIp,
+                                                                 DestinationPort=peerPort,
+                                                                 InitialReceiveTimestamp=sendTime,
+                                                                 Packet=requestBinary), binary=self.binaryMessageFormat)
+                self.redisMessaging.sendMessage(queue=outboundQueue, message=outboundMessage, queueExpiry=self.diameterRequestTimeout, usePrefix=True, prefixHostname=self.hostname, prefixServiceName='diameter')
                 self.logTool.log(service='HSS', level='debug', message=f"[diameter.py] [awaitDiameterRequestAndResponse] [{requestType}] Queueing for host: {hostname} on {peerIp}-{peerPort}", redisClient=self.redisMessaging)
-                startTimer = time.time()
-                while True:
-                    try:
-                        if not time.time() >= startTimer + timeout:
-                            if sessionId is None:
-                                queuedMessages = self.redisMessaging.getList(key=f"diameter-inbound", usePrefix=True, prefixHostname=self.hostname, prefixServiceName='diameter')
-                                self.logTool.log(service='HSS', level='debug', message=f"[diameter.py] [awaitDiameterRequestAndResponse] [{requestType}] queuedMessages(NoSessionId): {queuedMessages}", redisClient=self.redisMessaging)
-                                for queuedMessage in queuedMessages:
-                                    queuedMessage = json.loads(queuedMessage)
-                                    clientAddress = queuedMessage.get('SenderIp', None)
-                                    clientPort = queuedMessage.get('SenderPort', None)
-                                    if clientAddress != peerIp or clientPort != peerPort:
-                                        continue
-                                    messageReceiveTime = queuedMessage.get('InitialReceiveTimestamp', None)
-                                    if float(messageReceiveTime) > sendTime:
-                                        messageHex = queuedMessage.get('InboundHex')
-                                        messageType = self.getDiameterMessageType(messageHex)
-                                        if messageType['inbound'].upper() == responseType.upper():
-                                            self.logTool.log(service='HSS', level='debug', message=f"[diameter.py] [awaitDiameterRequestAndResponse] [{requestType}] Found inbound response: {messageHex}", redisClient=self.redisMessaging)
-                                            return messageHex
-                                time.sleep(0.02)
-                            else:
-                                queuedMessages = self.redisMessaging.getList(key=f"diameter-inbound", usePrefix=True, prefixHostname=self.hostname, prefixServiceName='diameter')
-                                self.logTool.log(service='HSS', level='debug', message=f"[diameter.py] [awaitDiameterRequestAndResponse] [{requestType}] queuedMessages({sessionId}): {queuedMessages} responseType: {responseType}", redisClient=self.redisMessaging)
-                                for queuedMessage in queuedMessages:
-                                    queuedMessage = json.loads(queuedMessage)
-                                    clientAddress = queuedMessage.get('SenderIp', None)
-                                    clientPort = queuedMessage.get('SenderPort', None)
-                                    if clientAddress != peerIp or clientPort != peerPort:
-                                        continue
-                                    messageReceiveTime = queuedMessage.get('InitialReceiveTimestamp', None)
-                                    if float(messageReceiveTime) > sendTime:
-                                        messageHex = queuedMessage.get('InboundHex')
-                                        messageType = self.getDiameterMessageType(messageHex)
-                                        if messageType['inbound'].upper() == responseType.upper():
-                                            packetVars, avps = self.decode_diameter_packet(messageHex)
-                                            messageSessionId = bytes.fromhex(self.get_avp_data(avps, 263)[0]).decode('ascii')
-                                            if messageSessionId == sessionId:
-                                                self.logTool.log(service='HSS', level='debug', message=f"[diameter.py] [awaitDiameterRequestAndResponse] [{requestType}] Matched on Session Id: {sessionId}", redisClient=self.redisMessaging)
-                                                return messageHex
-                                time.sleep(0.02)
-                        else:
-                            return ''
-                    except Exception as e:
-                        self.logTool.log(service='HSS', level='debug', message=f"[diameter.py] [awaitDiameterRequestAndResponse] [{requestType}] Traceback: {traceback.format_exc()}", redisClient=self.redisMessaging)
-                        return ''
+
+                replyMessage = self.redisMessaging.awaitMessage(key=replyKey, decodeMessage=False, timeout=timeout, usePrefix=True, prefixHostname=self.hostname, prefixServiceName='diameter')
+                if not replyMessage:
+                    self.redisMessaging.deleteQueue(queue=pendingKey, usePrefix=True, prefixHostname=self.hostname, prefixServiceName='diameter')
+                    self.logTool.log(service='HSS', level='debug', message=f"[diameter.py] [awaitDiameterRequestAndResponse] [{requestType}] Timed out waiting for answer on {replyKey}", redisClient=self.redisMessaging)
+                    return ''
+                messageHex = decodeInbound(replyMessage[1]).Packet.hex()
+                self.logTool.log(service='HSS', level='debug', message=f"[diameter.py] [awaitDiameterRequestAndResponse] [{requestType}] Found inbound response: {messageHex}", redisClient=self.redisMessaging)
+                return messageHex
         except Exception as e:
             self.logTool.log(service='HSS', level='error', message=f"[diameter.py] [awaitDiameterRequestAndResponse] [{requestType}] Error generating diameter outbound request: {traceback.format_exc()}", redisClient=self.redisMessaging)
             return ''
 
-    def generateDiameterResponse(self, binaryData: str) -> str:
+    def generateDiameterResponse(self, binaryData: str=None, packetVars: dict=None, avps=None) -> str:
+            """
+            Generates the answer to a diameter request, using the handler registered for its Application Id and Command Code.
+            Pass packetVars and avps from decode_diameter_packet to avoid decoding the message again.
+            """
+            packet_vars = packetVars if packetVars is not None else {}
             try:
-                packet_vars, avps = self.decode_diameter_packet(binaryData)
-                origin_host = self.get_avp_data(avps, 264)[0]
+                if packetVars is None:
+                    packet_vars, avps = self.decode_diameter_packet(binaryData)
+                origin_host = avps.hex(264)
                 origin_host = binascii.unhexlify(origin_host).decode("utf-8")
                 response = ''
 
@@ -921,22 +864,18 @@ class Diameter:
                     prefixHostname=self.hostname, 
                     prefixServiceName='metric')
                 
-                for diameterApplication in self.diameterResponseList:
+                diameterApplication = self.diameterResponseTable.get((packet_vars["ApplicationId"], packet_vars["command_code"], True), None)
+                if diameterApplication is not None and 'flags' in diameterApplication and str(packet_vars["flags"]) != str(diameterApplication["flags"]):
+                    diameterApplication = None
+
+                if diameterApplication is not None:
+                    self.logTool.log(service='HSS', level='debug', message=f"[diameter.py] [generateDiameterResponse] [{diameterApplication.get('requestAcronym', '')}] Attempting to generate response", redisClient=self.redisMessaging)
                     try:
-                        assert(packet_vars["command_code"] == diameterApplication["commandCode"])
-                        assert(packet_vars["ApplicationId"] == diameterApplication["applicationId"])
-                        if 'flags' in diameterApplication:
-                            assert(str(packet_vars["flags"]) == str(diameterApplication["flags"]))
-                        self.logTool.log(service='HSS', level='debug', message=f"[diameter.py] [generateDiameterResponse] [{diameterApplication.get('requestAcronym', '')}] Attempting to generate response", redisClient=self.redisMessaging)
-                        try:
-                            response = diameterApplication["responseMethod"](packet_vars, avps)
-                            self.logTool.log(service='HSS', level='debug', message=f"[diameter.py] [generateDiameterResponse] [{diameterApplication.get('requestAcronym', '')}] Successfully generated response: {response}", redisClient=self.redisMessaging)
-                        except Exception as e:
-                            self.logTool.log(service='HSS', level='error', message=f"[diameter.py] [generateDiameterResponse] [{diameterApplication.get('requestAcronym', '')}] Error generating response: {traceback.format_exc()}", redisClient=self.redisMessaging)
-                            return ''
-                        break
+                        response = diameterApplication["responseMethod"](packet_vars, avps)
+                        self.logTool.log(service='HSS', level='debug', message=f"[diameter.py] [generateDiameterResponse] [{diameterApplication.get('requestAcronym', '')}] Successfully generated response: {response}", redisClient=self.redisMessaging)
                     except Exception as e:
-                        continue
+                        self.logTool.log(service='HSS', level='error', message=f"[diameter.py] [generateDiameterResponse] [{diameterApplication.get('requestAcronym', '')}] Error generating response: {traceback.format_exc()}", redisClient=self.redisMessaging)
+                        return ''
 
                 self.redisMessaging.sendMetric(serviceName='diameter', metricName='prom_diam_response_count_application_id_successful',
                                     metricType='counter', metricAction='inc', 
@@ -954,8 +893,8 @@ class Diameter:
                 self.redisMessaging.sendMetric(serviceName='diameter', metricName='prom_diam_response_count_application_id_fail',
                                                 metricType='counter', metricAction='inc',
                                                 metricLabels={
-                                                    "diameter_application_id": packet_vars["ApplicationId"],
-                                                    "diameter_cmd_code": packet_vars["command_code"],
+                                                    "diameter_application_id": packet_vars.get("ApplicationId", ''),
+                                                    "diameter_cmd_code": packet_vars.get("command_code", ''),
                                                 },
                                                 metricValue=1.0, metricHelp='Number of Failed Diameter Responses',
                                                 metricExpiry=60,
@@ -1140,53 +1079,22 @@ class Diameter:
         """
 
         allowUndefinedNetworks = self.config.get('roaming', {}).get('outbound', {}).get('allow_undefined_networks', True)
-        roamingRules = self.database.GetAll(ROAMING_RULE)
-        subscriberRoamingRules = []
         if assignedRoamingRules:
-            subscriberRoamingRules = assignedRoamingRules.split(',')
-            self.logTool.log(service='HSS', level='debug', message=f"[diameter.py] [validateOutboundRoamingNetwork] Got Subscriber Roaming Rules: {subscriberRoamingRules}", redisClient=self.redisMessaging)
-
-        """
-        Iterate over every roaming rule, and it's reference roaming network.
-        If the network that it refers to matches the supplied mcc and mnc to this function,
-        then apply the rule action (allow/deny).
-        """
-
-        for subscriberRoamingRule in subscriberRoamingRules:
-            for roamingRule in roamingRules:
-                if str(roamingRule.get('roaming_rule_id')) != str(subscriberRoamingRule):
-                    continue
-                roamingNetworkId = roamingRule.get('roaming_network_id')
-                roamingNetwork = self.database.GetObj(ROAMING_NETWORK, roamingNetworkId)
-                allowNetwork = roamingRule.get('allow', True)
-                if roamingNetwork:
-                    if str(roamingNetwork.get('mcc')) == str(mcc) and str(roamingNetwork.get('mnc')) == str(mnc):
-                        if allowNetwork:
-                            self.logTool.log(service='HSS', level='debug', message=f"[diameter.py] [validateOutboundRoamingNetwork] Subscriber Roaming Rule for PLMN: {mcc}{mnc} is Allowed", redisClient=self.redisMessaging)
-                            return True
-                        else:
-                            self.logTool.log(service='HSS', level='debug', message=f"[diameter.py] [validateOutboundRoamingNetwork] Subscriber Roaming Rule for PLMN: {mcc}{mnc} is Not Allowed", redisClient=self.redisMessaging)
-                            return False
+            self.logTool.log(service='HSS', level='debug', message=f"[diameter.py] [validateOutboundRoamingNetwork] Got Subscriber Roaming Rules: {assignedRoamingRules.split(',')}", redisClient=self.redisMessaging)
 
         """
-        Iterate over every roaming rule, and it's reference roaming network.
-        If the network that it refers to matches the supplied mcc and mnc to this function,
-        then apply the rule action (allow/deny).
-        This acts as a blanket roaming rule if we haven't matched on the subscriber-specific rule.
+        The subscriber's assigned rules are checked first, in order.
+        If none of them match the network, the first roaming rule for the network
+        acts as a blanket rule of last resort.
         """
 
-        for roamingRule in roamingRules:
-            roamingNetworkId = roamingRule.get('roaming_network_id')
-            roamingNetwork = self.database.GetObj(ROAMING_NETWORK, roamingNetworkId)
-            allowNetwork = roamingRule.get('allow', True)
-            if roamingNetwork:
-                if str(roamingNetwork.get('mcc')) == str(mcc) and str(roamingNetwork.get('mnc')) == str(mnc):
-                    if allowNetwork:
-                        self.logTool.log(service='HSS', level='debug', message=f"[diameter.py] [validateOutboundRoamingNetwork] Fallback Roaming Rule for PLMN: {mcc}{mnc} is Allowed", redisClient=self.redisMessaging)
-                        return True
-                    else:
-                        self.logTool.log(service='HSS', level='debug', message=f"[diameter.py] [validateOutboundRoamingNetwork] Fallback Subscriber Roaming Rule for PLMN: {mcc}{mnc} is Not Allowed", redisClient=self.redisMessaging)
-                        return False
+        allowNetwork, ruleSource = self.database.Get_Roaming_Policy().evaluate(assignedRoamingRules=assignedRoamingRules, mcc=mcc, mnc=mnc)
+        if ruleSource == 'subscriber':
+            self.logTool.log(service='HSS', level='debug', message=f"[diameter.py] [validateOutboundRoamingNetwork] Subscriber Roaming Rule for PLMN: {mcc}{mnc} is {'Allowed' if allowNetwork else 'Not Allowed'}", redisClient=self.redisMessaging)
+            return allowNetwork
+        if ruleSource == 'network':
+            self.logTool.log(service='HSS', level='debug', message=f"[diameter.py] [validateOutboundRoamingNetwork] Fallback Roaming Rule for PLMN: {mcc}{mnc} is {'Allowed' if allowNetwork else 'Not Allowed'}", redisClient=self.redisMessaging)
+            return allowNetwork
 
         """
         By this point we haven't matched on any rules.
@@ -1220,12 +1128,11 @@ class Diameter:
         return True
 
     def AVP_278_Origin_State_Incriment(self, avps):                                               #Capabilities Exchange Answer incriment AVP body
-        for avp_dicts in avps:
-            if avp_dicts['avp_code'] == 278:
-                origin_state_incriment_int = int(avp_dicts['misc_data'], 16)
-                origin_state_incriment_int = origin_state_incriment_int + 1
-                origin_state_incriment_hex = format(origin_state_incriment_int,"x").zfill(8)
-                return origin_state_incriment_hex
+        if 278 in avps:
+            origin_state_incriment_int = avps.unsigned32(278)
+            origin_state_incriment_int = origin_state_incriment_int + 1
+            origin_state_incriment_hex = format(origin_state_incriment_int,"x").zfill(8)
+            return origin_state_incriment_hex
 
     def Match_SDP(self, regexPattern, sdpBody):
         """
@@ -1394,37 +1301,12 @@ class Diameter:
     #Capabilities Exchange Answer
     def Answer_257(self, packet_vars, avps):
         avp = ''                                                                                    #Initiate empty var AVP 
-        avp += self.generate_avp(268, 40, self.int_to_hex(2001, 4))                                 #Result Code (DIAMETER_SUCCESS (2001))
-        avp += self.generate_avp(264, 40, self.OriginHost)                                          #Origin Host
-        avp += self.generate_avp(296, 40, self.OriginRealm)                                         #Origin Realm
-        for avps_to_check in avps:                                                                  #Only include AVP 278 (Origin State) if inital request included it
-            if avps_to_check['avp_code'] == 278:
-                avp += self.generate_avp(278, 40, self.AVP_278_Origin_State_Incriment(avps))        #Origin State (Has to be incrimented (Handled by AVP_278_Origin_State_Incriment))
-        for host in self.config['hss']['bind_ip']:                                                  #Loop through all IPs from Config and add to response
-            avp += self.generate_avp(257, 40, self.ip_to_hex(host))                                 #Host-IP-Address (For this to work on Linux this is the IP defined in the hostsfile for localhost)
-        avp += self.generate_avp(266, 40, "00000000")                                               #Vendor-Id
-        avp += self.generate_avp(269, "00", self.ProductName)                                       #Product-Name
-
-        avp += self.generate_avp(267, "00", "000027d9")                                               #Firmware-Revision
-        avp += self.generate_avp(265, 40, format(int(10415),"x").zfill(8))                               #Supported-Vendor-ID (3GPP)
-        avp += self.generate_avp(260, 40, "000001024000000c" + format(int(16777251),"x").zfill(8) +  "0000010a4000000c000028af")      #Vendor-Specific-Application-ID (S6a)
-        avp += self.generate_avp(265, 40, format(int(10415),"x").zfill(8))                               #Supported-Vendor-ID (3GPP)        
-        avp += self.generate_avp(260, 40, "000001024000000c" + format(int(16777216),"x").zfill(8) +  "0000010a4000000c000028af")      #Vendor-Specific-Application-ID (Cx)
-        avp += self.generate_avp(265, 40, format(int(10415),"x").zfill(8))                               #Supported-Vendor-ID (3GPP)        
-        avp += self.generate_avp(260, 40, "000001024000000c" + format(int(16777252),"x").zfill(8) +  "0000010a4000000c000028af")      #Vendor-Specific-Application-ID (S13)
-        avp += self.generate_avp(265, 40, format(int(10415),"x").zfill(8))                               #Supported-Vendor-ID (3GPP)        
-        avp += self.generate_avp(260, 40, "000001024000000c" + format(int(16777291),"x").zfill(8) +  "0000010a4000000c000028af")      #Vendor-Specific-Application-ID (SLh)
-        avp += self.generate_avp(265, 40, format(int(10415),"x").zfill(8))                               #Supported-Vendor-ID (3GPP)
-        avp += self.generate_avp(260, 40, "000001024000000c" + format(int(16777217),"x").zfill(8) +  "0000010a4000000c000028af")      #Vendor-Specific-Application-ID (Sh)       
-        avp += self.generate_avp(265, 40, format(int(10415),"x").zfill(8))                               #Supported-Vendor-ID (3GPP)
-        avp += self.generate_avp(260, 40, "000001024000000c" + format(int(16777236),"x").zfill(8) +  "0000010a4000000c000028af")      #Vendor-Specific-Application-ID (Rx)
-        avp += self.generate_avp(265, 40, format(int(10415),"x").zfill(8))                               #Supported-Vendor-ID (3GPP)
-        avp += self.generate_avp(260, 40, "000001024000000c" + format(int(16777238),"x").zfill(8) +  "0000010a4000000c000028af")      #Vendor-Specific-Application-ID (Gx)
-        avp += self.generate_avp(258, 40, format(int(16777238),"x").zfill(8))                            #Auth-Application-ID - Diameter Gx
-        avp += self.generate_avp(258, 40, format(int(10),"x").zfill(8))                                  #Auth-Application-ID - Diameter CER
-        avp += self.generate_avp(265, 40, format(int(5535),"x").zfill(8))                                #Supported-Vendor-ID (3GGP v2)
-        avp += self.generate_avp(265, 40, format(int(10415),"x").zfill(8))                               #Supported-Vendor-ID (3GPP)
-        avp += self.generate_avp(265, 40, format(int(13019),"x").zfill(8))                               #Supported-Vendor-ID 13019 (ETSI)
+        avp += self.resultCodeSuccessAvp                                 #Result Code (DIAMETER_SUCCESS (2001))
+        avp += self.originHostAvp                                          #Origin Host
+        avp += self.originRealmAvp                                         #Origin Realm
+        if 278 in avps:                                                                             #Only include AVP 278 (Origin State) if inital request included it
+            avp += self.generate_avp(278, 40, self.AVP_278_Origin_State_Incriment(avps))            #Origin State (Has to be incrimented (Handled by AVP_278_Origin_State_Incriment))
+        avp += self.capabilitiesExchangeAvps                                                        #Host-IP-Address, Vendor-Id, Product-Name, Firmware-Revision, Supported-Vendor-Ids and Application-Ids
 
         response = self.generate_diameter_packet("01", "00", 257, 0, packet_vars['hop-by-hop-identifier'], packet_vars['end-to-end-identifier'], avp)            #Generate Diameter packet       
         self.logTool.log(service='HSS', level='debug', message="Successfully Generated CEA", redisClient=self.redisMessaging)
@@ -1433,12 +1315,11 @@ class Diameter:
     #Device Watchdog Answer                                                 
     def Answer_280(self, packet_vars, avps): 
         avp = ''                                                                                    #Initiate empty var AVP 
-        avp += self.generate_avp(268, 40, self.int_to_hex(2001, 4))                                           #Result Code (DIAMETER_SUCCESS (2001))
-        avp += self.generate_avp(264, 40, self.OriginHost)                                                    #Origin Host
-        avp += self.generate_avp(296, 40, self.OriginRealm)                                                   #Origin Realm
-        for avps_to_check in avps:                                                                  #Only include AVP 278 (Origin State) if inital request included it
-            if avps_to_check['avp_code'] == 278:                                
-                avp += self.generate_avp(278, 40, self.AVP_278_Origin_State_Incriment(avps))                  #Origin State (Has to be incrimented (Handled by AVP_278_Origin_State_Incriment))
+        avp += self.resultCodeSuccessAvp                                           #Result Code (DIAMETER_SUCCESS (2001))
+        avp += self.originHostAvp                                                    #Origin Host
+        avp += self.originRealmAvp                                                   #Origin Realm
+        if 278 in avps:                                                                             #Only include AVP 278 (Origin State) if inital request included it
+            avp += self.generate_avp(278, 40, self.AVP_278_Origin_State_Incriment(avps))                      #Origin State (Has to be incrimented (Handled by AVP_278_Origin_State_Incriment))
         response = self.generate_diameter_packet("01", "00", 280, 0, packet_vars['hop-by-hop-identifier'], packet_vars['end-to-end-identifier'], avp)            #Generate Diameter packet      
         self.logTool.log(service='HSS', level='debug', message="Successfully Generated DWA", redisClient=self.redisMessaging)
         return response
@@ -1446,9 +1327,9 @@ class Diameter:
     #Disconnect Peer Answer    
     def Answer_282(self, packet_vars, avps):                                                      
         avp = ''                                                                                    #Initiate empty var AVP 
-        avp += self.generate_avp(264, 40, self.OriginHost)                                                    #Origin Host
-        avp += self.generate_avp(296, 40, self.OriginRealm)                                                   #Origin Realm
-        avp += self.generate_avp(268, 40, "000007d1")                                                    #Result Code (DIAMETER_SUCCESS (2001))
+        avp += self.originHostAvp                                                    #Origin Host
+        avp += self.originRealmAvp                                                   #Origin Realm
+        avp += self.resultCodeSuccessAvp                                                    #Result Code (DIAMETER_SUCCESS (2001))
         response = self.generate_diameter_packet("01", "00", 282, 0, packet_vars['hop-by-hop-identifier'], packet_vars['end-to-end-identifier'], avp)            #Generate Diameter packet
         self.logTool.log(service='HSS', level='debug', message="Successfully Generated DPA", redisClient=self.redisMessaging)
         return response
@@ -1456,27 +1337,20 @@ class Diameter:
     #3GPP S6a/S6d Update Location Answer
     def Answer_16777251_316(self, packet_vars, avps):
         avp = ''                                                                                    #Initiate empty var AVP
-        session_id = self.get_avp_data(avps, 263)[0]                                                     #Get Session-ID
+        session_id = avps.hex(263)                                                     #Get Session-ID
         avp += self.generate_avp(263, 40, session_id)                                                    #Session-ID AVP set
-        avp += self.generate_avp(264, 40, self.OriginHost)                                                    #Origin Host
-        avp += self.generate_avp(296, 40, self.OriginRealm)                                                   #Origin Realm
+        avp += self.originHostAvp                                                    #Origin Host
+        avp += self.originRealmAvp                                                   #Origin Realm
 
         #AVP: Vendor-Specific-Application-Id(260) l=32 f=-M-
-        VendorSpecificApplicationId = ''
-        VendorSpecificApplicationId += self.generate_vendor_avp(266, 40, 10415, '')                     #AVP Vendor ID
-        VendorSpecificApplicationId += self.generate_avp(258, 40, format(int(16777251),"x").zfill(8))   #Auth-Application-ID Relay
-        avp += self.generate_avp(260, 40, VendorSpecificApplicationId)                                  #AVP: Auth-Application-Id(258) l=12 f=-M- val=3GPP S6a/S6d (16777251)  
+        avp += self.vendorSpecificApplicationIdAvps[16777251]                                         #Vendor-Specific-Application-ID
 
         #AVP: Supported-Features(628) l=36 f=V-- vnd=TGPP
-        SupportedFeatures = ''
-        SupportedFeatures += self.generate_vendor_avp(266, 40, 10415, '')                     #AVP Vendor ID
-        SupportedFeatures += self.generate_vendor_avp(629, 80, 10415, self.int_to_hex(1, 4))  #Feature-List ID
-        SupportedFeatures += self.generate_vendor_avp(630, 80, 10415, "1c000607")             #Feature-List Flags
-        avp += self.generate_vendor_avp(628, "80", 10415, SupportedFeatures)                  #Supported-Features(628) l=36 f=V-- vnd=TGPP
+        avp += self.s6aSupportedFeaturesAvp                                                  #Supported-Features(628) l=36 f=V-- vnd=TGPP
 
         #APNs from DB
         APN_Configuration = ''
-        imsi = self.get_avp_data(avps, 1)[0]                                                            #Get IMSI from User-Name AVP in request
+        imsi = avps.hex(1)                                                            #Get IMSI from User-Name AVP in request
         imsi = binascii.unhexlify(imsi).decode('utf-8')                                                  #Convert IMSI
         try:
             subscriber_details = self.database.Get_Subscriber(imsi=imsi)                                               #Get subscriber details
@@ -1488,10 +1362,10 @@ class Diameter:
                 #Experimental Result AVP(Response Code for Failure)
                 avp_experimental_result = ''
                 avp_experimental_result += self.generate_vendor_avp(266, 40, 10415, '')                         #AVP Vendor ID
-                avp_experimental_result += self.generate_avp(298, 40, self.int_to_hex(5001, 4), avps=avps, packet_vars=packet_vars)                 #AVP Experimental-Result-Code: DIAMETER_ERROR_USER_UNKNOWN (5001)
+                avp_experimental_result += self.generate_avp(298, 40, self.int_to_hex(5001, 4))                 #AVP Experimental-Result-Code: DIAMETER_ERROR_USER_UNKNOWN (5001)
                 avp += self.generate_avp(297, 40, avp_experimental_result)                                      #AVP Experimental-Result(297)
                 
-                avp += self.generate_avp(277, 40, "00000001")                                                   #Auth-Session-State
+                avp += self.authSessionStateAvp                                                   #Auth-Session-State
                 self.logTool.log(service='HSS', level='debug', message=f"Successfully Generated ULA for disabled Subscriber: {imsi}", redisClient=self.redisMessaging)
                 response = self.generate_diameter_packet("01", "40", 316, 16777251, packet_vars['hop-by-hop-identifier'], packet_vars['end-to-end-identifier'], avp)
                 return response
@@ -1510,7 +1384,7 @@ class Diameter:
             raise
 
         try:
-            plmn = self.get_avp_data(avps, 1407)[0]                                                          #Visited-PLMN-ID
+            plmn = avps.hex(1407)                                                          #Visited-PLMN-ID
             decodedPlmn = self.DecodePLMN(plmn=plmn)
             mcc = decodedPlmn[0]
             mnc = decodedPlmn[1]
@@ -1525,10 +1399,10 @@ class Diameter:
 
             if not subscriberRoamingAllowed and subscriberIsRoaming:
                 avp = ''
-                session_id = self.get_avp_data(avps, 263)[0]                                                     #Get Session-ID
+                session_id = avps.hex(263)                                                     #Get Session-ID
                 avp += self.generate_avp(263, 40, session_id)                                                    #Session-ID AVP set
-                avp += self.generate_avp(264, 40, self.OriginHost)                                                    #Origin Host
-                avp += self.generate_avp(296, 40, self.OriginRealm)                                                   #Origin Realm
+                avp += self.originHostAvp                                                    #Origin Host
+                avp += self.originRealmAvp                                                   #Origin Realm
 
                 #Experimental Result AVP(Parent AVP for Roaming Failure)
                 avp_experimental_result = ''
@@ -1536,7 +1410,7 @@ class Diameter:
                 avp_experimental_result += self.generate_avp(298, 40, self.int_to_hex(5004, 4))                 #AVP Experimental-Result-Code: DIAMETER_ERROR_ROAMING_NOT_ALLOWED (5004)
                 avp += self.generate_avp(297, 40, avp_experimental_result)                                      #AVP Experimental-Result(297)
                 
-                avp += self.generate_avp(277, 40, "00000001")                                                    #Auth-Session-State
+                avp += self.authSessionStateAvp                                                    #Auth-Session-State
                 avp += self.generate_avp(260, 40, "000001024000000c" + format(int(16777251),"x").zfill(8) +  "0000010a4000000c000028af")      #Vendor-Specific-Application-ID (S6a)
                 response = self.generate_diameter_packet("01", "40", 318, 16777251, packet_vars['hop-by-hop-identifier'], packet_vars['end-to-end-identifier'], avp)     #Generate Diameter packet
                 return response
@@ -1547,15 +1421,15 @@ class Diameter:
             self.logTool.log(service='HSS', level='error', message=f"[diameter.py] [Answer_16777251_318] [AIA] Error when validating subscriber roaming: {traceback.format_exc()}", redisClient=self.redisMessaging)
 
         #Store MME Location into Database
-        OriginHost = self.get_avp_data(avps, 264)[0]                          #Get OriginHost from AVP
+        OriginHost = avps.hex(264)                          #Get OriginHost from AVP
         OriginHost = binascii.unhexlify(OriginHost).decode('utf-8')      #Format it
-        OriginRealm = self.get_avp_data(avps, 296)[0]                          #Get OriginRealm from AVP
+        OriginRealm = avps.hex(296)                          #Get OriginRealm from AVP
         OriginRealm = binascii.unhexlify(OriginRealm).decode('utf-8')      #Format it
         self.logTool.log(service='HSS', level='debug', message="Subscriber is served by MME " + str(OriginHost) + " at realm " + str(OriginRealm), redisClient=self.redisMessaging)
 
         #Find Remote Peer we need to address CLRs through
         try:        #Check if we have a record-route set as that's where we'll need to send the response
-            remote_peer = self.get_avp_data(avps, 282)[-1]                          #Get first record-route header
+            remote_peer = avps.all(282)[-1].hex()                          #Get first record-route header
             remote_peer = binascii.unhexlify(remote_peer).decode('utf-8')           #Format it
         except:     #If we don't have a record-route set, we'll send the response to the OriginHost
             remote_peer = OriginHost
@@ -1565,8 +1439,8 @@ class Diameter:
         self.database.Update_Serving_MME(imsi=imsi, serving_mme=OriginHost, serving_mme_peer=remote_peer, serving_mme_realm=OriginRealm)
 
         #Boilerplate AVPs
-        avp += self.generate_avp(268, 40, self.int_to_hex(2001, 4))                                      #Result Code (DIAMETER_SUCCESS (2001))
-        avp += self.generate_avp(277, 40, "00000001")                                                    #Auth-Session-State    
+        avp += self.resultCodeSuccessAvp                                      #Result Code (DIAMETER_SUCCESS (2001))
+        avp += self.authSessionStateAvp                                                    #Auth-Session-State    
         avp += self.generate_vendor_avp(1406, "c0", 10415, "00000001")                                   #ULA Flags
 
         #Subscription Data: 
@@ -1766,19 +1640,19 @@ class Diameter:
     #3GPP S6a/S6d Authentication Information Answer
     def Answer_16777251_318(self, packet_vars, avps):
         self.logTool.log(service='HSS', level='debug', message=f"AIA AVPS: {avps}", redisClient=self.redisMessaging)
-        imsi = self.get_avp_data(avps, 1)[0]                                                             #Get IMSI from User-Name AVP in request
+        imsi = avps.hex(1)                                                             #Get IMSI from User-Name AVP in request
         imsi = binascii.unhexlify(imsi).decode('utf-8')                                                  #Convert IMSI
-        plmn = self.get_avp_data(avps, 1407)[0]                                                          #Get PLMN from User-Name AVP in request
+        plmn = avps.hex(1407)                                                          #Get PLMN from User-Name AVP in request
 
         try:
             subscriber_details = self.database.Get_Subscriber(imsi=imsi)                                               #Get subscriber details
             if subscriber_details['enabled'] == 0:
                 self.logTool.log(service='HSS', level='debug', message=f"Subscriber {imsi} is disabled", redisClient=self.redisMessaging)
                 avp = ''
-                session_id = self.get_avp_data(avps, 263)[0]                                                     #Get Session-ID
+                session_id = avps.hex(263)                                                     #Get Session-ID
                 avp += self.generate_avp(263, 40, session_id)                                                    #Session-ID AVP set
-                avp += self.generate_avp(264, 40, self.OriginHost)                                                    #Origin Host
-                avp += self.generate_avp(296, 40, self.OriginRealm)                                                   #Origin Realm
+                avp += self.originHostAvp                                                    #Origin Host
+                avp += self.originRealmAvp                                                   #Origin Realm
                 self.redisMessaging.sendMetric(serviceName='diameter', metricName='prom_diam_auth_event_count',
                                 metricType='counter', metricAction='inc', 
                                 metricValue=1.0, 
@@ -1799,7 +1673,7 @@ class Diameter:
                 avp_experimental_result += self.generate_avp(298, 40, self.int_to_hex(5001, 4))                 #AVP Experimental-Result-Code: DIAMETER_ERROR_USER_UNKNOWN (5001)
                 avp += self.generate_avp(297, 40, avp_experimental_result)                                      #AVP Experimental-Result(297)
                 
-                avp += self.generate_avp(277, 40, "00000001")                                                    #Auth-Session-State
+                avp += self.authSessionStateAvp                                                    #Auth-Session-State
                 avp += self.generate_avp(260, 40, "000001024000000c" + format(int(16777251),"x").zfill(8) +  "0000010a4000000c000028af")      #Vendor-Specific-Application-ID (S6a)
                 response = self.generate_diameter_packet("01", "40", 318, 16777251, packet_vars['hop-by-hop-identifier'], packet_vars['end-to-end-identifier'], avp)     #Generate Diameter packet
                 self.logTool.log(service='HSS', level='debug', message=f"Successfully Generated AIA for disabled Subscriber: {imsi}", redisClient=self.redisMessaging)
@@ -1833,10 +1707,10 @@ class Diameter:
             #Handle if the subscriber is not present in HSS return "DIAMETER_ERROR_USER_UNKNOWN"
             self.logTool.log(service='HSS', level='debug', message="Subscriber " + str(imsi) + " is unknown in database", redisClient=self.redisMessaging)
             avp = ''
-            session_id = self.get_avp_data(avps, 263)[0]                                                     #Get Session-ID
+            session_id = avps.hex(263)                                                     #Get Session-ID
             avp += self.generate_avp(263, 40, session_id)                                                    #Session-ID AVP set
-            avp += self.generate_avp(264, 40, self.OriginHost)                                                    #Origin Host
-            avp += self.generate_avp(296, 40, self.OriginRealm)                                                   #Origin Realm
+            avp += self.originHostAvp                                                    #Origin Host
+            avp += self.originRealmAvp                                                   #Origin Realm
 
             #Experimental Result AVP(Response Code for Failure)
             avp_experimental_result = ''
@@ -1844,7 +1718,7 @@ class Diameter:
             avp_experimental_result += self.generate_avp(298, 40, self.int_to_hex(5001, 4))                 #AVP Experimental-Result-Code: DIAMETER_ERROR_USER_UNKNOWN (5001)
             avp += self.generate_avp(297, 40, avp_experimental_result)                                      #AVP Experimental-Result(297)
             
-            avp += self.generate_avp(277, 40, "00000001")                                                    #Auth-Session-State
+            avp += self.authSessionStateAvp                                                    #Auth-Session-State
             avp += self.generate_avp(260, 40, "000001024000000c" + format(int(16777251),"x").zfill(8) +  "0000010a4000000c000028af")      #Vendor-Specific-Application-ID (S6a)
             response = self.generate_diameter_packet("01", "40", 318, 16777251, packet_vars['hop-by-hop-identifier'], packet_vars['end-to-end-identifier'], avp)     #Generate Diameter packet
             return response
@@ -1868,10 +1742,10 @@ class Diameter:
 
             if not subscriberRoamingAllowed and subscriberIsRoaming:
                 avp = ''
-                session_id = self.get_avp_data(avps, 263)[0]                                                     #Get Session-ID
+                session_id = avps.hex(263)                                                     #Get Session-ID
                 avp += self.generate_avp(263, 40, session_id)                                                    #Session-ID AVP set
-                avp += self.generate_avp(264, 40, self.OriginHost)                                                    #Origin Host
-                avp += self.generate_avp(296, 40, self.OriginRealm)                                                   #Origin Realm
+                avp += self.originHostAvp                                                    #Origin Host
+                avp += self.originRealmAvp                                                   #Origin Realm
 
                 #Experimental Result AVP(Parent AVP for Roaming Failure)
                 avp_experimental_result = ''
@@ -1879,7 +1753,7 @@ class Diameter:
                 avp_experimental_result += self.generate_avp(298, 40, self.int_to_hex(5004, 4))                 #AVP Experimental-Result-Code: DIAMETER_ERROR_ROAMING_NOT_ALLOWED (5004)
                 avp += self.generate_avp(297, 40, avp_experimental_result)                                      #AVP Experimental-Result(297)
                 
-                avp += self.generate_avp(277, 40, "00000001")                                                    #Auth-Session-State
+                avp += self.authSessionStateAvp                                                    #Auth-Session-State
                 avp += self.generate_avp(260, 40, "000001024000000c" + format(int(16777251),"x").zfill(8) +  "0000010a4000000c000028af")      #Vendor-Specific-Application-ID (S6a)
                 response = self.generate_diameter_packet("01", "40", 318, 16777251, packet_vars['hop-by-hop-identifier'], packet_vars['end-to-end-identifier'], avp)     #Generate Diameter packet
                 return response
@@ -1892,15 +1766,15 @@ class Diameter:
 
         try:
             requested_vectors = 1
-            EUTRAN_Authentication_Info = self.get_avp_data(avps, 1408)
+            resynced = False
+            EUTRAN_Authentication_Info = avps.first(1408)
             self.logTool.log(service='HSS', level='debug', message=f"authInfo: {EUTRAN_Authentication_Info}", redisClient=self.redisMessaging)
-            if len(EUTRAN_Authentication_Info) > 0:
-                EUTRAN_Authentication_Info = EUTRAN_Authentication_Info[0]
+            if EUTRAN_Authentication_Info is not None:
                 self.logTool.log(service='HSS', level='debug', message="AVP: Requested-EUTRAN-Authentication-Info(1408) l=44 f=VM- vnd=TGPP", redisClient=self.redisMessaging)
                 self.logTool.log(service='HSS', level='debug', message="EUTRAN_Authentication_Info is " + str(EUTRAN_Authentication_Info), redisClient=self.redisMessaging)
-                for sub_avp in EUTRAN_Authentication_Info:
+                for sub_avp in EUTRAN_Authentication_Info.children:
                     #If resync request
-                    if sub_avp['avp_code'] == 1411:
+                    if sub_avp.code == 1411:
                         self.logTool.log(service='HSS', level='debug', message="Re-Synchronization required - SQN is out of sync", redisClient=self.redisMessaging)
                         self.redisMessaging.sendMetric(serviceName='diameter', metricName='prom_diam_auth_event_count',
                                                         metricType='counter', metricAction='inc', 
@@ -1915,45 +1789,48 @@ class Diameter:
                                                         usePrefix=True, 
                                                         prefixHostname=self.hostname, 
                                                         prefixServiceName='metric')
-                        auts = str(sub_avp['misc_data'])[32:]
-                        rand = str(sub_avp['misc_data'])[:32]
-                        rand = binascii.unhexlify(rand)
+                        auts = sub_avp.hex()[32:]
+                        rand = sub_avp.octetString()[:16]
                         #Calculate correct SQN
                         self.database.Get_Vectors_AuC(subscriber_details['auc_id'], "sqn_resync", auts=auts, rand=rand)
+                        resynced = True
 
                     #Get number of requested vectors
-                    if sub_avp['avp_code'] == 1410:
-                        self.logTool.log(service='HSS', level='debug', message="Raw value of requested vectors is " + str(sub_avp['misc_data']), redisClient=self.redisMessaging)
-                        requested_vectors = int(sub_avp['misc_data'], 16)
+                    if sub_avp.code == 1410:
+                        self.logTool.log(service='HSS', level='debug', message="Raw value of requested vectors is " + sub_avp.hex(), redisClient=self.redisMessaging)
+                        requested_vectors = sub_avp.unsigned32()
                         if requested_vectors >= 32:
                             self.logTool.log(service='HSS', level='debug', message="Client has requested " + str(requested_vectors) + " vectors, limiting this to 32", redisClient=self.redisMessaging)
                             requested_vectors = 32
 
             self.logTool.log(service='HSS', level='debug', message="Generating " + str(requested_vectors) + " vectors as requested", redisClient=self.redisMessaging)
             eutranvector_complete = ''
-            while requested_vectors != 0:
-                self.logTool.log(service='HSS', level='debug', message="Generating vector number " + str(requested_vectors), redisClient=self.redisMessaging)
-                plmn = self.get_avp_data(avps, 1407)[0]                                                     #Get PLMN from request
-                vector_dict = self.database.Get_Vectors_AuC(subscriber_details['auc_id'], "air", plmn=plmn)
+            plmn = avps.hex(1407)                                                         #Get PLMN from request
+            #Vectors come from the vector pool if enabled, the rest from one AuC read and one SQN reservation, Item-Number 1 has the lowest SQN
+            #After a resync every pooled vector is behind the UE's SQN, so they're all generated from the new SQN
+            if resynced:
+                vector_list = self.database.getEutranVectors(subscriber_details['auc_id'], plmn, requested_vectors)
+            else:
+                vector_list = self.database.takeEutranVectors(subscriber_details['auc_id'], plmn, requested_vectors)
+            for item_number, vector_dict in enumerate(vector_list, start=1):
                 eutranvector = ''                                                                           #This goes into the payload of AVP 10415 (Authentication info)
-                eutranvector += self.generate_vendor_avp(1419, "c0", 10415, self.int_to_hex(requested_vectors, 4))
+                eutranvector += self.generate_vendor_avp(1419, "c0", 10415, self.int_to_hex(item_number, 4))
                 eutranvector += self.generate_vendor_avp(1447, "c0", 10415, vector_dict['rand'])                                #And is made up of other AVPs joined together with RAND
                 eutranvector += self.generate_vendor_avp(1448, "c0", 10415, vector_dict['xres'])                                #XRes
                 eutranvector += self.generate_vendor_avp(1449, "c0", 10415, vector_dict['autn'])                                #AUTN
                 eutranvector += self.generate_vendor_avp(1450, "c0", 10415, vector_dict['kasme'])                               #And KASME
 
-                requested_vectors = requested_vectors - 1
                 eutranvector_complete += self.generate_vendor_avp(1414, "c0", 10415, eutranvector)                         #Put EUTRAN vectors in E-UTRAN-Vector AVP
 
             avp = ''                                                                                    #Initiate empty var AVP
-            session_id = self.get_avp_data(avps, 263)[0]                                                     #Get Session-ID
+            session_id = avps.hex(263)                                                     #Get Session-ID
             avp += self.generate_avp(263, 40, session_id)                                                    #Session-ID AVP set
             avp += self.generate_vendor_avp(1413, "c0", 10415, eutranvector_complete)                                 #Authentication-Info (3GPP)                                      
-            avp += self.generate_avp(264, 40, self.OriginHost)                                                    #Origin Host
-            avp += self.generate_avp(296, 40, self.OriginRealm)                                                   #Origin Realm
-            avp += self.generate_avp(268, 40, self.int_to_hex(2001, 4))                                           #Result Code (DIAMETER_SUCCESS (2001))
-            avp += self.generate_avp(277, 40, "00000001")                                                    #Auth-Session-State
-            avp += self.generate_avp(260, 40, "0000010a4000000c000028af000001024000000c01000023")
+            avp += self.originHostAvp                                                    #Origin Host
+            avp += self.originRealmAvp                                                   #Origin Realm
+            avp += self.resultCodeSuccessAvp                                           #Result Code (DIAMETER_SUCCESS (2001))
+            avp += self.authSessionStateAvp                                                    #Auth-Session-State
+            avp += self.vendorSpecificApplicationIdAvps[16777251]
             #avp += self.generate_avp(260, 40, "000001024000000c" + format(int(16777251),"x").zfill(8) +  "0000010a4000000c000028af")      #Vendor-Specific-Application-ID (S6a)
             
             response = self.generate_diameter_packet("01", "40", 318, 16777251, packet_vars['hop-by-hop-identifier'], packet_vars['end-to-end-identifier'], avp)     #Generate Diameter packet
@@ -1967,28 +1844,24 @@ class Diameter:
     #Purge UE Answer (PUA)
     def Answer_16777251_321(self, packet_vars, avps):
         
-        imsi = self.get_avp_data(avps, 1)[0]                                                             #Get IMSI from User-Name AVP in request
+        imsi = avps.hex(1)                                                             #Get IMSI from User-Name AVP in request
         imsi = binascii.unhexlify(imsi).decode('utf-8')
 
         avp = ''
-        session_id = self.get_avp_data(avps, 263)[0]                                                     #Get Session-ID
+        session_id = avps.hex(263)                                                     #Get Session-ID
         avp += self.generate_avp(263, 40, session_id)                                                    #Session-ID AVP set
-        avp += self.generate_avp(268, 40, self.int_to_hex(2001, 4))                                      #Result Code (DIAMETER_SUCCESS (2001))
+        avp += self.resultCodeSuccessAvp                                      #Result Code (DIAMETER_SUCCESS (2001))
         avp += self.generate_avp(260, 40, "000001024000000c" + format(int(16777251),"x").zfill(8) +  "0000010a4000000c000028af")      #Vendor-Specific-Application-ID (S6a)        
-        avp += self.generate_avp(277, 40, "00000001")                                                    #Auth-Session-State (No state maintained)
+        avp += self.authSessionStateAvp                                                    #Auth-Session-State (No state maintained)
         
-        avp += self.generate_avp(264, 40, self.OriginHost)                                                    #Origin Host
-        avp += self.generate_avp(296, 40, self.OriginRealm)                                                   #Origin Realm
+        avp += self.originHostAvp                                                    #Origin Host
+        avp += self.originRealmAvp                                                   #Origin Realm
 
         #1442 - PUA-Flags
         avp += self.generate_vendor_avp(1442, "c0", 10415, self.int_to_hex(1, 4))
 
         #AVP: Supported-Features(628) l=36 f=V-- vnd=TGPP
-        SupportedFeatures = ''
-        SupportedFeatures += self.generate_vendor_avp(266, 40, 10415, '')                     #AVP Vendor ID
-        SupportedFeatures += self.generate_vendor_avp(629, 80, 10415, self.int_to_hex(1, 4))  #Feature-List ID
-        SupportedFeatures += self.generate_vendor_avp(630, 80, 10415, "1c000607")             #Feature-List Flags
-        avp += self.generate_vendor_avp(628, "80", 10415, SupportedFeatures)                  #Supported-Features(628) l=36 f=V-- vnd=TGPP
+        avp += self.s6aSupportedFeaturesAvp                                                  #Supported-Features(628) l=36 f=V-- vnd=TGPP
 
 
         response = self.generate_diameter_packet("01", "40", 321, 16777251, packet_vars['hop-by-hop-identifier'], packet_vars['end-to-end-identifier'], avp)     #Generate Diameter packet
@@ -2001,14 +1874,14 @@ class Diameter:
     #Notify Answer (NOA)
     def Answer_16777251_323(self, packet_vars, avps):
         avp = ''
-        session_id = self.get_avp_data(avps, 263)[0]                                                     #Get Session-ID
+        session_id = avps.hex(263)                                                     #Get Session-ID
         avp += self.generate_avp(263, 40, session_id)                                                    #Session-ID AVP set
-        avp += self.generate_avp(268, 40, self.int_to_hex(2001, 4))                                      #Result Code (DIAMETER_SUCCESS (2001))
+        avp += self.resultCodeSuccessAvp                                      #Result Code (DIAMETER_SUCCESS (2001))
         avp += self.generate_avp(260, 40, "000001024000000c" + format(int(16777251),"x").zfill(8) +  "0000010a4000000c000028af")      #Vendor-Specific-Application-ID (S6a)        
-        avp += self.generate_avp(277, 40, "00000001")                                                    #Auth-Session-State (No state maintained)
+        avp += self.authSessionStateAvp                                                    #Auth-Session-State (No state maintained)
         
-        avp += self.generate_avp(264, 40, self.OriginHost)                                                    #Origin Host
-        avp += self.generate_avp(296, 40, self.OriginRealm)                                                   #Origin Realm
+        avp += self.originHostAvp                                                    #Origin Host
+        avp += self.originRealmAvp                                                   #Origin Realm
 
         #AVP: Supported-Features(628) l=36 f=V-- vnd=TGPP
         SupportedFeatures = ''
@@ -2022,11 +1895,11 @@ class Diameter:
     #3GPP Gx Credit Control Answer
     def Answer_16777238_272(self, packet_vars, avps):
         try:
-            CC_Request_Type = self.get_avp_data(avps, 416)[0]
-            CC_Request_Number = self.get_avp_data(avps, 415)[0]
+            CC_Request_Type = avps.hex(416)
+            CC_Request_Number = avps.hex(415)
             #Called Station ID
             self.logTool.log(service='HSS', level='debug', message="[diameter.py] [Answer_16777238_272] [CCA] Attempting to find APN in CCR", redisClient=self.redisMessaging)
-            apn = bytes.fromhex(self.get_avp_data(avps, 30)[0]).decode('utf-8')
+            apn = avps.utf8String(30)
             # Strip plmn based domain from apn, if present
             try:
                 if '.' in apn:
@@ -2034,17 +1907,17 @@ class Diameter:
                         assert('mnc' in apn)
                         apn = apn.split('.')[0]
             except Exception as e:
-                apn = bytes.fromhex(self.get_avp_data(avps, 30)[0]).decode('utf-8')
+                apn = avps.utf8String(30)
             self.logTool.log(service='HSS', level='debug', message="[diameter.py] [Answer_16777238_272] [CCA] CCR for APN " + str(apn), redisClient=self.redisMessaging)
 
-            OriginHost = self.get_avp_data(avps, 264)[0]                          #Get OriginHost from AVP
+            OriginHost = avps.hex(264)                          #Get OriginHost from AVP
             OriginHost = binascii.unhexlify(OriginHost).decode('utf-8')      #Format it
 
-            OriginRealm = self.get_avp_data(avps, 296)[0]                          #Get OriginRealm from AVP
+            OriginRealm = avps.hex(296)                          #Get OriginRealm from AVP
             OriginRealm = binascii.unhexlify(OriginRealm).decode('utf-8')      #Format it
 
             try:        #Check if we have a record-route set as that's where we'll need to send the response
-                remote_peer = self.get_avp_data(avps, 282)[-1]                          #Get first record-route header
+                remote_peer = avps.all(282)[-1].hex()                          #Get first record-route header
                 remote_peer = binascii.unhexlify(remote_peer).decode('utf-8')           #Format it
             except:     #If we don't have a record-route set, we'll send the response to the OriginHost
                 remote_peer = OriginHost
@@ -2052,11 +1925,11 @@ class Diameter:
             remote_peer = remote_peer + ";" + str(self.config['hss']['OriginHost'])
 
             avp = ''                                                                                    #Initiate empty var AVP
-            session_id = self.get_avp_data(avps, 263)[0]                                                     #Get Session-ID
+            session_id = avps.hex(263)                                                     #Get Session-ID
             self.logTool.log(service='HSS', level='debug', message="[diameter.py] [Answer_16777238_272] [CCA] Session Id is " + str(binascii.unhexlify(session_id).decode()), redisClient=self.redisMessaging)
             avp += self.generate_avp(263, 40, session_id)                                                    #Session-ID AVP set
-            avp += self.generate_avp(264, 40, self.OriginHost)                                                    #Origin Host
-            avp += self.generate_avp(296, 40, self.OriginRealm)                                                   #Origin Realm
+            avp += self.originHostAvp                                                    #Origin Host
+            avp += self.originRealmAvp                                                   #Origin Realm
             avp += self.generate_avp(258, 40, "01000016")                                                    #Auth-Application-Id (3GPP Gx 16777238)
             avp += self.generate_avp(416, 40, format(int(CC_Request_Type),"x").zfill(8))                     #CC-Request-Type
             avp += self.generate_avp(415, 40, format(int(CC_Request_Number),"x").zfill(8))                   #CC-Request-Number
@@ -2070,15 +1943,13 @@ class Diameter:
                     self.logTool.log(service='HSS', level='debug', message="[diameter.py] [Answer_16777238_272] [CCA] Emergency Credit Control Request (SOS APN)", redisClient=self.redisMessaging)
                     localImsi = None
                     try:
-                        for SubscriptionIdentifier in self.get_avp_data(avps, 443):
-                            for UniqueSubscriptionIdentifier in SubscriptionIdentifier:
-                                if UniqueSubscriptionIdentifier['avp_code'] == 444:
-                                    localImsi = binascii.unhexlify(UniqueSubscriptionIdentifier['misc_data']).decode('utf-8')
-                                    self.logTool.log(service='HSS', level='debug', message=f"[diameter.py] [Answer_16777238_272] [CCA] Got local IMSI: {localImsi}", redisClient=self.redisMessaging)
-                                    subscriberDetails = self.database.Get_Subscriber(imsi=localImsi)
-                                    if not subscriberDetails:
-                                        self.logTool.log(service='HSS', level='debug', message=f"[diameter.py] [Answer_16777238_272] [CCA] Local IMSI {localImsi} not found, treating as Emergency Subscriber", redisClient=self.redisMessaging)
-                                        localImsi = None
+                        for UniqueSubscriptionIdentifier in avps.all('Subscription-Id/Subscription-Id-Data'):
+                            localImsi = UniqueSubscriptionIdentifier.utf8String()
+                            self.logTool.log(service='HSS', level='debug', message=f"[diameter.py] [Answer_16777238_272] [CCA] Got local IMSI: {localImsi}", redisClient=self.redisMessaging)
+                            subscriberDetails = self.database.Get_Subscriber(imsi=localImsi)
+                            if not subscriberDetails:
+                                self.logTool.log(service='HSS', level='debug', message=f"[diameter.py] [Answer_16777238_272] [CCA] Local IMSI {localImsi} not found, treating as Emergency Subscriber", redisClient=self.redisMessaging)
+                                localImsi = None
                     except:
                         localImsi = None
                     if not localImsi:
@@ -2125,36 +1996,34 @@ class Diameter:
                             avp += self.generate_vendor_avp(1016, "80", 10415, QoS_Information)                                         # QOS-Information
 
                             #Supported-Features(628) (Gx feature list)
-                            avp += self.generate_vendor_avp(628, "80", 10415, "0000010a4000000c000028af0000027580000010000028af000000010000027680000010000028af0000000b")
+                            avp += self.gxSupportedFeaturesAvp
 
                             """
                             Store the Emergency Subscriber
                             """
-                            ueIp = self.get_avp_data(avps, 8)[0]
+                            ueIp = avps.hex(8)
                             ueIp = str(self.hex_to_ip(ueIp))
                             try:
                                 #Get the IMSI
-                                for SubscriptionIdentifier in self.get_avp_data(avps, 443):
-                                    for UniqueSubscriptionIdentifier in SubscriptionIdentifier:
-                                        if UniqueSubscriptionIdentifier['avp_code'] == 444:
-                                            imsi = binascii.unhexlify(UniqueSubscriptionIdentifier['misc_data']).decode('utf-8')
+                                for UniqueSubscriptionIdentifier in avps.all('Subscription-Id/Subscription-Id-Data'):
+                                    imsi = UniqueSubscriptionIdentifier.utf8String()
                             except Exception as e:
                                 imsi="Unknown"
                             
                             try:
-                                ratType = self.get_avp_data(avps, 1032)[0]
+                                ratType = avps.hex(1032)
                                 ratType = int(ratType, 16)
                             except Exception as e:
                                 ratType = None
 
                             try:
-                                accessNetworkGatewayAddress = self.get_avp_data(avps, 1050)[0]
+                                accessNetworkGatewayAddress = avps.hex(1050)
                                 accessNetworkGatewayAddress = str(self.hex_to_ip(accessNetworkGatewayAddress[4:]))
                             except Exception as e:
                                 accessNetworkGatewayAddress = None
 
                             try:
-                                accessNetworkChargingAddress = self.get_avp_data(avps, 501)[0]
+                                accessNetworkChargingAddress = avps.hex(501)
                                 accessNetworkChargingAddress = str(self.hex_to_ip(accessNetworkChargingAddress[4:]))
                             except Exception as e:
                                 accessNetworkChargingAddress = None
@@ -2174,7 +2043,7 @@ class Diameter:
                             }
 
                             self.database.Update_Emergency_Subscriber(subscriberIp=ueIp, subscriberData=emergencySubscriberData, imsi=imsi, gxSessionId=emergencySubscriberData.get('servingPgw'))
-                            avp += self.generate_avp(268, 40, self.int_to_hex(2001, 4))                                           #Result Code (DIAMETER_SUCCESS (2001))
+                            avp += self.resultCodeSuccessAvp                                           #Result Code (DIAMETER_SUCCESS (2001))
                             response = self.generate_diameter_packet("01", "40", 272, 16777238, packet_vars['hop-by-hop-identifier'], packet_vars['end-to-end-identifier'], avp)     #Generate Diameter packet
                             return response
                         
@@ -2183,33 +2052,31 @@ class Diameter:
                             If we've recieved a CCR-Terminate, delete the emergency subscriber.
                             """
                             try:
-                                ueIp = self.get_avp_data(avps, 8)[0]
+                                ueIp = avps.hex(8)
                                 ueIp = str(self.hex_to_ip(ueIp))
                             except Exception as e:
                                 ueIp = None
                             try:
                                 #Get the IMSI
-                                for SubscriptionIdentifier in self.get_avp_data(avps, 443):
-                                    for UniqueSubscriptionIdentifier in SubscriptionIdentifier:
-                                        if UniqueSubscriptionIdentifier['avp_code'] == 444:
-                                            imsi = binascii.unhexlify(UniqueSubscriptionIdentifier['misc_data']).decode('utf-8')
+                                for UniqueSubscriptionIdentifier in avps.all('Subscription-Id/Subscription-Id-Data'):
+                                    imsi = UniqueSubscriptionIdentifier.utf8String()
                             except Exception as e:
                                 imsi="Unknown"
 
                             try:
-                                ratType = self.get_avp_data(avps, 1032)[0]
+                                ratType = avps.hex(1032)
                                 ratType = int(ratType, 16)
                             except Exception as e:
                                 ratType = None
 
                             try:
-                                accessNetworkGatewayAddress = self.get_avp_data(avps, 1050)[0]
+                                accessNetworkGatewayAddress = avps.hex(1050)
                                 accessNetworkGatewayAddress = str(self.hex_to_ip(accessNetworkGatewayAddress))
                             except Exception as e:
                                 accessNetworkGatewayAddress = None
 
                             try:
-                                accessNetworkChargingAddress = self.get_avp_data(avps, 501)[0]
+                                accessNetworkChargingAddress = avps.hex(501)
                                 accessNetworkChargingAddress = str(self.hex_to_ip(accessNetworkChargingAddress))
                             except Exception as e:
                                 accessNetworkChargingAddress = None
@@ -2228,7 +2095,7 @@ class Diameter:
 
                             self.database.Delete_Emergency_Subscriber(subscriberIp=ueIp, subscriberData=emergencySubscriberData, imsi=imsi, gxSessionId=binascii.unhexlify(session_id).decode())
 
-                            avp += self.generate_avp(268, 40, self.int_to_hex(2001, 4))                                           #Result Code (DIAMETER_SUCCESS (2001))
+                            avp += self.resultCodeSuccessAvp                                           #Result Code (DIAMETER_SUCCESS (2001))
                             response = self.generate_diameter_packet("01", "40", 272, 16777238, packet_vars['hop-by-hop-identifier'], packet_vars['end-to-end-identifier'], avp)     #Generate Diameter packet
                             return response
 
@@ -2236,14 +2103,12 @@ class Diameter:
                 self.logTool.log(service='HSS', level='error', message=f"[diameter.py] [Answer_16777238_272] [CCA] Error generating SOS CCA: {traceback.format_exc()}", redisClient=self.redisMessaging)
 
             #Get Subscriber info from Subscription ID
-            for SubscriptionIdentifier in self.get_avp_data(avps, 443):
-                for UniqueSubscriptionIdentifier in SubscriptionIdentifier:
-                    self.logTool.log(service='HSS', level='debug', message="[diameter.py] [Answer_16777238_272] [CCA] Evaluating UniqueSubscriptionIdentifier AVP " + str(UniqueSubscriptionIdentifier) + " to find IMSI", redisClient=self.redisMessaging)
-                    if UniqueSubscriptionIdentifier['avp_code'] == 444:
-                        imsi = binascii.unhexlify(UniqueSubscriptionIdentifier['misc_data']).decode('utf-8')
-                        self.logTool.log(service='HSS', level='debug', message="[diameter.py] [Answer_16777238_272] [CCA] Found IMSI " + str(imsi), redisClient=self.redisMessaging)
-
-            self.logTool.log(service='HSS', level='debug', message="[diameter.py] [Answer_16777238_272] [CCA] SubscriptionID: " + str(self.get_avp_data(avps, 443)), redisClient=self.redisMessaging)
+            for UniqueSubscriptionIdentifier in avps.all('Subscription-Id/Subscription-Id-Data'):
+                self.logTool.log(service='HSS', level='debug', message="[diameter.py] [Answer_16777238_272] [CCA] Evaluating UniqueSubscriptionIdentifier AVP " + str(UniqueSubscriptionIdentifier) + " to find IMSI", redisClient=self.redisMessaging)
+                imsi = UniqueSubscriptionIdentifier.utf8String()
+                self.logTool.log(service='HSS', level='debug', message="[diameter.py] [Answer_16777238_272] [CCA] Found IMSI " + str(imsi), redisClient=self.redisMessaging)
+
+            self.logTool.log(service='HSS', level='debug', message="[diameter.py] [Answer_16777238_272] [CCA] SubscriptionID: " + str(avps.all(443)), redisClient=self.redisMessaging)
             try:
                 self.logTool.log(service='HSS', level='debug', message="[diameter.py] [Answer_16777238_272] [CCA] Getting Get_Charging_Rules for IMSI " + str(imsi) + " using APN " + str(apn) + " from database", redisClient=self.redisMessaging)                                            #Get subscriber details
                 ChargingRules = self.database.Get_Charging_Rules(imsi=imsi, apn=apn)
@@ -2260,7 +2125,7 @@ class Diameter:
 
                 #Get UE IP            
                 try:
-                    ue_ip = self.get_avp_data(avps, 8)[0]
+                    ue_ip = avps.hex(8)
                     ue_ip = str(self.hex_to_ip(ue_ip))
                     # Fire a notification to the webhook queue, for the OCS.
                     try:
@@ -2293,7 +2158,7 @@ class Diameter:
 
 
                 #Supported-Features(628) (Gx feature list)
-                avp += self.generate_vendor_avp(628, "80", 10415, "0000010a4000000c000028af0000027580000010000028af000000010000027680000010000028af0000000b")
+                avp += self.gxSupportedFeaturesAvp
 
                 #Default EPS Bearer QoS (From database with fallback source CCR-I, then omission)
                 try:
@@ -2323,7 +2188,7 @@ class Diameter:
                 except Exception as E:
                     self.logTool.log(service='HSS', level='error', message=E, redisClient=self.redisMessaging)
                     self.logTool.log(service='HSS', level='error', message="[diameter.py] [Answer_16777238_272] [CCA] Failed to populate default_EPS_QoS from DB for sub " + str(imsi), redisClient=self.redisMessaging)
-                    default_EPS_QoS = self.get_avp_data(avps, 1049)[0][8:]
+                    default_EPS_QoS = avps.hex(1049, default='')
                     if len(default_EPS_QoS) > 0:
                         avp += self.generate_vendor_avp(1049, "80", 10415, default_EPS_QoS)
 
@@ -2344,9 +2209,9 @@ class Diameter:
                     self.logTool.log(service='HSS', level='error', message=E, redisClient=self.redisMessaging)
 
                     QoS_Information = ''
-                    for AMBR_Part in self.get_avp_data(avps, 1016)[0]:
+                    for AMBR_Part in avps.first(1016).children:
                         self.logTool.log(service='HSS', level='debug', message=AMBR_Part, redisClient=self.redisMessaging)
-                        AMBR_AVP = self.generate_vendor_avp(AMBR_Part['avp_code'], "80", 10415, AMBR_Part['misc_data'][8:])
+                        AMBR_AVP = self.generate_vendor_avp(AMBR_Part.code, "80", 10415, AMBR_Part.hex())
                         QoS_Information += AMBR_AVP
                         self.logTool.log(service='HSS', level='debug', message="[diameter.py] [Answer_16777238_272] [CCA] QoS_Information added " + str(AMBR_AVP), redisClient=self.redisMessaging)
                     avp += self.generate_vendor_avp(1016, "80", 10415, QoS_Information)
@@ -2405,7 +2270,7 @@ class Diameter:
                         except Exception as e:
                             self.logTool.log(service='HSS', level='debug', message=f"[diameter.py] [Answer_16777238_272] [CCA] Failed to clear apn state for {apn}: {traceback.format_exc()}", redisClient=self.redisMessaging)
 
-            avp += self.generate_avp(268, 40, self.int_to_hex(2001, 4))                                           #Result Code (DIAMETER_SUCCESS (2001))
+            avp += self.resultCodeSuccessAvp                                           #Result Code (DIAMETER_SUCCESS (2001))
             response = self.generate_diameter_packet("01", "40", 272, 16777238, packet_vars['hop-by-hop-identifier'], packet_vars['end-to-end-identifier'], avp)     #Generate Diameter packet
         except Exception as e:                                             #Get subscriber details
             #Handle if the subscriber is not present in HSS return "DIAMETER_ERROR_USER_UNKNOWN"
@@ -2432,21 +2297,21 @@ class Diameter:
     def Answer_16777216_300(self, packet_vars, avps):
         
         avp = ''                                                                                         #Initiate empty var AVP                                                                                           #Session-ID
-        session_id = self.get_avp_data(avps, 263)[0]                                                     #Get Session-ID
+        session_id = avps.hex(263)                                                     #Get Session-ID
         avp += self.generate_avp(263, 40, session_id)                                                    #Set session ID to received session ID
-        avp += self.generate_avp(264, 40, self.OriginHost)                                               #Origin Host
-        avp += self.generate_avp(296, 40, self.OriginRealm)                                              #Origin Realm
-        avp += self.generate_avp(277, 40, "00000001")                                                    #Auth-Session-State (No state maintained)
-        avp += self.generate_avp(260, 40, "0000010a4000000c000028af000001024000000c01000000")            #Vendor-Specific-Application-ID for Cx
+        avp += self.originHostAvp                                               #Origin Host
+        avp += self.originRealmAvp                                              #Origin Realm
+        avp += self.authSessionStateAvp                                                    #Auth-Session-State (No state maintained)
+        avp += self.vendorSpecificApplicationIdAvps[16777216]            #Vendor-Specific-Application-ID for Cx
 
 
-        OriginRealm = self.get_avp_data(avps, 296)[0]                          #Get OriginRealm from AVP
+        OriginRealm = avps.hex(296)                          #Get OriginRealm from AVP
         OriginRealm = binascii.unhexlify(OriginRealm).decode('utf-8')      #Format it
-        OriginHost = self.get_avp_data(avps, 264)[0]                          #Get OriginHost from AVP
+        OriginHost = avps.hex(264)                          #Get OriginHost from AVP
         OriginHost = binascii.unhexlify(OriginHost).decode('utf-8')      #Format it
 
         try:        #Check if we have a record-route set as that's where we'll need to send the response
-            remote_peer = self.get_avp_data(avps, 282)[-1]                          #Get first record-route header
+            remote_peer = avps.all(282)[-1].hex()                          #Get first record-route header
             remote_peer = binascii.unhexlify(remote_peer).decode('utf-8')           #Format it
         except:     #If we don't have a record-route set, we'll send the response to the OriginHost
             remote_peer = OriginHost
@@ -2454,7 +2319,7 @@ class Diameter:
 
         try:
             self.logTool.log(service='HSS', level='debug', message="Checking if username present", redisClient=self.redisMessaging)
-            username = self.get_avp_data(avps, 1)[0]                                                     
+            username = avps.hex(1)                                                     
             username = binascii.unhexlify(username).decode('utf-8')
             self.logTool.log(service='HSS', level='debug', message="Username AVP is present, value is " + str(username), redisClient=self.redisMessaging)
             imsi = username.split('@')[0]   #Strip Domain
@@ -2487,17 +2352,17 @@ class Diameter:
             return response
 
         #Determine SAR Type & Store
-        user_authorization_type_avp_data = self.get_avp_data(avps, 623)
-        if user_authorization_type_avp_data:
+        user_authorization_type_avp_data = avps.first(623)
+        if user_authorization_type_avp_data is not None:
             try:
-                User_Authorization_Type = int(user_authorization_type_avp_data[0])
+                User_Authorization_Type = user_authorization_type_avp_data.unsigned32()
                 self.logTool.log(service='HSS', level='debug', message="User_Authorization_Type is: " + str(User_Authorization_Type), redisClient=self.redisMessaging)
                 if (User_Authorization_Type == 1):
                     self.logTool.log(service='HSS', level='debug', message="This is Deregister", redisClient=self.redisMessaging)
                     self.database.Update_Serving_CSCF(imsi, serving_cscf=None)
                     #Populate S-CSCF Address
                     avp += self.generate_vendor_avp(602, "c0", 10415, str(binascii.hexlify(str.encode(ims_subscriber_details['scscf'])),'ascii'))
-                    avp += self.generate_avp(268, 40, self.int_to_hex(2001, 4))                                 #Result Code (DIAMETER_SUCCESS (2001))
+                    avp += self.resultCodeSuccessAvp                                 #Result Code (DIAMETER_SUCCESS (2001))
                     response = self.generate_diameter_packet("01", "40", 300, 16777216, packet_vars['hop-by-hop-identifier'], packet_vars['end-to-end-identifier'], avp)     #Generate Diameter packet
                     return response
                     
@@ -2535,23 +2400,23 @@ class Diameter:
     #3GPP Cx Server Assignment Answer
     def Answer_16777216_301(self, packet_vars, avps):
         avp = ''                                                                                    #Initiate empty var AVP                                                                                           #Session-ID
-        session_id = self.get_avp_data(avps, 263)[0]                                                     #Get Session-ID
+        session_id = avps.hex(263)                                                     #Get Session-ID
         avp += self.generate_avp(263, 40, session_id)                                                    #Set session ID to received session ID
-        avp += self.generate_avp(264, 40, self.OriginHost)                                               #Origin Host
-        avp += self.generate_avp(296, 40, self.OriginRealm)                                              #Origin Realm
-        avp += self.generate_avp(277, 40, "00000001")                                                    #Auth-Session-State (No state maintained)
+        avp += self.originHostAvp                                               #Origin Host
+        avp += self.originRealmAvp                                              #Origin Realm
+        avp += self.authSessionStateAvp                                                    #Auth-Session-State (No state maintained)
 
-        avp += self.generate_avp(260, 40, "0000010a4000000c000028af000001024000000c01000000")            #Vendor-Specific-Application-ID for Cx
+        avp += self.vendorSpecificApplicationIdAvps[16777216]            #Vendor-Specific-Application-ID for Cx
 
-        OriginHost = self.get_avp_data(avps, 264)[0]                          #Get OriginHost from AVP
+        OriginHost = avps.hex(264)                          #Get OriginHost from AVP
         OriginHost = binascii.unhexlify(OriginHost).decode('utf-8')      #Format it
 
-        OriginRealm = self.get_avp_data(avps, 296)[0]                          #Get OriginRealm from AVP
+        OriginRealm = avps.hex(296)                          #Get OriginRealm from AVP
         OriginRealm = binascii.unhexlify(OriginRealm).decode('utf-8')      #Format it
 
         #Find Remote Peer we need to address CLRs through
         try:        #Check if we have a record-route set as that's where we'll need to send the response
-            remote_peer = self.get_avp_data(avps, 282)[-1]                          #Get first record-route header
+            remote_peer = avps.all(282)[-1].hex()                          #Get first record-route header
             remote_peer = binascii.unhexlify(remote_peer).decode('utf-8')           #Format it
         except:     #If we don't have a record-route set, we'll send the response to the OriginHost
             remote_peer = OriginHost
@@ -2559,7 +2424,7 @@ class Diameter:
 
         try:
             self.logTool.log(service='HSS', level='debug', message="Checking if username present", redisClient=self.redisMessaging)
-            username = self.get_avp_data(avps, 601)[0]                                                     
+            username = avps.hex(601)                                                     
             ims_subscriber_details = self.Get_IMS_Subscriber_Details_from_AVP(username) 
             self.logTool.log(service='HSS', level='debug', message="Got subscriber details: " + str(ims_subscriber_details), redisClient=self.redisMessaging)
             imsi = ims_subscriber_details['imsi']
@@ -2594,13 +2459,13 @@ class Diameter:
         
         #Charging Information
         #avp += self.generate_vendor_avp(618, "c0", 10415, "0000026dc000001b000028af7072695f6363665f6164647265737300")
-        #avp += self.generate_avp(268, 40, "000007d1")                                                   #DIAMETER_SUCCESS
+        #avp += self.resultCodeSuccessAvp                                                   #DIAMETER_SUCCESS
 
         #Determine SAR Type & Store
-        Server_Assignment_Type_Hex = self.get_avp_data(avps, 614)[0]
+        Server_Assignment_Type_Hex = avps.hex(614)
         Server_Assignment_Type = self.hex_to_int(Server_Assignment_Type_Hex)
         self.logTool.log(service='HSS', level='debug', message="Server-Assignment-Type is: " + str(Server_Assignment_Type), redisClient=self.redisMessaging)
-        ServingCSCF = self.get_avp_data(avps, 602)[0]                          #Get OriginHost from AVP
+        ServingCSCF = avps.hex(602)                          #Get OriginHost from AVP
         ServingCSCF = binascii.unhexlify(ServingCSCF).decode('utf-8')      #Format it
         self.logTool.log(service='HSS', level='debug', message="Subscriber is served by S-CSCF " + str(ServingCSCF), redisClient=self.redisMessaging)
         if (Server_Assignment_Type == 1) or (Server_Assignment_Type == 2):
@@ -2611,7 +2476,7 @@ class Diameter:
             self.logTool.log(service='HSS', level='debug', message="SAR is not Register", redisClient=self.redisMessaging)
             self.database.Update_Serving_CSCF(imsi, serving_cscf=None)
 
-        avp += self.generate_avp(268, 40, self.int_to_hex(2001, 4))                                 #Result Code (DIAMETER_SUCCESS (2001))
+        avp += self.resultCodeSuccessAvp                                 #Result Code (DIAMETER_SUCCESS (2001))
 
         response = self.generate_diameter_packet("01", "40", 301, 16777216, packet_vars['hop-by-hop-identifier'], packet_vars['end-to-end-identifier'], avp)     #Generate Diameter packet
         return response    
@@ -2619,16 +2484,16 @@ class Diameter:
     #3GPP Cx Location Information Answer
     def Answer_16777216_302(self, packet_vars, avps):
         avp = ''                                                                                    #Initiate empty var AVP                                                                                           #Session-ID
-        session_id = self.get_avp_data(avps, 263)[0]                                                     #Get Session-ID
+        session_id = avps.hex(263)                                                     #Get Session-ID
         avp += self.generate_avp(263, 40, session_id)                                                    #Set session ID to received session ID
-        avp += self.generate_avp(264, 40, self.OriginHost)                                                    #Origin Host
-        avp += self.generate_avp(296, 40, self.OriginRealm)
-        avp += self.generate_avp(277, 40, "00000001")                                                    #Auth Session State
-        avp += self.generate_avp(260, 40, "0000010a4000000c000028af000001024000000c01000000")            #Vendor-Specific-Application-ID for Cx
+        avp += self.originHostAvp                                                    #Origin Host
+        avp += self.originRealmAvp
+        avp += self.authSessionStateAvp                                                    #Auth Session State
+        avp += self.vendorSpecificApplicationIdAvps[16777216]            #Vendor-Specific-Application-ID for Cx
         
         try:
             self.logTool.log(service='HSS', level='debug', message="Checking if username present", redisClient=self.redisMessaging)
-            username = self.get_avp_data(avps, 601)[0] 
+            username = avps.hex(601) 
             ims_subscriber_details = self.Get_IMS_Subscriber_Details_from_AVP(username)                                                    
             if ims_subscriber_details['scscf'] != None:
                 self.logTool.log(service='HSS', level='debug', message="Got SCSCF on record for Sub", redisClient=self.redisMessaging)
@@ -2672,17 +2537,17 @@ class Diameter:
             response = self.generate_diameter_packet("01", "40", 302, 16777216, packet_vars['hop-by-hop-identifier'], packet_vars['end-to-end-identifier'], avp)     #Generate Diameter packet
             return response
         
-        avp += self.generate_avp(268, 40, "000007d1")                                                   #DIAMETER_SUCCESS
+        avp += self.resultCodeSuccessAvp                                                   #DIAMETER_SUCCESS
         response = self.generate_diameter_packet("01", "40", 302, 16777216, packet_vars['hop-by-hop-identifier'], packet_vars['end-to-end-identifier'], avp)     #Generate Diameter packet
         
         return response
 
     #3GPP Cx Multimedia Authentication Answer
     def Answer_16777216_303(self, packet_vars, avps):
-        public_identity = self.get_avp_data(avps, 601)[0]
+        public_identity = avps.hex(601)
         public_identity = binascii.unhexlify(public_identity).decode('utf-8')
         self.logTool.log(service='HSS', level='debug', message="Got MAR for public_identity : " + str(public_identity), redisClient=self.redisMessaging)
-        username = self.get_avp_data(avps, 1)[0]
+        username = avps.hex(1)
         username = binascii.unhexlify(username).decode('utf-8')
         imsi = username.split('@')[0]   #Strip Domain
         domain = username.split('@')[1] #Get Domain Part
@@ -2690,12 +2555,12 @@ class Diameter:
         auth_scheme = ''
 
         avp = ''                                                                                    #Initiate empty var AVP
-        session_id = self.get_avp_data(avps, 263)[0]                                                     #Get Session-ID
+        session_id = avps.hex(263)                                                     #Get Session-ID
         avp += self.generate_avp(263, 40, session_id)                                                    #Set session ID to received session ID
-        avp += self.generate_avp(260, 40, "0000010a4000000c000028af000001024000000c01000000")            #Vendor-Specific-Application-ID for Cx
-        avp += self.generate_avp(277, 40, "00000001")                                                    #Auth Session State
-        avp += self.generate_avp(264, 40, self.OriginHost)                                                    #Origin Host
-        avp += self.generate_avp(296, 40, self.OriginRealm)                                                   #Origin Realm        
+        avp += self.vendorSpecificApplicationIdAvps[16777216]            #Vendor-Specific-Application-ID for Cx
+        avp += self.authSessionStateAvp                                                    #Auth Session State
+        avp += self.originHostAvp                                                    #Origin Host
+        avp += self.originRealmAvp                                                   #Origin Realm        
 
         try:
             subscriber_details = self.database.Get_Subscriber(imsi=imsi)                                               #Get subscriber details
@@ -2728,12 +2593,11 @@ class Diameter:
         plmn = self.EncodePLMN(mcc, mnc)
 
         #Determine if SQN Resync is required & auth type to use
-        for sub_avp_612 in self.get_avp_data(avps, 612)[0]:
-            if sub_avp_612['avp_code'] == 610:
+        for sub_avp_612 in avps.all(612)[0].children:
+            if sub_avp_612.code == 610:
                 self.logTool.log(service='HSS', level='debug', message="SQN in HSS is out of sync - Performing resync", redisClient=self.redisMessaging)
-                auts = str(sub_avp_612['misc_data'])[32:]
-                rand = str(sub_avp_612['misc_data'])[:32]
-                rand = binascii.unhexlify(rand)
+                auts = sub_avp_612.hex()[32:]
+                rand = sub_avp_612.octetString()[:16]
                 self.database.Get_Vectors_AuC(subscriber_details['auc_id'], "sqn_resync", auts=auts, rand=rand)
                 self.logTool.log(service='HSS', level='debug', message="Resynced SQN in DB", redisClient=self.redisMessaging)
                 self.redisMessaging.sendMetric(serviceName='diameter', metricName='prom_diam_auth_event_count',
@@ -2749,9 +2613,9 @@ class Diameter:
                                                 usePrefix=True, 
                                                 prefixHostname=self.hostname, 
                                                 prefixServiceName='metric')
-            if sub_avp_612['avp_code'] == 608:
-                self.logTool.log(service='HSS', level='debug', message="Auth mechansim requested: " + str(sub_avp_612['misc_data']), redisClient=self.redisMessaging)
-                auth_scheme = binascii.unhexlify(sub_avp_612['misc_data']).decode('utf-8')
+            if sub_avp_612.code == 608:
+                self.logTool.log(service='HSS', level='debug', message="Auth mechansim requested: " + sub_avp_612.hex(), redisClient=self.redisMessaging)
+                auth_scheme = sub_avp_612.utf8String()
                 self.logTool.log(service='HSS', level='debug', message="Auth mechansim requested: " + str(auth_scheme), redisClient=self.redisMessaging)
 
         self.logTool.log(service='HSS', level='debug', message="IMSI is " + str(imsi), redisClient=self.redisMessaging)        
@@ -2797,7 +2661,7 @@ class Diameter:
         avp += self.generate_vendor_avp(607, "c0", 10415, "00000001")                                    #3GPP-SIP-Number-Auth-Items
 
 
-        avp += self.generate_avp(268, 40, "000007d1")                                                   #DIAMETER_SUCCESS
+        avp += self.resultCodeSuccessAvp                                                   #DIAMETER_SUCCESS
         
         response = self.generate_diameter_packet("01", "40", 303, 16777216, packet_vars['hop-by-hop-identifier'], packet_vars['end-to-end-identifier'], avp)     #Generate Diameter packet
         return response
@@ -2806,19 +2670,18 @@ class Diameter:
     def Respond_ResultCode(self, packet_vars, avps, result_code):
         self.logTool.log(service='HSS', level='error', message="Responding with result code " + str(result_code) + " to request with command code " + str(packet_vars['command_code']), redisClient=self.redisMessaging)
         avp = ''                                                                                    #Initiate empty var AVP
-        avp += self.generate_avp(264, 40, self.OriginHost)                                                    #Origin Host
-        avp += self.generate_avp(296, 40, self.OriginRealm)                                                   #Origin Realm
+        avp += self.originHostAvp                                                    #Origin Host
+        avp += self.originRealmAvp                                                   #Origin Realm
         try:
-            session_id = self.get_avp_data(avps, 263)[0]                                                     #Get Session-ID
+            session_id = avps.hex(263)                                                     #Get Session-ID
             avp += self.generate_avp(263, 40, session_id)                                                    #Set session ID to received session ID
         except:
             self.logTool.log(service='HSS', level='debug', message="Failed to add SessionID into error", redisClient=self.redisMessaging)
-        for avps_to_check in avps:                                                                  #Only include AVP 260 (Vendor-Specific-Application-ID) if inital request included it
-            if avps_to_check['avp_code'] == 260:
-                concat_subavp = ''
-                for sub_avp in avps_to_check['misc_data']:
-                    concat_subavp += self.generate_avp(sub_avp['avp_code'], sub_avp['avp_flags'], sub_avp['misc_data'])
-                avp += self.generate_avp(260, 40, concat_subavp)        #Vendor-Specific-Application-ID
+        for avps_to_check in avps.all(260):                                                         #Only include AVP 260 (Vendor-Specific-Application-ID) if inital request included it
+            concat_subavp = ''
+            for sub_avp in avps_to_check.children:
+                concat_subavp += self.generate_avp(sub_avp.code, format(sub_avp.flags, '02x'), sub_avp.hex())
+            avp += self.generate_avp(260, 40, concat_subavp)        #Vendor-Specific-Application-ID
         avp += self.generate_avp(268, 40, self.int_to_hex(result_code, 4))                                                   #Response Code
         
         #Experimental Result AVP(Response Code for Failure)
@@ -2833,17 +2696,17 @@ class Diameter:
     #3GPP Cx Registration Termination Answer
     def Answer_16777216_304(self, packet_vars, avps):
         avp = ''                                                                                    #Initiate empty var AVP                                                                                           #Session-ID
-        session_id = self.get_avp_data(avps, 263)[0]                                                     #Get Session-ID
+        session_id = avps.hex(263)                                                     #Get Session-ID
         avp += self.generate_avp(263, 40, session_id)                                                    #Set session ID to received session ID
         vendor_id = self.generate_avp(266, 40, str(binascii.hexlify('10415'),'ascii'))
         self.logTool.log(service='HSS', level='debug', message="vendor_id avp: " + str(vendor_id), redisClient=self.redisMessaging)
         auth_application_id = self.generate_avp(248, 40, self.int_to_hex(16777252, 8))
         self.logTool.log(service='HSS', level='debug', message="auth_application_id: " + auth_application_id, redisClient=self.redisMessaging)
-        avp += self.generate_avp(260, 40, "0000010a4000000c000028af000001024000000c01000000")            #Vendor-Specific-Application-ID for Cx
-        avp += self.generate_avp(268, 40, "000007d1")                                                   #Result Code - DIAMETER_SUCCESS
-        avp += self.generate_avp(277, 40, "00000001")                                                    #Auth Session State        
-        avp += self.generate_avp(264, 40, self.OriginHost)                                                    #Origin Host
-        avp += self.generate_avp(296, 40, self.OriginRealm)                                             #Origin Realm
+        avp += self.vendorSpecificApplicationIdAvps[16777216]            #Vendor-Specific-Application-ID for Cx
+        avp += self.resultCodeSuccessAvp                                                   #Result Code - DIAMETER_SUCCESS
+        avp += self.authSessionStateAvp                                                    #Auth Session State        
+        avp += self.originHostAvp                                                    #Origin Host
+        avp += self.originRealmAvp                                             #Origin Realm
                 #* [ Proxy-Info ]
         proxy_host_avp = self.generate_avp(280, "40", str(binascii.hexlify(b'localdomain'),'ascii'))
         proxy_state_avp = self.generate_avp(33, "40", "0001")
@@ -2867,11 +2730,11 @@ class Diameter:
         username = None
         subscriber_ims_details = None
         try:
-            user_identity_avp = self.get_avp_data(avps, 700)[0]
+            user_identity_avp = avps.all(700)[0].subAvps
             
             #Try to get MSISDN
             try:
-                msisdn = self.get_avp_data(user_identity_avp, 701)[0]                                                         #Get MSISDN from AVP in request
+                msisdn = user_identity_avp.hex(701)                                                                         #Get MSISDN from AVP in request
                 self.logTool.log(service='HSS', level='debug', message="Got raw MSISDN with value " + str(msisdn), redisClient=self.redisMessaging)
                 msisdn = self.TBCD_decode(msisdn)
                 self.logTool.log(service='HSS', level='debug', message="Got MSISDN with value " + str(msisdn), redisClient=self.redisMessaging)            
@@ -2879,7 +2742,7 @@ class Diameter:
                 subscriber_details = self.database.Get_Subscriber(msisdn=msisdn)
             except:
             #Try to get the IMSI from the Public Identity
-                public_identity = self.get_avp_data(avps, 601)[0]
+                public_identity = avps.hex(601)
                 public_identity = binascii.unhexlify(public_identity).decode('utf-8')
                 self.logTool.log(service='HSS', level='debug', message="Got public_identity : " + str(public_identity), redisClient=self.redisMessaging)
                 if "sip:" in public_identity:
@@ -2902,13 +2765,13 @@ class Diameter:
         except:
             self.logTool.log(service='HSS', level='debug', message="No User Identity present - This request is invalid", redisClient=self.redisMessaging)
 
-        session_id = self.get_avp_data(avps, 263)[0]                                                     #Get Session-ID
+        session_id = avps.hex(263)                                                     #Get Session-ID
         avp += self.generate_avp(263, 40, session_id)                                                    #Set session ID to received session ID
-        avp += self.generate_avp(264, 40, self.OriginHost)                                               #Origin Host
-        avp += self.generate_avp(296, 40, self.OriginRealm)                                              #Origin Realm
-        avp += self.generate_avp(277, 40, "00000001")                                                    #Auth-Session-State (No state maintained)
+        avp += self.originHostAvp                                               #Origin Host
+        avp += self.originRealmAvp                                              #Origin Realm
+        avp += self.authSessionStateAvp                                                    #Auth-Session-State (No state maintained)
         
-        avp += self.generate_avp(260, 40, "0000010a4000000c000028af000001024000000c01000001")            #Vendor-Specific-Application-ID for Cx
+        avp += self.vendorSpecificApplicationIdAvps[16777217]            #Vendor-Specific-Application-ID for Cx
 
         if subscriber_ims_details is not None:
                 try:
@@ -3042,7 +2905,7 @@ class Diameter:
 
         avp += self.generate_vendor_avp(702, "c0", 10415, str(binascii.hexlify(str.encode(xmlbody)),'ascii'))
         
-        avp += self.generate_avp(268, 40, "000007d1")                                                   #DIAMETER_SUCCESS
+        avp += self.resultCodeSuccessAvp                                                   #DIAMETER_SUCCESS
 
         response = self.generate_diameter_packet("01", "40", 306, 16777217, packet_vars['hop-by-hop-identifier'], packet_vars['end-to-end-identifier'], avp)     #Generate Diameter packet
         
@@ -3053,11 +2916,11 @@ class Diameter:
         
 
         #Get IMSI
-        imsi = self.get_avp_data(avps, 1)[0]                                                        #Get IMSI from User-Name AVP in request
+        imsi = avps.hex(1)                                                        #Get IMSI from User-Name AVP in request
         imsi = binascii.unhexlify(imsi).decode('utf-8')
 
         #Get Sh User Data
-        sh_user_data = self.get_avp_data(avps, 702)[0]                                                        #Get IMSI from User-Name AVP in request
+        sh_user_data = avps.hex(702)                                                        #Get IMSI from User-Name AVP in request
         sh_user_data = binascii.unhexlify(sh_user_data).decode('utf-8')
 
         self.logTool.log(service='HSS', level='debug', message="Got Sh User data: " + str(sh_user_data), redisClient=self.redisMessaging)
@@ -3068,16 +2931,13 @@ class Diameter:
         self.database.UpdateObj(self.database.IMS_SUBSCRIBER, {'xcap_profile': sh_user_data}, subscriber_ims_details['ims_subscriber_id'])
 
         avp = ''                                                                                    #Initiate empty var AVP                                                                                           #Session-ID
-        session_id = self.get_avp_data(avps, 263)[0]                                                     #Get Session-ID
+        session_id = avps.hex(263)                                                     #Get Session-ID
         avp += self.generate_avp(263, 40, session_id)                                                    #Set session ID to received session ID
-        avp += self.generate_avp(264, 40, self.OriginHost)                                               #Origin Host
-        avp += self.generate_avp(296, 40, self.OriginRealm)                                              #Origin Realm
-        avp += self.generate_avp(277, 40, "00000001")                                                    #Auth-Session-State (No state maintained)
+        avp += self.originHostAvp                                               #Origin Host
+        avp += self.originRealmAvp                                              #Origin Realm
+        avp += self.authSessionStateAvp                                                    #Auth-Session-State (No state maintained)
         #AVP: Vendor-Specific-Application-Id(260) l=32 f=-M-
-        VendorSpecificApplicationId = ''
-        VendorSpecificApplicationId += self.generate_vendor_avp(266, 40, 10415, '')                     #AVP Vendor ID
-        VendorSpecificApplicationId += self.generate_avp(258, 40, format(int(16777217),"x").zfill(8))   #Auth-Application-ID Sh
-        avp += self.generate_avp(260, 40, VendorSpecificApplicationId) 
+        avp += self.vendorSpecificApplicationIdAvps[16777217]                                         #Vendor-Specific-Application-ID
         response = self.generate_diameter_packet("01", "40", 307, 16777217, packet_vars['hop-by-hop-identifier'], packet_vars['end-to-end-identifier'], avp)     #Generate Diameter packet
         return response
 
@@ -3093,14 +2953,14 @@ class Diameter:
             The response is determined by whether or not the subscriber is enabled, and has a matching ims_subscriber entry.
             """
             avp = ''
-            sessionId = bytes.fromhex(self.get_avp_data(avps, 263)[0]).decode('ascii')                                          #Get Session-ID
+            sessionId = avps.utf8String(263)                                          #Get Session-ID
             avp += self.generate_avp(263, 40, self.string_to_hex(sessionId))                                                    #Set session ID to received session ID
             avp += self.generate_avp(258, 40, format(int(16777236),"x").zfill(8))
-            avp += self.generate_avp(264, 40, self.OriginHost)                                               #Origin Host
-            avp += self.generate_avp(296, 40, self.OriginRealm)                                              #Origin Realm
+            avp += self.originHostAvp                                               #Origin Host
+            avp += self.originRealmAvp                                              #Origin Realm
             avp += self.generate_vendor_avp(628, 80, 10415, "0000010a4000000c000028af0000027580000010000028af000000010000027680000010000028af00000001") #Supported Features
 
-            subscriptionId = bytes.fromhex(self.get_avp_data(avps, 444)[0]).decode('ascii')
+            subscriptionId = avps.utf8String(444)
             self.logTool.log(service='HSS', level='debug', message=f"[diameter.py] [Answer_16777236_265] [AAA] Received subscription ID: {subscriptionId}", redisClient=self.redisMessaging)
             subscriptionId = subscriptionId.replace('sip:', '')
             imsi = None
@@ -3111,14 +2971,14 @@ class Diameter:
             servingApn = None
             ipServingApn = None
             try:
-                serviceUrn = bytes.fromhex(self.get_avp_data(avps, 525)[0]).decode('ascii')
+                serviceUrn = avps.utf8String(525)
             except:
                 serviceUrn = None
             emergencySubscriber = False
             registeredEmergencySubscriber = False
 
             try:
-                ueIp = self.get_avp_data(avps, 8)[0]
+                ueIp = avps.hex(8)
                 ueIp = str(self.hex_to_ip(ueIp))
             except Exception as e:
                 ueIp = None
@@ -3227,16 +3087,16 @@ class Diameter:
                     if imsi is None:
                         imsi = subscriberDetails.get('imsi', None)
                         
-                    aarOriginHost = self.get_avp_data(avps, 264)[0]
+                    aarOriginHost = avps.hex(264)
                     aarOriginHost = bytes.fromhex(aarOriginHost).decode('ascii')
-                    aarOriginRealm = self.get_avp_data(avps, 296)[0]
+                    aarOriginRealm = avps.hex(296)
                     aarOriginRealm = bytes.fromhex(aarOriginRealm).decode('ascii')
-                    aarSessionID = self.get_avp_data(avps, 263)[0]
+                    aarSessionID = avps.hex(263)
                     aarSessionID = bytes.fromhex(aarSessionID).decode('ascii')
                     #Check if we have a record-route set as that's where we'll need to send the response
                     try:
                         #Get first record-route header, then parse it
-                        remotePeer = self.get_avp_data(avps, 282)[-1]
+                        remotePeer = avps.all(282)[-1].hex()
                         remotePeer = binascii.unhexlify(remotePeer).decode('utf-8')
                     except Exception as e:
                         #If we don't have a record-route set, we'll send the response to the OriginHost
@@ -3250,8 +3110,8 @@ class Diameter:
                     Media-Type: 0 = Audio, 4 = Control
                     """
                 try:
-                    afApplicationIdentifier = self.get_avp_data(avps, 504)[0]
-                    mediaType = self.get_avp_data(avps, 520)[0]
+                    afApplicationIdentifier = avps.hex(504)
+                    mediaType = avps.hex(520)
                     # In order to send a Gx RAR, we need to ensure that mediaType is AUDIO(0) or VIDEO(1)
                     assert(int(mediaType, 16) == 0 or int(mediaType, 16) == 1)
 
@@ -3295,8 +3155,8 @@ class Diameter:
                         dlBandwidth = 512000
 
                         try:
-                            avpUlBandwidth = int((self.get_avp_data(avps, 516)[0]), 16)
-                            avpDlBandwidth = int((self.get_avp_data(avps, 515)[0]), 16)
+                            avpUlBandwidth = int((avps.hex(516)), 16)
+                            avpDlBandwidth = int((avps.hex(515)), 16)
 
                             if avpUlBandwidth <= ulBandwidth:
                                 ulBandwidth = avpUlBandwidth
@@ -3314,13 +3174,13 @@ class Diameter:
                         completedTftList = []
 
                         try:
-                            suppliedTfts = self.get_avp_data(avps, 507)
+                            suppliedTfts = avps.all(507)
                             if suppliedTfts:
                                 if isinstance(suppliedTfts, list):
                                     tftId = 1
                                     for suppliedTft in suppliedTfts:
                                         tftDirection = None
-                                        decodedTft = bytes.fromhex(suppliedTft).decode('ascii')
+                                        decodedTft = suppliedTft.utf8String()
                                         self.logTool.log(service='HSS', level='debug', message=f"[diameter.py] [Answer_16777236_265] [AAA] Got TFT from PCSCF: {decodedTft}", redisClient=self.redisMessaging)
                                         if 'permit out' in decodedTft.lower():
                                             tftDirection = 1
@@ -3346,11 +3206,11 @@ class Diameter:
                             self.logTool.log(service='HSS', level='error', message=f"[diameter.py] [Answer_16777236_265] [AAA] Error using TFTs from PCSCF: {traceback.format_exc()}", redisClient=self.redisMessaging)
                         if not suppliedTfts:
                             try:
-                                sdpOffer = self.get_avp_data(avps, 524)[0]
+                                sdpOffer = avps.hex(524)
                                 self.logTool.log(service='HSS', level='debug', message=f"[diameter.py] [Answer_16777236_265] [AAA] Got SDP Offer raw: {sdpOffer}", redisClient=self.redisMessaging)
                                 sdpOffer = binascii.unhexlify(sdpOffer).decode('utf-8')
                                 self.logTool.log(service='HSS', level='debug', message=f"[diameter.py] [Answer_16777236_265] [AAA] Got SDP Offer decoded: {sdpOffer}", redisClient=self.redisMessaging)
-                                sdpAnswer = self.get_avp_data(avps, 524)[1]
+                                sdpAnswer = avps.all(524)[1].hex()
                                 self.logTool.log(service='HSS', level='debug', message=f"[diameter.py] [Answer_16777236_265] [AAA] Got SDP Answer raw: {sdpAnswer}", redisClient=self.redisMessaging)
                                 sdpAnswer = binascii.unhexlify(sdpAnswer).decode('utf-8')
                                 self.logTool.log(service='HSS', level='debug', message=f"[diameter.py] [Answer_16777236_265] [AAA] Got SDP Answer decoded: {sdpAnswer}", redisClient=self.redisMessaging)
@@ -3482,10 +3342,10 @@ class Diameter:
                             assert()
                             
                         raaPacketVars, raaAvps = self.decode_diameter_packet(reAuthAnswer)
-                        raaResultCode = int(self.get_avp_data(raaAvps, 268)[0], 16)
+                        raaResultCode = int(raaAvps.hex(268), 16)
 
                         if raaResultCode == 2001:
-                            avp += self.generate_avp(268, 40, self.int_to_hex(2001, 4))
+                            avp += self.resultCodeSuccessAvp
                             self.logTool.log(service='HSS', level='debug', message=f"[diameter.py] [Answer_16777236_265] [AAA] RAA returned Successfully, authorizing request", redisClient=self.redisMessaging)
                         else:
                             avp += self.generate_avp(268, 40, self.int_to_hex(4001, 4))
@@ -3493,10 +3353,10 @@ class Diameter:
 
                     except Exception as e:
                         self.logTool.log(service='HSS', level='debug', message=f"[diameter.py] [Answer_16777236_265] [AAA] Error processing RAR / RAA, Authorizing request: {traceback.format_exc()}", redisClient=self.redisMessaging)
-                        avp += self.generate_avp(268, 40, self.int_to_hex(2001, 4))
+                        avp += self.resultCodeSuccessAvp
                     
                 except Exception as e:
-                    avp += self.generate_avp(268, 40, self.int_to_hex(2001, 4))
+                    avp += self.resultCodeSuccessAvp
                     pass
             else:
                 self.logTool.log(service='HSS', level='debug', message=f"[diameter.py] [Answer_16777236_265] [AAA] Request unauthorized", redisClient=self.redisMessaging)
@@ -3507,11 +3367,11 @@ class Diameter:
         except Exception as e:
             self.logTool.log(service='HSS', level='error', message=f"[diameter.py] [Answer_16777236_265] [AAA] Error generating AAA: {traceback.format_exc()}", redisClient=self.redisMessaging)
             avp = ''
-            session_id = self.get_avp_data(avps, 263)[0]                                                     #Get Session-ID
+            session_id = avps.hex(263)                                                     #Get Session-ID
             avp += self.generate_avp(263, 40, session_id)                                                    #Set session ID to received session ID
             avp += self.generate_avp(258, 40, format(int(16777236),"x").zfill(8))
-            avp += self.generate_avp(264, 40, self.OriginHost)                                               #Origin Host
-            avp += self.generate_avp(296, 40, self.OriginRealm)                                              #Origin Realm
+            avp += self.originHostAvp                                               #Origin Host
+            avp += self.originRealmAvp                                              #Origin Realm
             avp += self.generate_avp(268, 40, self.int_to_hex(5012, 4))                                      #Result Code 5012 UNABLE_TO_COMPLY
             response = self.generate_diameter_packet("01", "40", 265, 16777236, packet_vars['hop-by-hop-identifier'], packet_vars['end-to-end-identifier'], avp)     #Generate Diameter packet
             return response
@@ -3524,12 +3384,12 @@ class Diameter:
             The response is determined by whether or not the subscriber is enabled, and has a matching ims_subscriber entry.
             """
             avp = ''
-            session_id = self.get_avp_data(avps, 263)[0]                                                     #Get Session-ID
+            session_id = avps.hex(263)                                                     #Get Session-ID
             avp += self.generate_avp(263, 40, session_id)                                                    #Set session ID to received session ID
             avp += self.generate_avp(258, 40, format(int(16777236),"x").zfill(8))
-            avp += self.generate_avp(264, 40, self.OriginHost)                                               #Origin Host
-            avp += self.generate_avp(296, 40, self.OriginRealm)                                              #Origin Realm
-            subscriptionId = bytes.fromhex(self.get_avp_data(avps, 444)[0]).decode('ascii')
+            avp += self.originHostAvp                                               #Origin Host
+            avp += self.originRealmAvp                                              #Origin Realm
+            subscriptionId = avps.utf8String(444)
             self.logTool.log(service='HSS', level='debug', message=f"[diameter.py] [Answer_16777236_258] [RAA] Received subscription ID: {subscriptionId}", redisClient=self.redisMessaging)
             subscriptionId = subscriptionId.replace('sip:', '')
             imsi = None
@@ -3560,7 +3420,7 @@ class Diameter:
 
             if imsEnabled:
                 self.logTool.log(service='HSS', level='debug', message=f"[diameter.py] [Answer_16777236_258] [RAA] Request authorized", redisClient=self.redisMessaging)
-                avp += self.generate_avp(268, 40, self.int_to_hex(2001, 4))
+                avp += self.resultCodeSuccessAvp
             else:
                 self.logTool.log(service='HSS', level='debug', message=f"[diameter.py] [Answer_16777236_258] [RAA] Request unauthorized", redisClient=self.redisMessaging)
                 avp += self.generate_avp(268, 40, self.int_to_hex(4001, 4))
@@ -3570,11 +3430,11 @@ class Diameter:
         except Exception as e:
             self.logTool.log(service='HSS', level='error', message=f"[diameter.py] [Answer_16777236_258] [RAA] Error generating RAA: {traceback.format_exc()}", redisClient=self.redisMessaging)
             avp = ''
-            session_id = self.get_avp_data(avps, 263)[0]                                                     #Get Session-ID
+            session_id = avps.hex(263)                                                     #Get Session-ID
             avp += self.generate_avp(263, 40, session_id)                                                    #Set session ID to received session ID
             avp += self.generate_avp(258, 40, format(int(16777236),"x").zfill(8))
-            avp += self.generate_avp(264, 40, self.OriginHost)                                               #Origin Host
-            avp += self.generate_avp(296, 40, self.OriginRealm)                                              #Origin Realm
+            avp += self.originHostAvp                                               #Origin Host
+            avp += self.originRealmAvp                                              #Origin Realm
             avp += self.generate_avp(268, 40, self.int_to_hex(5012, 4))                                      #Result Code 5012 UNABLE_TO_COMPLY
             response = self.generate_diameter_packet("01", "40", 258, 16777236, packet_vars['hop-by-hop-identifier'], packet_vars['end-to-end-identifier'], avp)     #Generate Diameter packet
             return response
@@ -3586,10 +3446,10 @@ class Diameter:
             Triggers a Re-Auth-Request to the PGW, the returns a Session Termination Answer.
             """
             avp = ''
-            sessionId = bytes.fromhex(self.get_avp_data(avps, 263)[0]).decode('ascii')                                          #Get Session-ID
+            sessionId = avps.utf8String(263)                                          #Get Session-ID
             avp += self.generate_avp(263, 40, self.string_to_hex(sessionId))                                                    #Set session ID to received session ID
-            avp += self.generate_avp(264, 40, self.OriginHost)                                               #Origin Host
-            avp += self.generate_avp(296, 40, self.OriginRealm)                                              #Origin Realm
+            avp += self.originHostAvp                                               #Origin Host
+            avp += self.originRealmAvp                                              #Origin Realm
             servingApn = None
             try:
                 imsSubscriber = self.database.Get_IMS_Subscriber_By_Session_Id(sessionId=sessionId)
@@ -3649,7 +3509,7 @@ class Diameter:
                 servingPgw = emergencySubscriberData.get('serving_pgw', None).split(';')[0]
 
             try:
-                aarSessionID = self.get_avp_data(avps, 263)[0]
+                aarSessionID = avps.hex(263)
                 aarSessionID = bytes.fromhex(aarSessionID).decode('ascii')
                 self.logTool.log(service='HSS', level='debug', message=f"[diameter.py] [Answer_16777236_275] [STA] Got Original SessionID: {aarSessionID}", redisClient=self.redisMessaging)
             except:
@@ -3671,10 +3531,10 @@ class Diameter:
                     assert()
                 
                 raaPacketVars, raaAvps = self.decode_diameter_packet(reAuthAnswer)
-                raaResultCode = int(self.get_avp_data(raaAvps, 268)[0], 16)
+                raaResultCode = int(raaAvps.hex(268), 16)
 
                 if raaResultCode == 2001:
-                    avp += self.generate_avp(268, 40, self.int_to_hex(2001, 4))
+                    avp += self.resultCodeSuccessAvp
                     self.logTool.log(service='HSS', level='debug', message=f"[diameter.py] [Answer_16777236_275] [STA] RAA returned Successfully, authorizing request", redisClient=self.redisMessaging)
                 else:
                     avp += self.generate_avp(268, 40, self.int_to_hex(5001, 4))
@@ -3683,17 +3543,17 @@ class Diameter:
             else:
                 self.logTool.log(service='HSS', level='info', message=f"[diameter.py] [Answer_16777236_275] [STA] Unable to find serving APN for RAR, returning Result-Code 2001", redisClient=self.redisMessaging)
 
-            avp += self.generate_avp(268, 40, self.int_to_hex(2001, 4))
+            avp += self.resultCodeSuccessAvp
             response = self.generate_diameter_packet("01", "40", 275, 16777236, packet_vars['hop-by-hop-identifier'], packet_vars['end-to-end-identifier'], avp)     #Generate Diameter packet
             return response
         except Exception as e:
             self.logTool.log(service='HSS', level='debug', message=f"[diameter.py] [Answer_16777236_275] [STA] Error generating STA, returning 2001", redisClient=self.redisMessaging)
             avp = ''
-            sessionId = self.get_avp_data(avps, 263)[0]                                                       #Get Session-ID
+            sessionId = avps.hex(263)                                                       #Get Session-ID
             avp += self.generate_avp(263, 40, sessionId)                                                    #Set session ID to received session ID
-            avp += self.generate_avp(264, 40, self.OriginHost)                                               #Origin Host
-            avp += self.generate_avp(296, 40, self.OriginRealm)                                              #Origin Realm
-            avp += self.generate_avp(268, 40, self.int_to_hex(2001, 4))
+            avp += self.originHostAvp                                               #Origin Host
+            avp += self.originRealmAvp                                              #Origin Realm
+            avp += self.resultCodeSuccessAvp
             response = self.generate_diameter_packet("01", "40", 275, 16777236, packet_vars['hop-by-hop-identifier'], packet_vars['end-to-end-identifier'], avp)     #Generate Diameter packet
             return response
 
@@ -3705,11 +3565,11 @@ class Diameter:
             Returns Result-Code 2001.
             """
             avp = ''
-            session_id = self.get_avp_data(avps, 263)[0]                                                     #Get Session-ID
+            session_id = avps.hex(263)                                                     #Get Session-ID
             avp += self.generate_avp(263, 40, session_id)                                                    #Set session ID to received session ID
-            avp += self.generate_avp(264, 40, self.OriginHost)                                               #Origin Host
-            avp += self.generate_avp(296, 40, self.OriginRealm)                                              #Origin Realm
-            avp += self.generate_avp(268, 40, self.int_to_hex(2001, 4))
+            avp += self.originHostAvp                                               #Origin Host
+            avp += self.originRealmAvp                                              #Origin Realm
+            avp += self.resultCodeSuccessAvp
             response = self.generate_diameter_packet("01", "40", 274, 16777236, packet_vars['hop-by-hop-identifier'], packet_vars['end-to-end-identifier'], avp)     #Generate Diameter packet
             return response
         except Exception as e:
@@ -3720,11 +3580,11 @@ class Diameter:
     def Answer_16777238_258(self, packet_vars, avps):
         try:
             avp = ''
-            session_id = self.get_avp_data(avps, 263)[0]                                                     #Get Session-ID
+            session_id = avps.hex(263)                                                     #Get Session-ID
             avp += self.generate_avp(263, 40, session_id)                                                    #Set session ID to received session ID
-            avp += self.generate_avp(264, 40, self.OriginHost)                                               #Origin Host
-            avp += self.generate_avp(296, 40, self.OriginRealm)                                              #Origin Realm
-            avp += self.generate_avp(268, 40, self.int_to_hex(2001, 4))
+            avp += self.originHostAvp                                               #Origin Host
+            avp += self.originRealmAvp                                              #Origin Realm
+            avp += self.resultCodeSuccessAvp
             response = self.generate_diameter_packet("01", "40", 274, 16777236, packet_vars['hop-by-hop-identifier'], packet_vars['end-to-end-identifier'], avp)     #Generate Diameter packet
             return response
         except Exception as e:
@@ -3736,7 +3596,7 @@ class Diameter:
         #Get IMSI
         try:
             imei = ''
-            imsi = self.get_avp_data(avps, 1)[0]                                                            #Get IMSI from User-Name AVP in request
+            imsi = avps.hex(1)                                                            #Get IMSI from User-Name AVP in request
             imsi = binascii.unhexlify(imsi).decode('utf-8')                                                 #Convert IMSI
             #avp += self.generate_avp(1, 40, self.string_to_hex(imsi))                                      #Username (IMSI)
             self.logTool.log(service='HSS', level='debug', message="Got IMSI with value " + str(imsi), redisClient=self.redisMessaging)
@@ -3746,24 +3606,21 @@ class Diameter:
 
         try:
             #Get IMEI
-            for sub_avp in self.get_avp_data(avps, 1401)[0]:
-                self.logTool.log(service='HSS', level='debug', message="Evaluating sub_avp AVP " + str(sub_avp) + " to find IMSI", redisClient=self.redisMessaging)
-                if sub_avp['avp_code'] == 1402:
-                    imei = binascii.unhexlify(sub_avp['misc_data']).decode('utf-8')
-                    self.logTool.log(service='HSS', level='debug', message="Found IMEI " + str(imei), redisClient=self.redisMessaging)
+            imei = avps.utf8String('Terminal-Information/IMEI')
+            self.logTool.log(service='HSS', level='debug', message="Found IMEI " + str(imei), redisClient=self.redisMessaging)
 
             avp = ''                                                                                        #Initiate empty var AVP
-            session_id = self.get_avp_data(avps, 263)[0]                                                    #Get Session-ID
+            session_id = avps.hex(263)                                                    #Get Session-ID
             avp += self.generate_avp(263, 40, session_id)                                                   #Set session ID to received session ID
-            avp += self.generate_avp(260, 40, "0000010a4000000c000028af000001024000000c01000024")           #Vendor-Specific-Application-ID for S13
-            avp += self.generate_avp(277, 40, "00000001")                                                   #Auth Session State        
-            avp += self.generate_avp(264, 40, self.OriginHost)                                              #Origin Host
-            avp += self.generate_avp(296, 40, self.OriginRealm)                                             #Origin Realm
+            avp += self.vendorSpecificApplicationIdAvps[16777252]           #Vendor-Specific-Application-ID for S13
+            avp += self.authSessionStateAvp                                                   #Auth Session State        
+            avp += self.originHostAvp                                              #Origin Host
+            avp += self.originRealmAvp                                             #Origin Realm
             #Experimental Result AVP(Response Code for Failure)
             avp_experimental_result = ''
             avp_experimental_result += self.generate_vendor_avp(266, 'c0', 10415, '')                         #AVP Vendor ID
             avp_experimental_result += self.generate_avp(298, 'c0', self.int_to_hex(2001, 4))                 #AVP Experimental-Result-Code: SUCESS (2001)
-            avp += self.generate_avp(268, 40, self.int_to_hex(2001, 4))                                 #Result Code (DIAMETER_SUCCESS (2001))
+            avp += self.resultCodeSuccessAvp                                 #Result Code (DIAMETER_SUCCESS (2001))
 
             #Equipment-Status
             EquipmentStatus = self.database.Check_EIR(imsi=imsi, imei=imei)
@@ -3788,43 +3645,35 @@ class Diameter:
     #3GPP SLh - LCS-Routing-Info-Answer
     def Answer_16777291_8388622(self, packet_vars, avps):
         avp = '' 
-        session_id = self.get_avp_data(avps, 263)[0]                                                    #Get Session-ID
+        session_id = avps.hex(263)                                                    #Get Session-ID
         avp += self.generate_avp(263, 40, session_id)                                                   #Set session    ID to received session ID
         #AVP: Vendor-Specific-Application-Id(260) l=32 f=-M-
-        VendorSpecificApplicationId = ''
-        VendorSpecificApplicationId += self.generate_vendor_avp(266, 40, 10415, '')                     #AVP Vendor ID
-        VendorSpecificApplicationId += self.generate_avp(258, 40, format(int(16777291),"x").zfill(8))   #Auth-Application-ID SLh
-        avp += self.generate_avp(260, 40, VendorSpecificApplicationId)   
-        avp += self.generate_avp(277, 40, "00000001")                                                   #Auth Session State (NO_STATE_MAINTAINED)        
-        avp += self.generate_avp(264, 40, self.OriginHost)                                              #Origin Host
-        avp += self.generate_avp(296, 40, self.OriginRealm)                                             #Origin Realm
-
-        #Create list of valid AVPs
-        present_avps = []
-        for avp_id in avps:
-            present_avps.append(avp_id['avp_code'])
-        
+        avp += self.vendorSpecificApplicationIdAvps[16777291]                                         #Vendor-Specific-Application-ID
+        avp += self.authSessionStateAvp                                                   #Auth Session State (NO_STATE_MAINTAINED)        
+        avp += self.originHostAvp                                              #Origin Host
+        avp += self.originRealmAvp                                             #Origin Realm
+
         #Define values so we can check if they've been changed
         msisdn = None
         imsi = None
 
         #Try and get IMSI if present
-        if 1 in present_avps:
+        if 1 in avps:
             self.logTool.log(service='HSS', level='debug', message="IMSI AVP is present", redisClient=self.redisMessaging)
             try:
-                imsi = self.get_avp_data(avps, 1)[0]                                                            #Get IMSI from User-Name AVP in request
+                imsi = avps.hex(1)                                                            #Get IMSI from User-Name AVP in request
                 imsi = binascii.unhexlify(imsi).decode('utf-8')                                                 #Convert IMSI
                 avp += self.generate_avp(1, 40, self.string_to_hex(imsi))                                       #Username (IMSI)
                 self.logTool.log(service='HSS', level='debug', message="Got IMSI with value " + str(imsi), redisClient=self.redisMessaging)
             except Exception as e:
                 self.logTool.log(service='HSS', level='debug', message="Failed to get IMSI from LCS-Routing-Info-Request", redisClient=self.redisMessaging)
                 self.logTool.log(service='HSS', level='debug', message="Error was: " + str(e), redisClient=self.redisMessaging)
-        elif 701 in present_avps:
+        elif 701 in avps:
             #Try and get MSISDN if present
             try:
-                msisdn = self.get_avp_data(avps, 701)[0]                                                          #Get MSISDN from AVP in request
+                msisdn = avps.hex(701)                                                          #Get MSISDN from AVP in request
                 self.logTool.log(service='HSS', level='debug', message="Got MSISDN with value " + str(msisdn), redisClient=self.redisMessaging)
-                avp += self.generate_vendor_avp(701, 'c0', 10415, self.get_avp_data(avps, 701)[0])                     #MSISDN
+                avp += self.generate_vendor_avp(701, 'c0', 10415, avps.hex(701))                     #MSISDN
                 self.logTool.log(service='HSS', level='debug', message="Got MSISDN with encoded value " + str(msisdn), redisClient=self.redisMessaging)
                 msisdn = self.TBCD_decode(msisdn)
                 self.logTool.log(service='HSS', level='debug', message="Got MSISDN with decoded value " + str(msisdn), redisClient=self.redisMessaging)
@@ -3894,11 +3743,11 @@ class Diameter:
     #Capabilities Exchange Request
     def Request_257(self):
         avp = ''
-        avp += self.generate_avp(264, 40, self.OriginHost)                                                    #Origin Host
-        avp += self.generate_avp(296, 40, self.OriginRealm)                                                   #Origin Realm
+        avp += self.originHostAvp                                                    #Origin Host
+        avp += self.originRealmAvp                                                   #Origin Realm
         avp += self.generate_avp(257, 40, self.ip_to_hex(socket.gethostbyname(socket.gethostname())))         #Host-IP-Address (For this to work on Linux this is the IP defined in the hostsfile for localhost)
         avp += self.generate_avp(266, 40, "00000000")                                                    #Vendor-Id
-        avp += self.generate_avp(269, "00", self.ProductName)                                                   #Product-Name
+        avp += self.productNameAvp                                                   #Product-Name
         avp += self.generate_avp(260, 40, "000001024000000c01000023" +  "0000010a4000000c000028af")      #Vendor-Specific-Application-ID (S6a)
         avp += self.generate_avp(260, 40, "000001024000000c01000016" +  "0000010a4000000c000028af")      #Vendor-Specific-Application-ID (Gx)
         avp += self.generate_avp(260, 40, "000001024000000c01000027" +  "0000010a4000000c000028af")      #Vendor-Specific-Application-ID (SLg)
@@ -3914,16 +3763,16 @@ class Diameter:
     #Device Watchdog Request
     def Request_280(self):
         avp = ''
-        avp += self.generate_avp(264, 40, self.OriginHost)                                                    #Origin Host
-        avp += self.generate_avp(296, 40, self.OriginRealm)                                                   #Origin Realm
+        avp += self.originHostAvp                                                    #Origin Host
+        avp += self.originRealmAvp                                                   #Origin Realm
         response = self.generate_diameter_packet("01", "80", 280, 0, self.generate_id(4), self.generate_id(4), avp)#Generate Diameter packet
         return response
 
     #Disconnect Peer Request
     def Request_282(self):                                                                      
         avp = ''                                                                                    #Initiate empty var AVP 
-        avp += self.generate_avp(264, 40, self.OriginHost)                                                    #Origin Host
-        avp += self.generate_avp(296, 40, self.OriginRealm)                                                   #Origin Realm
+        avp += self.originHostAvp                                                    #Origin Host
+        avp += self.originRealmAvp                                                   #Origin Realm
         avp += self.generate_avp(273, 40, "00000000")                                                    #Disconnect-Cause (REBOOTING (0))
         response = self.generate_diameter_packet("01", "80", 282, 0, self.generate_id(4), self.generate_id(4), avp)#Generate Diameter packet
         return response
@@ -3933,9 +3782,9 @@ class Diameter:
         avp = ''                                                                                    #Initiate empty var AVP                                                                                           #Session-ID
         sessionid = str(bytes.fromhex(self.OriginHost).decode('ascii')) + ';' + self.generate_id(5) + ';1;app_s6a'                           #Session state generate
         avp += self.generate_avp(263, 40, str(binascii.hexlify(str.encode(sessionid)),'ascii'))          #Session State set AVP
-        avp += self.generate_avp(277, 40, "00000001")                                                    #Auth-Session-State
-        avp += self.generate_avp(264, 40, self.OriginHost)                                                    #Origin Host
-        avp += self.generate_avp(296, 40, self.OriginRealm)                                                   #Origin Realm
+        avp += self.authSessionStateAvp                                                    #Auth-Session-State
+        avp += self.originHostAvp                                                    #Origin Host
+        avp += self.originRealmAvp                                                   #Origin Realm
         avp += self.generate_avp(283, 40, self.string_to_hex(DestinationRealm))                                                   #Destination Realm
         #avp += self.generate_avp(293, 40, self.string_to_hex(DestinationHost))                                                   #Destination Host
         avp += self.generate_avp(1, 40, self.string_to_hex(imsi))                                             #Username (IMSI)
@@ -3946,7 +3795,7 @@ class Diameter:
         mcc = str(imsi)[:3]
         mnc = str(imsi)[3:5]
         avp += self.generate_vendor_avp(1407, "c0", 10415, self.EncodePLMN(mcc, mnc))                    #Visited-PLMN-Id(1407) (Derrived from start of IMSI)
-        avp += self.generate_avp(260, 40, "0000010a4000000c000028af000001024000000c01000023")            #Vendor-Specific-Application-ID       
+        avp += self.vendorSpecificApplicationIdAvps[16777251]            #Vendor-Specific-Application-ID       
         response = self.generate_diameter_packet("01", "c0", 318, 16777251, self.generate_id(4), self.generate_id(4), avp)     #Generate Diameter packet
         return response
 
@@ -3957,16 +3806,16 @@ class Diameter:
         avp = ''                                                                                    #Initiate empty var AVP                                                                                           #Session-ID
         sessionid = str(bytes.fromhex(self.OriginHost).decode('ascii')) + ';' + self.generate_id(5) + ';1;app_s6a'                           #Session state generate
         avp += self.generate_avp(263, 40, str(binascii.hexlify(str.encode(sessionid)),'ascii'))          #Session State set AVP
-        avp += self.generate_avp(277, 40, "00000001")                                                    #Auth-Session-State
+        avp += self.authSessionStateAvp                                                    #Auth-Session-State
         avp += self.generate_avp(264, 40, str(binascii.hexlify(str.encode("testclient." + self.config['hss']['OriginHost'])),'ascii'))          
-        avp += self.generate_avp(296, 40, self.OriginRealm)                                                   #Origin Realm
+        avp += self.originRealmAvp                                                   #Origin Realm
         avp += self.generate_avp(283, 40, self.string_to_hex(DestinationRealm))                                                   #Destination Realm
         avp += self.generate_avp(1, 40, self.string_to_hex(imsi))                                             #Username (IMSI)
         avp += self.generate_vendor_avp(1032, "80", 10415, self.int_to_hex(1004, 4))                    #RAT-Type val=EUTRAN (1004)
         avp += self.generate_vendor_avp(1405, "c0", 10415, "00000002")                                  #ULR-Flags val=2
         avp += self.generate_vendor_avp(1407, "c0", 10415, self.EncodePLMN(mcc, mnc))                    #Visited-PLMN-Id(1407) (Derrived from start of IMSI)
         avp += self.generate_vendor_avp(1615, "80", 10415, "00000000")                                  #E-SRVCC-Capability val=UE-SRVCC-NOT-SUPPORTED (0)
-        avp += self.generate_avp(260, 40, "0000010a4000000c000028af000001024000000c01000023")            #Vendor-Specific-Application-ID
+        avp += self.vendorSpecificApplicationIdAvps[16777251]            #Vendor-Specific-Application-ID
         response = self.generate_diameter_packet("01", "c0", 316, 16777251, self.generate_id(4), self.generate_id(4), avp)     #Generate Diameter packet
         return response
     
@@ -3975,13 +3824,13 @@ class Diameter:
         avp = ''
         sessionid = str(bytes.fromhex(self.OriginHost).decode('ascii')) + ';' + self.generate_id(5) + ';1;app_s6a'                           #Session state generate
         avp += self.generate_avp(263, 40, str(binascii.hexlify(str.encode(sessionid)),'ascii'))               #Session State set AVP
-        avp += self.generate_avp(277, 40, "00000001")                                                         #Auth-Session-State
-        avp += self.generate_avp(264, 40, self.OriginHost)                                                    #Origin Host
-        avp += self.generate_avp(296, 40, self.OriginRealm)                                                   #Origin Realm
+        avp += self.authSessionStateAvp                                                         #Auth-Session-State
+        avp += self.originHostAvp                                                    #Origin Host
+        avp += self.originRealmAvp                                                   #Origin Realm
         avp += self.generate_avp(283, 40, self.string_to_hex(DestinationRealm))                               #Destination Realm
         #avp += self.generate_avp(293, 40, self.string_to_hex(DestinationHost))                                #Destination Host
         avp += self.generate_avp(1, 40, self.string_to_hex(imsi))                                             #Username (IMSI)
-        avp += self.generate_avp(260, 40, "0000010a4000000c000028af000001024000000c01000023")                 #Vendor-Specific-Application-ID
+        avp += self.vendorSpecificApplicationIdAvps[16777251]                 #Vendor-Specific-Application-ID
         response = self.generate_diameter_packet("01", "c0", 321, 16777251, self.generate_id(4), self.generate_id(4), avp)     #Generate Diameter packet
         return response
 
@@ -3990,13 +3839,13 @@ class Diameter:
         avp = ''
         sessionid = str(bytes.fromhex(self.OriginHost).decode('ascii')) + ';' + self.generate_id(5) + ';1;app_s6a'                           #Session state generate
         avp += self.generate_avp(263, 40, str(binascii.hexlify(str.encode(sessionid)),'ascii'))               #Session State set AVP
-        avp += self.generate_avp(277, 40, "00000001")                                                         #Auth-Session-State
-        avp += self.generate_avp(264, 40, self.OriginHost)                                                    #Origin Host
-        avp += self.generate_avp(296, 40, self.OriginRealm)                                                   #Origin Realm
+        avp += self.authSessionStateAvp                                                         #Auth-Session-State
+        avp += self.originHostAvp                                                    #Origin Host
+        avp += self.originRealmAvp                                                   #Origin Realm
         avp += self.generate_avp(283, 40, self.string_to_hex(DestinationRealm))                               #Destination Realm
         #avp += self.generate_avp(293, 40, self.string_to_hex(DestinationHost))                                #Destination Host
         avp += self.generate_avp(1, 40, self.string_to_hex(imsi))                                             #Username (IMSI)
-        avp += self.generate_avp(260, 40, "0000010a4000000c000028af000001024000000c01000023")                 #Vendor-Specific-Application-ID
+        avp += self.vendorSpecificApplicationIdAvps[16777251]                 #Vendor-Specific-Application-ID
         response = self.generate_diameter_packet("01", "c0", 323, 16777251, self.generate_id(4), self.generate_id(4), avp)     #Generate Diameter packet
         return response
 
@@ -4005,14 +3854,14 @@ class Diameter:
         avp = ''
         sessionid = str(bytes.fromhex(self.OriginHost).decode('ascii')) + ';' + self.generate_id(5) + ';1;app_s6a'                      #Session state generate
         avp += self.generate_avp(263, 40, str(binascii.hexlify(str.encode(sessionid)),'ascii'))          #Session State set AVP
-        avp += self.generate_avp(277, 40, "00000001")                                                    #Auth-Session-State
-        avp += self.generate_avp(264, 40, self.OriginHost)                                               #Origin Host
-        avp += self.generate_avp(296, 40, self.OriginRealm)                                              #Origin Realm
+        avp += self.authSessionStateAvp                                                    #Auth-Session-State
+        avp += self.originHostAvp                                               #Origin Host
+        avp += self.originRealmAvp                                              #Origin Realm
         avp += self.generate_avp(283, 40, self.string_to_hex(DestinationRealm))                         #Destination Realm
         if DestinationHost != None:
             avp += self.generate_avp(293, 40, self.string_to_hex(DestinationHost))                           #Destination Host
         avp += self.generate_avp(1, 40, self.string_to_hex(imsi))                                        #Username (IMSI)
-        avp += self.generate_avp(260, 40, "0000010a4000000c000028af000001024000000c01000023")            #Vendor-Specific-Application-ID
+        avp += self.vendorSpecificApplicationIdAvps[16777251]            #Vendor-Specific-Application-ID
         avp += self.generate_vendor_avp(1420, "c0", 10415,  self.int_to_hex(CancellationType, 4))                       #Cancellation-Type (Subscription Withdrawl)
         if immediateReattach:
             avp += self.generate_vendor_avp(1638, "c0", 10415,  self.int_to_hex(2, 4))                       #CLR Flags
@@ -4025,9 +3874,9 @@ class Diameter:
         sessionid = str(bytes.fromhex(self.OriginHost).decode('ascii')) + ';' + self.generate_id(5) + ';1;app_s6a'                 #Session ID generate
         avp += self.generate_avp(263, 40, str(binascii.hexlify(str.encode(sessionid)),'ascii'))     #Session ID set AVP
         avp += self.generate_avp(260, 40, "000001024000000c" + format(int(16777251),"x").zfill(8) +  "0000010a4000000c000028af")      #Vendor-Specific-Application-ID (S6a) 
-        avp += self.generate_avp(277, 40, "00000001")                                               #Auth-Session-State
-        avp += self.generate_avp(264, 40, self.OriginHost)                                          #Origin Host
-        avp += self.generate_avp(296, 40, self.OriginRealm)                                         #Origin Realm
+        avp += self.authSessionStateAvp                                               #Auth-Session-State
+        avp += self.originHostAvp                                          #Origin Host
+        avp += self.originRealmAvp                                         #Origin Realm
         avp += self.generate_vendor_avp(266, 40, 10415, '')                                         #AVP Vendor ID
         #AVP: Vendor-Specific-Application-Id(260) l=32 f=-M-
         VendorSpecificApplicationId = ''
@@ -4221,14 +4070,14 @@ class Diameter:
         sessionid = str(bytes.fromhex(self.OriginHost).decode('ascii')) + ';' + self.generate_id(5) + ';1;app_cx'                           #Session state generate
         #Auth Session state
         avp += self.generate_avp(263, 40, str(binascii.hexlify(str.encode(sessionid)),'ascii'))          #Session State set AVP
-        avp += self.generate_avp(277, 40, "00000001")                                                    #Auth-Session-State
-        avp += self.generate_avp(264, 40, self.OriginHost)                                                    #Origin Host
-        avp += self.generate_avp(296, 40, self.OriginRealm)                                                   #Origin Realm
+        avp += self.authSessionStateAvp                                                    #Auth-Session-State
+        avp += self.originHostAvp                                                    #Origin Host
+        avp += self.originRealmAvp                                                   #Origin Realm
         avp += self.generate_avp(283, 40, str(binascii.hexlify(b'localdomain'),'ascii'))                 #Destination Realm
         avp += self.generate_vendor_avp(601, "c0", 10415, self.string_to_hex(sipaor))                      #Public-Identity / SIP-AOR
         avp += self.generate_avp(293, 40, str(binascii.hexlify(b'hss.localdomain'),'ascii'))                 #Destination Host
 
-        avp += self.generate_avp(260, 40, "0000010a4000000c000028af000001024000000c01000000")            #Vendor-Specific-Application-ID
+        avp += self.vendorSpecificApplicationIdAvps[16777216]            #Vendor-Specific-Application-ID
 
 
         response = self.generate_diameter_packet("01", "c0", 302, 16777216, self.generate_id(4), self.generate_id(4), avp)     #Generate Diameter packet
@@ -4239,11 +4088,11 @@ class Diameter:
         avp = ''                                                                                    #Initiate empty var AVP                                                                                           #Session-ID
         sessionid = str(bytes.fromhex(self.OriginHost).decode('ascii')) + ';' + self.generate_id(5) + ';1;app_cx'                           #Session state generate
         avp += self.generate_avp(263, 40, str(binascii.hexlify(str.encode(sessionid)),'ascii'))          #Session State set AVP
-        avp += self.generate_avp(264, 40, self.OriginHost)                                                    #Origin Host
-        avp += self.generate_avp(296, 40, self.OriginRealm)                                                   #Origin Realm
+        avp += self.originHostAvp                                                    #Origin Host
+        avp += self.originRealmAvp                                                   #Origin Realm
         avp += self.generate_avp(283, 40, str(binascii.hexlify(b'localdomain'),'ascii'))                 #Destination Realm
-        avp += self.generate_avp(260, 40, "0000010a4000000c000028af000001024000000c01000000")            #Vendor-Specific-Application-ID for Cx
-        avp += self.generate_avp(277, 40, "00000001")                                                    #Auth-Session-State
+        avp += self.vendorSpecificApplicationIdAvps[16777216]            #Vendor-Specific-Application-ID for Cx
+        avp += self.authSessionStateAvp                                                    #Auth-Session-State
         avp += self.generate_avp(1, 40, self.string_to_hex(imsi + "@" + domain))                   #User-Name
         avp += self.generate_vendor_avp(601, "c0", 10415, self.string_to_hex("sip:" + imsi + "@" + domain))                 #Public-Identity
         avp += self.generate_vendor_avp(600, "c0", 10415, self.string_to_hex(domain))               #Visited Network Identifier
@@ -4256,10 +4105,10 @@ class Diameter:
         sessionid = str(bytes.fromhex(self.OriginHost).decode('ascii')) + ';' + self.generate_id(5) + ';1;app_cx'                           #Session state generate
         avp += self.generate_avp(263, 40, str(binascii.hexlify(str.encode(sessionid)),'ascii'))          #Session Session ID
         avp += self.generate_avp(264, 40, str(binascii.hexlify(str.encode("testclient." + self.config['hss']['OriginHost'])),'ascii'))                                                              #Origin Host
-        avp += self.generate_avp(296, 40, self.OriginRealm)                                                   #Origin Realm
+        avp += self.originRealmAvp                                                   #Origin Realm
         avp += self.generate_avp(283, 40, str(binascii.hexlify(b'localdomain'),'ascii'))                 #Destination Realm
-        avp += self.generate_avp(260, 40, "0000010a4000000c000028af000001024000000c01000000")            #Vendor-Specific-Application-ID for Cx
-        avp += self.generate_avp(277, 40, "00000001")                                                    #Auth-Session-State (Not maintained)
+        avp += self.vendorSpecificApplicationIdAvps[16777216]            #Vendor-Specific-Application-ID for Cx
+        avp += self.authSessionStateAvp                                                    #Auth-Session-State (Not maintained)
         avp += self.generate_vendor_avp(601, "c0", 10415, self.string_to_hex("sip:" + imsi + "@" + domain))                 #Public-Identity
         avp += self.generate_vendor_avp(602, "c0", 10415, self.string_to_hex('sip:scscf.ims.mnc' + self.MNC + '.mcc' + self.MCC + '.3gppnetwork.org:5060'))                 #Public-Identity
         avp += self.generate_avp(1, 40, self.string_to_hex(imsi + "@" + domain))                   #User-Name
@@ -4273,11 +4122,11 @@ class Diameter:
         avp = ''                                                                                    #Initiate empty var AVP                                                                                           #Session-ID
         sessionid = str(bytes.fromhex(self.OriginHost).decode('ascii')) + ';' + self.generate_id(5) + ';1;app_cx'                           #Session state generate
         avp += self.generate_avp(263, 40, str(binascii.hexlify(str.encode(sessionid)),'ascii'))          #Session State set AVP
-        avp += self.generate_avp(264, 40, self.OriginHost)                                                    #Origin Host
-        avp += self.generate_avp(296, 40, self.OriginRealm)                                                   #Origin Realm
+        avp += self.originHostAvp                                                    #Origin Host
+        avp += self.originRealmAvp                                                   #Origin Realm
         avp += self.generate_avp(283, 40, str(binascii.hexlify(b'localdomain'),'ascii'))                 #Destination Realm
-        avp += self.generate_avp(260, 40, "0000010a4000000c000028af000001024000000c01000000")            #Vendor-Specific-Application-ID for Cx
-        avp += self.generate_avp(277, 40, "00000001")                                                    #Auth-Session-State (Not maintained)
+        avp += self.vendorSpecificApplicationIdAvps[16777216]            #Vendor-Specific-Application-ID for Cx
+        avp += self.authSessionStateAvp                                                    #Auth-Session-State (Not maintained)
         avp += self.generate_avp(1, 40, self.string_to_hex(str(imsi) + "@" + domain))                         #User-Name
         avp += self.generate_vendor_avp(601, "c0", 10415, self.string_to_hex("sip:" + str(imsi) + "@" + domain))                      #Public-Identity
         avp += self.generate_vendor_avp(607, "c0", 10415, "00000001")                                    #3GPP-SIP-Number-Auth-Items
@@ -4295,8 +4144,8 @@ class Diameter:
         avp += self.generate_avp(263, 40, str(binascii.hexlify(str.encode(sessionid)),'ascii'))          #Session ID AVP
         avp += self.generate_avp(260, 40, "000001024000000c" + format(int(16777216),"x").zfill(8) +  "0000010a4000000c000028af")      #Vendor-Specific-Application-ID (Cx)
         
-        avp += self.generate_avp(264, 40, self.OriginHost)                                                    #Origin Host
-        avp += self.generate_avp(296, 40, self.OriginRealm)                                                   #Origin Realm
+        avp += self.originHostAvp                                                    #Origin Host
+        avp += self.originRealmAvp                                                   #Origin Realm
         
         #SIP-Deregistration-Reason
         reason_code_avp = self.generate_vendor_avp(616, "c0", 10415, "00000000")
@@ -4306,7 +4155,7 @@ class Diameter:
         avp += self.generate_avp(283, 40, self.string_to_hex(destinationRealm))                 #Destination Realm
         avp += self.generate_avp(293, 40, self.string_to_hex(destinationHost))                 #Destination Host
         
-        avp += self.generate_avp(277, 40, "00000001")                                                    #Auth-Session-State (Not maintained)
+        avp += self.authSessionStateAvp                                                    #Auth-Session-State (Not maintained)
         avp += self.generate_avp(1, 40, self.string_to_hex(str(imsi) + "@" + domain))                         #User-Name
         avp += self.generate_vendor_avp(601, "c0", 10415, self.string_to_hex("sip:" + str(imsi) + "@" + domain))                      #Public-Identity
         avp += self.generate_vendor_avp(602, "c0", 10415, self.ProductName)                         #Server-Name
@@ -4325,13 +4174,13 @@ class Diameter:
         avp += self.generate_avp(263, 40, str(binascii.hexlify(str.encode(sessionid)),'ascii'))          #Session ID AVP
         avp += self.generate_avp(260, 40, "000001024000000c" + format(int(16777217),"x").zfill(8) +  "0000010a4000000c000028af")      #Vendor-Specific-Application-ID (Sh)
         
-        avp += self.generate_avp(264, 40, self.OriginHost)                                                    #Origin Host
-        avp += self.generate_avp(296, 40, self.OriginRealm)                                                   #Origin Realm
+        avp += self.originHostAvp                                                    #Origin Host
+        avp += self.originRealmAvp                                                   #Origin Realm
 
         avp += self.generate_avp(283, 40, str(binascii.hexlify(b'localdomain'),'ascii'))                 #Destination Realm
         avp += self.generate_avp(293, 40, str(binascii.hexlify(b'hss.localdomain'),'ascii'))                 #Destination Host
         
-        avp += self.generate_avp(277, 40, "00000001")                                                    #Auth-Session-State (Not maintained)
+        avp += self.authSessionStateAvp                                                    #Auth-Session-State (Not maintained)
         
         avp += self.generate_vendor_avp(602, "c0", 10415, self.ProductName)                         #Server-Name
 
@@ -4356,10 +4205,10 @@ class Diameter:
     #3GPP S13 - ME-Identity-Check Request
     def Request_16777252_324(self, imsi, imei, software_version):
         avp = ''
-        avp += self.generate_avp(260, 40, "0000010a4000000c000028af000001024000000c01000024")           #Vendor-Specific-Application-ID for S13
-        avp += self.generate_avp(277, 40, "00000001")                                                    #Auth-Session-State (Not maintained)        
-        avp += self.generate_avp(264, 40, self.OriginHost)                                                    #Origin Host
-        avp += self.generate_avp(296, 40, self.OriginRealm)                                                   #Origin Realm
+        avp += self.vendorSpecificApplicationIdAvps[16777252]           #Vendor-Specific-Application-ID for S13
+        avp += self.authSessionStateAvp                                                    #Auth-Session-State (Not maintained)        
+        avp += self.originHostAvp                                                    #Origin Host
+        avp += self.originRealmAvp                                                   #Origin Realm
         avp += self.generate_avp(283, 40, str(binascii.hexlify(b'localdomain'),'ascii'))                 #Destination Realm
         avp += self.generate_avp(293, 40, str(binascii.hexlify(b'eir.localdomain'),'ascii'))                 #Destination Host
         imei = self.generate_vendor_avp(1402, "c0", 10415, str(binascii.hexlify(str.encode(imei)),'ascii'))
@@ -4373,10 +4222,10 @@ class Diameter:
     def Request_16777255_8388620(self, imsi):
         avp = ''
         #ToDo - Update the Vendor Specific Application ID
-        avp += self.generate_avp(260, 40, "0000010a4000000c000028af000001024000000c01000024")           #Vendor-Specific-Application-ID
-        avp += self.generate_avp(277, 40, "00000001")                                                    #Auth-Session-State (Not maintained)        
-        avp += self.generate_avp(264, 40, self.OriginHost)                                                    #Origin Host
-        avp += self.generate_avp(296, 40, self.OriginRealm)                                                   #Origin Realm
+        avp += self.vendorSpecificApplicationIdAvps[16777252]           #Vendor-Specific-Application-ID
+        avp += self.authSessionStateAvp                                                    #Auth-Session-State (Not maintained)        
+        avp += self.originHostAvp                                                    #Origin Host
+        avp += self.originRealmAvp                                                   #Origin Realm
         avp += self.generate_avp(283, 40, str(binascii.hexlify(b'localdomain'),'ascii'))                 #Destination Realm
         avp += self.generate_avp(293, 40, str(binascii.hexlify(b'mme-slg.localdomain'),'ascii'))                 #Destination Host        
         #SLg Location Type AVP
@@ -4396,13 +4245,10 @@ class Diameter:
     def Request_16777291_8388622(self, **kwargs):
         avp = ''
         #AVP: Vendor-Specific-Application-Id(260) l=32 f=-M-
-        VendorSpecificApplicationId = ''
-        VendorSpecificApplicationId += self.generate_vendor_avp(266, 40, 10415, '')                     #AVP Vendor ID
-        VendorSpecificApplicationId += self.generate_avp(258, 40, format(int(16777252),"x").zfill(8))   #Auth-Application-ID S13
-        avp += self.generate_avp(260, 40, VendorSpecificApplicationId)   
-        avp += self.generate_avp(277, 40, "00000001")                                                    #Auth-Session-State (Not maintained)        
-        avp += self.generate_avp(264, 40, self.OriginHost)                                               #Origin Host
-        avp += self.generate_avp(296, 40, self.OriginRealm)                                              #Origin Realm
+        avp += self.vendorSpecificApplicationIdAvps[16777252]                                         #Vendor-Specific-Application-ID
+        avp += self.authSessionStateAvp                                                    #Auth-Session-State (Not maintained)        
+        avp += self.originHostAvp                                               #Origin Host
+        avp += self.originRealmAvp                                              #Origin Realm
 
         sessionid = str(bytes.fromhex(self.OriginHost).decode('ascii')) + self.generate_id(5) + ';1;app_slh'                           #Session state generate
         avp += self.generate_avp(263, 40, str(binascii.hexlify(str.encode(sessionid)),'ascii'))          #Session State set AVP
@@ -4430,13 +4276,10 @@ class Diameter:
             sessionid = sessionId
         avp += self.generate_avp(263, 40, str(binascii.hexlify(str.encode(sessionid)),'ascii'))          #Session State set AVP
         #AVP: Vendor-Specific-Application-Id(260) l=32 f=-M-
-        VendorSpecificApplicationId = ''
-        VendorSpecificApplicationId += self.generate_vendor_avp(266, 40, 10415, '')                     #AVP Vendor ID
-        VendorSpecificApplicationId += self.generate_avp(258, 40, format(int(16777238),"x").zfill(8))   #Auth-Application-ID Gx
-        avp += self.generate_avp(260, 40, VendorSpecificApplicationId)   
-        avp += self.generate_avp(277, 40, "00000001")                                                    #Auth-Session-State (Not maintained)        
-        avp += self.generate_avp(264, 40, self.OriginHost)                                               #Origin Host
-        avp += self.generate_avp(296, 40, self.OriginRealm)                                              #Origin Realm
+        avp += self.vendorSpecificApplicationIdAvps[16777238]                                         #Vendor-Specific-Application-ID
+        avp += self.authSessionStateAvp                                                    #Auth-Session-State (Not maintained)        
+        avp += self.originHostAvp                                               #Origin Host
+        avp += self.originRealmAvp                                              #Origin Realm
         
         avp += self.generate_avp(258, 40, format(int(16777238),"x").zfill(8))   #Auth-Application-ID Gx
 
@@ -4494,8 +4337,8 @@ class Diameter:
             avp += self.Charging_Rule_Generator(action=chargingRuleAction, chargingRuleName=chargingRuleName)
             self.logTool.log(service='HSS', level='debug', message=f"[diameter.py] [Request_16777238_258] [RAR] Removing Charging Rule: {chargingRuleName}", redisClient=self.redisMessaging)
 
-        avp += self.generate_avp(264, 40, self.OriginHost)                                               #Origin Host
-        avp += self.generate_avp(296, 40, self.OriginRealm)                                              #Origin Realm
+        avp += self.originHostAvp                                               #Origin Host
+        avp += self.originRealmAvp                                              #Origin Realm
         avp += self.generate_avp(293, 40, self.string_to_hex(servingPgw))                                               #Destination Host
         avp += self.generate_avp(283, 40, self.string_to_hex(servingRealm))                                               #Destination Realm
        
@@ -4511,8 +4354,8 @@ class Diameter:
         avp = ''
         avp += self.generate_avp(263, 40, str(binascii.hexlify(str.encode(sessionid)),'ascii'))          #Session-Id set AVP
 
-        avp += self.generate_avp(264, 40, self.OriginHost)                                                  #Origin Host
-        avp += self.generate_avp(296, 40, self.OriginRealm)                                                 #Origin Realm
+        avp += self.originHostAvp                                                  #Origin Host
+        avp += self.originRealmAvp                                                 #Origin Realm
         avp += self.generate_avp(283, 40, self.OriginRealm)                                                 #Destination Realm
        
         avp += self.generate_avp(258, 40, format(int(4),"x").zfill(8))                                      #Auth-Application-ID Gx
@@ -4574,14 +4417,11 @@ class Diameter:
         sessionid = 'nickpc.localdomain;' + self.generate_id(5) + ';1;app_sh'                           #Session state generate
         avp += self.generate_avp(263, 40, str(binascii.hexlify(str.encode(sessionid)),'ascii'))          #Session State set AVP
         #AVP: Vendor-Specific-Application-Id(260) l=32 f=-M-
-        VendorSpecificApplicationId = ''
-        VendorSpecificApplicationId += self.generate_vendor_avp(266, 40, 10415, '')                     #AVP Vendor ID
-        VendorSpecificApplicationId += self.generate_avp(258, 40, format(int(16777217),"x").zfill(8))   #Auth-Application-ID Gx
-        avp += self.generate_avp(260, 40, VendorSpecificApplicationId)   
-        avp += self.generate_avp(277, 40, "00000001")                                                    #Auth-Session-State (Not maintained)        
+        avp += self.vendorSpecificApplicationIdAvps[16777217]                                         #Vendor-Specific-Application-ID
+        avp += self.authSessionStateAvp                                                    #Auth-Session-State (Not maintained)        
         avp += self.generate_avp(264, 40, self.string_to_hex('ExamplePGW.com'))                          #Origin Host
         avp += self.generate_avp(283, 40, self.OriginRealm)                                              #Destination Realm
-        avp += self.generate_avp(296, 40, self.OriginRealm)                                              #Origin Realm
+        avp += self.originRealmAvp                                              #Origin Realm
 
         self.logTool.log(service='HSS', level='debug', message="Getting subscriber IMS info based on MSISDN", redisClient=self.redisMessaging)
         subscriber_ims_details = self.database.Get_IMS_Subscriber(msisdn=msisdn)
@@ -4618,14 +4458,11 @@ class Diameter:
         sessionid = 'nickpc.localdomain;' + self.generate_id(5) + ';1;app_s13'                           #Session state generate
         avp += self.generate_avp(263, 40, str(binascii.hexlify(str.encode(sessionid)),'ascii'))          #Session State set AVP
         #AVP: Vendor-Specific-Application-Id(260) l=32 f=-M-
-        VendorSpecificApplicationId = ''
-        VendorSpecificApplicationId += self.generate_vendor_avp(266, 40, 10415, '')                     #AVP Vendor ID
-        VendorSpecificApplicationId += self.generate_avp(258, 40, format(int(16777238),"x").zfill(8))   #Auth-Application-ID Gx
-        avp += self.generate_avp(260, 40, VendorSpecificApplicationId)   
-        avp += self.generate_avp(277, 40, "00000001")                                                    #Auth-Session-State (Not maintained)        
+        avp += self.vendorSpecificApplicationIdAvps[16777238]                                         #Vendor-Specific-Application-ID
+        avp += self.authSessionStateAvp                                                    #Auth-Session-State (Not maintained)        
         avp += self.generate_avp(264, 40, self.string_to_hex('ExamplePGW.com'))                          #Origin Host
         avp += self.generate_avp(283, 40, self.OriginRealm)                                              #Destination Realm
-        avp += self.generate_avp(296, 40, self.OriginRealm)                                              #Origin Realm
+        avp += self.originRealmAvp                                              #Origin Realm
         
         avp += self.generate_avp(1, 40, str(binascii.hexlify(str.encode(imsi)),'ascii'))                 #Username AVP
         TerminalInformation = ''
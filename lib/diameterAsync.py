@@ -7,6 +7,8 @@ import socket
 import traceback
 import binascii
 from messagingAsync import RedisMessagingAsync
+import diameterDecoder
+import diameterEncoder
 
 
 class DiameterAsync:
@@ -35,6 +37,15 @@ class DiameterAsync:
                 {"commandCode": 8388622, "applicationId": 16777291, "responseMethod": self.Answer_16777291_8388622, "failureResultCode": 4100 ,"requestAcronym": "LRR", "responseAcronym": "LRA", "requestName": "LCS Routing Info Request", "responseName": "LCS Routing Info Answer"},
             ]
 
+        #Dispatch tables keyed on (Application Id, Command Code, Request Bit), built once so each message is matched with a single lookup
+        self.diameterResponseTable = {}
+        self.diameterMessageTypeTable = {}
+        for diameterApplication in self.diameterCommandList:
+            applicationKey = (diameterApplication["applicationId"], diameterApplication["commandCode"])
+            self.diameterResponseTable[applicationKey + (True,)] = diameterApplication
+            self.diameterMessageTypeTable[applicationKey + (True,)] = {'inbound': diameterApplication["requestAcronym"], 'outbound': diameterApplication["responseAcronym"]}
+            self.diameterMessageTypeTable[applicationKey + (False,)] = {'inbound': diameterApplication["responseAcronym"], 'outbound': diameterApplication["requestAcronym"]}
+
         with open("../config.yaml", 'r') as stream:
             self.config = (yaml.safe_load(stream))
             
@@ -42,11 +53,21 @@ class DiameterAsync:
         self.redisUnixSocketPath = self.config.get('redis', {}).get('unixSocketPath', '/var/run/redis/redis-server.sock')
         self.redisHost = self.config.get('redis', {}).get('host', 'localhost')
         self.redisPort = self.config.get('redis', {}).get('port', 6379)
+        self.decoderType = str(self.config.get('hss', {}).get('diameter_decoder', 'binary')).lower()
         self.redisMessaging = RedisMessagingAsync(host=self.redisHost, port=self.redisPort, useUnixSocket=self.redisUseUnixSocket, unixSocketPath=self.redisUnixSocketPath)
 
         self.logTool = logTool
         self.hostname = socket.gethostname()
 
+        #Base protocol answers (CEA, DWA, DPA) are built from AVPs which never change for this HSS instance, so they're encoded once here
+        self.originHost = self.config.get('hss', {}).get('OriginHost', 'hss01')
+        self.originRealm = self.config.get('hss', {}).get('OriginRealm', 'epc.mnc999.mcc999.3gppnetwork.org')
+        self.productName = self.config.get('hss', {}).get('ProductName', 'PyHSS')
+        self.originHostAvp = diameterEncoder.encodeAvp(264, 0x40, self.originHost.encode('utf-8'))                     #Origin Host
+        self.originRealmAvp = diameterEncoder.encodeAvp(296, 0x40, self.originRealm.encode('utf-8'))                   #Origin Realm
+        self.resultCodeSuccessAvp = diameterEncoder.encodeAvp(268, 0x40, (2001).to_bytes(4, 'big'))                    #Result Code (DIAMETER_SUCCESS (2001))
+        self.capabilitiesExchangeAvps = diameterEncoder.encodeCapabilitiesExchangeAvps(self.config.get('hss', {}).get('bind_ip', []), self.productName.encode('utf-8'))
+
     #Generates rounding for calculating padding
     async def myRound(self, n, base=4):
         if(n > 0):
@@ -69,12 +90,8 @@ class DiameterAsync:
         return ((n + multiple - 1) // multiple) * multiple
 
     async def getAvpData(self, avps, avp_code):
-        #Loops through list of dicts generated by the packet decoder, and returns the data for a specific AVP code in list (May be more than one AVP with same code but different data)
-        misc_data = []
-        for keys in avps:
-            if keys['avp_code'] == avp_code:
-                misc_data.append(keys['misc_data'])
-        return misc_data
+        #Returns the hex data of every top level AVP matching avp_code from an AvpContainer, in a list (May be more than one AVP with same code but different data)
+        return [avp.hex() for avp in avps if avp.code == avp_code]
 
     async def validateSingleAvp(self, data) -> bool:
         """
@@ -100,7 +117,12 @@ class DiameterAsync:
     async def decodeDiameterPacket(self, data):
         """
         Handles decoding of a full diameter packet.
+        Uses the binary decoder unless hss.diameter_decoder is set to 'legacy' in the config.
         """
+        if self.decoderType != 'legacy':
+            header, avps = diameterDecoder.decodePacket(data)
+            return header.toPacketVars(), diameterDecoder.AvpContainer(avps)
+
         packet_vars = {}
         avps = []
 
@@ -141,7 +163,7 @@ class DiameterAsync:
         avps = await self.decodeAvpPacket(remaining_avps)
         #print(f"Got Back: {avps}")
 
-        return packet_vars, avps
+        return packet_vars, diameterDecoder.fromLegacyAvps(avps)
 
     async def decodeAvpPacket(self, data):
         """
@@ -270,45 +292,34 @@ class DiameterAsync:
             except Exception as e:
                 return []
 
-    async def getDiameterMessageType(self, binaryData: str) -> dict:
+    async def getDiameterMessageType(self, binaryData: str=None, packetVars: dict=None) -> dict:
         """
         Determines whether a message is a request or a response, and the appropriate acronyms for each type.
+        Pass packetVars from decodeDiameterPacket to avoid decoding the message again.
         """
-        packet_vars, avps = await(self.decodeDiameterPacket(binaryData))
-        response = {}
-        
-        for diameterApplication in self.diameterCommandList:
-            try:
-                assert(packet_vars["command_code"] == diameterApplication["commandCode"])
-                assert(packet_vars["ApplicationId"] == diameterApplication["applicationId"])
-                if packet_vars["flags_bin"][0:1] == "1":
-                    response['inbound'] = diameterApplication["requestAcronym"]
-                    response['outbound'] = diameterApplication["responseAcronym"]
-                else:
-                    response['inbound'] = diameterApplication["responseAcronym"]
-                    response['outbound'] = diameterApplication["requestAcronym"]
-            except Exception as e:
-                continue
-        
-        return response
+        if packetVars is None:
+            packetVars, avps = await(self.decodeDiameterPacket(binaryData))
+        return dict(self.diameterMessageTypeTable.get((packetVars["ApplicationId"], packetVars["command_code"], packetVars["flags_bin"][0:1] == "1"), {}))
 
-    async def generateDiameterResponse(self, binaryData: str) -> str:
-        packet_vars, avps = await(self.decodeDiameterPacket(binaryData))
+    async def generateDiameterResponse(self, binaryData: str=None, packetVars: dict=None, avps=None) -> str:
+        if packetVars is None:
+            packetVars, avps = await(self.decodeDiameterPacket(binaryData))
         response = ''
 
         # Drop packet if it's a response packet:
-        if packet_vars["flags_bin"][0:1] == "0":
+        if packetVars["flags_bin"][0:1] == "0":
             return
         
-        for diameterApplication in self.diameterCommandList:
-            try:
-                assert(packet_vars["command_code"] == diameterApplication["commandCode"])
-                assert(packet_vars["ApplicationId"] == diameterApplication["applicationId"])
-                if 'flags' in diameterApplication:
-                    assert(str(packet_vars["flags"]) == str(diameterApplication["flags"]))
-                response = diameterApplication["responseMethod"](packet_vars, avps)
-            except Exception as e:
-                continue
+        diameterApplication = self.diameterResponseTable.get((packetVars["ApplicationId"], packetVars["command_code"], True), None)
+        if diameterApplication is None:
+            return response
+        if 'flags' in diameterApplication and str(packetVars["flags"]) != str(diameterApplication["flags"]):
+            return response
+        try:
+            response = await(diameterApplication["responseMethod"](packetVars, avps))
+        except Exception as e:
+            await(self.logTool.logAsync(service='Diameter', level='error', message=f"[diameterAsync.py] [generateDiameterResponse] Failed to generate {diameterApplication.get('requestAcronym', packetVars['command_code'])} answer: {traceback.format_exc()}", redisClient=self.redisMessaging))
+            return ''
         
         return response
 
@@ -316,67 +327,19 @@ class DiameterAsync:
         length = length * 2
         return str(uuid.uuid4().hex[:length])
 
-    #Generates an AVP with inputs provided (AVP Code, AVP Flags, AVP Content, Padding)
+    #Generates an AVP with inputs provided (AVP Code, AVP Flags, AVP Content), padded to a multiple of 4 bytes
     #AVP content must already be in HEX - This can be done with binascii.hexlify(avp_content.encode())
     async def generate_avp(self, avp_code, avp_flags, avp_content):
-        avp_code = format(avp_code,"x").zfill(8)
-        
-        avp_length = 1 ##This is a placeholder that's overwritten later
+        return diameterEncoder.encodeAvp(avp_code, int(str(avp_flags), 16), bytes.fromhex(avp_content)).hex()
 
-        #AVP Must always be a multiple of 4 - Round up to nearest multiple of 4 and fill remaining bits with padding
-        avp = str(avp_code) + str(avp_flags) + str("000000") + str(avp_content)
-        avp_length = int(len(avp)/2)
-
-        if avp_length % 4  == 0:    #Multiple of 4 - No Padding needed
-            avp_padding = ''
-        else:                       #Not multiple of 4 - Padding needed
-            rounded_value = await(self.myRound(avp_length))
-            avp_padding = format(0,"x").zfill(int( rounded_value - avp_length) * 2)
-
-        avp = str(avp_code) + str(avp_flags) + str(format(avp_length,"x").zfill(6)) + str(avp_content) + str(avp_padding)
-        return avp
-
-    #Generates an AVP with inputs provided (AVP Code, AVP Flags, AVP Content, Padding)
+    #Generates a Vendor AVP with inputs provided (AVP Code, AVP Flags, Vendor ID, AVP Content), padded to a multiple of 4 bytes
     #AVP content must already be in HEX - This can be done with binascii.hexlify(avp_content.encode())
     async def generate_vendor_avp(self, avp_code, avp_flags, avp_vendorid, avp_content):
-        avp_code = format(avp_code,"x").zfill(8)
-        
-        avp_length = 1 ##This is a placeholder that gets overwritten later
-
-        avp_vendorid = format(int(avp_vendorid),"x").zfill(8)
-        
-        #AVP Must always be a multiple of 4 - Round up to nearest multiple of 4 and fill remaining bits with padding
-        avp = str(avp_code) + str(avp_flags) + str("000000") + str(avp_vendorid) + str(avp_content)
-        avp_length = int(len(avp)/2)
-
-        if avp_length % 4  == 0:    #Multiple of 4 - No Padding needed
-            avp_padding = ''
-        else:                       #Not multiple of 4 - Padding needed
-            rounded_value = await(self.myRound(avp_length))
-            # await(self.logTool.debug(message="Rounded value is " + str(rounded_value), redisClient=self.redisMessaging))
-            # await(self.logTool.debug(message="Has " + str( int( rounded_value - avp_length)) + " bytes of padding", redisClient=self.redisMessaging))
-            avp_padding = format(0,"x").zfill(int( rounded_value - avp_length) * 2)
-
-
-        
-        avp = str(avp_code) + str(avp_flags) + str(format(avp_length,"x").zfill(6)) + str(avp_vendorid) + str(avp_content) + str(avp_padding)
-        return avp
+        return diameterEncoder.encodeAvp(avp_code, int(str(avp_flags), 16), bytes.fromhex(avp_content), vendorId=int(avp_vendorid)).hex()
 
     async def generate_diameter_packet(self, packet_version, packet_flags, packet_command_code, packet_application_id, packet_hop_by_hop_id, packet_end_to_end_id, avp):
         try:
-            packet_length = 228
-            packet_length = format(packet_length,"x").zfill(6)
-        
-            packet_command_code = format(packet_command_code,"x").zfill(6)
-            
-            packet_application_id = format(packet_application_id,"x").zfill(8)
-            
-            packet_hex = packet_version + packet_length + packet_flags + packet_command_code + packet_application_id + packet_hop_by_hop_id + packet_end_to_end_id + avp
-            packet_length = int(round(len(packet_hex))/2)
-            packet_length = format(packet_length,"x").zfill(6)
-            
-            packet_hex = packet_version + packet_length + packet_flags + packet_command_code + packet_application_id + packet_hop_by_hop_id + packet_end_to_end_id + avp
-            return packet_hex
+            return diameterEncoder.encodePacket(int(packet_flags, 16), int(packet_command_code), int(packet_application_id), int(packet_hop_by_hop_id, 16), int(packet_end_to_end_id, 16), bytes.fromhex(avp), version=int(packet_version, 16)).hex()
         except Exception as e:
             await(self.logTool.error(message=f"Exception: {e}", redisClient=self.redisMessaging))
 
@@ -396,17 +359,37 @@ class DiameterAsync:
             await(self.logTool.error(message=f"Error: {traceback.format_exc()}", redisClient=self.redisMessaging))
             return None
 
-    async def Answer_257(self):
-        pass
+    async def originStateAvp(self, avps) -> bytes:
+        """
+        Returns the incremented Origin-State-Id AVP to include in an answer, or nothing if the request didn't include one.
+        """
+        if 278 not in avps:
+            return b''
+        return diameterEncoder.encodeAvp(278, 0x40, ((avps.unsigned32(278) + 1) & 0xFFFFFFFF).to_bytes(4, 'big'))
+
+    async def encodeAnswer(self, commandCode: int, packetVars: dict, avps: bytes) -> str:
+        return diameterEncoder.encodePacket(0x00, commandCode, 0, int(packetVars['hop-by-hop-identifier'], 16), int(packetVars['end-to-end-identifier'], 16), avps).hex()
+
+    #Capabilities Exchange Answer
+    async def Answer_257(self, packetVars, avps):
+        avp = self.resultCodeSuccessAvp + self.originHostAvp + self.originRealmAvp
+        avp += await(self.originStateAvp(avps))                                                     #Origin State, only included if the request included it
+        avp += self.capabilitiesExchangeAvps                                                        #Host-IP-Address, Vendor-Id, Product-Name, Firmware-Revision, Supported-Vendor-Ids and Application-Ids
+        return await(self.encodeAnswer(257, packetVars, avp))
 
     async def Answer_16777238_272(self):
         pass
 
-    async def Answer_280(self):
-        pass
+    #Device Watchdog Answer
+    async def Answer_280(self, packetVars, avps):
+        avp = self.resultCodeSuccessAvp + self.originHostAvp + self.originRealmAvp
+        avp += await(self.originStateAvp(avps))                                                     #Origin State, only included if the request included it
+        return await(self.encodeAnswer(280, packetVars, avp))
 
-    async def Answer_282(self):
-        pass
+    #Disconnect Peer Answer
+    async def Answer_282(self, packetVars, avps):
+        avp = self.originHostAvp + self.originRealmAvp + self.resultCodeSuccessAvp
+        return await(self.encodeAnswer(282, packetVars, avp))
 
     async def Answer_16777251_318(self):
         pass
@@ -0,0 +1,510 @@
+#Binary Diameter Packet Decoder
+import struct
+import ipaddress
+
+# Diameter header: Version + Length (4 bytes), Flags + Command Code (4 bytes), Application-Id, Hop-by-Hop Identifier, End-to-End Identifier
+diameterHeaderStruct = struct.Struct('!IIIII')
+# AVP header: AVP Code (4 bytes), AVP Flags + AVP Length (4 bytes)
+avpHeaderStruct = struct.Struct('!II')
+vendorIdStruct = struct.Struct('!I')
+# Version + Length word at the start of each message, used to frame the TCP stream.
+versionLengthStruct = struct.Struct('!I')
+
+DIAMETER_HEADER_LENGTH = 20
+AVP_FLAG_VENDOR = 0x80
+AVP_FLAG_MANDATORY = 0x40
+AVP_FLAG_RESERVED = 0x1F
+DIAMETER_FLAG_REQUEST = 0x80
+DIAMETER_VERSION = 1
+DEFAULT_MAX_MESSAGE_SIZE = 65536
+
+_missing = object()
+
+# Grouped AVPs, keyed by (Vendor-Id, AVP Code). Vendor-Id 0 is used for IETF AVPs.
+# AVPs not listed here are only treated as grouped if their payload decodes cleanly as a sequence of AVPs, which mirrors the legacy decoder.
+GROUPED_AVPS = frozenset([
+    (0, 260),       #Vendor-Specific-Application-Id
+    (0, 279),       #Failed-AVP
+    (0, 284),       #Proxy-Info
+    (0, 297),       #Experimental-Result
+    (0, 413),       #CC-Money
+    (0, 437),       #Requested-Service-Unit
+    (0, 443),       #Subscription-Id
+    (0, 446),       #Used-Service-Unit
+    (0, 456),       #Multiple-Services-Credit-Control
+    (0, 458),       #User-Equipment-Info
+    (10415, 603),   #Server-Capabilities
+    (10415, 612),   #SIP-Auth-Data-Item
+    (10415, 628),   #Supported-Features
+    (10415, 700),   #User-Identity
+    (10415, 1001),  #Charging-Rule-Install
+    (10415, 1002),  #Charging-Rule-Remove
+    (10415, 1003),  #Charging-Rule-Definition
+    (10415, 1016),  #QoS-Information
+    (10415, 1034),  #Allocation-Retention-Priority
+    (10415, 1049),  #Default-EPS-Bearer-QoS
+    (10415, 1058),  #Flow-Information
+    (10415, 1400),  #Subscription-Data
+    (10415, 1401),  #Terminal-Information
+    (10415, 1408),  #Requested-EUTRAN-Authentication-Info
+    (10415, 1409),  #Requested-UTRAN-GERAN-Authentication-Info
+    (10415, 1413),  #Authentication-Info
+    (10415, 1414),  #E-UTRAN-Vector
+    (10415, 1429),  #APN-Configuration-Profile
+    (10415, 1430),  #APN-Configuration
+    (10415, 1435),  #AMBR
+    (10415, 1490),  #Supported-Services
+    (10415, 517),   #Media-Component-Description
+    (10415, 519),   #Media-Sub-Component
+])
+
+# AVP names usable in AvpContainer lookups and paths, mapped to (Vendor-Id, AVP Code).
+AVP_CODES = {
+    'User-Name': (0, 1),
+    'Framed-IP-Address': (0, 8),
+    'Called-Station-Id': (0, 30),
+    'Host-IP-Address': (0, 257),
+    'Auth-Application-Id': (0, 258),
+    'Acct-Application-Id': (0, 259),
+    'Vendor-Specific-Application-Id': (0, 260),
+    'Session-Id': (0, 263),
+    'Origin-Host': (0, 264),
+    'Supported-Vendor-Id': (0, 265),
+    'Vendor-Id': (0, 266),
+    'Result-Code': (0, 268),
+    'Product-Name': (0, 269),
+    'Auth-Session-State': (0, 277),
+    'Origin-State-Id': (0, 278),
+    'Route-Record': (0, 282),
+    'Destination-Realm': (0, 283),
+    'Destination-Host': (0, 293),
+    'Origin-Realm': (0, 296),
+    'Experimental-Result': (0, 297),
+    'Experimental-Result-Code': (0, 298),
+    'CC-Request-Number': (0, 415),
+    'CC-Request-Type': (0, 416),
+    'Subscription-Id': (0, 443),
+    'Subscription-Id-Data': (0, 444),
+    'Subscription-Id-Type': (0, 450),
+    'Flow-Description': (10415, 507),
+    'Max-Requested-Bandwidth-DL': (10415, 515),
+    'Max-Requested-Bandwidth-UL': (10415, 516),
+    'Media-Type': (10415, 520),
+    'SDP-Session-Description': (10415, 524),
+    'Service-URN': (10415, 525),
+    'Visited-Network-Identifier': (10415, 600),
+    'Public-Identity': (10415, 601),
+    'Server-Name': (10415, 602),
+    'Server-Assignment-Type': (10415, 614),
+    'SIP-Number-Auth-Items': (10415, 607),
+    'SIP-Authentication-Scheme': (10415, 608),
+    'SIP-Authorization': (10415, 610),
+    'SIP-Auth-Data-Item': (10415, 612),
+    'User-Authorization-Type': (10415, 623),
+    'User-Identity': (10415, 700),
+    'MSISDN': (10415, 701),
+    'User-Data': (10415, 702),
+    'QoS-Information': (10415, 1016),
+    'RAT-Type': (10415, 1032),
+    'Default-EPS-Bearer-QoS': (10415, 1049),
+    'AN-GW-Address': (10415, 1050),
+    'Terminal-Information': (10415, 1401),
+    'IMEI': (10415, 1402),
+    'Software-Version': (10415, 1403),
+    'Visited-PLMN-Id': (10415, 1407),
+    'Requested-EUTRAN-Authentication-Info': (10415, 1408),
+    'Number-Of-Requested-Vectors': (10415, 1410),
+    'Re-Synchronization-Info': (10415, 1411),
+}
+
+
+class DiameterHeader:
+    """
+    Decoded Diameter message header.
+    """
+    __slots__ = ('version', 'length', 'flags', 'commandCode', 'applicationId', 'hopByHopId', 'endToEndId', 'raw')
+
+    def __init__(self, version: int, length: int, flags: int, commandCode: int, applicationId: int, hopByHopId: int, endToEndId: int, raw: memoryview):
+        self.version = version
+        self.length = length
+        self.flags = flags
+        self.commandCode = commandCode
+        self.applicationId = applicationId
+        self.hopByHopId = hopByHopId
+        self.endToEndId = endToEndId
+        self.raw = raw
+
+    @property
+    def isRequest(self) -> bool:
+        return bool(self.flags & DIAMETER_FLAG_REQUEST)
+
+    def toPacketVars(self) -> dict:
+        """
+        Returns the header in the packet_vars format produced by Diameter.decode_diameter_packet.
+        """
+        return {
+            'packet_version': format(self.version, '02x'),
+            'length': self.length,
+            'flags': format(self.flags, '02x'),
+            'flags_bin': format(self.flags, '08b'),
+            'command_code': self.commandCode,
+            'ApplicationId': self.applicationId,
+            'hop-by-hop-identifier': format(self.hopByHopId, '08x'),
+            'end-to-end-identifier': format(self.endToEndId, '08x'),
+        }
+
+
+class DiameterAvp:
+    """
+    A single decoded AVP.
+    payload is a memoryview into the original packet buffer, so no data is copied while decoding.
+    children holds the decoded sub-AVPs of a grouped AVP, and is empty for all other AVPs.
+    """
+    __slots__ = ('code', 'flags', 'length', 'vendorId', 'payload', 'children')
+
+    def __init__(self, code: int, flags: int, length: int, vendorId: int, payload: memoryview):
+        self.code = code
+        self.flags = flags
+        self.length = length
+        self.vendorId = vendorId
+        self.payload = payload
+        self.children = []
+
+    @property
+    def isGrouped(self) -> bool:
+        return len(self.children) > 0
+
+    @property
+    def subAvps(self):
+        """
+        Returns the children of a grouped AVP as an indexed AvpContainer.
+        """
+        return AvpContainer(self.children)
+
+    def octetString(self) -> bytes:
+        return bytes(self.payload)
+
+    def hex(self) -> str:
+        return self.payload.hex()
+
+    def utf8String(self) -> str:
+        return str(self.payload, 'utf-8')
+
+    def unsigned32(self) -> int:
+        return int.from_bytes(self.payload[:4], 'big')
+
+    def unsigned64(self) -> int:
+        return int.from_bytes(self.payload[:8], 'big')
+
+    def integer32(self) -> int:
+        return int.from_bytes(self.payload[:4], 'big', signed=True)
+
+    def address(self) -> str:
+        """
+        Decodes an Address AVP (2 byte address family followed by the address) into a string.
+        Payloads without an address family (such as Framed-IP-Address) are decoded from their length.
+        """
+        if len(self.payload) in (6, 18):
+            return str(ipaddress.ip_address(bytes(self.payload[2:])))
+        return str(ipaddress.ip_address(bytes(self.payload)))
+
+    def __repr__(self) -> str:
+        if self.children:
+            return f"DiameterAvp(code={self.code}, vendorId={self.vendorId}, children={self.children})"
+        return f"DiameterAvp(code={self.code}, vendorId={self.vendorId}, payload={self.payload.hex()})"
+
+
+class AvpContainer:
+    """
+    Indexed view over a decoded AVP tree.
+    Every AVP in the tree, including the descendants of grouped AVPs, is indexed once by (Vendor-Id, AVP Code) and by AVP Code when the container is built.
+    Lookups by code search the whole tree in packet order, including AVPs nested inside grouped AVPs.
+
+    Keys may be an AVP code, an AVP name from AVP_CODES, or a path of names or codes separated by '/' (e.g. 'Subscription-Id/Subscription-Id-Data').
+    The first element of a path is found anywhere in the tree, later elements are matched against the direct children of the previous element.
+
+    Typed accessors return the first matching AVP's value, and raise KeyError if it's missing and no default is given.
+    """
+    __slots__ = ('avps', 'index', 'codeIndex')
+
+    def __init__(self, avps: list):
+        self.avps = avps
+        self.index = {}
+        self.codeIndex = {}
+        workStack = list(reversed(avps))
+        while workStack:
+            avp = workStack.pop()
+            self.index.setdefault((avp.vendorId, avp.code), []).append(avp)
+            self.codeIndex.setdefault(avp.code, []).append(avp)
+            if avp.children:
+                workStack.extend(reversed(avp.children))
+
+    def __iter__(self):
+        return iter(self.avps)
+
+    def __len__(self) -> int:
+        return len(self.avps)
+
+    def __contains__(self, key) -> bool:
+        return len(self.all(key)) > 0
+
+    def __repr__(self) -> str:
+        return f"AvpContainer({self.avps})"
+
+    def all(self, key, vendorId: int=None) -> list:
+        """
+        Returns every AVP matching key, in packet order.
+        """
+        if isinstance(key, int):
+            if vendorId is None:
+                return self.codeIndex.get(key, [])
+            return self.index.get((vendorId, key), [])
+
+        pathElements = str(key).split('/')
+        matches = self.all(*resolveAvpKey(pathElements[0], vendorId))
+        for pathElement in pathElements[1:]:
+            elementCode, elementVendorId = resolveAvpKey(pathElement)
+            matches = [child for avp in matches for child in avp.children if child.code == elementCode and (elementVendorId is None or child.vendorId == elementVendorId)]
+        return matches
+
+    def first(self, key, vendorId: int=None) -> DiameterAvp:
+        """
+        Returns the first AVP matching key, or None.
+        """
+        matches = self.all(key, vendorId)
+        if matches:
+            return matches[0]
+        return None
+
+    def last(self, key, vendorId: int=None) -> DiameterAvp:
+        """
+        Returns the last AVP matching key, or None.
+        """
+        matches = self.all(key, vendorId)
+        if matches:
+            return matches[-1]
+        return None
+
+    def firstOrRaise(self, key, vendorId: int=None, default=_missing):
+        avp = self.first(key, vendorId)
+        if avp is None:
+            if default is _missing:
+                raise KeyError(f"AVP {key} not present")
+        return avp
+
+    def octetString(self, key, vendorId: int=None, default=_missing) -> bytes:
+        avp = self.firstOrRaise(key, vendorId, default)
+        return default if avp is None else avp.octetString()
+
+    def hex(self, key, vendorId: int=None, default=_missing) -> str:
+        avp = self.firstOrRaise(key, vendorId, default)
+        return default if avp is None else avp.hex()
+
+    def utf8String(self, key, vendorId: int=None, default=_missing) -> str:
+        avp = self.firstOrRaise(key, vendorId, default)
+        return default if avp is None else avp.utf8String()
+
+    def unsigned32(self, key, vendorId: int=None, default=_missing) -> int:
+        avp = self.firstOrRaise(key, vendorId, default)
+        return default if avp is None else avp.unsigned32()
+
+    def unsigned64(self, key, vendorId: int=None, default=_missing) -> int:
+        avp = self.firstOrRaise(key, vendorId, default)
+        return default if avp is None else avp.unsigned64()
+
+    def integer32(self, key, vendorId: int=None, default=_missing) -> int:
+        avp = self.firstOrRaise(key, vendorId, default)
+        return default if avp is None else avp.integer32()
+
+    def address(self, key, vendorId: int=None, default=_missing) -> str:
+        avp = self.firstOrRaise(key, vendorId, default)
+        return default if avp is None else avp.address()
+
+
+def resolveAvpKey(key, vendorId: int=None) -> tuple:
+    """
+    Resolves an AVP name or numeric string into an (AVP Code, Vendor-Id) tuple.
+    """
+    if isinstance(key, int) or str(key).isdigit():
+        return int(key), vendorId
+    if key not in AVP_CODES:
+        raise KeyError(f"Unknown AVP name: {key}")
+    return AVP_CODES[key][1], AVP_CODES[key][0]
+
+
+def decodeAvpHeaders(buffer: memoryview, start: int, end: int, strict: bool=False) -> list:
+    """
+    Decodes a flat run of AVPs between start and end in buffer, without descending into grouped AVPs.
+    Returns None when strict is set and the run doesn't decode exactly, which is used to probe unknown AVPs for sub-AVPs.
+    """
+    avps = []
+    offset = start
+    while end - offset >= 8:
+        avpCode, flagsAndLength = avpHeaderStruct.unpack_from(buffer, offset)
+        avpFlags = flagsAndLength >> 24
+        avpLength = flagsAndLength & 0xFFFFFF
+        headerLength = 12 if avpFlags & AVP_FLAG_VENDOR else 8
+        if avpLength < headerLength or offset + avpLength > end or (strict and avpFlags & AVP_FLAG_RESERVED):
+            if strict:
+                return None
+            break
+        if avpFlags & AVP_FLAG_VENDOR:
+            vendorId = vendorIdStruct.unpack_from(buffer, offset + 8)[0]
+        else:
+            vendorId = 0
+        avps.append(DiameterAvp(avpCode, avpFlags, avpLength, vendorId, buffer[offset + headerLength:offset + avpLength]))
+        # AVPs are padded to a multiple of 4 bytes, padding isn't included in the AVP length.
+        offset += (avpLength + 3) & ~3
+    if strict and (not avps or end - offset >= 4):
+        return None
+    return avps
+
+
+def decodeAvps(buffer, start: int=0, end: int=None) -> list:
+    """
+    Decodes all AVPs in buffer into a tree of DiameterAvp objects.
+    Grouped AVPs are expanded into their children iteratively, using a work stack instead of recursion.
+    """
+    if not isinstance(buffer, memoryview):
+        buffer = memoryview(buffer)
+    if end is None:
+        end = len(buffer)
+
+    topLevelAvps = decodeAvpHeaders(buffer, start, end)
+    workStack = list(topLevelAvps)
+
+    while workStack:
+        avp = workStack.pop()
+        payloadLength = len(avp.payload)
+        if payloadLength < 8:
+            continue
+        if (avp.vendorId, avp.code) in GROUPED_AVPS:
+            children = decodeAvpHeaders(avp.payload, 0, payloadLength)
+        else:
+            children = decodeAvpHeaders(avp.payload, 0, payloadLength, strict=True)
+        if children:
+            avp.children = children
+            workStack.extend(children)
+
+    return topLevelAvps
+
+
+def decodePacket(data) -> tuple:
+    """
+    Decodes a full Diameter packet from bytes (or a hex string) into a DiameterHeader and a list of top-level DiameterAvp objects.
+    """
+    if isinstance(data, str):
+        data = bytes.fromhex(data)
+    buffer = memoryview(data)
+    if len(buffer) < DIAMETER_HEADER_LENGTH:
+        raise ValueError(f"Diameter packet too short: {len(buffer)} bytes")
+
+    versionAndLength, flagsAndCommandCode, applicationId, hopByHopId, endToEndId = diameterHeaderStruct.unpack_from(buffer, 0)
+    packetLength = versionAndLength & 0xFFFFFF
+    header = DiameterHeader(version=versionAndLength >> 24,
+                            length=packetLength,
+                            flags=flagsAndCommandCode >> 24,
+                            commandCode=flagsAndCommandCode & 0xFFFFFF,
+                            applicationId=applicationId,
+                            hopByHopId=hopByHopId,
+                            endToEndId=endToEndId,
+                            raw=buffer[:DIAMETER_HEADER_LENGTH])
+
+    avpEnd = min(packetLength, len(buffer)) if packetLength >= DIAMETER_HEADER_LENGTH else len(buffer)
+    return header, decodeAvps(buffer, DIAMETER_HEADER_LENGTH, avpEnd)
+
+
+def toLegacyAvp(avp: DiameterAvp) -> dict:
+    """
+    Converts a DiameterAvp into the dictionary format produced by Diameter.decodeAvpPacket.
+    Descendants of grouped AVPs are flattened into sub_avps, and grouped AVPs have an empty misc_data.
+    """
+    legacyAvp = {
+        'avp_code': avp.code,
+        'avp_flags': format(avp.flags, '02x'),
+        'avp_length': avp.length,
+        'vendor_id': avp.vendorId if avp.flags & AVP_FLAG_VENDOR else '',
+        'misc_data': '' if avp.children else avp.payload.hex(),
+        'sub_avps': [],
+    }
+    workStack = list(reversed(avp.children))
+    while workStack:
+        subAvp = workStack.pop()
+        legacyAvp['sub_avps'].append({
+            'avp_code': subAvp.code,
+            'avp_flags': format(subAvp.flags, '02x'),
+            'avp_length': subAvp.length,
+            'vendor_id': subAvp.vendorId if subAvp.flags & AVP_FLAG_VENDOR else '',
+            'misc_data': '' if subAvp.children else subAvp.payload.hex(),
+        })
+        workStack.extend(reversed(subAvp.children))
+    return legacyAvp
+
+
+def toLegacyAvps(avps: list) -> list:
+    return [toLegacyAvp(avp) for avp in avps]
+
+
+def fromLegacyAvps(legacyAvps: list) -> AvpContainer:
+    """
+    Builds an AvpContainer from the output of the legacy hex string decoder.
+    The legacy decoder flattens grouped AVPs, so all descendants become direct children of their top-level AVP.
+    """
+    avps = []
+    for legacyAvp in legacyAvps:
+        avp = legacyAvpToNode(legacyAvp)
+        avp.children = [legacyAvpToNode(subAvp) for subAvp in legacyAvp.get('sub_avps', [])]
+        avps.append(avp)
+    return AvpContainer(avps)
+
+
+def legacyAvpToNode(legacyAvp: dict) -> DiameterAvp:
+    flags = int(legacyAvp['avp_flags'], 16)
+    vendorId = legacyAvp.get('vendor_id', '')
+    return DiameterAvp(code=int(legacyAvp['avp_code']),
+                       flags=flags,
+                       length=int(legacyAvp['avp_length']),
+                       vendorId=vendorId if flags & AVP_FLAG_VENDOR and isinstance(vendorId, int) else 0,
+                       payload=memoryview(bytes.fromhex(legacyAvp['misc_data'])))
+
+
+class DiameterFramer:
+    """
+    Splits a Diameter byte stream into whole messages, using the 24 bit length in each message header.
+    Data after the last complete message is kept until the rest of it arrives, so one framer must be used per connection.
+
+    feed raises ValueError if a header has the wrong version, or a length below the header size or above maxMessageSize.
+    The stream can't be resynchronised after that, so the connection should be closed.
+    """
+    __slots__ = ('buffer', 'maxMessageSize')
+
+    def __init__(self, maxMessageSize: int=DEFAULT_MAX_MESSAGE_SIZE):
+        self.buffer = bytearray()
+        self.maxMessageSize = maxMessageSize
+
+    def __len__(self) -> int:
+        return len(self.buffer)
+
+    def feed(self, data: bytes) -> list:
+        """
+        Appends data to the stream buffer, and returns a list of all complete messages as bytes, in the order received.
+        """
+        buffer = self.buffer
+        buffer += data
+        bufferLength = len(buffer)
+        messages = []
+        offset = 0
+        while bufferLength - offset >= 4:
+            versionAndLength = versionLengthStruct.unpack_from(buffer, offset)[0]
+            messageLength = versionAndLength & 0xFFFFFF
+            if versionAndLength >> 24 != DIAMETER_VERSION:
+                raise ValueError(f"Invalid Diameter version {versionAndLength >> 24} at stream offset {offset}")
+            if messageLength < DIAMETER_HEADER_LENGTH or messageLength > self.maxMessageSize:
+                raise ValueError(f"Invalid Diameter message length {messageLength}, maximum is {self.maxMessageSize}")
+            if bufferLength - offset < messageLength:
+                break
+            messages.append(bytes(buffer[offset:offset + messageLength]))
+            offset += messageLength
+        if offset:
+            del buffer[:offset]
+        return messages
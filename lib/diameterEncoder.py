@@ -0,0 +1,129 @@
+#Binary Diameter Packet Encoder
+import struct
+import ipaddress
+
+# Diameter header: Version + Length (4 bytes), Flags + Command Code (4 bytes), Application-Id, Hop-by-Hop Identifier, End-to-End Identifier
+diameterHeaderStruct = struct.Struct('!IIIII')
+# AVP header: AVP Code (4 bytes), Flags + Length (4 bytes)
+avpHeaderStruct = struct.Struct('!II')
+# AVP header with Vendor-Id: AVP Code (4 bytes), Flags + Length (4 bytes), Vendor-Id (4 bytes)
+vendorAvpHeaderStruct = struct.Struct('!III')
+# Flags + Length word, used to back-patch lengths once the payload has been written.
+flagsLengthStruct = struct.Struct('!I')
+
+DIAMETER_HEADER_LENGTH = 20
+DIAMETER_VERSION = 1
+PADDING = (b'', b'\x00\x00\x00', b'\x00\x00', b'\x00')
+VENDOR_ID_3GPP = 10415
+
+# Applications advertised in the Capabilities Exchange Answer, as (Supported-Vendor-Id, Vendor-Specific-Application-Id) pairs.
+CAPABILITIES_EXCHANGE_APPLICATIONS = (
+    16777251,   #S6a
+    16777216,   #Cx
+    16777252,   #S13
+    16777291,   #SLh
+    16777217,   #Sh
+    16777236,   #Rx
+    16777238,   #Gx
+)
+
+
+def encodeAvp(avpCode: int, avpFlags: int, payload: bytes, vendorId: int=None, buffer: bytearray=None) -> bytearray:
+    """
+    Appends a single AVP to buffer, padded to a multiple of 4 bytes, and returns the buffer.
+    A new bytearray is created if no buffer is given.
+    If vendorId is set, the Vendor-Id field is written regardless of the flags, which matches Diameter.generate_vendor_avp.
+    """
+    if buffer is None:
+        buffer = bytearray()
+    if vendorId is None:
+        avpLength = 8 + len(payload)
+        buffer += avpHeaderStruct.pack(avpCode, (avpFlags << 24) | avpLength)
+    else:
+        avpLength = 12 + len(payload)
+        buffer += vendorAvpHeaderStruct.pack(avpCode, (avpFlags << 24) | avpLength, vendorId)
+    buffer += payload
+    buffer += PADDING[avpLength & 3]
+    return buffer
+
+
+def startGroupedAvp(buffer: bytearray, avpCode: int, avpFlags: int, vendorId: int=None) -> int:
+    """
+    Writes the header of a grouped AVP with a placeholder length, and returns its offset in buffer.
+    Child AVPs are appended to buffer afterwards, then finishGroupedAvp back-patches the length.
+    """
+    avpOffset = len(buffer)
+    if vendorId is None:
+        buffer += avpHeaderStruct.pack(avpCode, avpFlags << 24)
+    else:
+        buffer += vendorAvpHeaderStruct.pack(avpCode, avpFlags << 24, vendorId)
+    return avpOffset
+
+
+def finishGroupedAvp(buffer: bytearray, avpOffset: int) -> bytearray:
+    """
+    Back-patches the length of the grouped AVP started at avpOffset, and pads it to a multiple of 4 bytes.
+    """
+    avpLength = len(buffer) - avpOffset
+    avpFlags = buffer[avpOffset + 4]
+    flagsLengthStruct.pack_into(buffer, avpOffset + 4, (avpFlags << 24) | avpLength)
+    buffer += PADDING[avpLength & 3]
+    return buffer
+
+
+def startPacket(flags: int, commandCode: int, applicationId: int, hopByHopId: int, endToEndId: int, version: int=DIAMETER_VERSION) -> bytearray:
+    """
+    Returns a new bytearray containing a Diameter header with a placeholder length.
+    AVPs are appended to it afterwards, then finishPacket back-patches the length.
+    """
+    return bytearray(diameterHeaderStruct.pack(version << 24, (flags << 24) | commandCode, applicationId, hopByHopId, endToEndId))
+
+
+def finishPacket(buffer: bytearray) -> bytearray:
+    """
+    Back-patches the length of the Diameter packet in buffer.
+    """
+    flagsLengthStruct.pack_into(buffer, 0, (buffer[0] << 24) | len(buffer))
+    return buffer
+
+
+def encodePacket(flags: int, commandCode: int, applicationId: int, hopByHopId: int, endToEndId: int, avps: bytes, version: int=DIAMETER_VERSION) -> bytearray:
+    """
+    Encodes a full Diameter packet from already encoded AVPs.
+    """
+    buffer = startPacket(flags, commandCode, applicationId, hopByHopId, endToEndId, version)
+    buffer += avps
+    return finishPacket(buffer)
+
+
+def encodeAddress(ipAddress: str) -> bytes:
+    """
+    Encodes an IPv4 or IPv6 address as an Address AVP payload, prefixed with its 2 byte address family.
+    """
+    address = ipaddress.ip_address(ipAddress)
+    return (b'\x00\x01' if address.version == 4 else b'\x00\x02') + address.packed
+
+
+def encodeCapabilitiesExchangeAvps(hostIpAddresses: list, productName: bytes) -> bytearray:
+    """
+    Encodes the body of a Capabilities Exchange Answer which follows Origin-State-Id.
+    This never changes for a given HSS instance, so it's built once and spliced into each CEA.
+    """
+    buffer = bytearray()
+    for hostIpAddress in hostIpAddresses:
+        encodeAvp(257, 0x40, encodeAddress(hostIpAddress), buffer=buffer)                  #Host-IP-Address
+    encodeAvp(266, 0x40, b'\x00\x00\x00\x00', buffer=buffer)                                  #Vendor-Id
+    encodeAvp(269, 0x00, productName, buffer=buffer)                                         #Product-Name
+    encodeAvp(267, 0x00, (10201).to_bytes(4, 'big'), buffer=buffer)                          #Firmware-Revision
+    for applicationId in CAPABILITIES_EXCHANGE_APPLICATIONS:
+        encodeAvp(265, 0x40, VENDOR_ID_3GPP.to_bytes(4, 'big'), buffer=buffer)               #Supported-Vendor-ID (3GPP)
+        avpOffset = startGroupedAvp(buffer, 260, 0x40)                                       #Vendor-Specific-Application-ID
+        encodeAvp(258, 0x40, applicationId.to_bytes(4, 'big'), buffer=buffer)
+        encodeAvp(266, 0x40, VENDOR_ID_3GPP.to_bytes(4, 'big'), buffer=buffer)
+        finishGroupedAvp(buffer, avpOffset)
+    encodeAvp(258, 0x40, (16777238).to_bytes(4, 'big'), buffer=buffer)                       #Auth-Application-ID - Diameter Gx
+    encodeAvp(258, 0x40, (10).to_bytes(4, 'big'), buffer=buffer)                             #Auth-Application-ID - Diameter CER
+    encodeAvp(265, 0x40, (5535).to_bytes(4, 'big'), buffer=buffer)                           #Supported-Vendor-ID (3GGP v2)
+    encodeAvp(265, 0x40, VENDOR_ID_3GPP.to_bytes(4, 'big'), buffer=buffer)                   #Supported-Vendor-ID (3GPP)
+    encodeAvp(265, 0x40, (13019).to_bytes(4, 'big'), buffer=buffer)                          #Supported-Vendor-ID 13019 (ETSI)
+    return buffer
@@ -0,0 +1,142 @@
+#Diameter Queue Envelope
+import struct
+import pydantic_core
+from baseModels import InboundData, OutboundData
+
+# Binary envelope header: Magic, Envelope Type, Initial Receive Timestamp (ns), then the length of each address field.
+# The address fields follow the header as ASCII, and the raw Diameter packet takes up the rest of the message.
+envelopeHeaderStruct = struct.Struct('!BBQBBBB')
+
+ENVELOPE_MAGIC = 0xD1
+ENVELOPE_TYPE_INBOUND = 1
+ENVELOPE_TYPE_OUTBOUND = 2
+
+# JSON envelopes always start with '{', which can never be the magic byte, so both formats can share a queue.
+JSON_START = ord('{')
+
+
+class InboundMessage:
+    """
+    A Diameter message received from a peer, as carried on the diameter-inbound queue.
+    Field names match InboundData, with the raw packet bytes in Packet instead of InboundHex.
+    """
+    __slots__ = ('SenderIp', 'SenderPort', 'LocalIp', 'LocalPort', 'InitialReceiveTimestamp', 'Packet')
+
+    def __init__(self, SenderIp: str, SenderPort: str, InitialReceiveTimestamp: int, Packet: bytes, LocalIp: str='', LocalPort: str=''):
+        self.SenderIp = SenderIp
+        self.SenderPort = SenderPort
+        self.LocalIp = LocalIp
+        self.LocalPort = LocalPort
+        self.InitialReceiveTimestamp = InitialReceiveTimestamp
+        self.Packet = Packet
+
+    def __repr__(self) -> str:
+        return f"InboundMessage(SenderIp={self.SenderIp!r}, SenderPort={self.SenderPort!r}, InitialReceiveTimestamp={self.InitialReceiveTimestamp}, Packet={bytes(self.Packet).hex()})"
+
+
+class OutboundMessage:
+    """
+    A Diameter message to be sent to a peer, as carried on the diameter-outbound-{ip}-{port} queues.
+    Field names match OutboundData, with the raw packet bytes in Packet instead of OutboundHex.
+    """
+    __slots__ = ('DestinationIp', 'DestinationPort', 'InitialReceiveTimestamp', 'Packet')
+
+    def __init__(self, DestinationIp: str, DestinationPort: str, InitialReceiveTimestamp: int, Packet: bytes):
+        self.DestinationIp = DestinationIp
+        self.DestinationPort = DestinationPort
+        self.InitialReceiveTimestamp = InitialReceiveTimestamp
+        self.Packet = Packet
+
+    def __repr__(self) -> str:
+        return f"OutboundMessage(DestinationIp={self.DestinationIp!r}, DestinationPort={self.DestinationPort!r}, InitialReceiveTimestamp={self.InitialReceiveTimestamp}, Packet={bytes(self.Packet).hex()})"
+
+
+def encodeEnvelope(envelopeType: int, timestamp: int, addressFields: tuple, packet: bytes) -> bytes:
+    encodedFields = [str(addressField).encode('ascii') for addressField in addressFields]
+    encodedFields += [b''] * (4 - len(encodedFields))
+    return b''.join((envelopeHeaderStruct.pack(ENVELOPE_MAGIC, envelopeType, timestamp, *(len(encodedField) for encodedField in encodedFields)),
+                     *encodedFields,
+                     packet))
+
+
+def decodeEnvelope(data: bytes, envelopeType: int) -> tuple:
+    magic, messageType, timestamp, *fieldLengths = envelopeHeaderStruct.unpack_from(data, 0)
+    if magic != ENVELOPE_MAGIC or messageType != envelopeType:
+        raise ValueError(f"Invalid envelope: magic {magic:#04x}, type {messageType}")
+    offset = envelopeHeaderStruct.size
+    addressFields = []
+    for fieldLength in fieldLengths:
+        addressFields.append(data[offset:offset + fieldLength].decode('ascii'))
+        offset += fieldLength
+    return timestamp, addressFields, data[offset:]
+
+
+def encodeInbound(message: InboundMessage, binary: bool=True):
+    """
+    Encodes an InboundMessage for the diameter-inbound queue.
+    Returns the binary envelope as bytes, or the legacy InboundData JSON as a string if binary is False.
+    """
+    if binary:
+        return encodeEnvelope(ENVELOPE_TYPE_INBOUND, message.InitialReceiveTimestamp, (message.SenderIp, message.SenderPort, message.LocalIp, message.LocalPort), message.Packet)
+    return InboundData(SenderIp=message.SenderIp,
+                       SenderPort=message.SenderPort,
+                       LocalIp=message.LocalIp,
+                       LocalPort=message.LocalPort,
+                       InitialReceiveTimestamp=message.InitialReceiveTimestamp,
+                       InboundHex=bytes(message.Packet).hex()).model_dump_json()
+
+
+def decodeInbound(data) -> InboundMessage:
+    """
+    Decodes a message from the diameter-inbound queue, in either the binary envelope or the legacy InboundData JSON format.
+    """
+    if isinstance(data, str):
+        data = data.encode('ascii')
+    if data[0] == JSON_START:
+        inboundData = InboundData.model_validate(pydantic_core.from_json(data))
+        return InboundMessage(SenderIp=inboundData.SenderIp,
+                              SenderPort=inboundData.SenderPort,
+                              LocalIp=inboundData.LocalIp,
+                              LocalPort=inboundData.LocalPort,
+                              InitialReceiveTimestamp=inboundData.InitialReceiveTimestamp,
+                              Packet=bytes.fromhex(inboundData.InboundHex))
+    timestamp, (senderIp, senderPort, localIp, localPort), packet = decodeEnvelope(data, ENVELOPE_TYPE_INBOUND)
+    return InboundMessage(SenderIp=senderIp, SenderPort=senderPort, LocalIp=localIp, LocalPort=localPort, InitialReceiveTimestamp=timestamp, Packet=packet)
+
+
+def encodeOutbound(message: OutboundMessage, binary: bool=True):
+    """
+    Encodes an OutboundMessage for a diameter-outbound queue.
+    Returns the binary envelope as bytes, or the legacy OutboundData JSON as a string if binary is False.
+    """
+    if binary:
+        return encodeEnvelope(ENVELOPE_TYPE_OUTBOUND, message.InitialReceiveTimestamp, (message.DestinationIp, message.DestinationPort), message.Packet)
+    return OutboundData(DestinationIp=message.DestinationIp,
+                        DestinationPort=message.DestinationPort,
+                        InitialReceiveTimestamp=message.InitialReceiveTimestamp,
+                        OutboundHex=bytes(message.Packet).hex()).model_dump_json()
+
+
+def decodeOutbound(data) -> OutboundMessage:
+    """
+    Decodes a message from a diameter-outbound queue, in either the binary envelope or the legacy OutboundData JSON format.
+    """
+    if isinstance(data, str):
+        data = data.encode('ascii')
+    if data[0] == JSON_START:
+        outboundData = OutboundData.model_validate(pydantic_core.from_json(data))
+        return OutboundMessage(DestinationIp=outboundData.DestinationIp,
+                               DestinationPort=outboundData.DestinationPort,
+                               InitialReceiveTimestamp=outboundData.InitialReceiveTimestamp,
+                               Packet=bytes.fromhex(outboundData.OutboundHex))
+    timestamp, (destinationIp, destinationPort, unusedIp, unusedPort), packet = decodeEnvelope(data, ENVELOPE_TYPE_OUTBOUND)
+    return OutboundMessage(DestinationIp=destinationIp, DestinationPort=destinationPort, InitialReceiveTimestamp=timestamp, Packet=packet)
+
+
+def correlationKeys(peerIp: str, peerPort: str, packet: bytes) -> tuple:
+    """
+    Returns the (pending, reply) queue names used to route the answer to an outbound request straight back to the caller waiting on it.
+    An answer carries the same Hop-by-Hop and End-to-End Identifiers as its request, which together with the peer identify the request.
+    """
+    correlationId = f"{peerIp}-{peerPort}-{bytes(packet[12:20]).hex()}"
+    return f"diameter-pending-{correlationId}", f"diameter-answer-{correlationId}"
@@ -0,0 +1,95 @@
+#EIR Rule Engine
+import re
+
+# Characters which end the literal prefix of a regex EIR rule.
+REGEX_METACHARACTERS = frozenset('.^$*+?{}[]\\|()')
+# Quantifiers which make the character before them optional or repeatable.
+REGEX_QUANTIFIERS = frozenset('*?{')
+
+
+def literalPrefix(pattern: str) -> str:
+    """
+    Returns the literal text every string matched by re.match(pattern) must start with.
+    Patterns with alternation have no usable prefix, since each branch can start differently.
+    """
+    if '|' in pattern:
+        return ''
+    # re.match is already anchored, so a leading ^ doesn't change what matches.
+    if pattern.startswith('^'):
+        pattern = pattern[1:]
+    for index, character in enumerate(pattern):
+        if character in REGEX_METACHARACTERS:
+            # A quantified character may be absent, so it isn't part of the prefix.
+            if character in REGEX_QUANTIFIERS:
+                return pattern[:max(index - 1, 0)]
+            return pattern[:index]
+    return pattern
+
+
+class EirEngine:
+    """
+    EIR rules from the EIR table compiled for matching, replacing the per-request queries in Check_EIR.
+    Exact rules (regex_mode 0) are held in hash maps keyed by IMEI and by (IMEI, IMSI).
+    Regex rules (regex_mode 1) are precompiled and indexed in a trie on their literal prefix, so only rules
+    which can match a given IMEI are evaluated. Within each mode, the rule earliest in table order wins, as before.
+    """
+    __slots__ = ('exactByImei', 'exactByImeiImsi', 'prefixTrie', 'regexRules', 'invalidRules')
+
+    def __init__(self, eirRules: list):
+        exactByImei = {}
+        exactByImeiImsi = {}
+        prefixTrie = {}
+        regexRules = []
+        invalidRules = []
+        for rank, eirRule in enumerate(sorted(eirRules, key=lambda eirRule: eirRule['eir_id'])):
+            imeiPattern = eirRule.get('imei') or ''
+            imsiPattern = eirRule.get('imsi') or ''
+            if eirRule.get('regex_mode') == 0:
+                if imsiPattern == '':
+                    exactByImei.setdefault(imeiPattern, (rank, eirRule))
+                else:
+                    exactByImeiImsi.setdefault((imeiPattern, imsiPattern), (rank, eirRule))
+            elif eirRule.get('regex_mode') == 1:
+                try:
+                    compiledRule = (re.compile(imeiPattern), re.compile(imsiPattern) if imsiPattern else None, eirRule)
+                except re.error as E:
+                    invalidRules.append((eirRule, str(E)))
+                    continue
+                trieNode = prefixTrie
+                for character in literalPrefix(imeiPattern):
+                    trieNode = trieNode.setdefault(character, {})
+                trieNode.setdefault('', []).append(len(regexRules))
+                regexRules.append(compiledRule)
+        self.exactByImei = exactByImei
+        self.exactByImeiImsi = exactByImeiImsi
+        self.prefixTrie = prefixTrie
+        self.regexRules = tuple(regexRules)
+        self.invalidRules = tuple(invalidRules)
+
+    def __repr__(self) -> str:
+        return f"EirEngine(exactRules={len(self.exactByImei) + len(self.exactByImeiImsi)}, regexRules={len(self.regexRules)})"
+
+    def match(self, imsi: str, imei: str):
+        """
+        Returns the EIR rule matching the IMSI and IMEI, or None if no rule matches.
+        Exact rules are checked before regex rules.
+        """
+        imsi = str(imsi)
+        imei = str(imei)
+        exactMatches = [exactMatch for exactMatch in (self.exactByImei.get(imei), self.exactByImeiImsi.get((imei, imsi))) if exactMatch is not None]
+        if exactMatches:
+            return min(exactMatches, key=lambda exactMatch: exactMatch[0])[1]
+
+        candidateRules = list(self.prefixTrie.get('', ()))
+        trieNode = self.prefixTrie
+        for character in imei:
+            trieNode = trieNode.get(character)
+            if trieNode is None:
+                break
+            candidateRules.extend(trieNode.get('', ()))
+        candidateRules.sort()
+        for ruleIndex in candidateRules:
+            imeiRegex, imsiRegex, eirRule = self.regexRules[ruleIndex]
+            if imeiRegex.match(imei) and (imsiRegex is None or imsiRegex.match(imsi)):
+                return eirRule
+        return None
@@ -12,6 +12,7 @@ class RedisMessaging:
             self.redisClient = Redis(unix_socket_path=unixSocketPath)
         else:
             self.redisClient = Redis(host=host, port=port)
+        self.registeredScripts = {}
 
     def handlePrefix(self, key: str, usePrefix: bool=False, prefixHostname: str='unknown', prefixServiceName: str='common'):
         """
@@ -120,13 +121,19 @@ class RedisMessaging:
         except Exception as e:
             return {}
 
-    def awaitMessage(self, key: str, usePrefix: bool=False, prefixHostname: str='unknown', prefixServiceName: str='common'):
+    def awaitMessage(self, key: str, decodeMessage: bool=True, timeout: float=0, usePrefix: bool=False, prefixHostname: str='unknown', prefixServiceName: str='common'):
         """
         Blocks until a message is received at the given key, then returns the message.
+        Set decodeMessage to False to return the raw bytes, for binary messages.
+        If timeout (in seconds) is set and no message is received in time, returns an empty string.
         """
         try:
             key = self.handlePrefix(key=key, usePrefix=usePrefix, prefixHostname=prefixHostname, prefixServiceName=prefixServiceName)
-            message =  self.redisClient.blpop(key)
+            message =  self.redisClient.blpop(key, timeout=timeout)
+            if message is None:
+                return ''
+            if not decodeMessage:
+                return message
             return tuple(data.decode() for data in message)
         except Exception as e:
             return ''
@@ -143,6 +150,100 @@ class RedisMessaging:
             print(traceback.format_exc())
             return ''
 
+    def createConsumerGroup(self, stream: str, group: str, usePrefix: bool=False, prefixHostname: str='unknown', prefixServiceName: str='common') -> bool:
+        """
+        Creates a consumer group on the given stream, creating the stream if it doesn't exist.
+        Returns True if the group exists afterwards.
+        """
+        try:
+            stream = self.handlePrefix(key=stream, usePrefix=usePrefix, prefixHostname=prefixHostname, prefixServiceName=prefixServiceName)
+            self.redisClient.xgroup_create(stream, group, id='0', mkstream=True)
+            return True
+        except Exception as e:
+            return 'BUSYGROUP' in str(e)
+
+    def awaitStreamMessages(self, stream: str, group: str, consumer: str, count: int=100, block: int=0, usePrefix: bool=False, prefixHostname: str='unknown', prefixServiceName: str='common') -> list:
+        """
+        Blocks for up to block milliseconds until new entries are delivered to the consumer in the given group, then returns up to count of them.
+        Returns a list of (entryId, message) tuples, which is empty if nothing arrived in time.
+        Entries stay pending until acknowledged with acknowledgeStreamMessages.
+        """
+        try:
+            stream = self.handlePrefix(key=stream, usePrefix=usePrefix, prefixHostname=prefixHostname, prefixServiceName=prefixServiceName)
+            result = self.redisClient.xreadgroup(group, consumer, {stream: '>'}, count=count, block=block)
+            if not result:
+                return []
+            return [(entryId, fields.get(b'message')) for entryId, fields in result[0][1]]
+        except Exception as e:
+            return []
+
+    def claimStreamMessages(self, stream: str, group: str, consumer: str, minIdleTime: int, count: int=100, usePrefix: bool=False, prefixHostname: str='unknown', prefixServiceName: str='common') -> list:
+        """
+        Claims up to count entries which have been pending in the given group for at least minIdleTime milliseconds, such as entries delivered to a consumer which has since died.
+        Returns a list of (entryId, message) tuples. Entries which have already been trimmed from the stream are skipped.
+        """
+        try:
+            stream = self.handlePrefix(key=stream, usePrefix=usePrefix, prefixHostname=prefixHostname, prefixServiceName=prefixServiceName)
+            result = self.redisClient.xautoclaim(stream, group, consumer, min_idle_time=minIdleTime, start_id='0-0', count=count)
+            return [(entryId, fields.get(b'message')) for entryId, fields in result[1] if fields]
+        except Exception as e:
+            return []
+
+    def acknowledgeStreamMessages(self, stream: str, group: str, entryIds: list, usePrefix: bool=False, prefixHostname: str='unknown', prefixServiceName: str='common') -> int:
+        """
+        Acknowledges the given entries in the given group, removing them from the pending entries list.
+        Returns the number of entries acknowledged.
+        """
+        try:
+            stream = self.handlePrefix(key=stream, usePrefix=usePrefix, prefixHostname=prefixHostname, prefixServiceName=prefixServiceName)
+            return self.redisClient.xack(stream, group, *entryIds)
+        except Exception as e:
+            return 0
+
+    def publishMessage(self, channel: str, message: str, usePrefix: bool=False, prefixHostname: str='unknown', prefixServiceName: str='common') -> int:
+        """
+        Publishes a message to a pub/sub channel, and returns the number of subscribers which received it.
+        """
+        try:
+            channel = self.handlePrefix(key=channel, usePrefix=usePrefix, prefixHostname=prefixHostname, prefixServiceName=prefixServiceName)
+            return self.redisClient.publish(channel, message)
+        except Exception as e:
+            return 0
+
+    def subscribeChannel(self, channel: str, messageHandler, errorHandler=None, usePrefix: bool=False, prefixHostname: str='unknown', prefixServiceName: str='common'):
+        """
+        Subscribes to a pub/sub channel, and calls messageHandler with the raw message data of each message from a background thread.
+        errorHandler is called with the exception whenever the connection fails, since messages published while disconnected are lost.
+        Returns the background thread, or None if the subscription failed.
+        """
+        try:
+            channel = self.handlePrefix(key=channel, usePrefix=usePrefix, prefixHostname=prefixHostname, prefixServiceName=prefixServiceName)
+            pubSub = self.redisClient.pubsub(ignore_subscribe_messages=True)
+            pubSub.subscribe(**{channel: lambda message: messageHandler(message['data'])})
+
+            def handleException(exception, pubSub, thread):
+                if errorHandler is not None:
+                    errorHandler(exception)
+                time.sleep(1)
+
+            return pubSub.run_in_thread(sleep_time=1, daemon=True, exception_handler=handleException)
+        except Exception as e:
+            return None
+
+    def runScript(self, script: str, keys: list, args: list=[], usePrefix: bool=False, prefixHostname: str='unknown', prefixServiceName: str='common'):
+        """
+        Runs a Lua script atomically against the given keys, and returns its result, or None if it failed.
+        Each script is loaded once, and called by its SHA1 afterwards.
+        """
+        try:
+            keys = [self.handlePrefix(key=key, usePrefix=usePrefix, prefixHostname=prefixHostname, prefixServiceName=prefixServiceName) for key in keys]
+            registeredScript = self.registeredScripts.get(script)
+            if registeredScript is None:
+                registeredScript = self.registeredScripts.setdefault(script, self.redisClient.register_script(script))
+            return registeredScript(keys=keys, args=args)
+        except Exception as e:
+            return None
+
     def deleteQueue(self, queue: str, usePrefix: bool=False, prefixHostname: str='unknown', prefixServiceName: str='common') -> bool:
         """
         Deletes the given Queue (Key)
@@ -181,15 +282,18 @@ class RedisMessaging:
         except Exception as e:
             return ''
 
-    def getList(self, key: str, usePrefix: bool=False, prefixHostname: str='unknown', prefixServiceName: str='common') -> list:
+    def getList(self, key: str, decodeMessage: bool=True, usePrefix: bool=False, prefixHostname: str='unknown', prefixServiceName: str='common') -> list:
         """
         Gets the list stored under a given key.
+        Set decodeMessage to False to return the raw bytes, for binary messages.
         """
         try:
             key = self.handlePrefix(key=key, usePrefix=usePrefix, prefixHostname=prefixHostname, prefixServiceName=prefixServiceName)
             allResults = self.redisClient.lrange(key, 0, -1)
             if allResults is None:
                 result = []
+            elif not decodeMessage:
+                return allResults
             else:
                 return [result.decode() for result in allResults]
         except Exception as e:
@@ -267,6 +371,18 @@ class RedisMessaging:
         except Exception as e:
             return e
 
+    def getSortedSetRangeByScore(self, key: str, minScore: float='-inf', maxScore: float='+inf', count: int=None, usePrefix: bool=False, prefixHostname: str='unknown', prefixServiceName: str='common') -> list:
+        """
+        Returns up to count members of a sorted set with a score between minScore and maxScore, lowest score first.
+        """
+        try:
+            key = self.handlePrefix(key=key, usePrefix=usePrefix, prefixHostname=prefixHostname, prefixServiceName=prefixServiceName)
+            if count is None:
+                return [member.decode() for member in self.redisClient.zrangebyscore(key, minScore, maxScore)]
+            return [member.decode() for member in self.redisClient.zrangebyscore(key, minScore, maxScore, start=0, num=count)]
+        except Exception as e:
+            return []
+
 if __name__ == '__main__':
     redisMessaging = RedisMessaging()
     print(redisMessaging.getNextQueue())
\ No newline at end of file
@@ -60,6 +60,25 @@ class RedisMessagingAsync:
         except Exception as e:
             return ''
 
+    async def sendBulkStreamMessage(self, stream: str, messageList: list, maxAge: int=None, usePrefix: bool=False, prefixHostname: str='unknown', prefixServiceName: str='common') -> str:
+        """
+        Appends each message in messageList to a given Stream in a single pipeline.
+        If maxAge (in seconds) is provided, entries older than maxAge are trimmed from the stream, approximately, as new entries are added.
+        """
+        try:
+            stream = await(self.handlePrefix(key=stream, usePrefix=usePrefix, prefixHostname=prefixHostname, prefixServiceName=prefixServiceName))
+            minimumId = None
+            if maxAge is not None:
+                # Stream entry IDs start with their creation time in milliseconds, so trimming by ID trims by age.
+                minimumId = f"{int(time.time() * 1000) - int(maxAge * 1000)}-0"
+            redisPipe = self.redisClient.pipeline()
+            for message in messageList:
+                redisPipe.xadd(stream, {'message': message}, minid=minimumId, approximate=True)
+            await(redisPipe.execute())
+            return f'Messages stored in {stream} successfully.'
+        except Exception as e:
+            return ''
+
     async def sendMetric(self, serviceName: str, metricName: str, metricType: str, metricAction: str, metricValue: float, metricHelp: str='', metricLabels: list=[], metricTimestamp: int=time.time_ns(), metricExpiry: int=None, usePrefix: bool=False, prefixHostname: str='unknown', prefixServiceName: str='common') -> str:
         """
         Stores a prometheus metric in a format readable by the metric service, asynchronously.
@@ -159,13 +178,16 @@ class RedisMessagingAsync:
             print(e)
         return ''
 
-    async def awaitMessage(self, key: str, usePrefix: bool=False, prefixHostname: str='unknown', prefixServiceName: str='common'):
+    async def awaitMessage(self, key: str, decodeMessage: bool=True, usePrefix: bool=False, prefixHostname: str='unknown', prefixServiceName: str='common'):
         """
         Asynchronously blocks until a message is received at the given key, then returns the message.
+        Set decodeMessage to False to return the raw bytes, for binary messages.
         """
         try:
             key = await(self.handlePrefix(key=key, usePrefix=usePrefix, prefixHostname=prefixHostname, prefixServiceName=prefixServiceName))
             message =  (await(self.redisClient.blpop(key)))
+            if not decodeMessage:
+                return message
             return tuple(data.decode() for data in message)
         except Exception as e:
             return ''
@@ -182,6 +204,34 @@ class RedisMessagingAsync:
             print(traceback.format_exc())
             return ''
 
+    async def awaitMultipleQueues(self, queues: list, count: int=100, timeout: float=0, usePrefix: bool=False, prefixHostname: str='unknown', prefixServiceName: str='common'):
+        """
+        Asynchronously blocks until one or more messages are received at any of the given queues, then pops up to count messages from the first non-empty queue, in the order they were queued.
+        Returns a tuple of (queue, messageList), or None if the timeout (in seconds) is reached. The queue name is returned as given, without a prefix.
+        Redis errors are raised rather than returned as None, so the caller can tell an outage from a timeout.
+        """
+        prefixedQueues = {}
+        for queue in queues:
+            prefixedQueues[await(self.handlePrefix(key=queue, usePrefix=usePrefix, prefixHostname=prefixHostname, prefixServiceName=prefixServiceName))] = queue
+        result = await(self.redisClient.blmpop(timeout, len(prefixedQueues), *prefixedQueues, direction='LEFT', count=count))
+        if result is None:
+            return None
+        return (prefixedQueues[result[0].decode()], result[1])
+
+    async def popMultipleQueues(self, queues: list, count: int=100, usePrefix: bool=False, prefixHostname: str='unknown', prefixServiceName: str='common') -> dict:
+        """
+        Pops up to count messages from each of the given queues in a single pipeline, without blocking, in the order they were queued.
+        Returns a dict of queue to messageList, only for queues which had messages. The keys are the queue names as given, without a prefix.
+        """
+        try:
+            redisPipe = self.redisClient.pipeline()
+            for queue in queues:
+                redisPipe.lpop(await(self.handlePrefix(key=queue, usePrefix=usePrefix, prefixHostname=prefixHostname, prefixServiceName=prefixServiceName)), count)
+            results = await(redisPipe.execute())
+            return {queue: messageList for queue, messageList in zip(queues, results) if messageList}
+        except Exception as e:
+            return {}
+
     async def deleteQueue(self, queue: str, usePrefix: bool=False, prefixHostname: str='unknown', prefixServiceName: str='common') -> bool:
         """
         Deletes the given Queue (Key) asynchronously.
@@ -193,6 +243,16 @@ class RedisMessagingAsync:
         except Exception as e:
             return False
 
+    async def deleteKey(self, key: str, usePrefix: bool=False, prefixHostname: str='unknown', prefixServiceName: str='common') -> bool:
+        """
+        Deletes the given key, and returns True only if it existed.
+        """
+        try:
+            key = await(self.handlePrefix(key=key, usePrefix=usePrefix, prefixHostname=prefixHostname, prefixServiceName=prefixServiceName))
+            return bool(await(self.redisClient.delete(key)))
+        except Exception as e:
+            return False
+
     async def setValue(self, key: str, value: str, keyExpiry: int=None, usePrefix: bool=False, prefixHostname: str='unknown', prefixServiceName: str='common') -> str:
         """
         Stores a value under a given key asynchronously and sets an expiry (in seconds) if provided.
@@ -9,7 +9,7 @@ of patent rights can be found in the PATENTS file in the same directory.
 
 import hmac
 from Crypto.Cipher import AES
-from Crypto.Random import random
+from Crypto.Random import get_random_bytes
 
 from lte import BaseLTEAuthAlgo
 
@@ -20,13 +20,15 @@ sys.path.append(os.path.realpath('../'))
 
 CryptoLogger = logging.getLogger('CryptoLogger')
 
+MASK_128 = (1 << 128) - 1
+
 
 class Milenage(BaseLTEAuthAlgo):
     """
     Milenage Algorithm (3GPP TS 35.205, .206, .207, .208)
     """
 
-    def generate_eutran_vector(self, key, opc, sqn, plmn):
+    def generate_eutran_vector(self, key, opc, sqn, plmn, rand=None):
         """
         Generate the E-EUTRAN key vector.
         Args:
@@ -38,127 +40,48 @@ class Milenage(BaseLTEAuthAlgo):
                   1      MCC digit 2 | MCC digit 1
                   2      MNC digit 3 | MCC digit 3
                   3      MNC digit 2 | MNC digit 1
+            rand (bytes): 128 bit random challenge, generated if not given
         Returns:
             rand (bytes): 128 bit random challenge
             xres (bytes): 128 bit expected result
             autn (bytes): 128 bit authentication token
             kasme (bytes): 256 bit base network authentication code
         """
-        CryptoLogger.debug("Called milenage.generate_eutran_vector")
-
-        CryptoLogger.debug("Generating SQN bytes")
-        CryptoLogger.debug("Current SQN value is " + str(sqn) + " and is " + str(len(str(sqn))) + " long")
-        sqn_bytes = bytearray.fromhex('{:012x}'.format(sqn))
-        #With some inputs a space is added here.
-        #See https://stackoverflow.com/questions/57697983/how-do-i-interpret-spaces-in-python-byte-arrays
-        CryptoLogger.debug("Generated SQN bytes")
-        CryptoLogger.debug("SQN bytes is " + str(sqn_bytes))
-
-        CryptoLogger.debug("Generating rand")
-        rand = Milenage.generate_rand()
-        CryptoLogger.debug("Generated rand")
-
-        CryptoLogger.debug("Generating f1")
-        mac_a, _ = Milenage.f1(key, sqn_bytes, rand, opc, self.amf)
-        CryptoLogger.debug("Generated f1")
-        CryptoLogger.debug("Generating f2")
-        xres, ak = Milenage.f2_f5(key, rand, opc)
-        CryptoLogger.debug("Generated f2")
-        CryptoLogger.debug("Generating f3")
-        ck = Milenage.f3(key, rand, opc)
-        CryptoLogger.debug("Generated f3")
-        CryptoLogger.debug("Generating f4")
-        ik = Milenage.f4(key, rand, opc)
-        CryptoLogger.debug("Generated f4")
-
-        CryptoLogger.debug("Generate generate_autn")
-        autn = Milenage.generate_autn(sqn_bytes, ak, mac_a, self.amf)
-        CryptoLogger.debug("Generated generate_autn")
-        CryptoLogger.debug("Generate generate_kasme")
-        kasme = Milenage.generate_kasme(ck, ik, plmn, sqn_bytes, ak)
-        CryptoLogger.debug("Generated generate_kasme")
-        CryptoLogger.debug("Successfully ran milenage.generate_eutran_vector")
+        if rand is None:
+            rand = Milenage.generate_rand()
+        sqn_bytes = sqn.to_bytes(6, 'big')
+        mac_a, _, xres, ck, ik, ak, _ = Milenage.f1_f5_star(key, opc, rand, sqn_bytes, self.amf)
+        sqn_x_ak = xor(sqn_bytes, ak)
+        autn = sqn_x_ak + self.amf + mac_a
+        kasme = Milenage.KDF(ck + ik, b'\x10' + plmn + b'\x00\x03' + sqn_x_ak + b'\x00\x06')
         return rand, xres, autn, kasme
 
     def generate_maa_vector(self, key, opc, sqn, plmn):
         """
-        Generate the E-EUTRAN key vector.
+        Generate the IMS AKA (Multimedia Auth) vector.
         Args:
             key (bytes): 128 bit subscriber key
             opc (bytes): 128 bit operator variant algorithm configuration field
             sqn (int): 48 bit sequence number
-            plmn (bytes): 24 bit network identifer
-                Octet           Description
-                  1      MCC digit 2 | MCC digit 1
-                  2      MNC digit 3 | MCC digit 3
-                  3      MNC digit 2 | MNC digit 1
+            plmn (bytes): 24 bit network identifer, unused
         Returns:
             rand (bytes): 128 bit random challenge
-            xres (bytes): 128 bit expected result
+            xres (bytes): 64 bit expected result
             autn (bytes): 128 bit authentication token
-            kasme (bytes): 256 bit base network authentication code
+            ck (bytes): 128 bit confidentiality key
+            ik (bytes): 128 bit integrity key
         """
-        CryptoLogger.debug("Called milenage.generate_maa_vector")
-
-        CryptoLogger.debug("Generating SQN bytes")
-        CryptoLogger.debug("Current SQN value is " + str(sqn) + " and is " + str(len(str(sqn))) + " long")
-        sqn_bytes = bytearray.fromhex('{:012x}'.format(sqn))
-        #With some inputs a space is added here.
-        #See https://stackoverflow.com/questions/57697983/how-do-i-interpret-spaces-in-python-byte-arrays
-        CryptoLogger.debug("Generated SQN bytes")
-        CryptoLogger.debug("SQN bytes is " + str(sqn_bytes))
-
-        CryptoLogger.debug("Generating rand")
         rand = Milenage.generate_rand()
-        CryptoLogger.debug("Generated rand")
-
-        CryptoLogger.debug("Generating f1")
-        mac_a, _ = Milenage.f1(key, sqn_bytes, rand, opc, self.amf)
-        CryptoLogger.debug("Generated f1")
-
-
-        CryptoLogger.debug("Generating f2")
-        xres, ak = Milenage.f2_f5(key, rand, opc)
-        CryptoLogger.debug("Generated f2")
-
-        CryptoLogger.debug("Generating ck")
-        ck = Milenage.f3(key, rand, opc)
-        CryptoLogger.debug("Generating ik")
-        ik = Milenage.f4(key, rand, opc)
-
-
-        CryptoLogger.debug("Generate generate_autn")
+        sqn_bytes = sqn.to_bytes(6, 'big')
+        mac_a, _, xres, ck, ik, ak, _ = Milenage.f1_f5_star(key, opc, rand, sqn_bytes, self.amf)
         autn = Milenage.generate_autn(sqn_bytes, ak, mac_a, self.amf)
-
         return rand, xres, autn, ck, ik
 
     def generate_eap_aka_vector(self, key, opc, sqn, plmn):
-        CryptoLogger.debug("Called milenage.generate_eap_aka_vector")
-
-        CryptoLogger.debug("Generating SQN bytes")
-        CryptoLogger.debug("Current SQN value is " + str(sqn) + " and is " + str(len(str(sqn))) + " long")
-        sqn_bytes = bytearray.fromhex('{:012x}'.format(sqn))
-        #With some inputs a space is added here.
-        #See https://stackoverflow.com/questions/57697983/how-do-i-interpret-spaces-in-python-byte-arrays
-        CryptoLogger.debug("Generated SQN bytes")
-        CryptoLogger.debug("SQN bytes is " + str(sqn_bytes))
-
-        CryptoLogger.debug("Generating rand")
         rand = Milenage.generate_rand()
-        CryptoLogger.debug("Generated rand")
-
-        CryptoLogger.debug("Generating f1")
-        mac_a, _ = Milenage.f1(key, sqn_bytes, rand, opc, self.amf)
-        CryptoLogger.debug("Generated f1")
-
-
-        CryptoLogger.debug("Generating f2")
-        xres, ak = Milenage.f2_f5(key, rand, opc)
-        CryptoLogger.debug("Generated f2")
-
-        CryptoLogger.debug("Generate generate_autn")
+        sqn_bytes = sqn.to_bytes(6, 'big')
+        mac_a, _, xres, _, _, ak, _ = Milenage.f1_f5_star(key, opc, rand, sqn_bytes, self.amf)
         autn = Milenage.generate_autn(sqn_bytes, ak, mac_a, self.amf)
-
         return rand, xres, autn, mac_a, ak
 
     def generate_auts(self, key, opc, rand, sqn):
@@ -201,6 +124,41 @@ class Milenage(BaseLTEAuthAlgo):
         _, mac_s = self.f1(key, sqn_ms, rand, opc, self.amf)
         return sqn_ms_int, mac_s
 
+    @classmethod
+    def f1_f5_star(cls, key, opc, rand, sqn, amf):
+        """
+        Runs f1, f1*, f2, f3, f4, f5 and f5* for one RAND with a single AES key schedule,
+        encrypting TEMP and then all five OUT blocks in one ECB call, with XOR and rotate done on integers.
+
+        Args:
+            key (bytes): 128 bit subscriber key
+            opc (bytes): 128 bit computed from OP and subscriber key
+            rand (bytes): 128 bit random challenge
+            sqn (bytes): 48 bit sequence number
+            amf (bytes): 16 bit authentication management field
+        Returns:
+            (mac_a, mac_s, res, ck, ik, ak, ak_star)
+        """
+        cipher = AES.new(bytes(key), AES.MODE_ECB)
+        opc_int = int.from_bytes(opc, 'big')
+        temp = int.from_bytes(cipher.encrypt((int.from_bytes(rand, 'big') ^ opc_int).to_bytes(16, 'big')), 'big')
+
+        # IN1 = SQN || AMF || SQN || AMF
+        in1 = int.from_bytes(bytes(sqn[0:6]) + bytes(amf[0:2]), 'big')
+        in1 = (in1 << 64) | in1
+        temp_x_opc = temp ^ opc_int
+        # OUT1 to OUT5 inputs, with the rotations (r1..r5) and constants (c1..c5) from 3GPP 35.206 4.1
+        blocks = b''.join(block.to_bytes(16, 'big') for block in (
+            temp ^ rotate_int(in1 ^ opc_int, 64),
+            temp_x_opc ^ 1,
+            rotate_int(temp_x_opc, 32) ^ 2,
+            rotate_int(temp_x_opc, 64) ^ 4,
+            rotate_int(temp_x_opc, 96) ^ 8,
+        ))
+        encrypted = cipher.encrypt(blocks)
+        out = [(int.from_bytes(encrypted[i:i + 16], 'big') ^ opc_int).to_bytes(16, 'big') for i in range(0, 80, 16)]
+        return out[0][:8], out[0][8:], out[1][8:16], out[2], out[3], out[1][0:6], out[4][:6]
+
     @classmethod
     def f1(cls, key, sqn, rand, opc, amf):
         """
@@ -370,7 +328,7 @@ class Milenage(BaseLTEAuthAlgo):
         Returns:
             (bytes) 128 random bits
         """
-        return bytearray.fromhex('{:032x}'.format(random.getrandbits(128)))
+        return get_random_bytes(16)
 
     @classmethod
     def generate_opc(cls, key, op):
@@ -398,10 +356,7 @@ class Milenage(BaseLTEAuthAlgo):
         Returns:
             autn (bytes): 128 bit authentication token
         """
-        CryptoLogger.debug("Attempting to xor(sqn, ak) where sqn is " + str(sqn) + " and AK is " + str(ak))
-        xor_ak = xor(sqn, ak)
-        CryptoLogger.debug("xor_ak output is " + str(xor_ak))
-        return xor_ak + AMF + mac_a
+        return xor(sqn, ak) + AMF + mac_a
 
     @classmethod
     def KDF(cls, key, buf):
@@ -428,8 +383,10 @@ class Milenage(BaseLTEAuthAlgo):
         Returns:
             encrypted output
         """
-        aes_cipher = AES.new(k, AES.MODE_CBC, IV)
-        return aes_cipher.encrypt(buf)
+        # A single CBC block is ECB of the block XOR the IV
+        if any(IV):
+            buf = xor(buf, IV)
+        return AES.new(bytes(k), AES.MODE_ECB).encrypt(bytes(buf))
 
 
 def xor(s1, s2):
@@ -444,10 +401,13 @@ def xor(s1, s2):
     Raises:
         ValueError if s1 and s2 lengths don't match
     """
-    if len(s1) != len(s2):
+    length = len(s1)
+    if length != len(s2):
         CryptoLogger.error("XOR Error - S1 and S2 don't match - Probably that space issue")
         #raise ValueError('Input not equal length, s1 is %d bytes and s2 is  %d bytes' % (len(s1), len(s2)))
-    return bytes(a ^ b for a, b in zip(s1, s2))
+        length = min(length, len(s2))
+        s1, s2 = s1[:length], s2[:length]
+    return (int.from_bytes(s1, 'big') ^ int.from_bytes(s2, 'big')).to_bytes(length, 'big')
 
 
 def rotate(input_s, bytes_):
@@ -460,5 +420,16 @@ def rotate(input_s, bytes_):
     Returns:
         (bytes) s1 rotated by n bytes
     """
-    return bytes(input_s[(i + bytes_) % len(input_s)] for i in range(len(
-        input_s)))
+    length = len(input_s)
+    if length == 0:
+        return b''
+    bits = (bytes_ % length) * 8
+    value = int.from_bytes(input_s, 'big')
+    return (((value << bits) | (value >> (length * 8 - bits))) & ((1 << (length * 8)) - 1)).to_bytes(length, 'big')
+
+
+def rotate_int(value, bits):
+    """
+    Rotate a 128 bit integer left by a number of bits
+    """
+    return ((value << bits) | (value >> (128 - bits))) & MASK_128
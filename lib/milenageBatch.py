@@ -0,0 +1,172 @@
+#Batch Milenage
+import hmac
+import os
+import numpy as np
+
+# AES S-box (FIPS 197 5.1.1)
+SBOX = np.array([
+    0x63, 0x7c, 0x77, 0x7b, 0xf2, 0x6b, 0x6f, 0xc5, 0x30, 0x01, 0x67, 0x2b, 0xfe, 0xd7, 0xab, 0x76,
+    0xca, 0x82, 0xc9, 0x7d, 0xfa, 0x59, 0x47, 0xf0, 0xad, 0xd4, 0xa2, 0xaf, 0x9c, 0xa4, 0x72, 0xc0,
+    0xb7, 0xfd, 0x93, 0x26, 0x36, 0x3f, 0xf7, 0xcc, 0x34, 0xa5, 0xe5, 0xf1, 0x71, 0xd8, 0x31, 0x15,
+    0x04, 0xc7, 0x23, 0xc3, 0x18, 0x96, 0x05, 0x9a, 0x07, 0x12, 0x80, 0xe2, 0xeb, 0x27, 0xb2, 0x75,
+    0x09, 0x83, 0x2c, 0x1a, 0x1b, 0x6e, 0x5a, 0xa0, 0x52, 0x3b, 0xd6, 0xb3, 0x29, 0xe3, 0x2f, 0x84,
+    0x53, 0xd1, 0x00, 0xed, 0x20, 0xfc, 0xb1, 0x5b, 0x6a, 0xcb, 0xbe, 0x39, 0x4a, 0x4c, 0x58, 0xcf,
+    0xd0, 0xef, 0xaa, 0xfb, 0x43, 0x4d, 0x33, 0x85, 0x45, 0xf9, 0x02, 0x7f, 0x50, 0x3c, 0x9f, 0xa8,
+    0x51, 0xa3, 0x40, 0x8f, 0x92, 0x9d, 0x38, 0xf5, 0xbc, 0xb6, 0xda, 0x21, 0x10, 0xff, 0xf3, 0xd2,
+    0xcd, 0x0c, 0x13, 0xec, 0x5f, 0x97, 0x44, 0x17, 0xc4, 0xa7, 0x7e, 0x3d, 0x64, 0x5d, 0x19, 0x73,
+    0x60, 0x81, 0x4f, 0xdc, 0x22, 0x2a, 0x90, 0x88, 0x46, 0xee, 0xb8, 0x14, 0xde, 0x5e, 0x0b, 0xdb,
+    0xe0, 0x32, 0x3a, 0x0a, 0x49, 0x06, 0x24, 0x5c, 0xc2, 0xd3, 0xac, 0x62, 0x91, 0x95, 0xe4, 0x79,
+    0xe7, 0xc8, 0x37, 0x6d, 0x8d, 0xd5, 0x4e, 0xa9, 0x6c, 0x56, 0xf4, 0xea, 0x65, 0x7a, 0xae, 0x08,
+    0xba, 0x78, 0x25, 0x2e, 0x1c, 0xa6, 0xb4, 0xc6, 0xe8, 0xdd, 0x74, 0x1f, 0x4b, 0xbd, 0x8b, 0x8a,
+    0x70, 0x3e, 0xb5, 0x66, 0x48, 0x03, 0xf6, 0x0e, 0x61, 0x35, 0x57, 0xb9, 0x86, 0xc1, 0x1d, 0x9e,
+    0xe1, 0xf8, 0x98, 0x11, 0x69, 0xd9, 0x8e, 0x94, 0x9b, 0x1e, 0x87, 0xe9, 0xce, 0x55, 0x28, 0xdf,
+    0x8c, 0xa1, 0x89, 0x0d, 0xbf, 0xe6, 0x42, 0x68, 0x41, 0x99, 0x2d, 0x0f, 0xb0, 0x54, 0xbb, 0x16,
+], dtype=np.uint32)
+ROUND_CONSTANTS = [0x01, 0x02, 0x04, 0x08, 0x10, 0x20, 0x40, 0x80, 0x1b, 0x36]
+
+
+def buildTables():
+    """
+    Builds the four AES round T-tables, each mapping a state byte to its SubBytes, ShiftRows and MixColumns contribution to a column.
+    """
+    doubled = ((SBOX << 1) ^ np.where(SBOX & 0x80, 0x1b, 0)) & 0xff
+    tripled = doubled ^ SBOX
+    t0 = (doubled << 24) | (SBOX << 16) | (SBOX << 8) | tripled
+    return [((t0 >> (8 * shift)) | (t0 << (32 - 8 * shift))) & 0xffffffff for shift in range(4)]
+
+
+T_TABLES = buildTables()
+
+
+def toWords(blocks) -> np.ndarray:
+    """
+    Converts an (N, 16) uint8 array of blocks to an (N, 4) array of big endian uint32 words.
+    """
+    return np.ascontiguousarray(blocks, dtype=np.uint8).view('>u4').astype(np.uint32)
+
+
+def toBytes(words) -> np.ndarray:
+    """
+    Converts an (N, W) array of uint32 words back to an (N, W * 4) uint8 array.
+    """
+    return np.ascontiguousarray(words, dtype='>u4').view(np.uint8)
+
+
+def sqnBytes(sqns) -> np.ndarray:
+    """
+    Converts an array of N SQNs to an (N, 6) uint8 array of big endian 48 bit values.
+    """
+    return np.asarray(sqns, dtype=np.uint64).astype('>u8').view(np.uint8).reshape(len(sqns), 8)[:, 2:]
+
+
+def subWord(word):
+    return (SBOX[word >> 24] << 24) | (SBOX[(word >> 16) & 0xff] << 16) | (SBOX[(word >> 8) & 0xff] << 8) | SBOX[word & 0xff]
+
+
+def expandKeys(keys) -> np.ndarray:
+    """
+    Runs the AES-128 key expansion for an (N, 16) uint8 array of keys, and returns the (N, 44) round key words.
+    """
+    roundKeys = np.empty((len(keys), 44), dtype=np.uint32)
+    roundKeys[:, :4] = toWords(keys)
+    for i in range(4, 44):
+        word = roundKeys[:, i - 1]
+        if i % 4 == 0:
+            word = subWord(((word << 8) | (word >> 24)) & 0xffffffff) ^ (ROUND_CONSTANTS[i // 4 - 1] << 24)
+        roundKeys[:, i] = roundKeys[:, i - 4] ^ word
+    return roundKeys
+
+
+def encryptBlocks(roundKeys, blocks) -> np.ndarray:
+    """
+    AES-128 encrypts row i of an (N, 4) uint32 word array with the round keys in row i of roundKeys.
+    """
+    t0, t1, t2, t3 = T_TABLES
+    s = [blocks[:, column] ^ roundKeys[:, column] for column in range(4)]
+    for round in range(1, 10):
+        s = [t0[s[column] >> 24] ^ t1[(s[(column + 1) % 4] >> 16) & 0xff] ^ t2[(s[(column + 2) % 4] >> 8) & 0xff] ^ t3[s[(column + 3) % 4] & 0xff] ^ roundKeys[:, 4 * round + column]
+             for column in range(4)]
+    # The final round has no MixColumns
+    s = [((SBOX[s[column] >> 24] << 24) | (SBOX[(s[(column + 1) % 4] >> 16) & 0xff] << 16) | (SBOX[(s[(column + 2) % 4] >> 8) & 0xff] << 8) | SBOX[s[(column + 3) % 4] & 0xff]) ^ roundKeys[:, 40 + column]
+         for column in range(4)]
+    return np.stack(s, axis=1)
+
+
+def generateRands(count: int) -> np.ndarray:
+    return np.frombuffer(os.urandom(16 * count), dtype=np.uint8).reshape(count, 16)
+
+
+def asBlocks(values, count: int, size: int=16) -> np.ndarray:
+    """
+    Returns values as a (count, size) uint8 array. A single bytes value is repeated for every row, and a list of bytes values is joined.
+    """
+    if isinstance(values, (bytes, bytearray)):
+        return np.tile(np.frombuffer(bytes(values), dtype=np.uint8), (count, 1))
+    if isinstance(values, (list, tuple)):
+        values = np.frombuffer(b''.join(values), dtype=np.uint8)
+    return np.asarray(values, dtype=np.uint8).reshape(count, size)
+
+
+def milenage(keys, opcs, sqns, rands, amf=b'\x80\x00'):
+    """
+    Runs f1, f2, f3, f4 and f5 (3GPP TS 35.206) across a batch.
+    keys, opcs and rands are (N, 16) uint8 arrays, sqns is an array of N 48 bit SQNs, and amf is one 16 bit AMF for the whole batch.
+    Returns (macA, xres, ck, ik, ak) as uint8 arrays of 8, 8, 16, 16 and 6 bytes per row.
+    """
+    count = len(sqns)
+    roundKeys = expandKeys(keys)
+    opcWords = toWords(opcs)
+    temp = encryptBlocks(roundKeys, toWords(rands) ^ opcWords)
+
+    # IN1 = SQN || AMF || SQN || AMF
+    sqns = np.asarray(sqns, dtype=np.uint64)
+    in1 = np.empty((count, 4), dtype=np.uint32)
+    in1[:, 0] = in1[:, 2] = (sqns >> np.uint64(16)).astype(np.uint32)
+    in1[:, 1] = in1[:, 3] = ((sqns & np.uint64(0xffff)).astype(np.uint32) << 16) | int.from_bytes(amf, 'big')
+
+    # Every Milenage rotation is a whole number of words, so rotating left is rolling the words
+    tempXorOpc = temp ^ opcWords
+    out1 = temp ^ np.roll(in1 ^ opcWords, -2, axis=1)
+    out2 = tempXorOpc.copy()
+    out2[:, 3] ^= 1
+    out3 = np.roll(tempXorOpc, -1, axis=1)
+    out3[:, 3] ^= 2
+    out4 = np.roll(tempXorOpc, -2, axis=1)
+    out4[:, 3] ^= 4
+
+    # OUT1 to OUT4 are encrypted as one batch of 4N blocks
+    outputs = encryptBlocks(np.concatenate([roundKeys] * 4), np.concatenate([out1, out2, out3, out4])) ^ np.concatenate([opcWords] * 4)
+    out1, out2, out3, out4 = (toBytes(outputs[i * count:(i + 1) * count]) for i in range(4))
+    return out1[:, :8], out2[:, 8:], out3, out4, out2[:, :6]
+
+
+def generateEutranVectors(keys, opcs, sqns, plmn, amf=b'\x80\x00', rands=None):
+    """
+    Generates one E-UTRAN vector per SQN, as in Milenage.generate_eutran_vector.
+    keys, opcs and rands are (N, 16) uint8 arrays, lists of bytes, or one bytes value for the whole batch. RANDs are generated if not given.
+    plmn and amf are bytes shared by the whole batch.
+    Returns (rand, xres, autn, kasme) as uint8 arrays of 16, 8, 16 and 32 bytes per row.
+    """
+    count = len(sqns)
+    rands = generateRands(count) if rands is None else asBlocks(rands, count)
+    macA, xres, ck, ik, ak = milenage(asBlocks(keys, count), asBlocks(opcs, count), sqns, rands, amf)
+    sqnXorAk = sqnBytes(sqns) ^ ak
+    autn = np.concatenate([sqnXorAk, asBlocks(amf, count, 2), macA], axis=1)
+
+    # KASME is HMAC-SHA256 keyed by CK || IK, which has no batch form, so it's one call per row
+    ckIk = np.concatenate([ck, ik], axis=1)
+    kdfPrefix = b'\x10' + bytes(plmn) + b'\x00\x03'
+    kasme = np.frombuffer(b''.join(hmac.digest(ckIk[i].tobytes(), kdfPrefix + sqnXorAk[i].tobytes() + b'\x00\x06', 'sha256') for i in range(count)), dtype=np.uint8).reshape(count, 32)
+    return rands, xres, autn, kasme
+
+
+def generateAkaVectors(keys, opcs, sqns, amf=b'\x80\x00', rands=None):
+    """
+    Generates one UMTS AKA vector per SQN, as in Milenage.generate_maa_vector, taking the same inputs as generateEutranVectors.
+    Returns (rand, autn, xres, ck, ik) as uint8 arrays of 16, 16, 8, 16 and 16 bytes per row.
+    """
+    count = len(sqns)
+    rands = generateRands(count) if rands is None else asBlocks(rands, count)
+    macA, xres, ck, ik, ak = milenage(asBlocks(keys, count), asBlocks(opcs, count), sqns, rands, amf)
+    autn = np.concatenate([sqnBytes(sqns) ^ ak, asBlocks(amf, count, 2), macA], axis=1)
+    return rands, autn, xres, ck, ik
@@ -0,0 +1,98 @@
+#Operation Log Writer
+import atexit
+import threading
+from collections import deque
+
+
+class OperationLogWriter:
+    """
+    Buffers operation log entries in memory and writes them in batches from a background thread,
+    so the transaction which made a change doesn't also have to write its audit log.
+    writeBatch is called with a list of entries, and should raise if they couldn't be written; they're kept and retried on the next flush.
+    Once maxQueued entries are waiting, the oldest are dropped.
+    """
+
+    def __init__(self, writeBatch, batchSize: int=100, flushInterval: float=1, maxQueued: int=10000, errorHandler=None):
+        self.writeBatch = writeBatch
+        self.batchSize = batchSize
+        self.flushInterval = flushInterval
+        self.errorHandler = errorHandler
+        self.entries = deque(maxlen=maxQueued)
+        self.droppedEntries = 0
+        self.condition = threading.Condition()
+        # Held while a batch is written, so a synchronous flush and the background thread never write out of order.
+        self.writeLock = threading.Lock()
+        self.thread = None
+        self.running = False
+        atexit.register(self.stop)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def append(self, entries: list):
+        """
+        Queues entries to be written, and wakes the writer once a full batch is waiting.
+        """
+        with self.condition:
+            self.droppedEntries += max(len(self.entries) + len(entries) - self.entries.maxlen, 0)
+            self.entries.extend(entries)
+            if len(self.entries) >= self.batchSize:
+                self.condition.notify()
+        self.start()
+
+    def start(self):
+        # Started on first use rather than in __init__, so a process forked after Database was created still gets a writer.
+        if self.thread is not None and self.thread.is_alive():
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self.run, name='operationLogWriter', daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """
+        Stops the background thread and writes everything still queued.
+        """
+        with self.condition:
+            self.running = False
+            self.condition.notify()
+        self.flush()
+
+    def run(self):
+        while self.running:
+            with self.condition:
+                if len(self.entries) < self.batchSize:
+                    self.condition.wait(self.flushInterval)
+            self.flush()
+
+    def takeBatch(self) -> list:
+        with self.condition:
+            return [self.entries.popleft() for _ in range(min(self.batchSize, len(self.entries)))]
+
+    def flush(self) -> int:
+        """
+        Writes every queued entry, and returns the number written.
+        Stops at the first failed batch, which is put back at the front of the queue.
+        """
+        written = 0
+        with self.writeLock:
+            while True:
+                batch = self.takeBatch()
+                if not batch:
+                    break
+                try:
+                    self.writeBatch(batch)
+                except Exception as E:
+                    with self.condition:
+                        requeued = batch[:self.entries.maxlen - len(self.entries)]
+                        self.droppedEntries += len(batch) - len(requeued)
+                        self.entries.extendleft(reversed(requeued))
+                    if self.errorHandler is not None:
+                        self.errorHandler(E)
+                    break
+                written += len(batch)
+        return written
+
+    def takeDroppedEntries(self) -> int:
+        with self.condition:
+            droppedEntries, self.droppedEntries = self.droppedEntries, 0
+        return droppedEntries
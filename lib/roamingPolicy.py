@@ -0,0 +1,50 @@
+#Outbound Roaming Policy
+from types import MappingProxyType
+
+
+class RoamingPolicy:
+    """
+    Outbound roaming rules compiled from the ROAMING_RULE and ROAMING_NETWORK tables.
+    Holds a map of roaming_rule_id to its (mcc, mnc, allow) decision for subscriber assigned rules,
+    and a map of (mcc, mnc) to the decision of the first rule for that network, used as the rule of last resort.
+    """
+    __slots__ = ('rulesById', 'networkDecisions')
+
+    def __init__(self, roamingRules: list, roamingNetworks: list):
+        roamingNetworksById = {roamingNetwork['roaming_network_id']: roamingNetwork for roamingNetwork in roamingNetworks}
+        rulesById = {}
+        networkDecisions = {}
+        # Rules are matched in roaming_rule_id order, so the first rule for a network wins the fallback pass.
+        for roamingRule in sorted(roamingRules, key=lambda roamingRule: roamingRule['roaming_rule_id']):
+            roamingNetwork = roamingNetworksById.get(roamingRule.get('roaming_network_id'))
+            if roamingNetwork is None:
+                continue
+            plmn = (str(roamingNetwork.get('mcc')), str(roamingNetwork.get('mnc')))
+            allowNetwork = bool(roamingRule.get('allow', True))
+            rulesById[str(roamingRule['roaming_rule_id'])] = (plmn, allowNetwork)
+            networkDecisions.setdefault(plmn, allowNetwork)
+        object.__setattr__(self, 'rulesById', MappingProxyType(rulesById))
+        object.__setattr__(self, 'networkDecisions', MappingProxyType(networkDecisions))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("RoamingPolicy is immutable")
+
+    def __repr__(self) -> str:
+        return f"RoamingPolicy(rules={len(self.rulesById)}, networks={len(self.networkDecisions)})"
+
+    def evaluate(self, assignedRoamingRules: str, mcc: str, mnc: str) -> tuple:
+        """
+        Returns (allowed, source) for outbound roaming to the given PLMN.
+        The subscriber's assigned rules (a comma separated list of roaming_rule_id) are checked in order first,
+        then the network's fallback rule. source is 'subscriber' or 'network', or (None, None) if no rule matched.
+        """
+        plmn = (str(mcc), str(mnc))
+        if assignedRoamingRules:
+            for subscriberRoamingRule in assignedRoamingRules.split(','):
+                roamingRule = self.rulesById.get(str(subscriberRoamingRule))
+                if roamingRule is not None and roamingRule[0] == plmn:
+                    return roamingRule[1], 'subscriber'
+        allowNetwork = self.networkDecisions.get(plmn)
+        if allowNetwork is not None:
+            return allowNetwork, 'network'
+        return None, None
@@ -0,0 +1,92 @@
+#Subscriber Profile Cache
+import time
+import threading
+from collections import OrderedDict
+
+
+class SubscriberCache:
+    """
+    In-process LRU cache with a TTL, sitting in front of the subscriber profile lookups in Database.
+    Entries are keyed by (table, field, value), e.g. ('subscriber', 'imsi', '001010000000001'),
+    and indexed by (table, row id) so that every key for a row can be dropped when that row changes.
+    """
+
+    def __init__(self, maxEntries: int=10000, ttl: float=60):
+        self.maxEntries = maxEntries
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.rowKeys = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, key: tuple):
+        """
+        Returns a copy of the cached row for key, or None if it's missing or expired.
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expiry, rowKey, value = entry
+            if expiry < time.monotonic():
+                self.removeEntry(key)
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return dict(value)
+
+    def set(self, key: tuple, rowKey: tuple, value: dict):
+        """
+        Stores a copy of value under key, evicting the least recently used entries once the cache is full.
+        rowKey is the (table, row id) of the row, which is what invalidate() is called with.
+        """
+        with self.lock:
+            if key in self.entries:
+                self.removeEntry(key)
+            self.entries[key] = (time.monotonic() + self.ttl, rowKey, dict(value))
+            self.rowKeys.setdefault(rowKey, set()).add(key)
+            while len(self.entries) > self.maxEntries:
+                self.removeEntry(next(iter(self.entries)))
+                self.evictions += 1
+
+    def invalidate(self, rowKey: tuple) -> int:
+        """
+        Drops every cached key for the given (table, row id), and returns how many were dropped.
+        """
+        with self.lock:
+            keys = self.rowKeys.pop(rowKey, ())
+            for key in keys:
+                self.entries.pop(key, None)
+            return len(keys)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.rowKeys.clear()
+
+    def takeStats(self) -> dict:
+        """
+        Returns the hit, miss and eviction counts since the last call, and resets them.
+        """
+        with self.lock:
+            stats = {'hit': self.hits, 'miss': self.misses, 'eviction': self.evictions}
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+            return stats
+
+    def removeEntry(self, key: tuple):
+        # Caller must hold the lock.
+        expiry, rowKey, value = self.entries.pop(key)
+        keys = self.rowKeys.get(rowKey)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self.rowKeys[rowKey]
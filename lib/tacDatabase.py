@@ -0,0 +1,166 @@
+#IMEI TAC Database
+import os
+import mmap
+import struct
+import bisect
+from array import array
+
+# Index file header: Magic, Format Version, Entry Count.
+# The header is followed by the sorted TAC keys, the string offsets and the string table, so the file can be mapped and searched in place.
+indexHeaderStruct = struct.Struct('<8sII')
+INDEX_MAGIC = b'PYHSSTAC'
+INDEX_VERSION = 1
+# Separates the name and model of an entry in the string table.
+FIELD_SEPARATOR = b'\x00'
+# Keys and offsets are unsigned 32 bit integers, in native byte order as the index is only read on the host that wrote it.
+INDEX_ITEM_SIZE = array('I').itemsize
+# TAC lengths which are looked up, longest first. Keys for these always fit in the index's 32 bit keys.
+TAC_LENGTHS = (8, 6)
+
+
+def tacKey(tacPrefix: str) -> int:
+    """
+    Packs a TAC prefix into one integer, including its length so that e.g. '012345' (6 digits) and '00012345' (8 digits) don't collide.
+    """
+    return int(tacPrefix) * 10 + len(tacPrefix)
+
+
+def parseTacCsv(csvPath: str, skippedRows: list=None) -> dict:
+    """
+    Reads a TAC CSV (tac, name, model) into a dict of tacKey: (tacPrefix, name, model).
+    Rows without a 6 or 8 digit TAC, name and model are skipped, and their line number and reason added to skippedRows if it's given.
+    A header row and blank lines are skipped silently. The first entry for a TAC wins.
+    """
+    tacEntries = {}
+    with open(csvPath, encoding='utf-8', errors='replace') as csvFile:
+        for lineNumber, line in enumerate(csvFile, start=1):
+            # Remove unsafe characters from the CSV file
+            line = line.replace('"', '').replace("'", '').replace("\\", '').rstrip()
+            if not line:
+                continue
+            fields = line.split(',')
+            tacPrefix = fields[0].strip()
+            if lineNumber == 1 and not tacPrefix.isdigit():
+                continue
+            try:
+                if len(tacPrefix) not in TAC_LENGTHS or not tacPrefix.isdigit():
+                    raise ValueError(f"TAC {tacPrefix} is not 6 or 8 digits")
+                if len(fields) < 3:
+                    raise ValueError(f"TAC {tacPrefix} has no name and model")
+                tacEntries.setdefault(tacKey(tacPrefix), (tacPrefix, fields[1].lstrip(), fields[2].lstrip()))
+            except (ValueError, OverflowError) as e:
+                if skippedRows is not None:
+                    skippedRows.append((lineNumber, str(e)))
+    return tacEntries
+
+
+class TacDatabase:
+    """
+    IMEI TAC database held as a sorted array of integer TAC keys, with each device's name and model in a shared string table.
+    It's either built in memory from the CSV, or mapped read-only from an index file written by writeIndex,
+    in which case every process shares the same pages and opening it costs the same regardless of the size of the list.
+    """
+
+    def __init__(self, keys, offsets, strings, indexFile=None):
+        self.keys = keys
+        self.offsets = offsets
+        self.strings = strings
+        self.indexFile = indexFile
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @classmethod
+    def fromCsv(cls, csvPath: str, skippedRows: list=None):
+        return cls(*cls.buildArrays(parseTacCsv(csvPath, skippedRows)))
+
+    @classmethod
+    def buildArrays(cls, tacEntries: dict) -> tuple:
+        keys = array('I')
+        offsets = array('I', [0])
+        strings = bytearray()
+        for key in sorted(tacEntries):
+            tacPrefix, name, model = tacEntries[key]
+            keys.append(key)
+            strings += name.encode('utf-8') + FIELD_SEPARATOR + model.encode('utf-8')
+            offsets.append(len(strings))
+        return keys, offsets, bytes(strings)
+
+    @classmethod
+    def writeIndex(cls, csvPath: str, indexPath: str, skippedRows: list=None) -> int:
+        """
+        Compiles the TAC CSV into an index file, and returns the number of entries written.
+        The file is written alongside and renamed into place, so processes opening it never see a partial index.
+        """
+        keys, offsets, strings = cls.buildArrays(parseTacCsv(csvPath, skippedRows))
+        temporaryPath = f"{indexPath}.{os.getpid()}.tmp"
+        with open(temporaryPath, 'wb') as indexFile:
+            indexFile.write(indexHeaderStruct.pack(INDEX_MAGIC, INDEX_VERSION, len(keys)))
+            keys.tofile(indexFile)
+            offsets.tofile(indexFile)
+            indexFile.write(strings)
+        os.replace(temporaryPath, indexPath)
+        return len(keys)
+
+    @classmethod
+    def openIndex(cls, indexPath: str):
+        """
+        Maps an index file written by writeIndex. Raises ValueError if it isn't a valid index.
+        """
+        with open(indexPath, 'rb') as indexFile:
+            indexMap = mmap.mmap(indexFile.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(indexMap) < indexHeaderStruct.size:
+            raise ValueError(f"TAC index {indexPath} is truncated")
+        magic, version, count = indexHeaderStruct.unpack_from(indexMap, 0)
+        keysStart = indexHeaderStruct.size
+        offsetsStart = keysStart + count * INDEX_ITEM_SIZE
+        stringsStart = offsetsStart + (count + 1) * INDEX_ITEM_SIZE
+        if magic != INDEX_MAGIC or version != INDEX_VERSION or len(indexMap) < stringsStart:
+            raise ValueError(f"TAC index {indexPath} is not a valid version {INDEX_VERSION} index")
+        indexView = memoryview(indexMap)
+        keys = indexView[keysStart:offsetsStart].cast('I')
+        offsets = indexView[offsetsStart:stringsStart].cast('I')
+        strings = indexView[stringsStart:]
+        if len(strings) != offsets[count]:
+            raise ValueError(f"TAC index {indexPath} is truncated")
+        return cls(keys, offsets, strings, indexFile=indexMap)
+
+    @classmethod
+    def load(cls, csvPath: str, indexPath: str=None, skippedRows: list=None):
+        """
+        Opens the index for csvPath, rebuilding it first if it's missing or older than the CSV.
+        Falls back to building the database in memory if there's no indexPath or the index can't be written.
+        Rows skipped while reading the CSV are added to skippedRows, so they're only reported when the index is rebuilt.
+        """
+        if not indexPath:
+            return cls.fromCsv(csvPath, skippedRows)
+        try:
+            if not os.path.exists(indexPath) or os.path.getmtime(indexPath) < os.path.getmtime(csvPath):
+                cls.writeIndex(csvPath, indexPath, skippedRows)
+            return cls.openIndex(indexPath)
+        except (OSError, ValueError):
+            if skippedRows is not None:
+                skippedRows.clear()
+            return cls.fromCsv(csvPath, skippedRows)
+
+    def findEntry(self, tacPrefix: str):
+        key = tacKey(tacPrefix)
+        index = bisect.bisect_left(self.keys, key)
+        if index == len(self.keys) or self.keys[index] != key:
+            return None
+        name, model = bytes(self.strings[self.offsets[index]:self.offsets[index + 1]]).decode('utf-8').split('\x00', 1)
+        return {'tacPrefix': tacPrefix, 'name': name, 'model': model}
+
+    def lookup(self, imei: str) -> dict:
+        """
+        Returns the device for an IMEI, trying the 8 digit TAC first and then the 6 digit TAC.
+        Returns an empty dict if neither is found.
+        """
+        imei = str(imei)
+        for tacLength in TAC_LENGTHS:
+            tacPrefix = imei[0:tacLength]
+            if len(tacPrefix) == tacLength and tacPrefix.isdigit():
+                entry = self.findEntry(tacPrefix)
+                if entry is not None:
+                    return entry
+        return {}
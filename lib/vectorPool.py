@@ -0,0 +1,194 @@
+#Authentication Vector Pool
+import time
+from Crypto.Cipher import AES
+from Crypto.Random import get_random_bytes
+
+# A vector is stored as RAND (16) || XRES (8) || AUTN (16) || KASME (32), encrypted with AES-GCM.
+VECTOR_FIELDS = (('rand', 16), ('xres', 8), ('autn', 16), ('kasme', 32))
+NONCE_SIZE = 12
+TAG_SIZE = 16
+
+# Pops up to ARGV[2] vectors for ARGV[1] (the serving PLMN), marks the AuC as recently seen, and requests a refill once the pool is low.
+# Vectors are bound to the PLMN their KASME was derived for, so a request from another PLMN drops them and starts a new generation.
+VECTOR_POOL_POP_SCRIPT = """
+local vectors = {}
+if redis.call('HGET', KEYS[2], 'plmn') == ARGV[1] then
+    vectors = redis.call('LPOP', KEYS[1], ARGV[2]) or {}
+else
+    local dropped = redis.call('LLEN', KEYS[1])
+    redis.call('DEL', KEYS[1])
+    redis.call('HINCRBY', KEYS[5], 'depth', -dropped)
+    redis.call('HINCRBY', KEYS[5], 'dropped', dropped)
+    redis.call('HINCRBY', KEYS[2], 'generation', 1)
+    redis.call('HSET', KEYS[2], 'plmn', ARGV[1])
+end
+redis.call('HINCRBY', KEYS[5], 'depth', -#vectors)
+if #vectors == tonumber(ARGV[2]) then
+    redis.call('HINCRBY', KEYS[5], 'hit', 1)
+elseif #vectors > 0 then
+    redis.call('HINCRBY', KEYS[5], 'partial', 1)
+else
+    redis.call('HINCRBY', KEYS[5], 'miss', 1)
+end
+redis.call('ZADD', KEYS[4], ARGV[3], ARGV[5])
+if redis.call('LLEN', KEYS[1]) <= tonumber(ARGV[4]) then
+    redis.call('ZADD', KEYS[3], 'NX', ARGV[3], ARGV[5])
+end
+return vectors
+"""
+
+# Appends vectors, unless the pool has been invalidated or refilled since ARGV[1] was read.
+VECTOR_POOL_PUSH_SCRIPT = """
+if redis.call('HGET', KEYS[2], 'generation') ~= ARGV[1] then
+    return 0
+end
+redis.call('RPUSH', KEYS[1], unpack(ARGV, 2))
+redis.call('HINCRBY', KEYS[2], 'generation', 1)
+redis.call('HINCRBY', KEYS[3], 'depth', #ARGV - 1)
+redis.call('HINCRBY', KEYS[3], 'generated', #ARGV - 1)
+return #ARGV - 1
+"""
+
+# Drops every pooled vector. A refill in progress is discarded, and a recently seen AuC is queued for a new one.
+VECTOR_POOL_INVALIDATE_SCRIPT = """
+local dropped = redis.call('LLEN', KEYS[1])
+redis.call('DEL', KEYS[1])
+redis.call('HINCRBY', KEYS[4], 'depth', -dropped)
+redis.call('HINCRBY', KEYS[4], 'dropped', dropped)
+if redis.call('EXISTS', KEYS[2]) == 1 then
+    redis.call('HINCRBY', KEYS[2], 'generation', 1)
+    redis.call('ZADD', KEYS[3], 'NX', ARGV[2], ARGV[1])
+end
+return dropped
+"""
+
+# Drops the pool and state of an AuC which hasn't been seen since ARGV[2].
+VECTOR_POOL_EXPIRE_SCRIPT = """
+local lastSeen = redis.call('ZSCORE', KEYS[3], ARGV[1])
+if lastSeen and tonumber(lastSeen) > tonumber(ARGV[2]) then
+    return 0
+end
+local dropped = redis.call('LLEN', KEYS[1])
+redis.call('DEL', KEYS[1], KEYS[2])
+redis.call('ZREM', KEYS[3], ARGV[1])
+redis.call('HINCRBY', KEYS[4], 'depth', -dropped)
+return 1
+"""
+
+# Takes up to ARGV[1] AuCs from the refill queue, oldest request first.
+VECTOR_POOL_CLAIM_SCRIPT = """
+local claimed = {}
+local entries = redis.call('ZPOPMIN', KEYS[1], ARGV[1])
+for i = 1, #entries, 2 do
+    claimed[#claimed + 1] = entries[i]
+end
+return claimed
+"""
+
+VECTOR_POOL_STATE_SCRIPT = """
+local state = redis.call('HMGET', KEYS[2], 'generation', 'plmn')
+return {state[1], state[2], redis.call('LLEN', KEYS[1])}
+"""
+
+# Returns the depth, AuC count and refill queue length, and the hit, partial, miss, generated and dropped counts since the last call.
+VECTOR_POOL_STATS_SCRIPT = """
+local counts = redis.call('HMGET', KEYS[1], 'depth', 'hit', 'partial', 'miss', 'generated', 'dropped')
+redis.call('HSET', KEYS[1], 'hit', 0, 'partial', 0, 'miss', 0, 'generated', 0, 'dropped', 0)
+return {counts[1] or 0, redis.call('ZCARD', KEYS[2]), redis.call('ZCARD', KEYS[3]), counts[2] or 0, counts[3] or 0, counts[4] or 0, counts[5] or 0, counts[6] or 0}
+"""
+
+
+class VectorPool:
+    """
+    Pool of E-UTRAN vectors generated ahead of time for recently seen AuCs, shared by every process on this host through Redis.
+    Vectors are encrypted with AES-GCM before they're stored, bound to their AuC and PLMN, and handed out in SQN order.
+    Each AuC's pool has a generation, which changes whenever it's refilled or invalidated, so a refill started before an invalidation is discarded.
+    """
+
+    def __init__(self, redisMessaging, hostname: str, encryptionKey: bytes, depth: int=8, refillThreshold: int=None):
+        if len(encryptionKey) not in (16, 24, 32):
+            raise ValueError("Vector pool encryption key must be 16, 24 or 32 bytes")
+        self.redisMessaging = redisMessaging
+        self.hostname = hostname
+        self.encryptionKey = encryptionKey
+        self.depth = depth
+        self.refillThreshold = depth // 2 if refillThreshold is None else refillThreshold
+
+    def runScript(self, script: str, keys: list, args: list=[]):
+        return self.redisMessaging.runScript(script, keys=keys, args=args, usePrefix=True, prefixHostname=self.hostname, prefixServiceName='vectorPool')
+
+    def encryptVector(self, auc_id, plmn: str, vector: dict) -> bytes:
+        nonce = get_random_bytes(NONCE_SIZE)
+        cipher = AES.new(self.encryptionKey, AES.MODE_GCM, nonce=nonce, mac_len=TAG_SIZE)
+        cipher.update(f"{auc_id}:{plmn}".encode())
+        ciphertext, tag = cipher.encrypt_and_digest(b''.join(bytes.fromhex(vector[field]) for field, size in VECTOR_FIELDS))
+        return nonce + ciphertext + tag
+
+    def decryptVector(self, auc_id, plmn: str, storedVector: bytes) -> dict:
+        """
+        Decrypts a stored vector, raising ValueError if it fails authentication.
+        """
+        cipher = AES.new(self.encryptionKey, AES.MODE_GCM, nonce=storedVector[:NONCE_SIZE], mac_len=TAG_SIZE)
+        cipher.update(f"{auc_id}:{plmn}".encode())
+        plaintext = cipher.decrypt_and_verify(storedVector[NONCE_SIZE:-TAG_SIZE], storedVector[-TAG_SIZE:])
+        vector = {}
+        offset = 0
+        for field, size in VECTOR_FIELDS:
+            vector[field] = plaintext[offset:offset + size].hex()
+            offset += size
+        return vector
+
+    def pop(self, auc_id, plmn: str, count: int) -> list:
+        """
+        Takes up to count vectors for an AuC and serving PLMN, lowest SQN first, as dicts of hex rand, xres, autn and kasme.
+        Returns fewer than count, or none, if the pool is short or Redis is unavailable.
+        """
+        storedVectors = self.runScript(VECTOR_POOL_POP_SCRIPT, keys=[f"vectors:{auc_id}", f"state:{auc_id}", 'refill', 'seen', 'stats'],
+                                       args=[plmn, count, time.time(), self.refillThreshold, auc_id])
+        return [self.decryptVector(auc_id, plmn, storedVector) for storedVector in storedVectors or []]
+
+    def invalidate(self, auc_id):
+        """
+        Drops an AuC's pooled vectors, after its SQN, K or OPc has changed or a vector has been generated outside the pool.
+        """
+        return self.runScript(VECTOR_POOL_INVALIDATE_SCRIPT, keys=[f"vectors:{auc_id}", f"state:{auc_id}", 'refill', 'stats'], args=[auc_id, time.time()])
+
+    def claimRefills(self, count: int) -> list:
+        return [int(auc_id) for auc_id in self.runScript(VECTOR_POOL_CLAIM_SCRIPT, keys=['refill'], args=[count]) or []]
+
+    def getState(self, auc_id):
+        """
+        Returns (generation, plmn, number of pooled vectors) for an AuC, or None if it hasn't been seen recently.
+        """
+        state = self.runScript(VECTOR_POOL_STATE_SCRIPT, keys=[f"vectors:{auc_id}", f"state:{auc_id}"])
+        if not state or state[0] is None or state[1] is None:
+            return None
+        return state[0].decode(), state[1].decode(), int(state[2])
+
+    def push(self, auc_id, plmn: str, generation: str, vectors: list) -> int:
+        """
+        Stores vectors read from the AuC at generation, in SQN order. Returns the number stored, which is 0 if the pool has moved on since.
+        """
+        if not vectors:
+            return 0
+        storedVectors = [self.encryptVector(auc_id, plmn, vector) for vector in vectors]
+        return int(self.runScript(VECTOR_POOL_PUSH_SCRIPT, keys=[f"vectors:{auc_id}", f"state:{auc_id}", 'stats'], args=[generation] + storedVectors) or 0)
+
+    def expireIdle(self, idleTime: float, limit: int=1000) -> int:
+        """
+        Drops the pools of AuCs which haven't been seen for idleTime seconds, up to limit at a time, and returns how many were dropped.
+        """
+        cutoff = time.time() - idleTime
+        expired = 0
+        for auc_id in self.redisMessaging.getSortedSetRangeByScore('seen', maxScore=cutoff, count=limit, usePrefix=True, prefixHostname=self.hostname, prefixServiceName='vectorPool'):
+            expired += int(self.runScript(VECTOR_POOL_EXPIRE_SCRIPT, keys=[f"vectors:{auc_id}", f"state:{auc_id}", 'seen', 'stats'], args=[auc_id, cutoff]) or 0)
+        return expired
+
+    def takeStats(self) -> dict:
+        """
+        Returns the pool depth, AuC count and refill queue length, and the request, generated and dropped counts since the last call.
+        """
+        stats = self.runScript(VECTOR_POOL_STATS_SCRIPT, keys=['stats', 'seen', 'refill'])
+        if not stats:
+            return {}
+        return dict(zip(('depth', 'subscribers', 'refillQueue', 'hit', 'partial', 'miss', 'generated', 'dropped'), (int(value) for value in stats)))
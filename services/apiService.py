@@ -1,4 +1,5 @@
 import sys
+import io
 import json
 from flask import Flask, request, jsonify, Response
 from flask_restx import Api, Resource, fields, reqparse, abort
@@ -15,6 +16,7 @@ from logtool import LogTool
 from diameter import Diameter
 from messaging import RedisMessaging
 import database
+import bulkImport
 import yaml
 
 with open("../config.yaml", 'r') as stream:
@@ -36,6 +38,7 @@ redisUseUnixSocket = config.get('redis', {}).get('useUnixSocket', False)
 redisUnixSocketPath = config.get('redis', {}).get('unixSocketPath', '/var/run/redis/redis-server.sock')
 
 insecureAuc = config.get('api', {}).get('enable_insecure_auc', False)
+exportChunkSize = config.get('api', {}).get('export_chunk_size', 1000)
 
 redisMessaging = RedisMessaging(host=redisHost, port=redisPort, useUnixSocket=redisUseUnixSocket, unixSocketPath=redisUnixSocketPath)
 
@@ -71,6 +74,9 @@ ROAMING_NETWORK = database.ROAMING_NETWORK
 ROAMING_RULE = database.ROAMING_RULE
 EMERGENCY_SUBSCRIBER = database.EMERGENCY_SUBSCRIBER
 
+# Tables which can be provisioned through /oam/bulk_import
+bulkImportTables = {'auc': AUC, 'subscriber': SUBSCRIBER, 'ims_subscriber': IMS_SUBSCRIBER}
+
 
 apiService.wsgi_app = ProxyFix(apiService.wsgi_app)
 api = Api(apiService, version='1.0', title=f'{siteName + " - " if siteName else ""}{originHostname} - PyHSS OAM API',
@@ -102,6 +108,15 @@ paginatorParser = reqparse.RequestParser()
 paginatorParser.add_argument('page', type=int, required=False, default=0, help='Page number for pagination')
 paginatorParser.add_argument('page_size', type=int, required=False, default=config['api'].get('page_size', 100), help='Number of items per page for pagination')
 
+listParser = paginatorParser.copy()
+listParser.add_argument('after_id', type=int, required=False, help='Return the page after this primary key, rather than using page (keyset pagination). The ID to request the next page with is returned in the Next-After-Id header')
+listParser.add_argument('format', type=str, required=False, default='json', choices=('json', 'ndjson'), help='json for a single page, or ndjson to stream every row (after after_id, if given) as one JSON object per line')
+
+bulkImportParser = reqparse.RequestParser()
+bulkImportParser.add_argument('format', type=str, required=False, choices=('csv', 'ndjson'), help='Format of the request body, csv (with a header line of column names) or ndjson. Defaults to ndjson for JSON content types, otherwise csv', location='args')
+bulkImportParser.add_argument('chunk_size', type=int, required=False, default=config['api'].get('bulk_import_chunk_size', 1000), help='Number of rows validated and inserted per batch', location='args')
+bulkImportParser.add_argument('operation_id', type=str, help='Operation ID', location='args')
+
 APN_model = api.schema_model('APN JSON', 
     databaseClient.Generate_JSON_Model_for_Flask(APN)
 )
@@ -286,6 +301,43 @@ def handle_exception(e):
         logTool.log(service='API', level='error', message=f"[API] Additional Error Information: {traceback.format_exc()}\n{sys.exc_info()[2]}", redisClient=redisMessaging)
         return response_json, 500
 
+def normalizeBulkImportRow(lineNumber, row):
+    # Same normalization as PUT /subscriber/ and PUT /ims_subscriber/
+    if isinstance(row, dict):
+        for key in ('msisdn', 'msisdn_list'):
+            if isinstance(row.get(key), str):
+                row[key] = row[key].replace('+', '')
+    return lineNumber, row
+
+def listResponse(obj_type, args, transform=None):
+    """
+    Returns a /list response for obj_type, either a page of rows or, for format=ndjson, a stream of every row.
+    transform is applied to each row before it's returned.
+    """
+    if args['format'] == 'ndjson':
+        def exportRows():
+            # Runs after the route has returned, so errors are handled here. The status is already sent, so the stream ends with an error line instead.
+            try:
+                for chunk in databaseClient.exportAll(obj_type, args['after_id'], exportChunkSize):
+                    yield ''.join(json.dumps(transform(record) if transform else record) + '\n' for record in chunk)
+            except Exception as e:
+                logTool.log(service='API', level='error', message=f"[API] [listResponse] Export of {obj_type.__tablename__} failed: {traceback.format_exc()}", redisClient=redisMessaging)
+                yield json.dumps({'result': 'Failed', 'reason': f'Export interrupted: {e}'}) + '\n'
+        return Response(exportRows(), mimetype='application/x-ndjson')
+
+    data = databaseClient.getAllPaginated(obj_type, args['page'], args['page_size'], after_id=args['after_id'])
+    headers = {}
+    if data and len(data) == args['page_size']:
+        headers['Next-After-Id'] = str(data[-1][databaseClient.getPrimaryKeyColumn(obj_type).name])
+    if transform:
+        data = [transform(record) for record in data]
+    return data, 200, headers
+
+def splitImsiImei(record):
+    record['imsi'] = record['imsi_imei'].split(',')[0]
+    record['imei'] = record['imsi_imei'].split(',')[1]
+    return record
+
 apiService.before_request(auth_before_request)
 
 @apiService.errorhandler(404)
@@ -360,13 +412,12 @@ class PyHSS_APN(Resource):
 
 @ns_apn.route('/list')
 class PyHSS_OAM_All_APNs(Resource):
-    @ns_apn.expect(paginatorParser)
+    @ns_apn.expect(listParser)
     def get(self):
         '''Get all APNs'''
         try:
-            args = paginatorParser.parse_args()
-            data = databaseClient.getAllPaginated(APN, args['page'], args['page_size'])
-            return (data), 200
+            args = listParser.parse_args()
+            return listResponse(APN, args)
         except Exception as E:
             print(E)
             return handle_exception(E)
@@ -461,19 +512,12 @@ class PyHSS_AUC(Resource):
 
 @ns_auc.route('/list')
 class PyHSS_AUC_All(Resource):
-    @ns_auc.expect(paginatorParser)
+    @ns_auc.expect(listParser)
     def get(self):
         '''Get all AuC Data (except keys)'''
         try:
-            args = paginatorParser.parse_args()
-            data = databaseClient.getAllPaginated(AUC, args['page'], args['page_size'])
-            if not insecureAuc:
-                sanitizedData = []
-                for aucRecord in data:
-                    databaseClient.Sanitize_Keys(aucRecord)
-                    sanitizedData.append(aucRecord)
-                return sanitizedData
-            return (data), 200
+            args = listParser.parse_args()
+            return listResponse(AUC, args, transform=None if insecureAuc else databaseClient.Sanitize_Keys)
         except Exception as E:
             print(E)
             return handle_exception(E)
@@ -615,13 +659,12 @@ class PyHSS_SUBSCRIBER_MSISDN(Resource):
 
 @ns_subscriber.route('/list')
 class PyHSS_SUBSCRIBER_All(Resource):
-    @ns_subscriber.expect(paginatorParser)
+    @ns_subscriber.expect(listParser)
     def get(self):
         '''Get all Subscribers'''
         try:
-            args = paginatorParser.parse_args()
-            data = databaseClient.getAllPaginated(SUBSCRIBER, args['page'], args['page_size'])
-            return (data), 200
+            args = listParser.parse_args()
+            return listResponse(SUBSCRIBER, args)
         except Exception as E:
             print(E)
             return handle_exception(E)
@@ -779,13 +822,12 @@ class PyHSS_IMS_SUBSCRIBER_IMSI(Resource):
 
 @ns_ims_subscriber.route('/list')
 class PyHSS_IMS_Subscriber_All(Resource):
-    @ns_ims_subscriber.expect(paginatorParser)
+    @ns_ims_subscriber.expect(listParser)
     def get(self):
         '''Get all IMS Subscribers'''
         try:
-            args = paginatorParser.parse_args()
-            data = databaseClient.getAllPaginated(IMS_SUBSCRIBER, args['page'], args['page_size'])
-            return (data), 200
+            args = listParser.parse_args()
+            return listResponse(IMS_SUBSCRIBER, args)
         except Exception as E:
             print(E)
             return handle_exception(E), 400
@@ -810,13 +852,12 @@ class PyHSS_ROAMING_RULE(Resource):
 
 @ns_roaming.route('/rule/list')
 class PyHSS_ROAMING_RULE_All(Resource):
-    @ns_tft.expect(paginatorParser)
+    @ns_tft.expect(listParser)
     def get(self):
         '''Get all roaming rules'''
         try:
-            args = paginatorParser.parse_args()
-            data = databaseClient.getAllPaginated(ROAMING_RULE, args['page'], args['page_size'])
-            return (data), 200
+            args = listParser.parse_args()
+            return listResponse(ROAMING_RULE, args)
         except Exception as E:
             print(E)
             return handle_exception(E)
@@ -881,13 +922,12 @@ class PyHSS_ROAMING_NETWORK(Resource):
 
 @ns_roaming.route('/network/list')
 class PyHSS_ROAMING_NETWORK_All(Resource):
-    @ns_tft.expect(paginatorParser)
+    @ns_tft.expect(listParser)
     def get(self):
         '''Get all roaming networks'''
         try:
-            args = paginatorParser.parse_args()
-            data = databaseClient.getAllPaginated(ROAMING_NETWORK, args['page'], args['page_size'])
-            return (data), 200
+            args = listParser.parse_args()
+            return listResponse(ROAMING_NETWORK, args)
         except Exception as E:
             print(E)
             return handle_exception(E)
@@ -992,13 +1032,12 @@ class PyHSS_TFT(Resource):
 
 @ns_tft.route('/list')
 class PyHSS_TFT_All(Resource):
-    @ns_tft.expect(paginatorParser)
+    @ns_tft.expect(listParser)
     def get(self):
         '''Get all TFTs'''
         try:
-            args = paginatorParser.parse_args()
-            data = databaseClient.getAllPaginated(TFT, args['page'], args['page_size'])
-            return (data), 200
+            args = listParser.parse_args()
+            return listResponse(TFT, args)
         except Exception as E:
             print(E)
             return handle_exception(E)
@@ -1063,13 +1102,12 @@ class PyHSS_Charging_Rule(Resource):
 
 @ns_charging_rule.route('/list')
 class PyHSS_Charging_Rule_All(Resource):
-    @ns_charging_rule.expect(paginatorParser)
+    @ns_charging_rule.expect(listParser)
     def get(self):
         '''Get all Charging Rules'''
         try:
-            args = paginatorParser.parse_args()
-            data = databaseClient.getAllPaginated(CHARGING_RULE, args['page'], args['page_size'])
-            return (data), 200
+            args = listParser.parse_args()
+            return listResponse(CHARGING_RULE, args)
         except Exception as E:
             print(E)
             return handle_exception(E)
@@ -1161,29 +1199,24 @@ class PyHSS_EIR_HISTORY(Resource):
 
 @ns_eir.route('/eir_history/list')
 class PyHSS_EIR_All_History(Resource):
-    @ns_eir.expect(paginatorParser)
+    @ns_eir.expect(listParser)
     def get(self):
         '''Get EIR history for all subscribers'''
         try:
-            args = paginatorParser.parse_args()
-            data = databaseClient.getAllPaginated(IMSI_IMEI_HISTORY, args['page'], args['page_size'])
-            for record in data:
-                record['imsi'] = record['imsi_imei'].split(',')[0]
-                record['imei'] = record['imsi_imei'].split(',')[1]
-            return (data), 200
+            args = listParser.parse_args()
+            return listResponse(IMSI_IMEI_HISTORY, args, transform=splitImsiImei)
         except Exception as E:
             print(E)
             return handle_exception(E)
 
 @ns_eir.route('/list')
 class PyHSS_EIR_All(Resource):
-    @ns_eir.expect(paginatorParser)
+    @ns_eir.expect(listParser)
     def get(self):
         '''Get all EIR Rules'''
         try:
-            args = paginatorParser.parse_args()
-            data = databaseClient.getAllPaginated(EIR, args['page'], args['page_size'])
-            return (data), 200
+            args = listParser.parse_args()
+            return listResponse(EIR, args)
         except Exception as E:
             print(E)
             return handle_exception(E)
@@ -1201,13 +1234,12 @@ class PyHSS_EIR_TAC(Resource):
 
 @ns_subscriber_attributes.route('/list')
 class PyHSS_Subscriber_Attributes_All(Resource):
-    @ns_subscriber_attributes.expect(paginatorParser)
+    @ns_subscriber_attributes.expect(listParser)
     def get(self):
         '''Get all Subscriber Attributes'''
         try:
-            args = paginatorParser.parse_args()
-            data = databaseClient.getAllPaginated(SUBSCRIBER_ATTRIBUTES, args['page'], args['page_size'])
-            return (data), 200
+            args = listParser.parse_args()
+            return listResponse(SUBSCRIBER_ATTRIBUTES, args)
         except Exception as E:
             print(E)
             return handle_exception(E)
@@ -1498,6 +1530,27 @@ class PyHSS_OAM_Rollback_Last_Table(Resource):
             print(E)
             return handle_exception(E)
 
+@ns_oam.route('/bulk_import/<string:table_name>')
+class PyHSS_OAM_Bulk_Import(Resource):
+    @ns_oam.expect(bulkImportParser)
+    def put(self, table_name):
+        '''Create AUC, SUBSCRIBER or IMS SUBSCRIBER objects in bulk from a CSV or NDJSON request body'''
+        try:
+            if table_name not in bulkImportTables:
+                return {'result': 'Failed', 'reason': f"Bulk import is only supported for {', '.join(bulkImportTables)}"}, 400
+            args = bulkImportParser.parse_args()
+            importFormat = args.get('format') or ('ndjson' if 'json' in str(request.content_type) else 'csv')
+            # The body is read and inserted a chunk at a time, rather than being loaded into memory first.
+            textStream = io.TextIOWrapper(request.stream, encoding='utf-8', newline='')
+            rows = bulkImport.readNdjsonRows(textStream) if importFormat == 'ndjson' else bulkImport.readCsvRows(textStream)
+            rows = (normalizeBulkImportRow(lineNumber, row) for lineNumber, row in rows)
+            data = databaseClient.bulkImport(bulkImportTables[table_name], rows, chunkSize=max(args['chunk_size'], 1), operation_id=args.get('operation_id', None))
+            data['result'] = 'OK' if data['rejected'] == 0 else 'Partial'
+            return data, 200
+        except Exception as E:
+            print(E)
+            return handle_exception(E)
+
 @ns_oam.route('/serving_subs')
 class PyHSS_OAM_Serving_Subs(Resource):
     def get(self):
@@ -2045,13 +2098,12 @@ class PyHSS_EMERGENCY_SUBSCRIBER(Resource):
 
 @ns_pcrf.route('/emergency_subscriber/list')
 class PyHSS_ALL_EMERGENCY_SUBSCRIBER(Resource):
-    @ns_apn.expect(paginatorParser)
+    @ns_apn.expect(listParser)
     def get(self):
         '''Get all Emergency Subscribers'''
         try:
-            args = paginatorParser.parse_args()
-            data = databaseClient.getAllPaginated(EMERGENCY_SUBSCRIBER, args['page'], args['page_size'])
-            return (data), 200
+            args = listParser.parse_args()
+            return listResponse(EMERGENCY_SUBSCRIBER, args)
         except Exception as E:
             print(E)
             return handle_exception(E)
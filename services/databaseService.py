@@ -10,7 +10,7 @@ from banners import Banners
 from logtool import LogTool
 from sqlalchemy import create_engine, inspect
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy import MetaData, Table
+from sqlalchemy import MetaData, Table, select
 
 class DatabaseService:
     """
@@ -49,6 +49,7 @@ class DatabaseService:
         self.database = self.config.get('database', {}).get('database', '')
         self.readCacheEnabled = self.config.get('database', {}).get('readCacheEnabled', True)
         self.cacheReadInterval = int(self.config.get('database', {}).get('cacheReadInterval', 60))
+        self.cacheReadBatchSize = int(self.config.get('database', {}).get('cacheReadBatchSize', 1000))
         
         if self.databaseType == 'mysql':
             self.sqlAlchemyEngine = create_engine(f'mysql://{self.databaseUsername}:{self.databasePassword}@{self.databaseHost}/{self.database}')
@@ -81,6 +82,7 @@ class DatabaseService:
                 databaseMetadata = MetaData()
                 databaseConnection = self.sqlAlchemyEngine.connect()
                 databaseMetadata.reflect(bind=databaseConnection) 
+                databaseConnection.close()
                 self.readSession = self.sqlAlchemySession()
 
                 for tableName in databaseMetadata.tables:
@@ -89,7 +91,8 @@ class DatabaseService:
                     if not primaryKeyColumnNames:
                         continue
                     primaryKeyName = primaryKeyColumnNames[0]
-                    records = self.readSession.query(tableObject).all()
+                    # Streamed through a server-side cursor in batches, rather than loading the whole table into memory.
+                    records = self.readSession.execute(select(tableObject).execution_options(yield_per=self.cacheReadBatchSize))
                     for record in records:
                         recordDict = dict(record._mapping)
                         recordJson = json.dumps(recordDict, default=self.sanitizeJson)
@@ -7,10 +7,11 @@ import sctp, socket
 sys.path.append(os.path.realpath('../lib'))
 from messagingAsync import RedisMessagingAsync
 from diameterAsync import DiameterAsync
+from diameterDecoder import DiameterFramer
 from banners import Banners
 from logtool import LogTool
-from baseModels import Peer, InboundData, OutboundData
-import pydantic_core
+from baseModels import Peer
+from diameterEnvelope import InboundMessage, OutboundMessage, encodeInbound, encodeOutbound, decodeOutbound, correlationKeys
 import traceback
 
 class DiameterService:
@@ -47,6 +48,9 @@ class DiameterService:
         self.originHost = self.config.get('hss', {}).get('OriginHost', 'hss01')
         self.originRealm = self.config.get('hss', {}).get('OriginRealm', "epc.mnc001.mcc001.3gppnetwork.org")
         self.diameterRequestTimeout = int(self.config.get('hss', {}).get('diameter_request_timeout', 10))
+        self.binaryMessageFormat = str(self.config.get('hss', {}).get('diameter_message_format', 'json')).lower() == 'binary'
+        self.inboundTransport = str(self.config.get('hss', {}).get('diameter_inbound_transport', 'list')).lower()
+        self.diameterMaxMessageSize = int(self.config.get('hss', {}).get('diameter_max_message_size', 65536))
         self.benchmarking = self.config.get('benchmarking', {}).get('enabled', False)
         self.benchmarkingInterval = self.config.get('benchmarking', {}).get('reporting_interval', 3600)
         self.diameterRequests = 0
@@ -55,6 +59,8 @@ class DiameterService:
         self.hostname = socket.gethostname()
         self.useExternalSocketService = self.config.get('hss', {}).get('use_external_socket_service', False)
         self.diameterPeerKey = self.config.get('hss', {}).get('diameter_peer_key', 'diameterPeers')
+        self.outboundQueues = {}
+        self.outboundDispatcherKey = f"diameter-outbound-dispatcher-{uuid.uuid4().hex}"
     
     async def validateDiameterInbound(self, clientAddress: str, clientPort: str, inboundData) -> bool:
         """
@@ -62,8 +68,7 @@ class DiameterService:
         """
         try:
             packetVars, avps = await(self.diameterLibrary.decodeDiameterPacket(inboundData))
-            originHost = (await(self.diameterLibrary.getAvpData(avps, 264)))[0]
-            originHost = bytes.fromhex(originHost).decode("utf-8")
+            originHost = avps.utf8String(264)
             peerType = await(self.diameterLibrary.getPeerType(originHost))
             self.activePeers[f"{clientAddress}-{clientPort}"].update(Hostname=originHost,
                                                                      Metadata=json.dumps({
@@ -93,12 +98,12 @@ class DiameterService:
                         continue
 
                     outboundQueue = f"diameter-outbound-{peerIp}-{peerPort}"
-                    outboundData = OutboundData(DestinationIp=peerIp,
-                                                DestinationPort=peerPort,
-                                                InitialReceiveTimestamp=time.time_ns(),
-                                                OutboundHex=outboundDwrEncoded)
+                    outboundData = OutboundMessage(DestinationIp=peerIp,
+                                                   DestinationPort=peerPort,
+                                                   InitialReceiveTimestamp=time.time_ns(),
+                                                   Packet=bytes.fromhex(outboundDwrEncoded))
                     await(self.logTool.logAsync(service='Diameter', level='debug', message=f"[Diameter] [handleOutboundDwr] Sending Outbound DWR to: {outboundQueue}"))
-                    await(self.redisDwrMessaging.sendMessage(queue=outboundQueue, message=outboundData.model_dump_json(), queueExpiry=60, usePrefix=True, prefixHostname=self.hostname, prefixServiceName='diameter'))
+                    await(self.redisDwrMessaging.sendMessage(queue=outboundQueue, message=encodeOutbound(outboundData, binary=self.binaryMessageFormat), queueExpiry=60, usePrefix=True, prefixHostname=self.hostname, prefixServiceName='diameter'))
                 await(asyncio.sleep(self.outboundDwrInterval))
                 continue
             except Exception as e:
@@ -238,13 +243,44 @@ class DiameterService:
             self.diameterResponses = 0
             await(asyncio.sleep(benchmarkInterval))
 
+    async def answerBaseProtocolRequest(self, clientAddress: str, clientPort: str, diameterMessage: bytes, coroutineUuid: str) -> bool:
+        """
+        Answers a base protocol request (CER, DWR or DPR) through the connection's outbound queue, without the round trip through Redis and the HSS service.
+        The peer is validated on its first message, the same as in inboundDataWorker.
+        """
+        try:
+            if len(self.activePeers.get(f'{clientAddress}-{clientPort}', {}).Metadata) == 0:
+                if not await(self.validateDiameterInbound(clientAddress, clientPort, diameterMessage)):
+                    await(self.logTool.logAsync(service='Diameter', level='warning', message=f"[Diameter] [answerBaseProtocolRequest] [{coroutineUuid}] Invalid Diameter Inbound, discarding data."))
+                    return False
+                await(self.logTool.logAsync(service='Diameter', level='info', message=f"[Diameter] [answerBaseProtocolRequest] [{coroutineUuid}] Validated peer: {clientAddress} on port {clientPort}"))
+
+            packetVars, avps = await(self.diameterLibrary.decodeDiameterPacket(diameterMessage))
+            diameterAnswer = await(self.diameterLibrary.generateDiameterResponse(packetVars=packetVars, avps=avps))
+            if not diameterAnswer:
+                await(self.logTool.logAsync(service='Diameter', level='warning', message=f"[Diameter] [answerBaseProtocolRequest] [{coroutineUuid}] No answer generated for command code {packetVars.get('command_code')} from {clientAddress} on port {clientPort}"))
+                return False
+
+            await(self.logTool.logAsync(service='Diameter', level='debug', message=f"[Diameter] [answerBaseProtocolRequest] [{coroutineUuid}] Sending: {diameterAnswer} to {clientAddress} on {clientPort}."))
+            self.outboundQueues[f"{clientAddress}-{clientPort}"].put_nowait(bytes.fromhex(diameterAnswer))
+            if self.benchmarking:
+                self.diameterRequests += 1
+            return True
+        except Exception as e:
+            await(self.logTool.logAsync(service='Diameter', level='warning', message=f"[Diameter] [answerBaseProtocolRequest] [{coroutineUuid}] Exception: {e}\n{traceback.format_exc()}"))
+            return False
+
     async def readInboundData(self, reader, clientAddress: str, clientPort: str, socketTimeout: int, coroutineUuid: str) -> bool:
         """
         Reads incoming data from a connected client. Data is sent to a shared memory-based queue, to be polled and processed by a worker coroutine.
-        Terminates the connection if the client disconnects, the queue fills or another exception occurs.
+        The stream is split into whole Diameter messages using the length in each header, so each queue item holds exactly one message.
+        Partial messages are buffered until the rest arrives.
+        Base protocol requests (Application Id 0) are answered directly on the connection, and only application traffic is queued.
+        Terminates the connection if the client disconnects, sends an invalid or oversized message, the queue fills or another exception occurs.
         """
         await(self.logTool.logAsync(service='Diameter', level='debug', message=f"[Diameter] [readInboundData] [{coroutineUuid}] New connection from {clientAddress} on port {clientPort}"))
         clientConnection = f"{clientAddress}-{clientPort}"
+        diameterFramer = DiameterFramer(maxMessageSize=self.diameterMaxMessageSize)
         while True:
             try:
 
@@ -254,23 +290,49 @@ class DiameterService:
                     return False
 
                 if len(inboundData) > 0:
-                    inboundData = InboundData(SenderIp=clientAddress,
-                                              SenderPort=clientPort,
-                                              InitialReceiveTimestamp=time.time_ns(),
-                                              InboundHex=inboundData.hex())
-                    
-                    self.sharedQueue.put_nowait(inboundData)
+                    try:
+                        diameterMessages = diameterFramer.feed(inboundData)
+                    except ValueError as e:
+                        await(self.logTool.logAsync(service='Diameter', level='warning', message=f"[Diameter] [readInboundData] [{coroutineUuid}] Framing error for {clientAddress} on port {clientPort}, closing connection: {e}"))
+                        return False
+
+                    receiveTimestamp = time.time_ns()
+                    for diameterMessage in diameterMessages:
+                        if diameterMessage[4] & 0x80 and diameterMessage[8:12] == b'\x00\x00\x00\x00':
+                            await(self.answerBaseProtocolRequest(clientAddress, clientPort, diameterMessage, coroutineUuid))
+                            continue
+                        self.sharedQueue.put_nowait(InboundMessage(SenderIp=clientAddress,
+                                                                   SenderPort=clientPort,
+                                                                   InitialReceiveTimestamp=receiveTimestamp,
+                                                                   Packet=diameterMessage))
 
             except Exception as e:
                 await(self.logTool.logAsync(service='Diameter', level='info', message=f"[Diameter] [readInboundData] [{coroutineUuid}] Socket Exception for {clientAddress} on port {clientPort}, closing connection.\n{e}"))
                 return False
 
+    async def routeCorrelatedAnswer(self, inboundData: InboundMessage, coroutineUuid: str) -> bool:
+        """
+        If an answer matches a request registered by Diameter.awaitDiameterRequestAndResponse, pushes it to that request's reply queue.
+        Returns True if the answer was routed, or False if it should be queued to diameter-inbound as usual.
+        """
+        try:
+            pendingKey, replyKey = correlationKeys(inboundData.SenderIp, inboundData.SenderPort, inboundData.Packet)
+            if not await(self.redisReaderMessaging.deleteKey(key=pendingKey, usePrefix=True, prefixHostname=self.hostname, prefixServiceName='diameter')):
+                return False
+            await(self.redisReaderMessaging.sendMessage(queue=replyKey, message=encodeInbound(inboundData, binary=self.binaryMessageFormat), queueExpiry=self.diameterRequestTimeout, usePrefix=True, prefixHostname=self.hostname, prefixServiceName='diameter'))
+            await(self.logTool.logAsync(service='Diameter', level='debug', message=f"[Diameter] [routeCorrelatedAnswer] [{coroutineUuid}] Routed answer to {replyKey}"))
+            return True
+        except Exception as e:
+            await(self.logTool.logAsync(service='Diameter', level='warning', message=f"[Diameter] [routeCorrelatedAnswer] [{coroutineUuid}] Exception: {e}\n{traceback.format_exc()}"))
+            return False
+
     async def inboundDataWorker(self, coroutineUuid: str) -> bool:
         """
         Collects messages from the memory queue, performs peer validation and fires off to redis every 0.01 seconds.
         """
         batchInterval = 0.1
         inboundQueueName = f"diameter-inbound"
+        inboundStreamName = f"diameter-inbound-stream"
         while True:
             try:
                 nextSendTime = time.time() + batchInterval
@@ -280,44 +342,86 @@ class DiameterService:
                         inboundData = await(asyncio.wait_for(self.sharedQueue.get(), timeout=nextSendTime - time.time()))
 
                         if len(self.activePeers.get(f'{inboundData.SenderIp}-{inboundData.SenderPort}', {}).Metadata) == 0:
-                            if not await(self.validateDiameterInbound(inboundData.SenderIp, inboundData.SenderPort, inboundData.InboundHex)):
+                            if not await(self.validateDiameterInbound(inboundData.SenderIp, inboundData.SenderPort, inboundData.Packet)):
                                 await(self.logTool.logAsync(service='Diameter', level='warning', message=f"[Diameter] [inboundDataWorker] [{coroutineUuid}] Invalid Diameter Inbound, discarding data."))
                                 continue
                             else:
                                 await(self.logTool.logAsync(service='Diameter', level='info', message=f"[Diameter] [inboundDataWorker] [{coroutineUuid}] Validated peer: {inboundData.SenderIp} on port {inboundData.SenderPort}"))
 
+                        if not inboundData.Packet[4] & 0x80 and await(self.routeCorrelatedAnswer(inboundData, coroutineUuid)):
+                            continue
+
                         await(self.logTool.logAsync(service='Diameter', level='debug', message=f"[Diameter] [inboundDataWorker] [{coroutineUuid}] Queueing to redis: {inboundData}"))
-                        messageList.append(inboundData.model_dump_json())
+                        messageList.append(encodeInbound(inboundData, binary=self.binaryMessageFormat))
                         if self.benchmarking:
                             self.diameterRequests += 1
                     except asyncio.TimeoutError:
                         break
 
                 if messageList:
-                    await self.redisReaderMessaging.sendBulkMessage(queue=inboundQueueName, messageList=messageList, queueExpiry=self.diameterRequestTimeout, usePrefix=True, prefixHostname=self.hostname, prefixServiceName='diameter')
+                    if self.inboundTransport == 'stream':
+                        await self.redisReaderMessaging.sendBulkStreamMessage(stream=inboundStreamName, messageList=messageList, maxAge=self.diameterRequestTimeout, usePrefix=True, prefixHostname=self.hostname, prefixServiceName='diameter')
+                    else:
+                        await self.redisReaderMessaging.sendBulkMessage(queue=inboundQueueName, messageList=messageList, queueExpiry=self.diameterRequestTimeout, usePrefix=True, prefixHostname=self.hostname, prefixServiceName='diameter')
                     messageList = []
 
             except Exception as e:
                 await(self.logTool.logAsync(service='Diameter', level='info', message=f"[Diameter] [inboundDataWorker] [{coroutineUuid}] Exception for inboundDataWorker, continuing.\n{e}"))
                 pass
 
+    async def outboundDataDispatcher(self) -> bool:
+        """
+        Pops outbound messages for every connected peer from Redis, and routes them to the in-memory queue of each connection.
+        A single blocking BLMPOP covers all diameter-outbound queues for this process, instead of one BLPOP per connection.
+        Once it returns, the rest of the queues are drained in one pipeline, so a busy peer can't hold up the others.
+        handleConnection pushes to outboundDispatcherKey when a peer connects, so the new queue is included straight away.
+        """
+        batchSize = 100
+        refreshInterval = 1
+        while True:
+            try:
+                outboundQueueNames = {f"diameter-outbound-{connectionKey}": connectionKey for connectionKey in self.outboundQueues}
+                pendingMessages = await(self.redisWriterMessaging.awaitMultipleQueues(queues=[self.outboundDispatcherKey, *outboundQueueNames], count=batchSize, timeout=refreshInterval, usePrefix=True, prefixHostname=self.hostname, prefixServiceName='diameter'))
+                if pendingMessages is None:
+                    continue
+                queuedMessages = {pendingMessages[0]: pendingMessages[1]}
+                if outboundQueueNames:
+                    queuedMessages.update(await(self.redisWriterMessaging.popMultipleQueues(queues=[queueName for queueName in outboundQueueNames if queueName != pendingMessages[0]], count=batchSize, usePrefix=True, prefixHostname=self.hostname, prefixServiceName='diameter')))
+
+                for queueName, messageList in queuedMessages.items():
+                    outboundQueue = self.outboundQueues.get(outboundQueueNames.get(queueName))
+                    if outboundQueue is None:
+                        continue
+                    for pendingOutboundMessage in messageList:
+                        try:
+                            outboundQueue.put_nowait(decodeOutbound(pendingOutboundMessage).Packet)
+                        except Exception as e:
+                            # Only this entry is skipped, the rest of the batch has already been popped and is still delivered.
+                            await(self.logTool.logAsync(service='Diameter', level='warning', message=f"[Diameter] [outboundDataDispatcher] Discarding undecodable message on {queueName}: {e}", redisClient=self.redisWriterMessaging))
+            except Exception as e:
+                # Usually Redis being unavailable, backed off so the dispatcher doesn't spin until it's back.
+                await(self.logTool.logAsync(service='Diameter', level='error', message=f"[Diameter] [outboundDataDispatcher] Exception, retrying in {refreshInterval}s: {e}\n{traceback.format_exc()}", redisClient=self.redisWriterMessaging))
+                await(asyncio.sleep(refreshInterval))
+
     async def writeOutboundData(self, writer, clientAddress: str, clientPort: str, socketTimeout: int, coroutineUuid: str) -> bool:
         """
-        Waits for a message to be received from Redis, then sends to the connected client.
+        Waits for messages on the connection's in-memory queue, filled by outboundDataDispatcher and answerBaseProtocolRequest, then sends them to the connected client.
+        Everything already queued is written before draining the socket.
         """
         await(self.logTool.logAsync(service='Diameter', level='debug', message=f"[Diameter] [writeOutboundData] [{coroutineUuid}] writeOutboundData with host {clientAddress} on port {clientPort}"))
+        outboundQueue = self.outboundQueues[f"{clientAddress}-{clientPort}"]
         while not writer.transport.is_closing():
             try:
-                await(self.logTool.logAsync(service='Diameter', level='debug', message=f"[Diameter] [writeOutboundData] [{coroutineUuid}] Waiting for messages for host {clientAddress} on port {clientPort}"))
-                pendingOutboundMessage = (await(self.redisWriterMessaging.awaitMessage(key=f"diameter-outbound-{clientAddress}-{clientPort}", usePrefix=True, prefixHostname=self.hostname, prefixServiceName='diameter')))[1]
-                outboundData = OutboundData.model_validate(pydantic_core.from_json(pendingOutboundMessage))
-                diameterOutboundBinary = bytes.fromhex(outboundData.OutboundHex)
-                await(self.logTool.logAsync(service='Diameter', level='debug', message=f"[Diameter] [writeOutboundData] [{coroutineUuid}] Sending: {diameterOutboundBinary.hex()} to to {clientAddress} on {clientPort}."))
-
+                diameterOutboundBinary = await(outboundQueue.get())
                 writer.write(diameterOutboundBinary)
+                messageCount = 1
+                while not outboundQueue.empty():
+                    writer.write(outboundQueue.get_nowait())
+                    messageCount += 1
                 await(writer.drain())
+                await(self.logTool.logAsync(service='Diameter', level='debug', message=f"[Diameter] [writeOutboundData] [{coroutineUuid}] Sent {messageCount} message(s) to {clientAddress} on {clientPort}."))
                 if self.benchmarking:
-                    self.diameterResponses += 1
+                    self.diameterResponses += messageCount
             except Exception as e:
                 await(self.logTool.logAsync(service='Diameter', level='info', message=f"[Diameter] [writeOutboundData] [{coroutineUuid}] Connection closed for {clientAddress} on port {clientPort}, closing writer.{traceback.format_exc()}"))
                 return False
@@ -362,6 +466,9 @@ class DiameterService:
 
             await(self.logActivePeers())
 
+            self.outboundQueues[f"{clientAddress}-{clientPort}"] = asyncio.Queue()
+            await(self.redisWriterMessaging.sendMessage(queue=self.outboundDispatcherKey, message='', queueExpiry=60, usePrefix=True, prefixHostname=self.hostname, prefixServiceName='diameter'))
+
             readTask = asyncio.create_task(self.readInboundData(reader=reader, clientAddress=clientAddress, clientPort=clientPort, socketTimeout=self.socketTimeout, coroutineUuid=coroutineUuid))
             writeTask = asyncio.create_task(self.writeOutboundData(writer=writer, clientAddress=clientAddress, clientPort=clientPort, socketTimeout=self.socketTimeout, coroutineUuid=coroutineUuid))
 
@@ -374,6 +481,7 @@ class DiameterService:
                 except asyncio.CancelledError:
                     pass
       
+            self.outboundQueues.pop(f"{clientAddress}-{clientPort}", None)
             writer.close()
             await(writer.wait_closed())
             self.activePeers[f"{clientAddress}-{clientPort}"].update(LastDisconnectTimestamp=datetime.now(get_localzone()).isoformat('T'),
@@ -407,6 +515,9 @@ class DiameterService:
             for i in range(self.workerPoolSize):
                 asyncio.create_task(self.inboundDataWorker(coroutineUuid=f'inboundDataWorker-{i}'))
 
+            # Held on the service, as the event loop only keeps a weak reference to running tasks.
+            self.outboundDataDispatcherTask = asyncio.create_task(self.outboundDataDispatcher())
+
             if host is None:
                 host=str(self.config.get('hss', {}).get('bind_ip', '0.0.0.0')[0])
             
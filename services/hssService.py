@@ -1,10 +1,12 @@
-import os, sys, json, yaml, time, traceback, socket
+import os, sys, json, yaml, time, traceback, socket, threading
+from concurrent.futures import ThreadPoolExecutor
 sys.path.append(os.path.realpath('../lib'))
 from messaging import RedisMessaging
 from diameter import Diameter
 from banners import Banners
 from logtool import LogTool
-from baseModels import Peer, InboundData, OutboundData
+from baseModels import Peer
+from diameterEnvelope import OutboundMessage, decodeInbound, encodeOutbound
 import pydantic_core
 
 
@@ -35,11 +37,151 @@ class HssService:
         self.benchmarking = self.config.get('hss').get('enable_benchmarking', False)
         self.hostname = socket.gethostname()
         self.diameterPeerKey = self.config.get('hss', {}).get('diameter_peer_key', 'diameterPeers')
+        self.binaryMessageFormat = str(self.config.get('hss', {}).get('diameter_message_format', 'json')).lower() == 'binary'
+        self.inboundTransport = str(self.config.get('hss', {}).get('diameter_inbound_transport', 'list')).lower()
+        self.diameterRequestTimeout = float(self.config.get('hss', {}).get('diameter_request_timeout', 10))
+        # Entries claimed while their worker is still handling them would be answered twice, so the claim idle time can't be shorter than a request can take.
+        minimumClaimIdleTime = int(self.diameterRequestTimeout * 1000) + 1000
+        self.streamClaimIdleTime = int(self.config.get('hss', {}).get('diameter_stream_claim_idle_ms', minimumClaimIdleTime))
+        if self.streamClaimIdleTime < minimumClaimIdleTime:
+            self.logTool.log(service='HSS', level='warning', message=f"[HSS] diameter_stream_claim_idle_ms of {self.streamClaimIdleTime} is shorter than diameter_request_timeout allows, using {minimumClaimIdleTime}", redisClient=self.redisMessaging)
+            self.streamClaimIdleTime = minimumClaimIdleTime
+        self.streamReadCount = max(int(self.config.get('hss', {}).get('diameter_stream_read_count', 10)), 1)
+        self.cryptoWorkers = int(self.config.get('hss', {}).get('crypto_workers', 0))
+        self.cryptoMaxQueued = int(self.config.get('hss', {}).get('crypto_max_queued', 64))
+        self.requestThreads = int(self.config.get('hss', {}).get('request_threads', 16))
+        self.requestExecutor = None
+        if self.cryptoWorkers > 0:
+            # Vectors are generated in worker processes, and requests are handled on a pool of threads,
+            # so requests queued behind an AIR or MAR carry on while its vectors are generated.
+            self.diameterLibrary.database.startCryptoPool(workers=self.cryptoWorkers, maxQueued=self.cryptoMaxQueued, timeout=self.diameterRequestTimeout)
+            self.requestExecutor = ThreadPoolExecutor(max_workers=self.requestThreads, thread_name_prefix='hssRequest')
+            # Limits requests taken off the inbound queue but not yet handled, so a backlog stays in Redis rather than in memory.
+            self.requestSlots = threading.BoundedSemaphore(self.requestThreads * 2)
+
+    def handleInboundMessage(self, inboundMessage: bytes, startTime: float=None) -> bool:
+        """
+        Decodes a single message from the inbound queue, generates the answer and queues it to the peer's outbound queue.
+        Returns False if no answer was sent.
+        """
+        self.logTool.log(service='HSS', level='debug', message=f"[HSS] [handleQueue] Message: {inboundMessage}", redisClient=self.redisMessaging)
+        inboundData = decodeInbound(inboundMessage)
+        inboundBinary = inboundData.Packet
+
+        if inboundBinary == None:
+            return False
+
+        try:
+            diameterPeers = self.redisMessaging.getAllHashData(self.diameterPeerKey, usePrefix=True, prefixHostname=self.hostname, prefixServiceName='diameter')
+            if diameterPeers:
+                for diameterPeerKey, diameterPeerValue in diameterPeers.items():
+                    diameterPeer = Peer.model_validate(pydantic_core.from_json(json.dumps(diameterPeerValue)))
+                    # If this is a message from a stored peer, increment prom_diam_request_count_host by 1.
+                    if diameterPeer.IpAddress == inboundData.SenderIp and diameterPeer.Port == inboundData.SenderPort:
+                        self.redisMessaging.sendMetric(serviceName='diameter', metricName='prom_diam_request_count_host',
+                                    metricType='gauge', metricAction='inc',
+                                    metricLabels={
+                                    "host": diameterPeer.Hostname},
+                                    metricValue=float(1), metricHelp='Number of Diameter Requests Recieved per Host',
+                                    metricExpiry=60,
+                                    usePrefix=True, 
+                                    prefixHostname=self.hostname, 
+                                    prefixServiceName='metric')
+
+        except Exception as e:
+            self.logTool.log(service='HSS', level='error', message=f"[HSS] [handleQueue] Error updating prom_diam_request_count_host: {traceback.format_exc()}", redisClient=self.redisMessaging)
+            pass
+
+        try:
+            # Decode once, and share the decoded packet between the response handler and the message type lookup.
+            packetVars, avps = self.diameterLibrary.decode_diameter_packet(inboundBinary)
+            diameterOutbound = self.diameterLibrary.generateDiameterResponse(packetVars=packetVars, avps=avps)
+
+            if diameterOutbound == None:
+                return False
+            if not len(diameterOutbound) > 0:
+                return False
+
+            diameterMessageTypeDict = self.diameterLibrary.getDiameterMessageType(packetVars=packetVars)
+
+            if diameterMessageTypeDict == None:
+                return False
+            if not len(diameterMessageTypeDict) > 0:
+                return False
+
+            diameterMessageTypeInbound = diameterMessageTypeDict.get('inbound', '')
+            diameterMessageTypeOutbound = diameterMessageTypeDict.get('outbound', '')
+        except Exception as e:
+            self.logTool.log(service='HSS', level='warning', message=f"[HSS] [handleQueue] Failed to generate diameter outbound: {e}", redisClient=self.redisMessaging)
+            return False
+
+        self.logTool.log(service='HSS', level='debug', message=f"[HSS] [handleQueue] [{diameterMessageTypeInbound}] Inbound Diameter: {inboundMessage}", redisClient=self.redisMessaging)
+
+        outboundQueue = f"diameter-outbound-{inboundData.SenderIp}-{inboundData.SenderPort}"
+        outboundMessage = OutboundMessage(DestinationIp=inboundData.SenderIp,
+                                          DestinationPort=inboundData.SenderPort,
+                                          InitialReceiveTimestamp=inboundData.InitialReceiveTimestamp,
+                                          Packet=bytes.fromhex(diameterOutbound))
+
+        self.logTool.log(service='HSS', level='debug', message=f"[HSS] [handleQueue] [{diameterMessageTypeOutbound}] Generated Diameter Outbound: {diameterOutbound}", redisClient=self.redisMessaging)
+        self.logTool.log(service='HSS', level='debug', message=f"[HSS] [handleQueue] [{diameterMessageTypeOutbound}] Outbound Diameter Queue: {outboundQueue}", redisClient=self.redisMessaging)
+        self.logTool.log(service='HSS', level='debug', message=f"[HSS] [handleQueue] [{diameterMessageTypeOutbound}] Outbound Diameter: {outboundMessage}", redisClient=self.redisMessaging)
+
+        self.redisMessaging.sendMessage(queue=outboundQueue, message=encodeOutbound(outboundMessage, binary=self.binaryMessageFormat), queueExpiry=60, usePrefix=True, prefixHostname=self.hostname, prefixServiceName='diameter')
+        if self.benchmarking:
+            self.logTool.log(service='HSS', level='info', message=f"[HSS] [handleQueue] [{diameterMessageTypeInbound}] Time taken to process request: {round(((time.perf_counter() - startTime)*1000), 3)} ms", redisClient=self.redisMessaging)
+
+        try:
+            diameterPeers = self.redisMessaging.getAllHashData(self.diameterPeerKey, usePrefix=True, prefixHostname=self.hostname, prefixServiceName='diameter')
+            if diameterPeers:
+                for diameterPeerKey, diameterPeerValue in diameterPeers.items():
+                    diameterPeer = Peer.model_validate(pydantic_core.from_json(json.dumps(diameterPeerValue)))
+                    if diameterPeer.IpAddress == inboundData.SenderIp and diameterPeer.Port == inboundData.SenderPort:
+                        self.redisMessaging.sendMetric(serviceName='diameter', metricName='prom_diam_response_count_host',
+                                    metricType='gauge', metricAction='inc',
+                                    metricLabels={
+                                    "host": diameterPeer.Hostname},
+                                    metricValue=float(1), metricHelp='Number of Diameter Responses Sent per Host',
+                                    metricExpiry=60,
+                                    usePrefix=True, 
+                                    prefixHostname=self.hostname, 
+                                    prefixServiceName='metric')
+
+        except Exception as e:
+            self.logTool.log(service='HSS', level='error', message=f"[HSS] [handleQueue] Error updating prom_diam_response_count_host: {traceback.format_exc()}", redisClient=self.redisMessaging)
+            pass
+        return True
+
+    def submitInboundMessage(self, inboundMessage: bytes, startTime: float=None, onComplete=None):
+        """
+        Hands a message to the request threads, blocking while requestSlots are all taken.
+        onComplete is called once the message has been handled, whether or not that succeeded.
+        """
+        self.requestSlots.acquire()
+        try:
+            future = self.requestExecutor.submit(self.handleInboundMessage, inboundMessage, startTime)
+        except Exception:
+            self.requestSlots.release()
+            raise
+        future.add_done_callback(lambda future: self.completeInboundMessage(future, onComplete))
+
+    def completeInboundMessage(self, future, onComplete=None):
+        self.requestSlots.release()
+        exception = future.exception()
+        if exception is not None:
+            self.logTool.log(service='HSS', level='error', message=f"[HSS] [completeInboundMessage] Exception: {''.join(traceback.format_exception(type(exception), exception, exception.__traceback__))}", redisClient=self.redisMessaging)
+        if onComplete is not None:
+            try:
+                onComplete()
+            except Exception as e:
+                self.logTool.log(service='HSS', level='error', message=f"[HSS] [completeInboundMessage] Exception: {traceback.format_exc()}", redisClient=self.redisMessaging)
 
     def handleQueue(self):
         """
         Gets and parses inbound diameter requests, processes them and queues the response.
         """
+        if self.inboundTransport == 'stream':
+            return self.handleStream()
         while True:
             try:
                 if self.benchmarking:
@@ -50,99 +192,78 @@ class HssService:
                 if inboundMessageList == None:
                     continue
                 for inboundMessage in inboundMessageList[1]:
-                    self.logTool.log(service='HSS', level='debug', message=f"[HSS] [handleQueue] Message: {inboundMessage}", redisClient=self.redisMessaging)
-                    inboundMessage = inboundMessage.decode('ascii')
-                    inboundData = InboundData.model_validate(pydantic_core.from_json(inboundMessage))
-                    inboundBinary = bytes.fromhex(inboundData.InboundHex)
-
-                    if inboundBinary == None:
+                    if self.requestExecutor is not None:
+                        self.submitInboundMessage(inboundMessage, startTime=startTime if self.benchmarking else None)
                         continue
+                    self.handleInboundMessage(inboundMessage, startTime=startTime if self.benchmarking else None)
 
-                    try:
-                        diameterPeers = self.redisMessaging.getAllHashData(self.diameterPeerKey, usePrefix=True, prefixHostname=self.hostname, prefixServiceName='diameter')
-                        if diameterPeers:
-                            for diameterPeerKey, diameterPeerValue in diameterPeers.items():
-                                diameterPeer = Peer.model_validate(pydantic_core.from_json(json.dumps(diameterPeerValue)))
-                                # If this is a message from a stored peer, increment prom_diam_request_count_host by 1.
-                                if diameterPeer.IpAddress == inboundData.SenderIp and diameterPeer.Port == inboundData.SenderPort:
-                                    self.redisMessaging.sendMetric(serviceName='diameter', metricName='prom_diam_request_count_host',
-                                                metricType='gauge', metricAction='inc',
-                                                metricLabels={
-                                                "host": diameterPeer.Hostname},
-                                                metricValue=float(1), metricHelp='Number of Diameter Requests Recieved per Host',
-                                                metricExpiry=60,
-                                                usePrefix=True, 
-                                                prefixHostname=self.hostname, 
-                                                prefixServiceName='metric')
-
-                    except Exception as e:
-                        self.logTool.log(service='HSS', level='error', message=f"[HSS] [handleQueue] Error updating prom_diam_request_count_host: {traceback.format_exc()}", redisClient=self.redisMessaging)
-                        pass
-
-                    try:
-                        diameterOutbound = self.diameterLibrary.generateDiameterResponse(binaryData=inboundBinary)
-
-                        if diameterOutbound == None:
-                            continue
-                        if not len(diameterOutbound) > 0:
-                            continue
 
-                        diameterMessageTypeDict = self.diameterLibrary.getDiameterMessageType(binaryData=inboundBinary)
-                        
-                        if diameterMessageTypeDict == None:
-                            continue
-                        if not len(diameterMessageTypeDict) > 0:
-                            continue
+            except Exception as e:
+                self.logTool.log(service='HSS', level='error', message=f"[HSS] [handleQueue] Exception: {traceback.format_exc()}", redisClient=self.redisMessaging)
+                continue
 
-                        diameterMessageTypeInbound = diameterMessageTypeDict.get('inbound', '')
-                        diameterMessageTypeOutbound = diameterMessageTypeDict.get('outbound', '')
-                    except Exception as e:
-                        self.logTool.log(service='HSS', level='warning', message=f"[HSS] [handleQueue] Failed to generate diameter outbound: {e}", redisClient=self.redisMessaging)
+    def handleStream(self):
+        """
+        Gets inbound diameter requests from a Redis Stream, through a consumer group shared by every HSS worker on this host.
+        Each request is acknowledged once it's been processed, so a worker dying mid-batch doesn't lose requests.
+        Entries left pending by a worker which died are claimed by the remaining workers once they've been idle for streamClaimIdleTime milliseconds.
+        A live worker must finish every entry it reads within that time, so it only reads streamReadCount entries at once, or as many as it has idle request threads.
+        Entries older than diameter_request_timeout are trimmed by the Diameter service.
+        """
+        streamName = 'diameter-inbound-stream'
+        groupName = f'{self.hostname}-hss'
+        consumerName = f'{self.hostname}-{os.getpid()}'
+        self.redisMessaging.createConsumerGroup(stream=streamName, group=groupName, usePrefix=True, prefixHostname=self.hostname, prefixServiceName='diameter')
+        nextClaimTime = 0
+        inFlightEntryIds = set()
+        while True:
+            try:
+                streamMessages = []
+                readCount = self.streamReadCount
+                if self.requestExecutor is not None:
+                    # Entries read beyond the idle request threads would sit waiting for a thread, while counting towards the claim idle time.
+                    readCount = min(readCount, self.requestThreads - len(inFlightEntryIds))
+                    if readCount <= 0:
+                        time.sleep(0.005)
                         continue
+                if time.time() >= nextClaimTime:
+                    streamMessages += self.redisMessaging.claimStreamMessages(stream=streamName, group=groupName, consumer=consumerName, minIdleTime=self.streamClaimIdleTime, count=readCount, usePrefix=True, prefixHostname=self.hostname, prefixServiceName='diameter')
+                    nextClaimTime = time.time() + (self.streamClaimIdleTime / 1000)
+                    if streamMessages:
+                        self.logTool.log(service='HSS', level='info', message=f"[HSS] [handleStream] Claimed {len(streamMessages)} stale entries from {streamName}", redisClient=self.redisMessaging)
 
-                    self.logTool.log(service='HSS', level='debug', message=f"[HSS] [handleQueue] [{diameterMessageTypeInbound}] Inbound Diameter: {inboundMessage}", redisClient=self.redisMessaging)
-                    
-                    outboundQueue = f"diameter-outbound-{inboundData.SenderIp}-{inboundData.SenderPort}"
-                    outboundMessage = OutboundData(DestinationIp=inboundData.SenderIp,
-                                                   DestinationPort=inboundData.SenderPort,
-                                                   InitialReceiveTimestamp=inboundData.InitialReceiveTimestamp,
-                                                   OutboundHex=diameterOutbound)
-
-                    self.logTool.log(service='HSS', level='debug', message=f"[HSS] [handleQueue] [{diameterMessageTypeOutbound}] Generated Diameter Outbound: {diameterOutbound}", redisClient=self.redisMessaging)
-                    self.logTool.log(service='HSS', level='debug', message=f"[HSS] [handleQueue] [{diameterMessageTypeOutbound}] Outbound Diameter Queue: {outboundQueue}", redisClient=self.redisMessaging)
-                    self.logTool.log(service='HSS', level='debug', message=f"[HSS] [handleQueue] [{diameterMessageTypeOutbound}] Outbound Diameter: {outboundMessage}", redisClient=self.redisMessaging)
+                if self.benchmarking:
+                    startTime = time.perf_counter()
 
-                    self.redisMessaging.sendMessage(queue=outboundQueue, message=outboundMessage.model_dump_json(), queueExpiry=60, usePrefix=True, prefixHostname=self.hostname, prefixServiceName='diameter')
-                    if self.benchmarking:
-                        self.logTool.log(service='HSS', level='info', message=f"[HSS] [handleQueue] [{diameterMessageTypeInbound}] Time taken to process request: {round(((time.perf_counter() - startTime)*1000), 3)} ms", redisClient=self.redisMessaging)
+                if len(streamMessages) < readCount:
+                    streamMessages += self.redisMessaging.awaitStreamMessages(stream=streamName, group=groupName, consumer=consumerName, count=readCount - len(streamMessages), block=1000, usePrefix=True, prefixHostname=self.hostname, prefixServiceName='diameter')
 
+                for entryId, inboundMessage in streamMessages:
+                    if self.requestExecutor is not None:
+                        # An entry still being handled here can be claimed back once it's been idle long enough, it's only handled once.
+                        if entryId in inFlightEntryIds:
+                            continue
+                        inFlightEntryIds.add(entryId)
+                        # Acknowledged by the request thread once it's been handled.
+                        self.submitInboundMessage(inboundMessage, startTime=startTime if self.benchmarking else None,
+                                                  onComplete=lambda entryId=entryId: self.acknowledgeStreamEntry(streamName, groupName, entryId, inFlightEntryIds))
+                        continue
                     try:
-                        diameterPeers = self.redisMessaging.getAllHashData(self.diameterPeerKey, usePrefix=True, prefixHostname=self.hostname, prefixServiceName='diameter')
-                        if diameterPeers:
-                            for diameterPeerKey, diameterPeerValue in diameterPeers.items():
-                                diameterPeer = Peer.model_validate(pydantic_core.from_json(json.dumps(diameterPeerValue)))
-                                if diameterPeer.IpAddress == inboundData.SenderIp and diameterPeer.Port == inboundData.SenderPort:
-                                    self.redisMessaging.sendMetric(serviceName='diameter', metricName='prom_diam_response_count_host',
-                                                metricType='gauge', metricAction='inc',
-                                                metricLabels={
-                                                "host": diameterPeer.Hostname},
-                                                metricValue=float(1), metricHelp='Number of Diameter Responses Sent per Host',
-                                                metricExpiry=60,
-                                                usePrefix=True, 
-                                                prefixHostname=self.hostname, 
-                                                prefixServiceName='metric')
-
+                        self.handleInboundMessage(inboundMessage, startTime=startTime if self.benchmarking else None)
                     except Exception as e:
-                        self.logTool.log(service='HSS', level='error', message=f"[HSS] [handleQueue] Error updating prom_diam_response_count_host: {traceback.format_exc()}", redisClient=self.redisMessaging)
-                        pass
-
+                        self.logTool.log(service='HSS', level='error', message=f"[HSS] [handleStream] Exception processing entry {entryId}: {traceback.format_exc()}", redisClient=self.redisMessaging)
+                    # Acknowledged straight away, rather than with the batch, so a handled entry can't be claimed while the rest are handled.
+                    self.redisMessaging.acknowledgeStreamMessages(stream=streamName, group=groupName, entryIds=[entryId], usePrefix=True, prefixHostname=self.hostname, prefixServiceName='diameter')
 
             except Exception as e:
-                self.logTool.log(service='HSS', level='error', message=f"[HSS] [handleQueue] Exception: {traceback.format_exc()}", redisClient=self.redisMessaging)
+                self.logTool.log(service='HSS', level='error', message=f"[HSS] [handleStream] Exception: {traceback.format_exc()}", redisClient=self.redisMessaging)
                 continue
-            
+
+    def acknowledgeStreamEntry(self, streamName: str, groupName: str, entryId, inFlightEntryIds: set):
+        self.redisMessaging.acknowledgeStreamMessages(stream=streamName, group=groupName, entryIds=[entryId], usePrefix=True, prefixHostname=self.hostname, prefixServiceName='diameter')
+        inFlightEntryIds.discard(entryId)
 
 
 if __name__ == '__main__':
     hssService = HssService()
-    hssService.handleQueue()
\ No newline at end of file
+    hssService.handleQueue()
@@ -0,0 +1,148 @@
+import os, sys, yaml, time, traceback, socket
+sys.path.append(os.path.realpath('../lib'))
+from messaging import RedisMessaging
+from database import Database
+from banners import Banners
+from logtool import LogTool
+
+
+class VectorPoolService:
+    """
+    PyHSS Vector Pool Service
+    Keeps the vector pool topped up with E-UTRAN vectors for recently seen subscribers, so AIRs can be answered without Milenage or an SQN write.
+    AuCs are queued for refill by the HSS service as it takes vectors from their pool. Refills are generated in batches with the batch Milenage, at up to refill_rate vectors per second.
+    """
+
+    def __init__(self):
+        try:
+            with open("../config.yaml", "r") as self.configFile:
+                self.config = yaml.safe_load(self.configFile)
+        except:
+            print(f"[VectorPool] Fatal Error - config.yaml not found, exiting.")
+            quit()
+        self.redisUseUnixSocket = self.config.get('redis', {}).get('useUnixSocket', False)
+        self.redisUnixSocketPath = self.config.get('redis', {}).get('unixSocketPath', '/var/run/redis/redis-server.sock')
+        self.redisHost = self.config.get('redis', {}).get('host', 'localhost')
+        self.redisPort = self.config.get('redis', {}).get('port', 6379)
+        self.redisMessaging = RedisMessaging(host=self.redisHost, port=self.redisPort, useUnixSocket=self.redisUseUnixSocket, unixSocketPath=self.redisUnixSocketPath)
+        self.logTool = LogTool(config=self.config)
+        self.banners = Banners()
+        self.hostname = socket.gethostname()
+        self.refillRate = float(self.config.get('vector_pool', {}).get('refill_rate', 2000))
+        self.refillBatchSize = int(self.config.get('vector_pool', {}).get('refill_batch_size', 256))
+        self.idleTimeout = float(self.config.get('vector_pool', {}).get('idle_timeout', 3600))
+        self.metricInterval = float(self.config.get('vector_pool', {}).get('metric_interval', 10))
+        self.logTool.log(service='VectorPool', level='info', message=f"{self.banners.vectorPoolService()}", redisClient=self.redisMessaging)
+        self.database = Database(logTool=self.logTool, redisMessaging=self.redisMessaging)
+
+        if self.database.vectorPool is None:
+            self.logTool.log(service='VectorPool', level='error', message="[VectorPool] Fatal Error - vector pool not enabled under vector_pool.enabled, or vector_pool.encryption_key not set, exiting.", redisClient=self.redisMessaging)
+            quit()
+        self.vectorPool = self.database.vectorPool
+
+    def refillPools(self) -> int:
+        """
+        Refills the pools of up to refillBatchSize AuCs from the refill queue, and returns the number of vectors generated.
+        """
+        refills = []
+        for auc_id in self.vectorPool.claimRefills(self.refillBatchSize):
+            state = self.vectorPool.getState(auc_id)
+            if state is None:
+                continue
+            generation, plmn, pooledVectors = state
+            if pooledVectors < self.vectorPool.depth:
+                refills.append((auc_id, plmn, self.vectorPool.depth - pooledVectors, generation))
+        if not refills:
+            return 0
+
+        vectorsByAuc = self.database.getEutranVectorBatch([(auc_id, plmn, count) for auc_id, plmn, count, generation in refills])
+        generatedVectors = 0
+        for auc_id, plmn, count, generation in refills:
+            vectors = vectorsByAuc.get(auc_id)
+            if not vectors:
+                continue
+            generatedVectors += len(vectors)
+            # Dropped if the pool was invalidated while these were generated, their SQNs are just skipped.
+            if not self.vectorPool.push(auc_id, plmn, generation, vectors):
+                self.logTool.log(service='VectorPool', level='debug', message=f"[VectorPool] [refillPools] Discarded {len(vectors)} vectors for auc_id {auc_id}, pool changed during refill", redisClient=self.redisMessaging)
+        self.logTool.log(service='VectorPool', level='debug', message=f"[VectorPool] [refillPools] Generated {generatedVectors} vectors for {len(refills)} AuCs", redisClient=self.redisMessaging)
+        return generatedVectors
+
+    def sendPoolMetrics(self):
+        stats = self.vectorPool.takeStats()
+        if not stats:
+            return
+        for metricName, statName, metricHelp in (('prom_vector_pool_depth', 'depth', 'Number of vectors in the vector pool'),
+                                                  ('prom_vector_pool_subscribers', 'subscribers', 'Number of recently seen AuCs in the vector pool'),
+                                                  ('prom_vector_pool_refill_queue', 'refillQueue', 'Number of AuCs waiting for their vector pool to be refilled')):
+            self.redisMessaging.sendMetric(serviceName='vectorPool', metricName=metricName,
+                                            metricType='gauge', metricAction='set',
+                                            metricValue=stats[statName], metricHelp=metricHelp,
+                                            metricExpiry=60,
+                                            usePrefix=True,
+                                            prefixHostname=self.hostname,
+                                            prefixServiceName='metric')
+        for result in ('hit', 'partial', 'miss'):
+            if stats[result] == 0:
+                continue
+            self.redisMessaging.sendMetric(serviceName='vectorPool', metricName='prom_vector_pool_requests',
+                                            metricType='counter', metricAction='inc',
+                                            metricValue=stats[result], metricHelp='AIRs answered fully, partly or not at all from the vector pool',
+                                            metricLabels={'result': result},
+                                            metricExpiry=60,
+                                            usePrefix=True,
+                                            prefixHostname=self.hostname,
+                                            prefixServiceName='metric')
+        requests = stats['hit'] + stats['partial'] + stats['miss']
+        if requests > 0:
+            self.redisMessaging.sendMetric(serviceName='vectorPool', metricName='prom_vector_pool_hit_ratio',
+                                            metricType='gauge', metricAction='set',
+                                            metricValue=stats['hit'] / requests, metricHelp='Share of AIRs answered fully from the vector pool, over the last metric interval',
+                                            metricExpiry=60,
+                                            usePrefix=True,
+                                            prefixHostname=self.hostname,
+                                            prefixServiceName='metric')
+        for event in ('generated', 'dropped'):
+            if stats[event] == 0:
+                continue
+            self.redisMessaging.sendMetric(serviceName='vectorPool', metricName='prom_vector_pool_vectors',
+                                            metricType='counter', metricAction='inc',
+                                            metricValue=stats[event], metricHelp='Vectors added to the vector pool, and dropped from it by invalidation',
+                                            metricLabels={'event': event},
+                                            metricExpiry=60,
+                                            usePrefix=True,
+                                            prefixHostname=self.hostname,
+                                            prefixServiceName='metric')
+
+    def handleRefills(self):
+        """
+        Refills pools as they're queued, no faster than refillRate vectors per second.
+        Pools of AuCs without an AIR for idleTimeout seconds are dropped, and metrics are sent, every metricInterval seconds.
+        """
+        nextMetricTime = 0
+        while True:
+            try:
+                if time.monotonic() >= nextMetricTime:
+                    nextMetricTime = time.monotonic() + self.metricInterval
+                    expiredPools = self.vectorPool.expireIdle(self.idleTimeout)
+                    if expiredPools:
+                        self.logTool.log(service='VectorPool', level='debug', message=f"[VectorPool] [handleRefills] Dropped {expiredPools} idle pools", redisClient=self.redisMessaging)
+                    self.sendPoolMetrics()
+
+                startTime = time.monotonic()
+                generatedVectors = self.refillPools()
+                if generatedVectors == 0:
+                    # Nothing queued, polled rather than blocking so metrics and expiry still run.
+                    time.sleep(0.1)
+                    continue
+                time.sleep(max(generatedVectors / self.refillRate - (time.monotonic() - startTime), 0))
+
+            except Exception as e:
+                self.logTool.log(service='VectorPool', level='error', message=f"[VectorPool] [handleRefills] Exception: {traceback.format_exc()}", redisClient=self.redisMessaging)
+                time.sleep(1)
+                continue
+
+
+if __name__ == '__main__':
+    vectorPoolService = VectorPoolService()
+    vectorPoolService.handleRefills()
@@ -0,0 +1,49 @@
+import unittest
+import logging
+import sys
+import io
+import datetime
+global log
+log= logging.getLogger("UnitTestLogger")
+from sqlalchemy import MetaData, Table, Column, Integer, String, Boolean, DateTime
+import bulkImport
+
+class BulkImport_Tests(unittest.TestCase):
+    table = Table('sim', MetaData(),
+                  Column('sim_id', Integer, primary_key=True),
+                  Column('imsi', String(15), nullable=False),
+                  Column('sqn', Integer, default=1),
+                  Column('enabled', Boolean, default=True),
+                  Column('attached', DateTime),
+                  Column('note', String(512)))
+
+    def test_A_Read_Csv(self):
+        rows = list(bulkImport.readCsvRows(io.StringIO('imsi,sqn,note\n001010000000001,5,"a, b"\n001010000000002,,\n001010000000003,1,x,extra\n')))
+        self.assertEqual(rows[0], (2, {'imsi': '001010000000001', 'sqn': '5', 'note': 'a, b'}), "Quoted fields should be parsed")
+        self.assertEqual(rows[1], (3, {'imsi': '001010000000002'}), "Empty fields should be left out")
+        self.assertEqual(rows[2][0], 4, "Line number should be reported")
+        self.assertIsInstance(rows[2][1], ValueError, "Row with extra fields should be an error")
+
+    def test_B_Read_Ndjson(self):
+        rows = list(bulkImport.readNdjsonRows(io.StringIO('{"imsi": "001010000000001"}\n\nnot json\n[1, 2]\n')))
+        self.assertEqual(rows[0], (1, {'imsi': '001010000000001'}), "JSON object should be parsed")
+        self.assertEqual([lineNumber for lineNumber, row in rows], [1, 3, 4], "Blank lines should be skipped")
+        self.assertIsInstance(rows[1][1], ValueError, "Invalid JSON should be an error")
+        self.assertIsInstance(rows[2][1], ValueError, "JSON which isn't an object should be an error")
+
+    def test_C_Chunk_Rows(self):
+        self.assertEqual(list(bulkImport.chunkRows(range(5), 2)), [[0, 1], [2, 3], [4]], "Rows should be grouped into chunks")
+        self.assertEqual(list(bulkImport.chunkRows([], 2)), [], "No rows should give no chunks")
+
+    def test_D_Validate_Row(self):
+        table = self.__class__.table
+        self.assertEqual(bulkImport.validateRow(table, {'imsi': '001010000000001', 'sqn': '5', 'enabled': 'false', 'attached': '2024-01-01T00:00:00Z'}),
+                         {'imsi': '001010000000001', 'sqn': 5, 'enabled': False, 'attached': datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)}, "Values should be converted to their column types")
+        with self.assertRaisesRegex(ValueError, 'Unknown column'):
+            bulkImport.validateRow(table, {'imsi': '001010000000001', 'ki': '00'})
+        with self.assertRaisesRegex(ValueError, 'Missing required column: imsi'):
+            bulkImport.validateRow(table, {'sqn': 1})
+        with self.assertRaisesRegex(ValueError, 'Invalid value for sqn'):
+            bulkImport.validateRow(table, {'imsi': '001010000000001', 'sqn': 'one'})
+        with self.assertRaisesRegex(ValueError, 'longer than 15'):
+            bulkImport.validateRow(table, {'imsi': '0010100000000010'})
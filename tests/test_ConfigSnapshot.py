@@ -0,0 +1,47 @@
+import unittest
+import logging
+import sys
+global log
+log= logging.getLogger("UnitTestLogger")
+from configSnapshot import ConfigSnapshot
+
+class ConfigSnapshot_Tests(unittest.TestCase):
+    apns = [{'apn_id': 1, 'apn': 'internet', 'charging_rule_list': '1'}, {'apn_id': 2, 'apn': 'ims', 'charging_rule_list': ''}]
+    chargingRules = [{'charging_rule_id': 1, 'rule_name': 'default', 'tft_group_id': 7}, {'charging_rule_id': 2, 'rule_name': 'notft', 'tft_group_id': 8}]
+    tfts = [{'tft_id': 1, 'tft_group_id': 7, 'tft_string': 'permit out ip from any to {{ UE_IP }}', 'direction': 1},
+            {'tft_id': 2, 'tft_group_id': 7, 'tft_string': 'permit out ip from {{ UE_IP }} to any', 'direction': 2}]
+
+    def test_A_Apn_Lookup(self):
+        configSnapshot = ConfigSnapshot(1, self.__class__.apns, self.__class__.chargingRules, self.__class__.tfts)
+        self.assertEqual(configSnapshot.apn(2)['apn'], 'ims', "APN by id Mismatch")
+        self.assertEqual(configSnapshot.apn('2')['apn'], 'ims', "APN ids from apn_list strings should match")
+        self.assertEqual(configSnapshot.apnByName('internet')['apn_id'], 1, "APN by name Mismatch")
+        self.assertIsNone(configSnapshot.apn(3), "Missing APN should return None")
+        self.assertIsNone(configSnapshot.apn('None'), "Invalid APN id should return None")
+
+    def test_B_Charging_Rule_Tfts(self):
+        configSnapshot = ConfigSnapshot(1, self.__class__.apns, self.__class__.chargingRules, self.__class__.tfts)
+        chargingRule = configSnapshot.chargingRule('1')
+        self.assertEqual(chargingRule['rule_name'], 'default', "Charging Rule Mismatch")
+        self.assertEqual([tft['tft_id'] for tft in chargingRule['tft']], [1, 2], "TFT group Mismatch")
+        self.assertEqual(configSnapshot.chargingRule(2)['tft'], [], "Charging Rule without TFTs should have an empty list")
+
+    def test_C_Returned_Rows_Are_Copies(self):
+        configSnapshot = ConfigSnapshot(1, self.__class__.apns, self.__class__.chargingRules, self.__class__.tfts)
+        chargingRule = configSnapshot.chargingRule(1)
+        chargingRule['tft'][0]['tft_string'] = 'permit out ip from any to 10.0.0.1'
+        self.assertIn('{{ UE_IP }}', configSnapshot.chargingRule(1)['tft'][0]['tft_string'], "Snapshot should not be changed by the caller")
+        with self.assertRaises(TypeError):
+            configSnapshot.apnsById[1]['apn'] = 'changed'
+        with self.assertRaises(AttributeError):
+            configSnapshot.version = 2
+
+    def test_D_Duplicate_Apn_Names(self):
+        configSnapshot = ConfigSnapshot(1, self.__class__.apns + [{'apn_id': 3, 'apn': 'internet'}], [], [])
+        self.assertIsNone(configSnapshot.apnByName('internet'), "Duplicate APN names should not be resolved from the snapshot")
+        self.assertEqual(configSnapshot.apn(3)['apn'], 'internet', "Duplicate APN should still be found by id")
+
+if __name__ == '__main__':
+    logging.basicConfig( stream=sys.stderr )
+    logging.getLogger("UnitTestLogger").setLevel( logging.DEBUG )
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+import logging
+import sys
+import time
+import threading
+global log
+log= logging.getLogger("UnitTestLogger")
+import cryptoPool
+import S6a_crypt
+
+class CryptoPool_Tests(unittest.TestCase):
+
+    def test_A_Run(self):
+        pool = cryptoPool.CryptoPool(workers=2, timeout=30, preloadModules=('S6a_crypt',))
+        self.assertEqual(pool.run(pow, 2, 10), 1024, "Result should be returned from the worker")
+        vectors = pool.run(S6a_crypt.generate_eutran_vectors, '465b5ce8b199b49faa5f0a2ee238a6bc', 'cd63cb71954a9f4e48a5994e37a02baf', '8000', [100, 200], '00f110')
+        self.assertEqual([len(value) for vector in vectors for value in vector], [32, 16, 32, 64] * 2, "Vectors should be generated in the worker")
+        pool.stop()
+
+    def test_B_Job_Timeout(self):
+        pool = cryptoPool.CryptoPool(workers=1, timeout=30)
+        pool.run(pow, 2, 1)
+        pool.timeout = 0.2
+        with self.assertRaisesRegex(TimeoutError, "didn't complete"):
+            pool.run(time.sleep, 2)
+        pool.stop()
+
+    def test_C_Pool_Full(self):
+        pool = cryptoPool.CryptoPool(workers=1, maxQueued=0, timeout=30)
+        pool.run(pow, 2, 1)
+        slowJob = threading.Thread(target=pool.run, args=(time.sleep, 1))
+        slowJob.start()
+        time.sleep(0.1)
+        pool.timeout = 0.2
+        with self.assertRaisesRegex(TimeoutError, "full"):
+            pool.run(pow, 2, 1)
+        slowJob.join()
+        pool.timeout = 30
+        self.assertEqual(pool.run(pow, 2, 2), 4, "A slot should be free once the running job completes")
+        pool.stop()
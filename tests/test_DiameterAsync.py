@@ -0,0 +1,38 @@
+import unittest
+import logging
+import sys
+import asyncio
+global log
+log= logging.getLogger("UnitTestLogger")
+import diameterDecoder
+from diameterAsync import DiameterAsync
+
+class DiameterAsync_Tests(unittest.TestCase):
+    Diameter_CER = b"\x01\x00\x01P\x80\x00\x01\x01\x00\x00\x00\x00\x8e\xb7\xd5j\xb0{\xcd\xd6\x00\x00\x01\x08@\x00\x00\rhss01\x00\x00\x00\x00\x00\x01(@\x00\x00)epc.mnc001.mcc001.3gppnetwork.org\x00\x00\x00\x00\x00\x01\x01@\x00\x00\x0e\x00\x01\x7f\x00\x01\x01\x00\x00\x00\x00\x01\n@\x00\x00\x0c\x00\x00\x00\x00\x00\x00\x01\r\x00\x00\x00\x14PyHSS-client\x00\x00\x01\x04@\x00\x00 \x00\x00\x01\x02@\x00\x00\x0c\x01\x00\x00#\x00\x00\x01\n@\x00\x00\x0c\x00\x00(\xaf\x00\x00\x01\x04@\x00\x00 \x00\x00\x01\x02@\x00\x00\x0c\x01\x00\x00\x16\x00\x00\x01\n@\x00\x00\x0c\x00\x00(\xaf\x00\x00\x01\x04@\x00\x00 \x00\x00\x01\x02@\x00\x00\x0c\x01\x00\x00'\x00\x00\x01\n@\x00\x00\x0c\x00\x00(\xaf\x00\x00\x01\x04@\x00\x00 \x00\x00\x01\x02@\x00\x00\x0c\x01\x00\x00\x01\x00\x00\x01\n@\x00\x00\x0c\x00\x00(\xaf\x00\x00\x01\x04@\x00\x00 \x00\x00\x01\x02@\x00\x00\x0c\x01\x00\x00\x00\x00\x00\x01\n@\x00\x00\x0c\x00\x00(\xaf\x00\x00\x01\x02@\x00\x00\x0c\xff\xff\xff\xff\x00\x00\x01\t@\x00\x00\x0c\x00\x00\x15\x9f\x00\x00\x01\t@\x00\x00\x0c\x00\x00(\xaf\x00\x00\x01\t@\x00\x00\x0c\x00\x002\xdb"
+
+    def setUp(self):
+        self.diameterLibrary = DiameterAsync(logTool=None)
+
+    def test_A_Answer_CER(self):
+        response = asyncio.run(self.diameterLibrary.generateDiameterResponse(binaryData=self.__class__.Diameter_CER))
+        header, avps = diameterDecoder.decodePacket(response)
+        avps = diameterDecoder.AvpContainer(avps)
+        self.assertEqual(header.commandCode, 257, "Command Code Mismatch")
+        self.assertFalse(header.isRequest, "CEA should be an answer")
+        self.assertEqual(header.hopByHopId, 0x8eb7d56a, "Hop-by-Hop Identifier Mismatch")
+        self.assertEqual(avps.unsigned32(268), 2001, "Result-Code Mismatch")
+        self.assertEqual(avps.utf8String(264), self.diameterLibrary.originHost, "Origin-Host Mismatch")
+        self.assertNotIn(278, avps, "Origin-State-Id should only be included if the request included it")
+
+    def test_B_Answer_DWR(self):
+        dwr = bytes.fromhex(asyncio.run(self.diameterLibrary.Request_280(originHost='mme01', originRealm='example.com')))
+        response = asyncio.run(self.diameterLibrary.generateDiameterResponse(binaryData=dwr))
+        header, avps = diameterDecoder.decodePacket(response)
+        self.assertEqual(header.commandCode, 280, "Command Code Mismatch")
+        self.assertEqual(header.endToEndId, int.from_bytes(dwr[16:20], 'big'), "End-to-End Identifier Mismatch")
+        self.assertEqual(diameterDecoder.AvpContainer(avps).unsigned32(268), 2001, "Result-Code Mismatch")
+
+if __name__ == '__main__':
+    logging.basicConfig( stream=sys.stderr )
+    logging.getLogger("UnitTestLogger").setLevel( logging.DEBUG )
+    unittest.main()
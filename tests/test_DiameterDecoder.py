@@ -0,0 +1,108 @@
+import unittest
+import logging
+import sys
+global log
+log= logging.getLogger("UnitTestLogger")
+import diameterDecoder
+
+class DiameterDecoder_Tests(unittest.TestCase):
+    Diameter_CER = b"\x01\x00\x01P\x80\x00\x01\x01\x00\x00\x00\x00\x8e\xb7\xd5j\xb0{\xcd\xd6\x00\x00\x01\x08@\x00\x00\rhss01\x00\x00\x00\x00\x00\x01(@\x00\x00)epc.mnc001.mcc001.3gppnetwork.org\x00\x00\x00\x00\x00\x01\x01@\x00\x00\x0e\x00\x01\x7f\x00\x01\x01\x00\x00\x00\x00\x01\n@\x00\x00\x0c\x00\x00\x00\x00\x00\x00\x01\r\x00\x00\x00\x14PyHSS-client\x00\x00\x01\x04@\x00\x00 \x00\x00\x01\x02@\x00\x00\x0c\x01\x00\x00#\x00\x00\x01\n@\x00\x00\x0c\x00\x00(\xaf\x00\x00\x01\x04@\x00\x00 \x00\x00\x01\x02@\x00\x00\x0c\x01\x00\x00\x16\x00\x00\x01\n@\x00\x00\x0c\x00\x00(\xaf\x00\x00\x01\x04@\x00\x00 \x00\x00\x01\x02@\x00\x00\x0c\x01\x00\x00'\x00\x00\x01\n@\x00\x00\x0c\x00\x00(\xaf\x00\x00\x01\x04@\x00\x00 \x00\x00\x01\x02@\x00\x00\x0c\x01\x00\x00\x01\x00\x00\x01\n@\x00\x00\x0c\x00\x00(\xaf\x00\x00\x01\x04@\x00\x00 \x00\x00\x01\x02@\x00\x00\x0c\x01\x00\x00\x00\x00\x00\x01\n@\x00\x00\x0c\x00\x00(\xaf\x00\x00\x01\x02@\x00\x00\x0c\xff\xff\xff\xff\x00\x00\x01\t@\x00\x00\x0c\x00\x00\x15\x9f\x00\x00\x01\t@\x00\x00\x0c\x00\x00(\xaf\x00\x00\x01\t@\x00\x00\x0c\x00\x002\xdb"
+    Diameter_AIR = b"\x01\x00\x01\x14\xc0\x00\x01>\x01\x00\x00#0\xd0hym\x19i\xc8\x00\x00\x01\x07@\x00\x00'6873733031;3076d64228;1;app_s6a\x00\x00\x00\x01\x15@\x00\x00\x0c\x00\x00\x00\x01\x00\x00\x01\x08@\x00\x00\rhss01\x00\x00\x00\x00\x00\x01(@\x00\x00)epc.mnc001.mcc001.3gppnetwork.org\x00\x00\x00\x00\x00\x01\x1b@\x00\x00\x1cnickvsnetworking.com\x00\x00\x00\x01@\x00\x00\x17505931111111116\x00\x00\x00\x05\x80\xc0\x00\x00,\x00\x00(\xaf\x00\x00\x05\x82\xc0\x00\x00\x10\x00\x00(\xaf\x00\x00\x00\x01\x00\x00\x05\x84\xc0\x00\x00\x10\x00\x00(\xaf\x00\x00\x00\x01\x00\x00\x05\x7f\xc0\x00\x00\x0f\x00\x00(\xaf\x05\xf59\x00\x00\x00\x01\x04@\x00\x00 \x00\x00\x01\n@\x00\x00\x0c\x00\x00(\xaf\x00\x00\x01\x02@\x00\x00\x0c\x01\x00\x00#"
+
+    def test_A_Decode_CER_Header(self):
+        header, avps = diameterDecoder.decodePacket(self.__class__.Diameter_CER)
+        self.assertEqual(header.commandCode, 257, "Command Code Mismatch")
+        self.assertEqual(header.applicationId, 0, "Application ID Mismatch")
+        self.assertTrue(header.isRequest, "CER should be a request")
+        self.assertEqual(header.length, len(self.__class__.Diameter_CER), "Length Mismatch")
+
+    def test_B_Decode_Hex_String(self):
+        headerBinary, avpsBinary = diameterDecoder.decodePacket(self.__class__.Diameter_CER)
+        headerHex, avpsHex = diameterDecoder.decodePacket(self.__class__.Diameter_CER.hex())
+        self.assertEqual(headerBinary.toPacketVars(), headerHex.toPacketVars(), "Hex and binary input should decode identically")
+        self.assertEqual(diameterDecoder.toLegacyAvps(avpsBinary), diameterDecoder.toLegacyAvps(avpsHex), "Hex and binary input should decode identically")
+
+    def test_C_Decode_AIR_Tree(self):
+        header, avps = diameterDecoder.decodePacket(self.__class__.Diameter_AIR)
+        self.assertEqual(header.toPacketVars()['flags'], 'c0', "Flags Mismatch")
+        self.assertEqual(header.toPacketVars()['hop-by-hop-identifier'], '30d06879', "Hop-by-Hop Identifier Mismatch")
+        requestedAuthInfo = [avp for avp in avps if avp.code == 1408][0]
+        self.assertEqual(requestedAuthInfo.vendorId, 10415, "Vendor ID Mismatch")
+        self.assertEqual([child.code for child in requestedAuthInfo.children], [1410, 1412], "Grouped AVP children mismatch")
+        self.assertEqual(bytes(requestedAuthInfo.children[0].payload), b'\x00\x00\x00\x01', "Number-Of-Requested-Vectors Mismatch")
+
+    def test_D_Payload_Is_Zero_Copy(self):
+        header, avps = diameterDecoder.decodePacket(self.__class__.Diameter_AIR)
+        userName = [avp for avp in avps if avp.code == 1][0]
+        self.assertIsInstance(userName.payload, memoryview, "Payload should be a memoryview")
+        self.assertIs(userName.payload.obj, self.__class__.Diameter_AIR, "Payload should reference the original buffer")
+        self.assertEqual(bytes(userName.payload), b'505931111111116', "User-Name Mismatch")
+
+    def test_E_Legacy_Format(self):
+        header, avps = diameterDecoder.decodePacket(self.__class__.Diameter_AIR)
+        legacyAvps = diameterDecoder.toLegacyAvps(avps)
+        sessionId = [avp for avp in legacyAvps if avp['avp_code'] == 263][0]
+        self.assertEqual(bytes.fromhex(sessionId['misc_data']).decode('ascii'), '6873733031;3076d64228;1;app_s6a', "Session-Id Mismatch")
+        self.assertEqual(sessionId['vendor_id'], '', "Non-vendor AVP should have an empty vendor_id")
+        requestedAuthInfo = [avp for avp in legacyAvps if avp['avp_code'] == 1408][0]
+        self.assertEqual(requestedAuthInfo['misc_data'], '', "Grouped AVP should have empty misc_data")
+        self.assertEqual([subAvp['misc_data'] for subAvp in requestedAuthInfo['sub_avps']], ['00000001', '00000001'], "Sub-AVP data mismatch")
+
+    def test_F_Container_Lookup(self):
+        header, avps = diameterDecoder.decodePacket(self.__class__.Diameter_AIR)
+        avpContainer = diameterDecoder.AvpContainer(avps)
+        self.assertEqual(avpContainer.utf8String(1), '505931111111116', "User-Name Mismatch")
+        self.assertEqual(avpContainer.utf8String('User-Name'), '505931111111116', "User-Name lookup by name Mismatch")
+        self.assertEqual(avpContainer.hex(1407, 10415), '05f539', "Visited-PLMN-Id Mismatch")
+        self.assertEqual(len(avpContainer.all(1410)), 1, "Nested AVP should be indexed")
+        self.assertIsNone(avpContainer.first(1410, 0), "Vendor ID should be part of the index key")
+        self.assertIn(1410, avpContainer, "Nested AVP should be found with in")
+        self.assertNotIn(278, avpContainer, "Origin-State-Id should not be present in AIR")
+
+    def test_G_Container_Path(self):
+        header, avps = diameterDecoder.decodePacket(self.__class__.Diameter_AIR)
+        avpContainer = diameterDecoder.AvpContainer(avps)
+        self.assertEqual(avpContainer.unsigned32('Requested-EUTRAN-Authentication-Info/Number-Of-Requested-Vectors'), 1, "Number-Of-Requested-Vectors Mismatch")
+        self.assertEqual(avpContainer.unsigned32('Vendor-Specific-Application-Id/Auth-Application-Id'), 16777251, "Auth-Application-Id Mismatch")
+        self.assertEqual(avpContainer.all('Vendor-Specific-Application-Id/Product-Name'), [], "Path should only match direct children")
+
+    def test_H_Container_Missing_Avp(self):
+        header, avps = diameterDecoder.decodePacket(self.__class__.Diameter_CER)
+        avpContainer = diameterDecoder.AvpContainer(avps)
+        with self.assertRaises(KeyError):
+            avpContainer.utf8String(1)
+        self.assertIsNone(avpContainer.utf8String(1, default=None), "Default should be returned for a missing AVP")
+        self.assertEqual(avpContainer.address(257), '127.0.1.1', "Host-IP-Address Mismatch")
+
+    def test_I_Container_From_Legacy(self):
+        header, avps = diameterDecoder.decodePacket(self.__class__.Diameter_AIR)
+        avpContainer = diameterDecoder.fromLegacyAvps(diameterDecoder.toLegacyAvps(avps))
+        self.assertEqual(avpContainer.utf8String(263), '6873733031;3076d64228;1;app_s6a', "Session-Id Mismatch")
+        self.assertEqual(avpContainer.unsigned32('Requested-EUTRAN-Authentication-Info/Number-Of-Requested-Vectors'), 1, "Number-Of-Requested-Vectors Mismatch")
+    def test_J_Framer_Coalesced_Messages(self):
+        diameterFramer = diameterDecoder.DiameterFramer()
+        messages = diameterFramer.feed(self.__class__.Diameter_CER + self.__class__.Diameter_AIR)
+        self.assertEqual(messages, [self.__class__.Diameter_CER, self.__class__.Diameter_AIR], "Coalesced messages should be split")
+        self.assertEqual(len(diameterFramer), 0, "Framer buffer should be empty")
+
+    def test_K_Framer_Partial_Messages(self):
+        diameterFramer = diameterDecoder.DiameterFramer()
+        stream = self.__class__.Diameter_CER + self.__class__.Diameter_AIR
+        self.assertEqual(diameterFramer.feed(stream[:3]), [], "Partial header should be buffered")
+        self.assertEqual(diameterFramer.feed(stream[3:100]), [], "Partial message should be buffered")
+        self.assertEqual(diameterFramer.feed(stream[100:len(self.__class__.Diameter_CER) + 30]), [self.__class__.Diameter_CER], "First message should be returned once complete")
+        self.assertEqual(len(diameterFramer), 30, "Start of the second message should stay buffered")
+        self.assertEqual(diameterFramer.feed(stream[len(self.__class__.Diameter_CER) + 30:]), [self.__class__.Diameter_AIR], "Second message should be returned once complete")
+
+    def test_L_Framer_Invalid_Messages(self):
+        with self.assertRaises(ValueError):
+            diameterDecoder.DiameterFramer(maxMessageSize=256).feed(self.__class__.Diameter_CER)
+        with self.assertRaises(ValueError):
+            diameterDecoder.DiameterFramer().feed(b'\x02' + self.__class__.Diameter_CER[1:])
+        with self.assertRaises(ValueError):
+            diameterDecoder.DiameterFramer().feed(b'\x01\x00\x00\x08')
+
+if __name__ == '__main__':
+    logging.basicConfig( stream=sys.stderr )
+    logging.getLogger("UnitTestLogger").setLevel( logging.DEBUG )
+    unittest.main()
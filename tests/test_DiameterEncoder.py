@@ -0,0 +1,52 @@
+import unittest
+import logging
+import sys
+global log
+log= logging.getLogger("UnitTestLogger")
+import diameterEncoder
+import diameterDecoder
+
+class DiameterEncoder_Tests(unittest.TestCase):
+
+    def test_A_Encode_Avp_Padding(self):
+        avp = diameterEncoder.encodeAvp(264, 0x40, b'hss01')
+        self.assertEqual(avp.hex(), '000001084000000d6873733031000000', "Origin-Host AVP Mismatch")
+        self.assertEqual(len(avp) % 4, 0, "AVP should be padded to a multiple of 4 bytes")
+
+    def test_B_Encode_Vendor_Avp(self):
+        avp = diameterEncoder.encodeAvp(1407, 0xc0, bytes.fromhex('05f539'), vendorId=10415)
+        self.assertEqual(avp.hex(), '0000057fc000000f000028af05f53900', "Visited-PLMN-Id AVP Mismatch")
+
+    def test_C_Grouped_Avp_Length_Backpatch(self):
+        buffer = bytearray()
+        avpOffset = diameterEncoder.startGroupedAvp(buffer, 260, 0x40)
+        diameterEncoder.encodeAvp(266, 0x40, b'\x00\x00\x28\xaf', buffer=buffer)
+        diameterEncoder.encodeAvp(258, 0x40, b'\x01\x00\x00\x23', buffer=buffer)
+        diameterEncoder.finishGroupedAvp(buffer, avpOffset)
+        self.assertEqual(buffer.hex(), '00000104400000200000010a4000000c000028af000001024000000c01000023', "Vendor-Specific-Application-Id Mismatch")
+
+    def test_D_Encode_Packet_Roundtrip(self):
+        avps = diameterEncoder.encodeAvp(263, 0x40, b'hss01;1;app_s6a')
+        avps = diameterEncoder.encodeAvp(1, 0x40, b'505931111111116', buffer=avps)
+        packet = diameterEncoder.encodePacket(0xc0, 318, 16777251, 0x30d06879, 0x6d1969c8, avps)
+        header, decodedAvps = diameterDecoder.decodePacket(bytes(packet))
+        self.assertEqual(header.length, len(packet), "Packet Length Mismatch")
+        self.assertEqual(header.commandCode, 318, "Command Code Mismatch")
+        self.assertEqual(header.applicationId, 16777251, "Application ID Mismatch")
+        self.assertEqual(header.hopByHopId, 0x30d06879, "Hop-by-Hop Identifier Mismatch")
+        self.assertEqual(diameterDecoder.AvpContainer(decodedAvps).utf8String(1), '505931111111116', "User-Name Mismatch")
+
+    def test_E_Encode_Address(self):
+        self.assertEqual(diameterEncoder.encodeAddress('127.0.1.1').hex(), '00017f000101', "IPv4 Address Mismatch")
+        self.assertEqual(diameterEncoder.encodeAddress('::1').hex(), '0002' + '00' * 15 + '01', "IPv6 Address Mismatch")
+
+    def test_F_Capabilities_Exchange_Avps(self):
+        avps = diameterDecoder.AvpContainer(diameterDecoder.decodeAvps(bytes(diameterEncoder.encodeCapabilitiesExchangeAvps(['10.0.0.1'], b'PyHSS'))))
+        self.assertEqual(avps.address(257), '10.0.0.1', "Host-IP-Address Mismatch")
+        self.assertEqual(avps.utf8String(269), 'PyHSS', "Product-Name Mismatch")
+        self.assertEqual([avp.unsigned32() for avp in avps.all('Vendor-Specific-Application-Id/Auth-Application-Id')], list(diameterEncoder.CAPABILITIES_EXCHANGE_APPLICATIONS), "Advertised applications Mismatch")
+
+if __name__ == '__main__':
+    logging.basicConfig( stream=sys.stderr )
+    logging.getLogger("UnitTestLogger").setLevel( logging.DEBUG )
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+import logging
+import sys
+global log
+log= logging.getLogger("UnitTestLogger")
+import diameterEnvelope
+
+class DiameterEnvelope_Tests(unittest.TestCase):
+    Diameter_DWA = bytes.fromhex('01000044000001180000000000000001000000010000010c4000000c000007d1000001084000000d687373303100000000000128400000136578616d706c652e636f6d00')
+
+    def test_A_Inbound_Binary_Roundtrip(self):
+        inboundMessage = diameterEnvelope.InboundMessage(SenderIp='10.0.0.1', SenderPort='3868', InitialReceiveTimestamp=1700000000123456789, Packet=self.__class__.Diameter_DWA)
+        encodedMessage = diameterEnvelope.encodeInbound(inboundMessage)
+        self.assertEqual(len(encodedMessage), 14 + len('10.0.0.1') + len('3868') + len(self.__class__.Diameter_DWA), "Envelope Length Mismatch")
+        decodedMessage = diameterEnvelope.decodeInbound(encodedMessage)
+        self.assertEqual(decodedMessage.SenderIp, '10.0.0.1', "Sender IP Mismatch")
+        self.assertEqual(decodedMessage.SenderPort, '3868', "Sender Port Mismatch")
+        self.assertEqual(decodedMessage.LocalIp, '', "Local IP Mismatch")
+        self.assertEqual(decodedMessage.InitialReceiveTimestamp, 1700000000123456789, "Timestamp Mismatch")
+        self.assertEqual(decodedMessage.Packet, self.__class__.Diameter_DWA, "Packet Mismatch")
+
+    def test_B_Inbound_Json_Compatibility(self):
+        inboundMessage = diameterEnvelope.InboundMessage(SenderIp='10.0.0.1', SenderPort='3868', InitialReceiveTimestamp=1700000000123456789, Packet=self.__class__.Diameter_DWA)
+        encodedMessage = diameterEnvelope.encodeInbound(inboundMessage, binary=False)
+        self.assertIn('"InboundHex":"' + self.__class__.Diameter_DWA.hex() + '"', encodedMessage, "JSON format should match InboundData")
+        decodedMessage = diameterEnvelope.decodeInbound(encodedMessage.encode('ascii'))
+        self.assertEqual(decodedMessage.SenderIp, '10.0.0.1', "Sender IP Mismatch")
+        self.assertEqual(decodedMessage.Packet, self.__class__.Diameter_DWA, "Packet Mismatch")
+
+    def test_C_Outbound_Roundtrip(self):
+        outboundMessage = diameterEnvelope.OutboundMessage(DestinationIp='10.0.0.2', DestinationPort='40000', InitialReceiveTimestamp=1, Packet=self.__class__.Diameter_DWA)
+        for binary in (True, False):
+            decodedMessage = diameterEnvelope.decodeOutbound(diameterEnvelope.encodeOutbound(outboundMessage, binary=binary))
+            self.assertEqual(decodedMessage.DestinationIp, '10.0.0.2', "Destination IP Mismatch")
+            self.assertEqual(decodedMessage.DestinationPort, '40000', "Destination Port Mismatch")
+            self.assertEqual(decodedMessage.Packet, self.__class__.Diameter_DWA, "Packet Mismatch")
+
+    def test_D_Envelope_Type_Mismatch(self):
+        outboundMessage = diameterEnvelope.OutboundMessage(DestinationIp='10.0.0.2', DestinationPort='40000', InitialReceiveTimestamp=1, Packet=self.__class__.Diameter_DWA)
+        with self.assertRaises(ValueError):
+            diameterEnvelope.decodeInbound(diameterEnvelope.encodeOutbound(outboundMessage))
+    def test_E_Correlation_Keys(self):
+        diameterAnswer = bytes([self.__class__.Diameter_DWA[0], 0, 0, 0x44, 0x00]) + self.__class__.Diameter_DWA[5:]
+        requestKeys = diameterEnvelope.correlationKeys('10.0.0.1', '3868', self.__class__.Diameter_DWA)
+        self.assertEqual(requestKeys, diameterEnvelope.correlationKeys('10.0.0.1', '3868', diameterAnswer), "Answer should match its request")
+        self.assertNotEqual(requestKeys, diameterEnvelope.correlationKeys('10.0.0.2', '3868', diameterAnswer), "Answer from another peer should not match")
+        self.assertEqual(requestKeys[1], 'diameter-answer-10.0.0.1-3868-0000000100000001', "Reply Key Mismatch")
+
+if __name__ == '__main__':
+    logging.basicConfig( stream=sys.stderr )
+    logging.getLogger("UnitTestLogger").setLevel( logging.DEBUG )
+    unittest.main()
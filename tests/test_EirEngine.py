@@ -0,0 +1,46 @@
+import unittest
+import logging
+import sys
+global log
+log= logging.getLogger("UnitTestLogger")
+import eirEngine
+
+class EirEngine_Tests(unittest.TestCase):
+    eirRules = [{'eir_id': 1, 'imei': '^3512', 'imsi': '', 'regex_mode': 1, 'match_response_code': 1},
+                {'eir_id': 2, 'imei': '351234567890123', 'imsi': '001010000000001', 'regex_mode': 0, 'match_response_code': 0},
+                {'eir_id': 3, 'imei': '351234567890123', 'imsi': '', 'regex_mode': 0, 'match_response_code': 2},
+                {'eir_id': 4, 'imei': '86.*', 'imsi': '00102.*', 'regex_mode': 1, 'match_response_code': 1},
+                {'eir_id': 5, 'imei': '(35|86)99', 'imsi': '', 'regex_mode': 1, 'match_response_code': 2},
+                {'eir_id': 6, 'imei': '[', 'imsi': '', 'regex_mode': 1, 'match_response_code': 1}]
+
+    def test_A_Literal_Prefix(self):
+        self.assertEqual(eirEngine.literalPrefix('^3512.*'), '3512', "Anchored prefix Mismatch")
+        self.assertEqual(eirEngine.literalPrefix('35?1'), '3', "Optional character should not be part of the prefix")
+        self.assertEqual(eirEngine.literalPrefix('351{2}'), '35', "Repeated character should not be part of the prefix")
+        self.assertEqual(eirEngine.literalPrefix('35|86'), '', "Alternation should have no prefix")
+        self.assertEqual(eirEngine.literalPrefix('351234567890123'), '351234567890123', "Literal pattern should be its own prefix")
+
+    def test_B_Exact_Match_Order(self):
+        engine = eirEngine.EirEngine(self.__class__.eirRules)
+        self.assertEqual(engine.match(imsi='001010000000001', imei='351234567890123')['eir_id'], 2, "IMEI and IMSI exact rule should match")
+        self.assertEqual(engine.match(imsi='001010000000002', imei='351234567890123')['eir_id'], 3, "IMEI only exact rule should match other IMSIs")
+        engine = eirEngine.EirEngine(self.__class__.eirRules + [{'eir_id': 0, 'imei': '351234567890123', 'imsi': '', 'regex_mode': 0, 'match_response_code': 1}])
+        self.assertEqual(engine.match(imsi='001010000000001', imei='351234567890123')['eir_id'], 0, "Earliest exact rule should win")
+
+    def test_C_Regex_Match(self):
+        engine = eirEngine.EirEngine(self.__class__.eirRules)
+        self.assertEqual(engine.match(imsi='001010000000001', imei='351299999999999')['eir_id'], 1, "Prefix regex rule should match")
+        self.assertEqual(engine.match(imsi='001020000000001', imei='861200000000000')['eir_id'], 4, "IMEI and IMSI regex rule should match")
+        self.assertIsNone(engine.match(imsi='001010000000001', imei='861200000000000'), "IMSI regex should be checked")
+        self.assertEqual(engine.match(imsi='001010000000001', imei='869900000000000')['eir_id'], 5, "Alternation rule should match without a prefix")
+        self.assertIsNone(engine.match(imsi='001010000000001', imei='490154203237518'), "Unmatched IMEI should return None")
+
+    def test_D_Invalid_Regex(self):
+        engine = eirEngine.EirEngine(self.__class__.eirRules)
+        self.assertEqual([eirRule['eir_id'] for eirRule, eirError in engine.invalidRules], [6], "Invalid regex rule should be reported")
+        self.assertEqual(len(engine.regexRules), 3, "Invalid regex rule should be skipped")
+
+if __name__ == '__main__':
+    logging.basicConfig( stream=sys.stderr )
+    logging.getLogger("UnitTestLogger").setLevel( logging.DEBUG )
+    unittest.main()
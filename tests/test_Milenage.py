@@ -0,0 +1,58 @@
+import unittest
+import logging
+import sys
+global log
+log= logging.getLogger("UnitTestLogger")
+from milenage import Milenage, xor, rotate
+
+# 3GPP TS 35.208 test sets 1 to 4: K, RAND, SQN, AMF, OP, OPc, f1, f1*, f2, f5, f3, f4, f5*
+TEST_SETS = [
+    ('465b5ce8b199b49faa5f0a2ee238a6bc', '23553cbe9637a89d218ae64dae47bf35', 'ff9bb4d0b607', 'b9b9', 'cdc202d5123e20f62b6d676ac72cb318', 'cd63cb71954a9f4e48a5994e37a02baf',
+     '4a9ffac354dfafb3', '01cfaf9ec4e871e9', 'a54211d5e3ba50bf', 'aa689c648370', 'b40ba9a3c58b2a05bbf0d987b21bf8cb', 'f769bcd751044604127672711c6d3441', '451e8beca43b'),
+    ('0396eb317b6d1c36f19c1c84cd6ffd16', 'c00d603103dcee52c4478119494202e8', 'fd8eef40df7d', 'af17', 'ff53bade17df5d4e793073ce9d7579fa', '53c15671c60a4b731c55b4a441c0bde2',
+     '5df5b31807e258b0', 'a8c016e51ef4a343', 'd3a628ed988620f0', 'c47783995f72', '58c433ff7a7082acd424220f2b67c556', '21a8c1f929702adb3e738488b9f5c5da', '30f1197061c1'),
+    ('fec86ba6eb707ed08905757b1bb44b8f', '9f7c8d021accf4db213ccff0c7f71a6a', '9d0277595ffc', '725c', 'dbc59adcb6f9a0ef735477b7fadf8374', '1006020f0a478bf6b699f15c062e42b3',
+     '9cabc3e99baf7281', '95814ba2b3044324', '8011c48c0c214ed2', '33484dc2136b', '5dbdbb2954e8f3cde665b046179a5098', '59a92d3b476a0443487055cf88b2307b', 'deacdd848cc6'),
+    ('9e5944aea94b81165c82fbf9f32db751', 'ce83dbc54ac0274a157c17f80d017bd6', '0b604a81eca8', '9e09', '223014c5806694c007ca1eeef57f004f', 'a64a507ae1a2a98bb88eb4210135dc87',
+     '74a58220cba84c49', 'ac2cc74a96871837', 'f365cd683cd92e96', 'f0b9c08ad02e', 'e203edb3971574f5a94b0d61b816345d', '0c4524adeac041c4dd830d20854fc46b', '6085a86c6f63'),
+]
+
+class Milenage_Tests(unittest.TestCase):
+
+    def test_A_Generate_Opc(self):
+        for testSet in TEST_SETS:
+            key, op, opc = bytes.fromhex(testSet[0]), bytes.fromhex(testSet[4]), testSet[5]
+            self.assertEqual(Milenage.generate_opc(key, op).hex(), opc, "OPc should match TS 35.208")
+
+    def test_B_Functions(self):
+        for key, rand, sqn, amf, op, opc, f1, f1Star, f2, f5, f3, f4, f5Star in TEST_SETS:
+            key, rand, sqn, amf, opc = bytes.fromhex(key), bytes.fromhex(rand), bytes.fromhex(sqn), bytes.fromhex(amf), bytes.fromhex(opc)
+            macA, macS = Milenage.f1(key, sqn, rand, opc, amf)
+            self.assertEqual((macA.hex(), macS.hex()), (f1, f1Star), "f1 and f1* should match TS 35.208")
+            xres, ak = Milenage.f2_f5(key, rand, opc)
+            self.assertEqual((xres.hex(), ak.hex()), (f2, f5), "f2 and f5 should match TS 35.208")
+            self.assertEqual(Milenage.f3(key, rand, opc).hex(), f3, "f3 should match TS 35.208")
+            self.assertEqual(Milenage.f4(key, rand, opc).hex(), f4, "f4 should match TS 35.208")
+            self.assertEqual(Milenage.f5_star(key, rand, opc).hex(), f5Star, "f5* should match TS 35.208")
+
+    def test_C_Xor_Rotate(self):
+        self.assertEqual(xor(b'\x0f\xf0\xaa', b'\xff\xff\x55'), b'\xf0\x0f\xff', "Bytes should be XORed")
+        self.assertEqual(rotate(b'\x01\x02\x03\x04', 1), b'\x02\x03\x04\x01', "Rotate should move bytes left")
+        self.assertEqual(rotate(b'\x01\x02\x03\x04', 0), b'\x01\x02\x03\x04', "Rotate by zero should be unchanged")
+
+    def test_D_Resync(self):
+        key, rand, sqn, amf, op, opc = [bytes.fromhex(value) for value in TEST_SETS[0][:6]]
+        crypto = Milenage(amf)
+        auts = crypto.generate_auts(key, opc, rand, 12345)
+        self.assertEqual(crypto.generate_resync(auts, key, opc, rand)[0], 12345, "SQN should be recovered from AUTS")
+
+    def test_E_Eutran_Vector(self):
+        for key, rand, sqn, amf, op, opc, f1, f1Star, f2, f5, f3, f4, f5Star in TEST_SETS:
+            crypto = Milenage(bytes.fromhex(amf))
+            plmn = bytes.fromhex('00f110')
+            vector = crypto.generate_eutran_vector(bytes.fromhex(key), bytes.fromhex(opc), int(sqn, 16), plmn, rand=bytes.fromhex(rand))
+            sqnXorAk = xor(bytes.fromhex(sqn), bytes.fromhex(f5))
+            self.assertEqual(vector[0].hex(), rand, "RAND should be returned")
+            self.assertEqual(vector[1].hex(), f2, "XRES should be f2")
+            self.assertEqual(vector[2], sqnXorAk + bytes.fromhex(amf + f1), "AUTN should be SQN xor AK, AMF and MAC-A")
+            self.assertEqual(vector[3], Milenage.KDF(bytes.fromhex(f3 + f4), b'\x10' + plmn + b'\x00\x03' + sqnXorAk + b'\x00\x06'), "KASME should be derived from CK and IK")
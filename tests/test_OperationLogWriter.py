@@ -0,0 +1,55 @@
+import unittest
+import logging
+import sys
+import time
+global log
+log= logging.getLogger("UnitTestLogger")
+import operationLogWriter
+
+class OperationLogWriter_Tests(unittest.TestCase):
+
+    def setUp(self):
+        self.batches = []
+        self.failWrites = False
+
+    def writeBatch(self, batch):
+        if self.failWrites:
+            raise ValueError("Database unavailable")
+        self.batches.append(batch)
+
+    def test_A_Flush_In_Batches(self):
+        writer = operationLogWriter.OperationLogWriter(writeBatch=self.writeBatch, batchSize=3, flushInterval=60)
+        writer.entries.extend(range(7))
+        self.assertEqual(writer.flush(), 7, "Every queued entry should be written")
+        self.assertEqual(self.batches, [[0, 1, 2], [3, 4, 5], [6]], "Entries should be written in order, in batches")
+        self.assertEqual(len(writer), 0, "Queue should be empty after a flush")
+
+    def test_B_Background_Write(self):
+        writer = operationLogWriter.OperationLogWriter(writeBatch=self.writeBatch, batchSize=100, flushInterval=0.05)
+        writer.append([{'operation_id': 'A'}, {'operation_id': 'B'}])
+        for attempt in range(100):
+            if self.batches:
+                break
+            time.sleep(0.01)
+        self.assertEqual(self.batches, [[{'operation_id': 'A'}, {'operation_id': 'B'}]], "Background thread should write queued entries")
+        writer.stop()
+
+    def test_C_Failed_Write_Requeued(self):
+        errors = []
+        writer = operationLogWriter.OperationLogWriter(writeBatch=self.writeBatch, batchSize=2, flushInterval=60, errorHandler=errors.append)
+        writer.entries.extend(range(5))
+        self.failWrites = True
+        self.assertEqual(writer.flush(), 0, "Nothing should be written while the database is unavailable")
+        self.assertEqual(len(errors), 1, "Error handler should be called once per flush")
+        self.assertEqual(list(writer.entries), [0, 1, 2, 3, 4], "Failed batch should be put back in order")
+        self.failWrites = False
+        writer.flush()
+        self.assertEqual(self.batches, [[0, 1], [2, 3], [4]], "Entries should be written once the database is back")
+
+    def test_D_Overflow_Drops_Oldest(self):
+        writer = operationLogWriter.OperationLogWriter(writeBatch=self.writeBatch, batchSize=100, flushInterval=60, maxQueued=3)
+        writer.start = lambda: None
+        writer.append([0, 1, 2, 3, 4])
+        self.assertEqual(list(writer.entries), [2, 3, 4], "Oldest entries should be dropped")
+        self.assertEqual(writer.takeDroppedEntries(), 2, "Dropped entries should be counted")
+        self.assertEqual(writer.takeDroppedEntries(), 0, "Dropped count should reset once taken")
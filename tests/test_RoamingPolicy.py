@@ -0,0 +1,36 @@
+import unittest
+import logging
+import sys
+global log
+log= logging.getLogger("UnitTestLogger")
+from roamingPolicy import RoamingPolicy
+
+class RoamingPolicy_Tests(unittest.TestCase):
+    roamingNetworks = [{'roaming_network_id': 1, 'mcc': '505', 'mnc': '001'},
+                       {'roaming_network_id': 2, 'mcc': '505', 'mnc': '002'}]
+    roamingRules = [{'roaming_rule_id': 3, 'roaming_network_id': 1, 'allow': True},
+                    {'roaming_rule_id': 1, 'roaming_network_id': 1, 'allow': False},
+                    {'roaming_rule_id': 2, 'roaming_network_id': 2, 'allow': True},
+                    {'roaming_rule_id': 4, 'roaming_network_id': 9, 'allow': True}]
+
+    def test_A_Subscriber_Rules(self):
+        roamingPolicy = RoamingPolicy(self.__class__.roamingRules, self.__class__.roamingNetworks)
+        self.assertEqual(roamingPolicy.evaluate('3', '505', '001'), (True, 'subscriber'), "Subscriber rule should allow the network")
+        self.assertEqual(roamingPolicy.evaluate('2,1', '505', '001'), (False, 'subscriber'), "First subscriber rule for the network should apply")
+        self.assertEqual(roamingPolicy.evaluate('1,3', '505', '001'), (False, 'subscriber'), "Subscriber rules should be checked in order")
+
+    def test_B_Network_Fallback(self):
+        roamingPolicy = RoamingPolicy(self.__class__.roamingRules, self.__class__.roamingNetworks)
+        self.assertEqual(roamingPolicy.evaluate('', '505', '001'), (False, 'network'), "Lowest roaming_rule_id for the network should apply")
+        self.assertEqual(roamingPolicy.evaluate('2', '505', '001'), (False, 'network'), "Subscriber rules for other networks should fall back")
+        self.assertEqual(roamingPolicy.evaluate(None, 505, '002'), (True, 'network'), "PLMN should be matched as strings")
+
+    def test_C_Undefined_Network(self):
+        roamingPolicy = RoamingPolicy(self.__class__.roamingRules, self.__class__.roamingNetworks)
+        self.assertEqual(roamingPolicy.evaluate('4', '001', '01'), (None, None), "Unknown network should not match any rule")
+        self.assertNotIn('4', roamingPolicy.rulesById, "Rule without a roaming network should be skipped")
+
+if __name__ == '__main__':
+    logging.basicConfig( stream=sys.stderr )
+    logging.getLogger("UnitTestLogger").setLevel( logging.DEBUG )
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+import logging
+import sys
+import time
+global log
+log= logging.getLogger("UnitTestLogger")
+from subscriberCache import SubscriberCache
+
+class SubscriberCache_Tests(unittest.TestCase):
+
+    def test_A_Get_Returns_Copy(self):
+        subscriberCache = SubscriberCache()
+        subscriberCache.set(('subscriber', 'imsi', '001010000000001'), ('subscriber', 1), {'subscriber_id': 1, 'msisdn': '123'})
+        row = subscriberCache.get(('subscriber', 'imsi', '001010000000001'))
+        self.assertEqual(row['msisdn'], '123', "MSISDN Mismatch")
+        row['attributes'] = []
+        self.assertNotIn('attributes', subscriberCache.get(('subscriber', 'imsi', '001010000000001')), "Cached row should not be changed by the caller")
+        self.assertIsNone(subscriberCache.get(('subscriber', 'imsi', '001010000000002')), "Missing key should return None")
+        self.assertEqual(subscriberCache.takeStats(), {'hit': 2, 'miss': 1, 'eviction': 0}, "Stats Mismatch")
+        self.assertEqual(subscriberCache.takeStats(), {'hit': 0, 'miss': 0, 'eviction': 0}, "Stats should be reset once taken")
+
+    def test_B_Invalidate_Row(self):
+        subscriberCache = SubscriberCache()
+        subscriberCache.set(('subscriber', 'imsi', '001010000000001'), ('subscriber', 1), {'subscriber_id': 1})
+        subscriberCache.set(('subscriber', 'msisdn', '123'), ('subscriber', 1), {'subscriber_id': 1})
+        subscriberCache.set(('subscriber', 'imsi', '001010000000002'), ('subscriber', 2), {'subscriber_id': 2})
+        self.assertEqual(subscriberCache.invalidate(('subscriber', 1)), 2, "Every key for the row should be invalidated")
+        self.assertIsNone(subscriberCache.get(('subscriber', 'msisdn', '123')), "Invalidated key should be missing")
+        self.assertIsNotNone(subscriberCache.get(('subscriber', 'imsi', '001010000000002')), "Other rows should stay cached")
+        self.assertEqual(subscriberCache.invalidate(('subscriber', 1)), 0, "Row should only be invalidated once")
+
+    def test_C_Least_Recently_Used_Eviction(self):
+        subscriberCache = SubscriberCache(maxEntries=2)
+        subscriberCache.set(('apn', 'apn_id', '1'), ('apn', 1), {'apn_id': 1})
+        subscriberCache.set(('apn', 'apn_id', '2'), ('apn', 2), {'apn_id': 2})
+        subscriberCache.get(('apn', 'apn_id', '1'))
+        subscriberCache.set(('apn', 'apn_id', '3'), ('apn', 3), {'apn_id': 3})
+        self.assertEqual(len(subscriberCache), 2, "Cache should not grow past maxEntries")
+        self.assertIsNone(subscriberCache.get(('apn', 'apn_id', '2')), "Least recently used entry should be evicted")
+        self.assertIsNotNone(subscriberCache.get(('apn', 'apn_id', '1')), "Recently used entry should be kept")
+        self.assertEqual(subscriberCache.invalidate(('apn', 2)), 0, "Evicted entry should be removed from the row index")
+        self.assertEqual(subscriberCache.takeStats()['eviction'], 1, "Eviction count Mismatch")
+
+    def test_D_Expiry(self):
+        subscriberCache = SubscriberCache(ttl=0.05)
+        subscriberCache.set(('auc', 'imsi', '001010000000001'), ('auc', 1), {'auc_id': 1})
+        self.assertIsNotNone(subscriberCache.get(('auc', 'imsi', '001010000000001')), "Entry should be cached before the TTL")
+        time.sleep(0.1)
+        self.assertIsNone(subscriberCache.get(('auc', 'imsi', '001010000000001')), "Entry should expire after the TTL")
+        self.assertEqual(len(subscriberCache), 0, "Expired entry should be removed")
+
+if __name__ == '__main__':
+    logging.basicConfig( stream=sys.stderr )
+    logging.getLogger("UnitTestLogger").setLevel( logging.DEBUG )
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+import logging
+import sys
+import os
+import tempfile
+global log
+log= logging.getLogger("UnitTestLogger")
+import tacDatabase
+
+class TacDatabase_Tests(unittest.TestCase):
+    tacCsv = ('tac,name,model\n'
+              '35123456,"Apple","iPhone 12"\n'
+              '351234,Apple,Generic\n'
+              '012345,Nokia,Six Digit\n'
+              '00012345,Nokia,Eight Digit\n'
+              '86000000,Quectel,EC25\n'
+              '86000000,Duplicate,Ignored\n')
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.csvPath = os.path.join(self.directory.name, 'tac.csv')
+        self.indexPath = os.path.join(self.directory.name, 'tac.csv.idx')
+        with open(self.csvPath, 'w') as csvFile:
+            csvFile.write(self.__class__.tacCsv)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def assertLookups(self, database):
+        self.assertEqual(len(database), 5, "Header and duplicate rows should be skipped")
+        self.assertEqual(database.lookup('351234567890123'), {'tacPrefix': '35123456', 'name': 'Apple', 'model': 'iPhone 12'}, "8 digit TAC should match first")
+        self.assertEqual(database.lookup('351234000000000')['model'], 'Generic', "6 digit TAC should match when there's no 8 digit TAC")
+        self.assertEqual(database.lookup('000123450000000')['model'], 'Eight Digit', "Leading zeros should be part of the TAC")
+        self.assertEqual(database.lookup('012345000000000')['model'], 'Six Digit', "6 and 8 digit TACs should not collide")
+        self.assertEqual(database.lookup('860000001234567')['name'], 'Quectel', "First entry for a TAC should win")
+        self.assertEqual(database.lookup('490154203237518'), {}, "Unknown TAC should return an empty dict")
+        self.assertEqual(database.lookup('35'), {}, "Short IMEI should return an empty dict")
+
+    def test_A_In_Memory_Lookup(self):
+        self.assertLookups(tacDatabase.TacDatabase.load(self.csvPath))
+
+    def test_B_Index_Lookup(self):
+        database = tacDatabase.TacDatabase.load(self.csvPath, self.indexPath)
+        self.assertTrue(os.path.exists(self.indexPath), "Index file should be written")
+        self.assertIsNotNone(database.indexFile, "Index file should be mapped")
+        self.assertLookups(database)
+
+    def test_C_Stale_Index_Rebuilt(self):
+        tacDatabase.TacDatabase.load(self.csvPath, self.indexPath)
+        with open(self.csvPath, 'a') as csvFile:
+            csvFile.write('49015420,Motorola,Razr\n')
+        indexTime = os.path.getmtime(self.indexPath)
+        os.utime(self.csvPath, (indexTime + 10, indexTime + 10))
+        database = tacDatabase.TacDatabase.load(self.csvPath, self.indexPath)
+        self.assertEqual(database.lookup('490154203237518')['model'], 'Razr', "Index older than the CSV should be rebuilt")
+
+    def test_D_Invalid_Index(self):
+        with open(self.indexPath, 'wb') as indexFile:
+            indexFile.write(b'not an index')
+        with self.assertRaises(ValueError):
+            tacDatabase.TacDatabase.openIndex(self.indexPath)
+
+    def test_E_Invalid_Rows_Skipped(self):
+        with open(self.csvPath, 'a') as csvFile:
+            csvFile.write('923456789,Bad,Row\n'
+                          '1234567,Seven,Digits\n'
+                          '35ABCDEF,Not,Numeric\n'
+                          '35999999,NoModel\n'
+                          '\n'
+                          '49015420,Motorola,Razr\n')
+        skippedRows = []
+        database = tacDatabase.TacDatabase.load(self.csvPath, self.indexPath, skippedRows)
+        self.assertIsNotNone(database.indexFile, "Invalid rows shouldn't stop the index being written")
+        self.assertEqual(len(database), 6, "Only valid rows should be loaded")
+        self.assertEqual(database.lookup('490154203237518')['model'], 'Razr', "Rows after invalid rows should still be loaded")
+        self.assertEqual([lineNumber for lineNumber, reason in skippedRows], [8, 9, 10, 11], "Each invalid row should be reported with its line number")
+        self.assertIn('923456789', skippedRows[0][1], "Reason should include the TAC")
@@ -0,0 +1,46 @@
+import unittest
+import logging
+import sys
+import os
+global log
+log= logging.getLogger("UnitTestLogger")
+import vectorPool
+import S6a_crypt
+from milenage import Milenage
+
+class VectorPool_Tests(unittest.TestCase):
+    vector = {'rand': os.urandom(16).hex(), 'xres': os.urandom(8).hex(), 'autn': os.urandom(16).hex(), 'kasme': os.urandom(32).hex()}
+
+    def test_A_Encrypt_Vector(self):
+        pool = vectorPool.VectorPool(redisMessaging=None, hostname='hss01', encryptionKey=os.urandom(32))
+        storedVector = pool.encryptVector(1, '00f110', self.__class__.vector)
+        self.assertEqual(len(storedVector), 12 + 72 + 16, "Stored vector should be the nonce, vector and tag")
+        self.assertNotIn(bytes.fromhex(self.__class__.vector['kasme']), storedVector, "KASME shouldn't be stored in the clear")
+        self.assertNotEqual(storedVector, pool.encryptVector(1, '00f110', self.__class__.vector), "Each vector should have its own nonce")
+        self.assertEqual(pool.decryptVector(1, '00f110', storedVector), self.__class__.vector, "Vector should decrypt to the original")
+
+    def test_B_Vector_Bound_To_AuC(self):
+        pool = vectorPool.VectorPool(redisMessaging=None, hostname='hss01', encryptionKey=os.urandom(16))
+        storedVector = pool.encryptVector(1, '00f110', self.__class__.vector)
+        with self.assertRaises(ValueError):
+            pool.decryptVector(2, '00f110', storedVector)
+        with self.assertRaises(ValueError):
+            pool.decryptVector(1, '00f120', storedVector)
+        with self.assertRaises(ValueError):
+            pool.decryptVector(1, '00f110', storedVector[:-1] + bytes([storedVector[-1] ^ 1]))
+
+    def test_C_Encryption_Key(self):
+        with self.assertRaisesRegex(ValueError, 'encryption key'):
+            vectorPool.VectorPool(redisMessaging=None, hostname='hss01', encryptionKey=os.urandom(20))
+        self.assertEqual(vectorPool.VectorPool(redisMessaging=None, hostname='hss01', encryptionKey=os.urandom(32), depth=8).refillThreshold, 4, "Refill threshold should default to half the depth")
+
+    def test_D_Refill_Batch(self):
+        keys = [os.urandom(16) for i in range(3)]
+        opcs = [os.urandom(16) for i in range(3)]
+        sqns = [100, 200, 5000]
+        plmn = bytes.fromhex('00f110')
+        vectors = S6a_crypt.generate_eutran_vector_batch([key.hex() for key in keys], [opc.hex() for opc in opcs], '8000', sqns, plmn.hex())
+        crypto = Milenage(b'\x80\x00')
+        for i, (rand, xres, autn, kasme) in enumerate(vectors):
+            expected = crypto.generate_eutran_vector(keys[i], opcs[i], sqns[i], plmn, rand=bytes.fromhex(rand))
+            self.assertEqual((rand, xres, autn, kasme), tuple(value.hex() for value in expected), "Each row should use its own K, OPc and SQN")
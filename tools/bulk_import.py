@@ -0,0 +1,47 @@
+# Streams a CSV or NDJSON file of AUC, SUBSCRIBER or IMS SUBSCRIBER objects to the PyHSS API's bulk import endpoint
+# e.g. python3 bulk_import.py --table auc --file sims.csv --api http://localhost:8080
+import argparse
+import json
+import sys
+import requests
+
+parser = argparse.ArgumentParser(description='PyHSS Bulk Provisioning Import Tool')
+parser.add_argument('--table', type=str, required=True, choices=('auc', 'subscriber', 'ims_subscriber'), help='Table to import into')
+parser.add_argument('--file', type=str, required=True, help='CSV file with a header line of column names, or NDJSON file with one object per line')
+parser.add_argument('--format', type=str, required=False, choices=('csv', 'ndjson'), help='File format, defaults to ndjson for .ndjson and .jsonl files, otherwise csv')
+parser.add_argument('--api', type=str, required=False, default='http://localhost:8080', help='PyHSS API URL')
+parser.add_argument('--chunk-size', type=int, required=False, help='Number of rows validated and inserted per batch, defaults to api.bulk_import_chunk_size')
+parser.add_argument('--operation-id', type=str, required=False, help='Operation ID to record the import under')
+parser.add_argument('--provisioning-key', type=str, required=False, help='Provisioning-Key, if hss.lock_provisioning is enabled')
+args = parser.parse_args()
+
+importFormat = args.format or ('ndjson' if args.file.endswith(('.ndjson', '.jsonl')) else 'csv')
+params = {'format': importFormat}
+if args.chunk_size:
+    params['chunk_size'] = args.chunk_size
+if args.operation_id:
+    params['operation_id'] = args.operation_id
+headers = {'Content-Type': 'application/x-ndjson' if importFormat == 'ndjson' else 'text/csv'}
+if args.provisioning_key:
+    headers['Provisioning-Key'] = args.provisioning_key
+
+# Passing the open file streams it to the API, rather than reading it all into memory.
+with open(args.file, 'rb') as importFile:
+    response = requests.put(f"{args.api.rstrip('/')}/oam/bulk_import/{args.table}", params=params, headers=headers, data=importFile)
+
+try:
+    result = response.json()
+except ValueError:
+    print(f"Import failed with HTTP {response.status_code}: {response.text}")
+    sys.exit(1)
+
+if response.status_code != 200:
+    print(f"Import failed with HTTP {response.status_code}: {json.dumps(result)}")
+    sys.exit(1)
+
+for error in result.get('errors', []):
+    print(f"Line {error['line']}: {error['reason']}")
+print(f"Operation {result.get('operation_id')}: inserted {result.get('inserted')} rows, rejected {result.get('rejected')} rows")
+if result.get('rejected', 0) > len(result.get('errors', [])):
+    print(f"Only the first {len(result.get('errors', []))} rejected rows are listed")
+sys.exit(0 if result.get('rejected', 0) == 0 else 2)
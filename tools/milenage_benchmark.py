@@ -0,0 +1,53 @@
+# Measures E-UTRAN vector generation throughput, for the scalar Milenage functions and for milenageBatch
+# e.g. python3 milenage_benchmark.py --vectors 20000
+import argparse
+import os
+import sys
+import time
+sys.path.append(os.path.realpath('../lib'))
+from milenage import Milenage
+import milenageBatch
+
+parser = argparse.ArgumentParser(description='PyHSS Milenage Benchmark')
+parser.add_argument('--vectors', type=int, required=False, default=10000, help='Number of vectors to generate per run')
+parser.add_argument('--batch-size', type=int, required=False, default=1000, help='Number of vectors per milenageBatch call')
+args = parser.parse_args()
+
+key = bytes.fromhex('465b5ce8b199b49faa5f0a2ee238a6bc')
+opc = bytes.fromhex('cd63cb71954a9f4e48a5994e37a02baf')
+amf = bytes.fromhex('8000')
+plmn = bytes.fromhex('00f110')
+crypto = Milenage(amf)
+
+def referenceVector(sqn):
+    # The vector built from the individual f1 to f4 functions, each running its own AES encryptions
+    sqnBytes = sqn.to_bytes(6, 'big')
+    rand = Milenage.generate_rand()
+    macA, _ = Milenage.f1(key, sqnBytes, rand, opc, amf)
+    xres, ak = Milenage.f2_f5(key, rand, opc)
+    ck = Milenage.f3(key, rand, opc)
+    ik = Milenage.f4(key, rand, opc)
+    return rand, xres, Milenage.generate_autn(sqnBytes, ak, macA, amf), Milenage.generate_kasme(ck, ik, plmn, sqnBytes, ak)
+
+def run(name, generateVector):
+    startTime = time.perf_counter()
+    for sqn in range(args.vectors):
+        generateVector(sqn)
+    elapsed = time.perf_counter() - startTime
+    print(f"{name}: {args.vectors} vectors in {elapsed:.3f}s, {args.vectors / elapsed:.0f} vectors/s")
+
+run('f1-f4 functions', referenceVector)
+run('generate_eutran_vector', lambda sqn: crypto.generate_eutran_vector(key, opc, sqn, plmn))
+
+def runBatch():
+    # Every row gets its own K and OPc, as when precomputing vectors for many subscribers
+    keys = milenageBatch.generateRands(args.batch_size)
+    opcs = milenageBatch.generateRands(args.batch_size)
+    startTime = time.perf_counter()
+    for firstSqn in range(0, args.vectors, args.batch_size):
+        sqns = list(range(firstSqn, min(firstSqn + args.batch_size, args.vectors)))
+        milenageBatch.generateEutranVectors(keys[:len(sqns)], opcs[:len(sqns)], sqns, plmn, amf)
+    elapsed = time.perf_counter() - startTime
+    print(f"milenageBatch, batches of {args.batch_size}: {args.vectors} vectors in {elapsed:.3f}s, {args.vectors / elapsed:.0f} vectors/s")
+
+runBatch()